@@ -3,10 +3,12 @@ Export API endpoints for CSV and Excel generation
 """
 
 import logging
-from fastapi import APIRouter, HTTPException, Response
-from fastapi.responses import StreamingResponse
+import os
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
-from ...services.export_service import get_export_service
+from ...services.export_service import get_export_service, new_export_path
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -19,13 +21,14 @@ async def export_job_to_csv(job_id: str):
     
     Returns CSV file with one row per field:
     - document_name, field_name, field_value, confidence, page, etc.
+    
+    The file is streamed from a database cursor, so memory use does not grow with job size
     """
     try:
         export_service = await get_export_service()
-        csv_bytes = await export_service.generate_csv_export(job_id)
         
-        return Response(
-            content=csv_bytes,
+        return StreamingResponse(
+            export_service.stream_csv_export(job_id),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename=job_{job_id}_export.csv"
@@ -56,20 +59,29 @@ async def export_job_to_excel(
         export_service = await get_export_service()
         
         if format == "summary":
-            excel_bytes = await export_service.generate_excel_summary(job_id)
+            write_excel = export_service.write_excel_summary
             filename = f"job_{job_id}_summary.xlsx"
         elif format == "pivoted":
-            excel_bytes = await export_service.generate_excel_pivoted(job_id)
+            write_excel = export_service.write_excel_pivoted
             filename = f"job_{job_id}_pivoted.xlsx"
         else:
             raise HTTPException(status_code=400, detail=f"Invalid format: {format}")
         
-        return Response(
-            content=excel_bytes,
+        # Write-only workbook goes to a temp file, streamed from disk and removed after sending
+        path = new_export_path(".xlsx")
+        try:
+            await write_excel(job_id, path)
+        except Exception:
+            os.unlink(path)
+            raise
+        
+        return FileResponse(
+            path,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
-            }
+            },
+            background=BackgroundTask(os.unlink, path)
         )
     except HTTPException:
         raise
@@ -89,14 +101,13 @@ async def preview_export_data(job_id: str, limit: int = 10):
     """
     try:
         export_service = await get_export_service()
-        documents = await export_service.query_job_fields(job_id)
-        
-        # Limit preview
-        preview_docs = documents[:limit]
+        # Only the previewed documents are read; the total comes from a count query
+        preview_docs = await export_service.query_job_fields(job_id, limit=limit)
+        total_documents = await export_service.count_job_documents(job_id)
         
         return {
             "job_id": job_id,
-            "total_documents": len(documents),
+            "total_documents": total_documents,
             "preview_count": len(preview_docs),
             "documents": preview_docs
         }
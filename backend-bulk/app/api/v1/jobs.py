@@ -330,7 +330,7 @@ async def fix_stuck_jobs(
             completed_docs = completed_docs_result.scalar()
             
             # If all documents are done, update job status
-            if total_docs > 0 and completed_docs == total_docs:
+            if total_docs > 0 and completed_docs == total_docs and job.discovery_cursor is None:
                 job.status = 'completed'
                 job.completed_at = datetime.utcnow()
                 fixed_jobs.append({
@@ -46,15 +46,33 @@ class Settings(BaseSettings):
     DEFAULT_BATCH_SIZE: int = 50
     DEFAULT_MAX_RETRIES: int = 3
     DEFAULT_RETRY_DELAY: int = 60
+    WORKER_BULK_INSERT_METHOD: str = "copy"  # Worker row persistence: "copy" (COPY FROM STDIN) or "executemany" (batched multi-row INSERT)
+    DISCOVERY_TASK_MAX_SECONDS: int = 240  # A discovery task hands its cursor to a fresh task after this long (keeps huge sources under the task time limit)
+    ENQUEUE_CHUNK_SIZE: int = 500  # process_document tasks published per broker producer (and per status/progress update)
+    EXPORT_FETCH_SIZE: int = 2000  # Field rows fetched per round trip by the export server-side cursor
     
     # PDF Processing
     PDF_PROCESSING_MAX_WORKERS: int = 10
     PDF_PROCESSING_MAX_THREADS: int = 4
+    PDF_DOCUMENT_CACHE_MAX_MB: int = 512  # Byte budget for cached opened PDFs; pinned documents are never evicted
+    PDF_DOCUMENT_CACHE_MAX_ENTRIES: int = 64  # Maximum number of opened PDFs kept in the cache
+    PDF_RENDER_MODE: str = "thread"  # "thread" or "process" (process mode needs a non-daemonic worker, e.g. --pool=threads)
+    PDF_RENDER_PROCESSES: int = 0  # Render worker processes in "process" mode (0 = one per CPU core)
+    PDF_RENDER_PAGES_PER_TASK: int = 4  # Pages rendered per worker task in "process" mode
+    PAGE_RENDER_CACHE_ENABLED: bool = True  # Cache encoded pages and text results on local disk
+    PAGE_RENDER_CACHE_DIR: str = ""  # Cache directory ("" = <system temp>/page_render_cache); share it between services
+    PAGE_RENDER_CACHE_MAX_MB: int = 2048  # Size cap for the page render cache (LRU eviction)
     
     # Parallel Page Processing (Batch-based threading)
     PARALLEL_PAGE_WORKERS: int = 10  # Number of threads per document
-    PAGES_PER_THREAD: int = 5  # Each thread processes N pages sequentially
+    PAGES_PER_THREAD: int = 5  # Unused - pages are streamed through PAGE_PIPELINE_WINDOW instead of per-thread batches
+    PAGE_PIPELINE_WINDOW: int = 0  # Max pages rendered but not yet extracted per document (0 = 2 x PARALLEL_PAGE_WORKERS)
     PROGRESS_CHECKPOINT_INTERVAL: int = 10  # Save progress every N pages
+    LLM_PAGES_PER_CALL: int = 1  # Pages packed into one extraction call (1 = one call per page)
+    LLM_CALL_TOKEN_BUDGET: int = 24000  # Estimated tokens (page images + expected output) per multi-page call (0 = no limit)
+    PAGE_TASK_MIN_PAGES: int = 0  # Documents with at least this many pages are split into page-range tasks (0 = whole-document tasks only)
+    PAGE_TASK_RANGE_SIZE: int = 25  # Pages per page-range task
+    PAGE_TASK_STAGING_DIR: str = ""  # Where a split document's PDF is staged for its range tasks ("" = <system temp>/page_range_staging; use a shared volume across hosts)
     MAX_TOKENS_PER_PAGE: int = 50000  # Maximum tokens per page extraction
     MAX_RETRIES_PER_PAGE: int = 3  # Maximum retries for failed pages
     RETRY_BACKOFF_BASE: int = 5  # Base seconds for exponential backoff (5s, 10s, 20s)
@@ -65,6 +83,17 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = ""  # Direct Gemini API key
     EXTRACTION_MODEL: str = "gemini-2.0-flash"  # Model to use for extraction
     MAPPING_MODEL: str = "azure/gpt-4.1"  # Model to use for mapping
+    LLM_RESPONSE_CACHE_BACKEND: str = "none"  # Response cache, opt in per deployment: "memory" (per process), "sqlite" (shared on host) or "none"
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 86400  # How long a cached response stays valid
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 5000  # Maximum cached responses (LRU eviction)
+    LLM_RESPONSE_CACHE_PATH: str = ""  # SQLite file for the "sqlite" backend ("" = <system temp>/llm_response_cache.sqlite3)
+    LLM_RATE_LIMITER_ENABLED: bool = True  # Enforce the adaptive concurrency limit and budgets (429 cooldown always applies)
+    LLM_MIN_CONCURRENCY: int = 2  # Floor for the adaptive in-flight limit (per worker process)
+    LLM_MAX_CONCURRENCY: int = 20  # Ceiling for the adaptive in-flight limit (per worker process)
+    LLM_INITIAL_CONCURRENCY: int = 10  # Starting in-flight limit; grows on success, halves on 429/503
+    LLM_REQUESTS_PER_MINUTE: int = 0  # Per-process request budget (0 = unlimited)
+    LLM_TOKENS_PER_MINUTE: int = 0  # Per-process token budget, tracked from response usage (0 = unlimited)
+    LLM_TARGET_LATENCY_SECONDS: float = 60.0  # Calls slower than this shrink the limit (0 = ignore latency)
     
     # LiteLLM (legacy/fallback)
     LITELLM_API_URL: str = ""
@@ -31,6 +31,9 @@ class BulkJob(Base):
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    discovery_cursor = Column(Text, nullable=True)  # Continuation token after the last discovered page (None when not started or finished)
+    discovery_completed_at = Column(DateTime(timezone=True), nullable=True)
+    queued_documents = Column(Integer, default=0)  # Documents whose processing task has been published
     
     # Relationships
     documents = relationship("BulkJobDocument", back_populates="job", cascade="all, delete-orphan")
@@ -68,7 +68,7 @@ class ProcessingOptions(BaseModel):
     # Advanced worker configuration (per-job settings)
     worker_concurrency: int = Field(default=50, ge=1, le=100, description="Max PDFs processing simultaneously")
     worker_prefetch_multiplier: int = Field(default=2, ge=1, le=10, description="Tasks prefetched per worker")
-    pages_per_thread: int = Field(default=5, ge=1, le=20, description="Pages each thread processes sequentially")
+    page_window: Optional[int] = Field(default=None, ge=1, le=200, description="Max pages rendered ahead of extraction (default 2 x parallel_workers)")
     checkpoint_interval: int = Field(default=50, ge=10, le=500, description="Save progress every N pages")
 
 
@@ -138,6 +138,7 @@ class BulkJobResponse(BaseModel):
     total_documents: int = Field(..., alias="totalDocuments")
     processed_documents: int = Field(..., alias="processedDocuments")
     failed_documents: int = Field(..., alias="failedDocuments")
+    queued_documents: int = Field(default=0, alias="queuedDocuments")
     documents_needing_review: int = Field(default=0, alias="documentsNeedingReview")
     created_at: datetime = Field(..., alias="createdAt")
     started_at: Optional[datetime] = Field(None, alias="startedAt")
@@ -165,6 +166,7 @@ class BulkJobResponse(BaseModel):
             "totalDocuments": obj.total_documents or 0,
             "processedDocuments": obj.processed_documents or 0,
             "failedDocuments": obj.failed_documents or 0,
+            "queuedDocuments": obj.queued_documents or 0,
             "createdAt": obj.created_at,
             "startedAt": obj.started_at,
             "completedAt": obj.completed_at,
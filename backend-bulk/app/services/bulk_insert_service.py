@@ -4,8 +4,11 @@ Handles inserting 3,600+ fields per document in ~100ms
 """
 
 import asyncio
+import io
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import uuid
+from typing import List, Dict, Any, Optional, Sequence
 from datetime import datetime
 import asyncpg
 from ..core.config import settings
@@ -322,3 +325,96 @@ async def shutdown_bulk_insert_service():
         await _bulk_insert_service.close_pool()
         _bulk_insert_service = None
         logger.info("BulkInsertService shutdown complete")
+
+
+# ============================================================================
+# Synchronous COPY for Celery workers (SQLAlchemy Session on psycopg2)
+# ============================================================================
+
+# Rows per INSERT statement in "executemany" mode
+_EXECUTE_VALUES_PAGE_SIZE = 1000
+
+
+def copy_rows_sync(
+    db,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    method: Optional[str] = None
+) -> int:
+    """
+    Bulk insert rows through a worker's sync Session without the ORM
+    
+    Rows are written on the Session's own connection, so they commit or roll back
+    together with the rest of the Session (the caller still calls db.commit()).
+    
+    Args:
+        db: SQLAlchemy Session (psycopg2)
+        table: Table name
+        columns: Column names, in row order
+        rows: Tuples of values (dict/list values are stored as JSON)
+        method: "copy" (COPY FROM STDIN) or "executemany" (batched multi-row INSERT);
+                defaults to settings.WORKER_BULK_INSERT_METHOD
+            
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    
+    method = (method or settings.WORKER_BULK_INSERT_METHOD).lower()
+    column_list = ", ".join(columns)
+    start_time = datetime.now()
+    
+    cursor = db.connection().connection.cursor()
+    try:
+        if method == "copy":
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write(",".join(_copy_csv_value(value) for value in row))
+                buffer.write("\n")
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+        elif method == "executemany":
+            from psycopg2.extras import execute_values
+            execute_values(
+                cursor,
+                f"INSERT INTO {table} ({column_list}) VALUES %s",
+                [tuple(_sql_value(value) for value in row) for row in rows],
+                page_size=_EXECUTE_VALUES_PAGE_SIZE
+            )
+        else:
+            raise ValueError(f"Unknown bulk insert method: {method}")
+    finally:
+        cursor.close()
+    
+    elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+    logger.debug(f"Bulk inserted {len(rows)} rows into {table} in {elapsed_ms}ms ({method})")
+    return len(rows)
+
+
+def _sql_value(value: Any) -> Any:
+    """Adapt a row value for psycopg2 (JSON columns take serialized dicts/lists)"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _copy_csv_value(value: Any) -> str:
+    """
+    Encode one value for COPY ... WITH (FORMAT csv)
+    
+    NULL is an unquoted empty field and every string is quoted, so empty strings and
+    NULLs stay distinct (csv.writer cannot express that before Python 3.12).
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return '"' + str(value).replace('"', '""') + '"'
@@ -3,13 +3,17 @@ Export Service - Generate CSV/Excel files from granular field data
 Queries bulk_extracted_fields table and builds structured exports
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from io import BytesIO, StringIO
+import os
+import tempfile
+from typing import List, Dict, Any, Optional, AsyncIterator
+from io import StringIO
 import csv
 import asyncpg
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 
@@ -17,6 +21,42 @@ from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Rows are ordered by document so each document's fields arrive contiguously
+# (d.id breaks ties between documents sharing a filename)
+_JOB_FIELDS_QUERY = """
+    SELECT 
+        d.id as document_id,
+        d.filename as document_name,
+        d.source_path,
+        f.field_name,
+        f.field_label,
+        f.field_type,
+        f.field_value,
+        f.confidence_score,
+        f.page_number,
+        f.validation_status,
+        f.needs_manual_review
+    FROM bulk_job_documents d
+    JOIN bulk_extracted_fields f ON d.id = f.document_id
+    WHERE d.job_id = $1 
+      AND d.status = 'completed'
+    ORDER BY d.filename, d.id, f.page_number, f.field_name
+"""
+
+CSV_FIELDNAMES = [
+    "document_name",
+    "field_name",
+    "field_label",
+    "field_type",
+    "field_value",
+    "confidence",
+    "page",
+    "validation_status",
+    "needs_review"
+]
+
+CSV_CHUNK_BYTES = 64 * 1024  # Flush streamed CSV to the client in chunks of about this size
+
 
 class ExportService:
     """
@@ -48,225 +88,256 @@ class ExportService:
             await self.pool.close()
             self.pool = None
     
-    async def query_job_fields(self, job_id: str) -> List[Dict[str, Any]]:
+    async def iter_job_field_rows(self, job_id: str) -> AsyncIterator[asyncpg.Record]:
         """
-        Query all fields for a job, organized by document
-        
-        Returns:
-            List of documents with their extracted fields
+        Stream field rows for a job through a server-side cursor
+        Rows are fetched EXPORT_FETCH_SIZE at a time, so memory stays flat regardless of job size
         """
         if not self.pool:
             await self.initialize_pool()
         
         async with self.pool.acquire() as conn:
-            # Query all fields with document info
-            rows = await conn.fetch("""
-                SELECT 
-                    d.id as document_id,
-                    d.filename as document_name,
-                    d.source_path,
-                    f.field_name,
-                    f.field_label,
-                    f.field_type,
-                    f.field_value,
-                    f.confidence_score,
-                    f.page_number,
-                    f.validation_status,
-                    f.needs_manual_review
-                FROM bulk_job_documents d
-                JOIN bulk_extracted_fields f ON d.id = f.document_id
-                WHERE d.job_id = $1 
-                  AND d.status = 'completed'
-                ORDER BY d.filename, f.page_number, f.field_name
-            """, job_id)
-            
-            # Group by document
-            documents = {}
-            for row in rows:
+            # Cursors only live inside a transaction (this also pins the pooler connection)
+            async with conn.transaction():
+                async for row in conn.cursor(_JOB_FIELDS_QUERY, job_id, prefetch=settings.EXPORT_FETCH_SIZE):
+                    yield row
+    
+    async def iter_job_documents(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream documents with their extracted fields, one document at a time
+        Relies on the query returning each document's rows contiguously
+        """
+        rows = self.iter_job_field_rows(job_id)
+        current = None
+        try:
+            async for row in rows:
                 doc_id = str(row["document_id"])
-                if doc_id not in documents:
-                    documents[doc_id] = {
+                if current is None or current["document_id"] != doc_id:
+                    if current is not None:
+                        yield current
+                    current = {
                         "document_id": doc_id,
                         "document_name": row["document_name"],
                         "source_path": row["source_path"],
                         "fields": []
                     }
                 
-                documents[doc_id]["fields"].append({
+                current["fields"].append({
                     "name": row["field_name"],
                     "label": row["field_label"],
                     "type": row["field_type"],
                     "value": row["field_value"],
-                    "confidence": float(row["confidence_score"]) if row["confidence_score"] else 0.0,
+                    "confidence": _confidence(row),
                     "page": row["page_number"],
                     "status": row["validation_status"],
                     "needs_review": row["needs_manual_review"]
                 })
-            
-            logger.info(f"📊 Retrieved {len(rows)} fields from {len(documents)} documents")
-            return list(documents.values())
+        finally:
+            # Release the cursor connection even when the consumer stops early
+            await rows.aclose()
+        
+        if current is not None:
+            yield current
     
-    async def generate_csv_export(self, job_id: str) -> bytes:
+    async def query_job_fields(self, job_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Generate CSV export (flat format)
-        One row per field across all documents
+        Query fields for a job, organized by document
+        
+        Args:
+            limit: Stop after this many documents (None = all documents)
+        
+        Returns:
+            List of documents with their extracted fields
         """
-        documents = await self.query_job_fields(job_id)
+        documents = []
+        stream = self.iter_job_documents(job_id)
+        try:
+            async for doc in stream:
+                if limit is not None and len(documents) >= limit:
+                    break
+                documents.append(doc)
+        finally:
+            await stream.aclose()
         
-        output = StringIO()
-        writer = csv.DictWriter(output, fieldnames=[
-            "document_name",
-            "field_name",
-            "field_label",
-            "field_type",
-            "field_value",
-            "confidence",
-            "page",
-            "validation_status",
-            "needs_review"
-        ])
+        logger.info(f"📊 Retrieved {sum(len(d['fields']) for d in documents)} fields from {len(documents)} documents")
+        return documents
+    
+    async def count_job_documents(self, job_id: str) -> int:
+        """Count completed documents that have at least one extracted field"""
+        if not self.pool:
+            await self.initialize_pool()
         
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval("""
+                SELECT COUNT(DISTINCT d.id)
+                FROM bulk_job_documents d
+                JOIN bulk_extracted_fields f ON d.id = f.document_id
+                WHERE d.job_id = $1
+                  AND d.status = 'completed'
+            """, job_id)
+    
+    async def query_job_field_names(self, job_id: str) -> List[str]:
+        """Distinct field names across a job's completed documents (sorted)"""
+        if not self.pool:
+            await self.initialize_pool()
+        
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT DISTINCT f.field_name
+                FROM bulk_job_documents d
+                JOIN bulk_extracted_fields f ON d.id = f.document_id
+                WHERE d.job_id = $1
+                  AND d.status = 'completed'
+                ORDER BY f.field_name
+            """, job_id)
+        return [row["field_name"] for row in rows]
+    
+    async def stream_csv_export(self, job_id: str) -> AsyncIterator[bytes]:
+        """
+        Stream CSV export (flat format)
+        One row per field across all documents, yielded in chunks of roughly CSV_CHUNK_BYTES
+        """
+        output = StringIO()
+        writer = csv.DictWriter(output, fieldnames=CSV_FIELDNAMES)
         writer.writeheader()
         
-        for doc in documents:
-            for field in doc["fields"]:
+        total_bytes = 0
+        rows = self.iter_job_field_rows(job_id)
+        try:
+            async for row in rows:
                 writer.writerow({
-                    "document_name": doc["document_name"],
-                    "field_name": field["name"],
-                    "field_label": field["label"],
-                    "field_type": field["type"],
-                    "field_value": field["value"],
-                    "confidence": field["confidence"],
-                    "page": field["page"],
-                    "validation_status": field["status"],
-                    "needs_review": field["needs_review"]
+                    "document_name": row["document_name"],
+                    "field_name": row["field_name"],
+                    "field_label": row["field_label"],
+                    "field_type": row["field_type"],
+                    "field_value": row["field_value"],
+                    "confidence": _confidence(row),
+                    "page": row["page_number"],
+                    "validation_status": row["validation_status"],
+                    "needs_review": row["needs_manual_review"]
                 })
+                
+                if output.tell() >= CSV_CHUNK_BYTES:
+                    chunk = output.getvalue().encode("utf-8")
+                    output.seek(0)
+                    output.truncate()
+                    total_bytes += len(chunk)
+                    yield chunk
+        finally:
+            await rows.aclose()
         
-        csv_bytes = output.getvalue().encode("utf-8")
-        logger.info(f"✅ Generated CSV export ({len(csv_bytes)} bytes)")
-        return csv_bytes
+        chunk = output.getvalue().encode("utf-8")
+        if chunk:
+            total_bytes += len(chunk)
+            yield chunk
+        logger.info(f"✅ Streamed CSV export ({total_bytes} bytes)")
     
-    async def generate_excel_summary(self, job_id: str) -> bytes:
+    async def generate_csv_export(self, job_id: str) -> bytes:
         """
-        Generate Excel with summary format
-        One row per document with key statistics
+        Generate CSV export as bytes
+        Prefer stream_csv_export for large jobs - this holds the whole file in memory
         """
-        documents = await self.query_job_fields(job_id)
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Document Summary"
+        return b"".join([chunk async for chunk in self.stream_csv_export(job_id)])
+    
+    async def write_excel_summary(self, job_id: str, path: str) -> None:
+        """
+        Write Excel with summary format to path
+        One row per document with key statistics (write-only workbook, one document in memory at a time)
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Document Summary")
         
-        # Header styling
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
+        # Column widths must be set before any row is written in write-only mode
+        ws.column_dimensions["A"].width = 50
+        for column_letter in "BCDE":
+            ws.column_dimensions[column_letter].width = 16
         
-        # Headers
         headers = ["Document Name", "Total Fields", "Avg Confidence", "Pages", "Needs Review"]
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center")
+        ws.append(_header_cells(ws, headers, Alignment(horizontal="center")))
         
-        # Data rows
-        for row_num, doc in enumerate(documents, 2):
+        row_count = 0
+        async for doc in self.iter_job_documents(job_id):
             fields = doc["fields"]
             avg_confidence = sum(f["confidence"] for f in fields) / len(fields) if fields else 0
-            max_page = max((f["page"] for f in fields), default=0)
+            max_page = max((f["page"] or 0 for f in fields), default=0)
             review_count = sum(1 for f in fields if f["needs_review"])
             
-            ws.cell(row=row_num, column=1, value=doc["document_name"])
-            ws.cell(row=row_num, column=2, value=len(fields))
-            ws.cell(row=row_num, column=3, value=round(avg_confidence, 3))
-            ws.cell(row=row_num, column=4, value=max_page)
-            ws.cell(row=row_num, column=5, value=review_count)
-        
-        # Auto-size columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(cell.value)
-                except:
-                    pass
-            ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
-        
-        # Save to bytes
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
+            ws.append([doc["document_name"], len(fields), round(avg_confidence, 3), max_page, review_count])
+            row_count += 1
         
-        excel_bytes = buffer.getvalue()
-        logger.info(f"✅ Generated Excel summary ({len(excel_bytes)} bytes)")
-        return excel_bytes
+        await asyncio.to_thread(wb.save, path)
+        logger.info(f"✅ Generated Excel summary ({row_count} documents)")
     
-    async def generate_excel_pivoted(self, job_id: str) -> bytes:
+    async def write_excel_pivoted(self, job_id: str, path: str) -> None:
         """
-        Generate Excel in pivoted format (like BNI)
-        Columns = field names, Rows = documents
+        Write Excel in pivoted format (like BNI) to path
+        Columns = field names, Rows = documents (write-only workbook, one document in memory at a time)
         """
-        documents = await self.query_job_fields(job_id)
-        
-        # Get all unique field names
-        all_field_names = set()
-        for doc in documents:
-            for field in doc["fields"]:
-                all_field_names.add(field["name"])
-        
-        sorted_fields = sorted(all_field_names)
+        sorted_fields = await self.query_job_field_names(job_id)
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Fields by Document"
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Fields by Document")
         
-        # Header styling
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
+        # Column widths must be set before any row is written in write-only mode
+        ws.column_dimensions["A"].width = 40
+        for col_num in range(2, len(sorted_fields) + 2):
+            ws.column_dimensions[get_column_letter(col_num)].width = 20
         
         # Headers: Document Name | field1 | field2 | ... | fieldN
         headers = ["Document Name"] + sorted_fields
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", wrap_text=True)
+        ws.append(_header_cells(ws, headers, Alignment(horizontal="center", wrap_text=True)))
         
-        # Data rows
-        for row_num, doc in enumerate(documents, 2):
-            # Create field lookup
+        row_count = 0
+        async for doc in self.iter_job_documents(job_id):
             field_lookup = {f["name"]: f["value"] for f in doc["fields"]}
-            
-            # Document name in first column
-            ws.cell(row=row_num, column=1, value=doc["document_name"])
-            
-            # Fill in field values
-            for col_num, field_name in enumerate(sorted_fields, 2):
-                value = field_lookup.get(field_name, "")
-                ws.cell(row=row_num, column=col_num, value=value)
+            ws.append([doc["document_name"]] + [field_lookup.get(name, "") for name in sorted_fields])
+            row_count += 1
         
-        # Auto-size columns (with limits)
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(cell.value)
-                except:
-                    pass
-            ws.column_dimensions[column_letter].width = min(max_length + 2, 40)
-        
-        # Save to bytes
-        buffer = BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        
-        excel_bytes = buffer.getvalue()
-        logger.info(f"✅ Generated Excel pivoted ({len(excel_bytes)} bytes)")
-        return excel_bytes
+        await asyncio.to_thread(wb.save, path)
+        logger.info(f"✅ Generated Excel pivoted ({row_count} documents, {len(sorted_fields)} fields)")
+    
+    async def generate_excel_summary(self, job_id: str) -> bytes:
+        """Generate Excel summary as bytes (holds the whole file in memory)"""
+        return await self._excel_bytes(self.write_excel_summary, job_id)
+    
+    async def generate_excel_pivoted(self, job_id: str) -> bytes:
+        """Generate Excel pivoted export as bytes (holds the whole file in memory)"""
+        return await self._excel_bytes(self.write_excel_pivoted, job_id)
+    
+    async def _excel_bytes(self, write_excel, job_id: str) -> bytes:
+        path = new_export_path(".xlsx")
+        try:
+            await write_excel(job_id, path)
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.unlink(path)
+
+
+def new_export_path(suffix: str) -> str:
+    """Create an empty temp file for an export and return its path (caller removes it)"""
+    fd, path = tempfile.mkstemp(prefix="export_", suffix=suffix)
+    os.close(fd)
+    return path
+
+
+def _confidence(row) -> float:
+    return float(row["confidence_score"]) if row["confidence_score"] else 0.0
+
+
+def _header_cells(ws, headers: List[str], alignment: Alignment) -> List[WriteOnlyCell]:
+    """Styled header row for a write-only worksheet"""
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+    
+    cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = alignment
+        cells.append(cell)
+    return cells
 
 
 # Singleton instance
@@ -3,10 +3,11 @@ Job Service - Business logic for bulk processing jobs
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, update, func, and_
 from sqlalchemy.orm import selectinload
 from typing import Optional
 from datetime import datetime
+import asyncio
 import uuid
 import logging
 
@@ -14,7 +15,7 @@ from app.models.schemas import (
     BulkJobCreate, BulkJobUpdate, BulkJobResponse, BulkJobListResponse, BulkJobStatus
 )
 from app.models.database import BulkJob, BulkJobDocument
-from app.workers.discovery import discover_documents
+from app.workers.discovery import discover_documents, queue_pending_documents
 
 logger = logging.getLogger(__name__)
 
@@ -353,29 +354,22 @@ class JobService:
                 # Documents already exist (from upload) - queue processing directly
                 logger.info(f"📄 Job {job_id} has {existing_doc_count} documents - skipping discovery, starting processing")
                 
-                # Get all pending documents
-                docs_result = await self.db.execute(
-                    select(BulkJobDocument).where(
-                        and_(
-                            BulkJobDocument.job_id == uuid.UUID(job_id),
-                            BulkJobDocument.status == 'pending'
-                        )
-                    )
-                )
-                documents = docs_result.scalars().all()
+                # Uploaded documents have nothing to discover - mark discovery done so a resumed
+                # job doesn't start it (a paused discovery keeps its cursor and continues below)
+                if job.discovery_cursor is None and job.discovery_completed_at is None:
+                    job.discovery_completed_at = datetime.utcnow()
+                    await self.db.commit()
                 
-                # Queue processing tasks for each document
-                from app.workers.processing import process_document
-                for doc in documents:
-                    job_config = {
-                        'source_config': job.source_config,
-                        'processing_options': job.processing_options,
-                        'extraction_task': 'without_template_extraction'
-                    }
-                    process_document.delay(str(doc.id), str(job.id), job_config)
-                    logger.info(f"   📄 Queued processing for document: {doc.filename}")
+                # Publish first, then mark queued (sync worker helper, see queue_pending_documents);
+                # publishing blocks on the broker - keep it off the event loop
+                queued_count, pending_count = await asyncio.to_thread(queue_pending_documents, str(job.id))
                 
-                logger.info(f"✅ Started job {job_id} with {len(documents)} documents")
+                await self.db.refresh(job)
+                logger.info(f"✅ Started job {job_id}: queued {queued_count}/{pending_count} documents")
+                
+                if job.discovery_completed_at is None:
+                    discovery_result = discover_documents.delay(str(job.id), job.source_config)
+                    logger.info(f"🚀 Queued discovery continuation for job {job_id}: {discovery_result.id}")
             else:
                 # No documents yet - need to discover from source
                 try:
@@ -463,6 +457,17 @@ class JobService:
             await self.db.commit()
             await self.db.refresh(job)
             
+            # Documents inserted but never published (paused or crashed in between)
+            queued_count, pending_count = await asyncio.to_thread(queue_pending_documents, str(job.id))
+            if pending_count:
+                logger.info(f"📤 Re-queued {queued_count}/{pending_count} pending documents for job {job_id}")
+            
+            # Discovery halts while the job is paused - continue it from the saved cursor
+            # (or from the start if it was paused before committing its first page)
+            if job.discovery_completed_at is None:
+                discovery_result = discover_documents.delay(str(job.id), job.source_config)
+                logger.info(f"🚀 Queued discovery continuation for job {job_id}: {discovery_result.id}")
+            
             logger.info(f"▶️ Resumed job: {job_id}")
             return BulkJobResponse.from_orm(job)
         
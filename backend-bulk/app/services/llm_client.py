@@ -12,11 +12,14 @@ import asyncio
 import time
 import re
 import threading
-from typing import Dict, Any, Optional
+import weakref
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 from fastapi import HTTPException
 from dotenv import load_dotenv
 from ..core.config import settings
+from .llm_response_cache import get_llm_response_cache
+from .llm_rate_limiter import THROTTLE_STATUS_CODES, get_llm_rate_limiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -65,12 +68,20 @@ class LLMClient:
         # Model configuration
         self.extraction_model = os.getenv("EXTRACTION_MODEL", "gemini-2.0-flash")
         
+        # Response cache for repeated identical requests (None when disabled)
+        self.response_cache = get_llm_response_cache()
+        
+        # Process-wide adaptive concurrency/rate limiter shared by every LLM call
+        self.rate_limiter = get_llm_rate_limiter()
+        
         # HTTP client with connection pooling (lazy initialization)
         self._http_client: Optional[httpx.AsyncClient] = None
         
         # Thread-local storage for HTTP sessions (each thread gets its own session)
         # This prevents thread contention when multiple threads make concurrent requests
         self._thread_local = threading.local()
+        # Every live thread-local session, so a worker shutting down can close them all
+        self._thread_sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
         
         # Global session for backward compatibility (used when thread-local not needed)
         self._sync_session: Optional[requests.Session] = None
@@ -171,7 +182,7 @@ class LLMClient:
 
 
     
-    def _prepare_request_body(self, prompt: str, image_data: Optional[str], response_format: Dict[str, Any], document_name: Optional[str] = None, content_type: str = "image") -> Dict[str, Any]:
+    def _prepare_request_body(self, prompt: str, image_data: Optional[Union[str, List[str]]], response_format: Dict[str, Any], document_name: Optional[str] = None, content_type: str = "image") -> Dict[str, Any]:
         """
         Prepare request body for LiteLLM API
         
@@ -181,7 +192,7 @@ class LLMClient:
         # LiteLLM/OpenRouter handles response format conversion internally
         return self._prepare_litellm_request_body(prompt, image_data, response_format, document_name, content_type)
     
-    def _prepare_litellm_request_body(self, prompt: str, image_data: Optional[str], response_format: Dict[str, Any], document_name: Optional[str] = None, content_type: str = "image") -> Dict[str, Any]:
+    def _prepare_litellm_request_body(self, prompt: str, image_data: Optional[Union[str, List[str]]], response_format: Dict[str, Any], document_name: Optional[str] = None, content_type: str = "image") -> Dict[str, Any]:
         """Prepare request body for LiteLLM API using chat/completions format (supports images and text)"""
         # Use the same model from EXTRACTION_MODEL for both text and image requests
         model = self.extraction_model
@@ -217,13 +228,15 @@ class LLMClient:
         
         # Add image only if image_data is provided, not empty, and content_type is "image"
         # When content_type is "text", image_data contains the extracted text (already included in prompt)
-        if content_type == "image" and image_data and image_data.strip():
-            content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": image_data
-                }
-            })
+        # A list of images (multi-page call) adds one image part per page, in order
+        if content_type == "image":
+            for image in _image_inputs(image_data):
+                content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": image
+                    }
+                })
         
         # Always use chat/completions format for vision support
         request_body = {
@@ -242,7 +255,7 @@ class LLMClient:
         
         return request_body
 
-    def _prepare_google_ai_request(self, prompt: str, image_data: Optional[str], response_format: Dict[str, Any], document_name: Optional[str] = None, content_type: str = "image") -> Dict[str, Any]:
+    def _prepare_google_ai_request(self, prompt: str, image_data: Optional[Union[str, List[str]]], response_format: Dict[str, Any], document_name: Optional[str] = None, content_type: str = "image") -> Dict[str, Any]:
         """Prepare request body for Google AI native API (generativelanguage.googleapis.com)"""
         # Build prompt text
         if content_type == "text":
@@ -257,16 +270,16 @@ class LLMClient:
         # Build parts array for Google AI format
         parts = [{"text": full_prompt}]
         
-        # Add image if provided (Google AI uses inline_data format)
-        if content_type == "image" and image_data and image_data.strip():
+        # Add image(s) if provided (Google AI uses inline_data format)
+        for image in (_image_inputs(image_data) if content_type == "image" else []):
             # Extract base64 data and mime type from data URL
-            if image_data.startswith("data:"):
+            if image.startswith("data:"):
                 # Parse data URL: data:image/png;base64,<base64_data>
-                header, base64_data = image_data.split(",", 1)
+                header, base64_data = image.split(",", 1)
                 mime_type = header.split(":")[1].split(";")[0]
             else:
                 # Assume it's raw base64 PNG
-                base64_data = image_data
+                base64_data = image
                 mime_type = "image/png"
             
             parts.append({
@@ -308,22 +321,33 @@ class LLMClient:
                 logger.debug(f"🌐 Making Google AI API call (attempt {attempt + 1}/{max_retries})")
                 logger.debug(f"🔍 Model: {model_name}")
                 
-                request_submit_time = time.time()
-                response = session.post(
-                    api_url,
-                    json=request_body,
-                    headers={"Content-Type": "application/json"},
-                    timeout=90
-                )
-                request_complete_time = time.time()
+                ticket = self.rate_limiter.acquire()
+                response = None
+                result = None
+                try:
+                    request_submit_time = time.time()
+                    response = session.post(
+                        api_url,
+                        json=request_body,
+                        headers={"Content-Type": "application/json"},
+                        timeout=90
+                    )
+                    request_complete_time = time.time()
+                    if response.status_code == 200:
+                        # Convert Google AI response to OpenAI-compatible format
+                        result = self._convert_google_ai_response(response.json())
+                finally:
+                    self._release_rate_limit(ticket, response, result)
                 
                 http_duration = request_complete_time - request_submit_time
                 logger.info(f"⏱️ Google AI HTTP duration: {http_duration:.2f}s, Status: {response.status_code}")
                 
                 if response.status_code == 200:
-                    google_response = response.json()
-                    # Convert Google AI response to OpenAI-compatible format
-                    return self._convert_google_ai_response(google_response)
+                    return result
+                elif response.status_code in THROTTLE_STATUS_CODES and attempt < max_retries - 1:
+                    # The limiter pauses every caller; retry once the shared cooldown ends
+                    logger.warning(f"🚦 Google AI throttled ({response.status_code}) on attempt {attempt + 1}, retrying after shared cooldown")
+                    continue
                 else:
                     error_text = response.text
                     logger.error(f"❌ Google AI API error {response.status_code}: {error_text}")
@@ -403,18 +427,29 @@ class LLMClient:
                 if "model" in request_body:
                     logger.debug(f"🔍 Model: {request_body.get('model')}")
                     
-                    # Fix: Add timeout to async HTTP calls to prevent blocking
-                    response = await client.post(
-                        api_url,
-                        json=request_body,
-                        headers=headers,
-                        timeout=90.0  # 90 second timeout per request
-                    )
+                    ticket = await self.rate_limiter.acquire_async()
+                    response = None
+                    result = None
+                    try:
+                        # Fix: Add timeout to async HTTP calls to prevent blocking
+                        response = await client.post(
+                            api_url,
+                            json=request_body,
+                            headers=headers,
+                            timeout=90.0  # 90 second timeout per request
+                        )
+                        if response.status_code == 200:
+                            result = response.json()
+                    finally:
+                        self._release_rate_limit(ticket, response, result)
                     
                     if response.status_code == 200:
-                        result = response.json()
                         logger.debug(f"✅ {provider_name} API call successful on endpoint: {api_url}")
                         return result
+                    elif response.status_code in THROTTLE_STATUS_CODES and attempt < max_retries - 1:
+                        # The limiter pauses every caller; retry once the shared cooldown ends
+                        logger.warning(f"🚦 {provider_name} throttled ({response.status_code}) on attempt {attempt + 1}, retrying after shared cooldown")
+                        continue
                     else:
                         error_msg = f"API call failed with status {response.status_code}: {response.text}"
                         logger.error(f"❌ {error_msg}")
@@ -441,6 +476,61 @@ class LLMClient:
         logger.error(f"❌ All retries failed for endpoint: {api_url}")
         raise last_exception or Exception(f"All retries failed for endpoint: {api_url}")
 
+    def _release_rate_limit(self, ticket: Any, response: Any = None, result: Any = None) -> None:
+        """Report a call's outcome (httpx/requests response, None on network errors) to the shared limiter"""
+        if response is None:
+            self.rate_limiter.release(ticket)
+            return
+        usage = result.get("usage") if isinstance(result, dict) else None
+        self.rate_limiter.release(
+            ticket,
+            response.status_code,
+            usage=usage,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
+
+    def get_rate_limiter_stats(self) -> Dict[str, Any]:
+        """Concurrency limit, observed RPM/TPM and throttle counters of the shared LLM limiter"""
+        return self.rate_limiter.get_stats()
+
+    def _response_cache_key(self, prompt: str, image_data: Optional[Union[str, List[str]]], response_format: Dict[str, Any],
+                            task: str, model_to_use: str, content_type: str) -> Optional[str]:
+        """Cache key for a request (document_name is left out so re-uploads under another name still hit)"""
+        if self.response_cache is None:
+            return None
+        if isinstance(image_data, list):
+            image_data = "\x00".join(image_data)  # Multi-page call - every page is part of the key
+        return self.response_cache.make_key(self.provider, model_to_use, task, content_type, prompt, image_data, response_format)
+
+    def _get_cached_response(self, cache_key: Optional[str], task: str, model_to_use: str, start_time: float) -> Optional[Dict[str, Any]]:
+        """Return the cached processed result for cache_key, marked as a cache hit, or None"""
+        if cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is None:
+            return None
+
+        # No tokens were spent on this call
+        if isinstance(cached.get("usage"), dict):
+            cached["usage"] = {key: 0 for key in cached["usage"]}
+        cached["_cached"] = True
+        duration = time.time() - start_time
+        cached["_timing"] = {
+            "start_time": start_time,
+            "end_time": time.time(),
+            "duration_seconds": duration
+        }
+        logger.info(f"🗄️ LLM response cache hit - Task: {task}, Model: {model_to_use}, Duration: {duration:.3f}s")
+        return cached
+
+    def _store_cached_response(self, cache_key: Optional[str], processed_result: Any) -> None:
+        if cache_key is not None:
+            self.response_cache.set(cache_key, processed_result)
+
+    def get_response_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit-rate metrics of the LLM response cache (None when disabled)"""
+        return self.response_cache.get_stats() if self.response_cache is not None else None
+
     async def call_api(self, prompt: str, image_data: Optional[str], response_format: Dict[str, Any], 
                       task: str, document_name: Optional[str] = None) -> Dict[str, Any]:
         """Make API call to LLM provider through LiteLLM using vision-capable endpoint with optional LangSmith monitoring"""
@@ -467,6 +557,12 @@ class LLMClient:
                            start_time: float, model_to_use: str, page_number: Optional[int] = None, trace_name: Optional[str] = None) -> Dict[str, Any]:
         """Execute the actual LLM API call"""
         try:
+            # Serve repeated identical requests from the response cache
+            cache_key = self._response_cache_key(prompt, image_data, response_format, task, model_to_use, "image")
+            cached_result = self._get_cached_response(cache_key, task, model_to_use, start_time)
+            if cached_result is not None:
+                return cached_result
+            
             # Determine API URL for LiteLLM
             base_url = self.litellm_api_url.rstrip('/')
             # Check if URL already contains the endpoint to avoid doubling
@@ -513,6 +609,7 @@ class LLMClient:
             # Process the result to normalize the structure
             # This is NOT included in LangSmith timing
             processed_result = self.process_api_result(result, task)
+            self._store_cached_response(cache_key, processed_result)
             
             # Calculate duration (total time including prep and processing)
             duration = time.time() - start_time
@@ -569,6 +666,7 @@ class LLMClient:
             # Store session in thread-local storage
             self._thread_local.session = session
             self._thread_local.pool_maxsize = pool_maxsize
+            self._thread_sessions.add(session)
             
             logger.debug(f"🌐 Created thread-local HTTP session (thread: {threading.current_thread().name}) - pool_connections: {pool_connections}, pool_maxsize: {pool_maxsize}")
         
@@ -594,6 +692,7 @@ class LLMClient:
             
             self._thread_local.session = session
             self._thread_local.pool_maxsize = max_connections
+            self._thread_sessions.add(session)
             
             logger.debug(f"🔄 Recreated thread-local HTTP session with larger pool size: {max_connections} (was: {self._thread_local.pool_maxsize})")
         
@@ -616,6 +715,24 @@ class LLMClient:
             except Exception as e:
                 logger.warning(f"⚠️ Error cleaning up thread session: {e}")
     
+    def close_sync_sessions(self):
+        """
+        Close the HTTP sessions of every thread (call when the process is shutting down)
+        A closed session drops its pooled connections and reconnects if used again
+        """
+        sessions = list(self._thread_sessions)
+        self._thread_sessions.clear()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Error closing HTTP session: {e}")
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+        if sessions:
+            logger.debug(f"🔒 Closed {len(sessions)} thread-local HTTP sessions")
+    
     def _call_api_with_retry_sync(self, request_body: Dict[str, Any], api_url: str, max_retries: int = 3) -> Dict[str, Any]:
         """
         Synchronous version: Call LLM API with retry logic for network issues
@@ -648,14 +765,25 @@ class LLMClient:
                 # Measure HTTP request/response time with accurate timing
                 # Note: response.elapsed is the accurate measure from requests library
                 # It measures from when the HTTP request actually starts (socket connection) to when headers are received
-                request_submit_time = time.time()
-                response = session.post(
-                    api_url,
-                    json=request_body,
-                    headers=headers,
-                    timeout=90  # Fix: Reduced to 90s per request to prevent blocking (with retries, total can be up to 270s)
-                )
-                request_complete_time = time.time()
+                ticket = self.rate_limiter.acquire()
+                response = None
+                result = None
+                try:
+                    request_submit_time = time.time()
+                    response = session.post(
+                        api_url,
+                        json=request_body,
+                        headers=headers,
+                        timeout=90  # Fix: Reduced to 90s per request to prevent blocking (with retries, total can be up to 270s)
+                    )
+                    request_complete_time = time.time()
+                    if response.status_code == 200:
+                        # Measure response parsing time
+                        parse_start = time.time()
+                        result = response.json()
+                        parse_time = time.time() - parse_start
+                finally:
+                    self._release_rate_limit(ticket, response, result)
                 
                 # Use response.elapsed as the accurate HTTP request time (from requests library)
                 # This measures from when HTTP request actually starts to when headers are received
@@ -690,10 +818,6 @@ class LLMClient:
                     logger.debug(f"ℹ️ Moderate TTFB ({ttfb:.2f}s) - network latency may be affecting performance")
                 
                 if response.status_code == 200:
-                    # Measure response parsing time
-                    parse_start = time.time()
-                    result = response.json()
-                    parse_time = time.time() - parse_start
                     logger.debug(f"✅ {provider_name} API call successful on endpoint: {api_url}")
                     logger.debug(f"   🔄 JSON parsing took: {parse_time*1000:.1f}ms")
                     
@@ -702,6 +826,10 @@ class LLMClient:
                     logger.debug(f"   ⏱️ Total attempt duration: {attempt_duration:.3f}s")
                     
                     return result
+                elif response.status_code in THROTTLE_STATUS_CODES and attempt < max_retries - 1:
+                    # The limiter pauses every caller; retry once the shared cooldown ends
+                    logger.warning(f"🚦 {provider_name} throttled ({response.status_code}) on attempt {attempt + 1}, retrying after shared cooldown")
+                    continue
                 else:
                     error_msg = f"API call failed with status {response.status_code}: {response.text}"
                     logger.error(f"❌ {error_msg}")
@@ -730,7 +858,7 @@ class LLMClient:
         logger.error(f"❌ All retries failed for endpoint: {api_url}")
         raise last_exception or Exception(f"All retries failed for endpoint: {api_url}")
     
-    def call_api_sync(self, prompt: str, image_data: Optional[str], response_format: Dict[str, Any], 
+    def call_api_sync(self, prompt: str, image_data: Optional[Union[str, List[str]]], response_format: Dict[str, Any], 
                      task: str, document_name: Optional[str] = None, content_type: str = "image") -> Dict[str, Any]:
         """
         Synchronous version: Make API call to LLM provider through LiteLLM
@@ -754,11 +882,17 @@ class LLMClient:
         # Execute the call (LangSmith tracing is now inside _execute_call_sync, wrapping only the HTTP request)
         return self._execute_call_sync(prompt, image_data, response_format, task, document_name, start_time, model_to_use, content_type, page_number, trace_name)
     
-    def _execute_call_sync(self, prompt: str, image_data: Optional[str], response_format: Dict[str, Any], 
+    def _execute_call_sync(self, prompt: str, image_data: Optional[Union[str, List[str]]], response_format: Dict[str, Any], 
                            task: str, document_name: Optional[str],
                            start_time: float, model_to_use: str, content_type: str, page_number: Optional[int] = None, trace_name: Optional[str] = None) -> Dict[str, Any]:
         """Execute the actual synchronous LLM API call"""
         try:
+            # Serve repeated identical requests from the response cache
+            cache_key = self._response_cache_key(prompt, image_data, response_format, task, model_to_use, content_type)
+            cached_result = self._get_cached_response(cache_key, task, model_to_use, start_time)
+            if cached_result is not None:
+                return cached_result
+            
             # Prepare request body
             prep_start = time.time()
             
@@ -821,6 +955,7 @@ class LLMClient:
             # This is NOT included in LangSmith timing
             parse_start = time.time()
             processed_result = self.process_api_result(result, task)
+            self._store_cached_response(cache_key, processed_result)
             parse_time = time.time() - parse_start
             
             # Calculate duration
@@ -843,6 +978,123 @@ class LLMClient:
             logger.error(f"❌ Error in LLM API call: {e}")
             raise
 
+    def call_api_sync_pages(self, prompt: str, page_images: List[str], page_numbers: List[int],
+                            response_format: Dict[str, Any], task: str,
+                            document_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Synchronous multi-page call: extract several page images with one request
+        
+        The single-page prompt is wrapped with instructions to answer page by page, and
+        the response is split back into one result per page, shaped like a call_api_sync
+        result (normalized structure, "_parsed", and the call's usage divided across the
+        pages). Pages missing from the response come back as {"error": ...} so the caller
+        can redo them on their own.
+        
+        Args:
+            prompt: Prompt for a single page
+            page_images: Page image data URLs, in page order
+            page_numbers: Page numbers (1-indexed) of page_images
+            response_format: Response format for a single page
+            task: Task type
+            document_name: Document name for logging/tracing
+        
+        Returns:
+            One result per page, aligned with page_numbers
+        """
+        result = self.call_api_sync(
+            self._multi_page_prompt(prompt, page_numbers),
+            page_images,
+            self._multi_page_response_format(response_format),
+            task,
+            document_name
+        )
+        return self._split_multi_page_result(result, page_numbers, task)
+    
+    def _multi_page_prompt(self, prompt: str, page_numbers: List[int]) -> str:
+        """Wrap a single-page prompt so the model returns one JSON object per attached page"""
+        page_list = ", ".join(str(page_number) for page_number in page_numbers)
+        return f"""{prompt}
+
+MULTI-PAGE INPUT:
+The {len(page_numbers)} attached images are pages {page_list} of the same document, in that order.
+Apply the instructions above to each page on its own - do not merge or move data between pages.
+Return ONLY this JSON object, with one entry per page in page order:
+{{"pages": [{{"page_number": <page number>, "data": <the JSON object you would return for that page alone>}}]}}"""
+    
+    def _multi_page_response_format(self, response_format: Dict[str, Any]) -> Dict[str, Any]:
+        """Response format for a multi-page call: the single-page schema as items of a pages array"""
+        if not response_format or response_format.get("type") != "json_schema":
+            return response_format
+        
+        json_schema = response_format.get("json_schema", {})
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": f"{json_schema.get('name', 'extraction')}_pages",
+                "strict": False,
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "pages": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "page_number": {"type": "integer"},
+                                    "data": json_schema.get("schema") or {"type": "object"}
+                                },
+                                "required": ["page_number", "data"]
+                            }
+                        }
+                    },
+                    "required": ["pages"]
+                }
+            }
+        }
+    
+    def _split_multi_page_result(self, result: Dict[str, Any], page_numbers: List[int], task: str) -> List[Dict[str, Any]]:
+        """Split a multi-page response into per-page results (see call_api_sync_pages)"""
+        parsed = result.get("_parsed") if isinstance(result, dict) else None
+        entries = parsed.get("pages") if isinstance(parsed, dict) else None
+        
+        page_data: Dict[int, Dict[str, Any]] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict) or not isinstance(entry.get("data"), dict):
+                continue
+            try:
+                page_data.setdefault(int(entry.get("page_number")), entry["data"])
+            except (TypeError, ValueError):
+                continue
+        
+        # A truncated response may have cut the last page it returned short - redo that page
+        if result.get("_truncated") and page_data:
+            page_data.pop(list(page_data)[-1])
+        
+        # Token usage is split evenly - the API only reports it per call
+        usage = result.get("usage", {}) if isinstance(result, dict) else {}
+        page_usage = {
+            key: usage.get(key, 0) // len(page_numbers)
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens")
+        }
+        page_usage["batched_pages"] = len(page_numbers)
+        
+        page_results = []
+        for page_number in page_numbers:
+            data = page_data.get(page_number)
+            if data is None:
+                page_results.append({
+                    "error": f"Page {page_number} missing from multi-page response",
+                    "usage": page_usage
+                })
+                continue
+            
+            page_result = self._normalize_result_structure(data, task)
+            page_result["_parsed"] = data
+            page_result["usage"] = page_usage
+            page_results.append(page_result)
+        
+        return page_results
+
     def process_api_result(self, result: Dict[str, Any], task: str) -> Dict[str, Any]:
         """Process API result and handle JSON parsing"""
         try:
@@ -1303,4 +1555,66 @@ class LLMClient:
                 
         except Exception as e:
             logger.error(f"Error normalizing result structure: {e}")
-            return {"fields": []}
\ No newline at end of file
+            return {"fields": []}
+
+
+def _image_inputs(image_data: Optional[Union[str, List[str]]]) -> List[str]:
+    """Non-empty images of a request - image_data is one data URL or a list (multi-page call)"""
+    images = image_data if isinstance(image_data, list) else [image_data]
+    return [image for image in images if image and image.strip()]
+
+
+# Gemini bills an image as 258 tokens per 768x768 tile
+_IMAGE_TILE_PIXELS = 768
+_TOKENS_PER_IMAGE_TILE = 258
+# Encoded bytes per expected output token - denser pages compress worse and yield more JSON
+_IMAGE_BYTES_PER_OUTPUT_TOKEN = 40
+
+
+def estimate_page_tokens(image_data: str) -> int:
+    """
+    Rough token cost of one page image in a multi-page call (input + expected output)
+    
+    Input tokens come from the pixel size read from the PNG/JPEG header; the encoded size
+    stands in for how much text the page holds, which drives the output tokens. Used to
+    pack pages into calls under a token budget, not for billing.
+    """
+    payload = image_data.split(",", 1)[1] if image_data.startswith("data:") else image_data
+    encoded_bytes = len(payload) * 3 // 4
+    
+    size = _image_dimensions(payload)
+    if size:
+        width, height = size
+        tiles = -(-width // _IMAGE_TILE_PIXELS) * -(-height // _IMAGE_TILE_PIXELS)
+    else:
+        tiles = 6  # A letter/A4 page at ~150 DPI
+    
+    return tiles * _TOKENS_PER_IMAGE_TILE + encoded_bytes // _IMAGE_BYTES_PER_OUTPUT_TOKEN
+
+
+def _image_dimensions(base64_payload: str) -> Optional[tuple]:
+    """(width, height) from the header of a base64 PNG or JPEG, or None"""
+    import base64
+    import struct
+    
+    try:
+        head = base64.b64decode(base64_payload[:87384])  # First 64 KB of the image
+    except Exception:
+        return None
+    
+    if head.startswith(b"\x89PNG\r\n\x1a\n") and len(head) >= 24:
+        return struct.unpack(">II", head[16:24])
+    
+    if head.startswith(b"\xff\xd8"):
+        # Walk JPEG segments to the first start-of-frame marker
+        position = 2
+        while position + 9 < len(head):
+            if head[position] != 0xFF:
+                return None
+            marker = head[position + 1]
+            if marker in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+                height, width = struct.unpack(">HH", head[position + 5:position + 9])
+                return width, height
+            position += 2 + struct.unpack(">H", head[position + 2:position + 4])[0]
+    
+    return None
@@ -0,0 +1,332 @@
+"""
+LLM Rate Limiter Module
+Process-wide adaptive concurrency and rate limiting for LLM gateway calls
+
+Every caller (the page pipeline's LLM stage, the bulk worker's page threads, the async
+API paths) used to fire requests at a fixed concurrency, and on a 429 each thread backed
+off on its own and then stampeded the gateway again. All LLMClient calls now pass through
+one shared limiter per process:
+
+- AIMD concurrency: the in-flight limit grows by ~1 per window of successful calls and is
+  halved on a 429/503 (at most once per cooldown, so one burst of 429s halves it once);
+  calls slower than the target latency shrink it gently
+- Token buckets: requests-per-minute and tokens-per-minute budgets (0 = unlimited); token
+  use is estimated up front from the running average and corrected from response usage
+- Shared cooldown: a 429/503 (honouring Retry-After) pauses every caller until it expires
+  instead of each thread retrying on its own schedule
+
+Usable from threads (acquire) and coroutines (acquire_async); both share the same state.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes that mean "slow down" rather than "request is wrong"
+THROTTLE_STATUS_CODES = (429, 503)
+# SDK exception types that signal throttling (google.api_core, openai/litellm)
+_THROTTLE_EXCEPTION_NAMES = frozenset({"ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "RateLimitError"})
+# Whole phrases only - a bare "rate" also matches "generate", "iterate", "moderate"
+_THROTTLE_PHRASES = (
+    "rate limit", "rate-limit", "ratelimit", "quota exceeded", "exceeded your current quota",
+    "resource exhausted", "resource has been exhausted", "too many requests",
+)
+
+# Shortest interval between two multiplicative decreases of the concurrency limit
+_DECREASE_COOLDOWN_SECONDS = 2.0
+# Shared pause after a throttle response without Retry-After (doubles while throttling continues)
+_BASE_BACKOFF_SECONDS = 1.0
+_MAX_BACKOFF_SECONDS = 60.0
+
+
+class LLMRateLimitTicket:
+    """Handle for one admitted call; pass it back to release()"""
+
+    __slots__ = ("start_time", "estimated_tokens")
+
+    def __init__(self, start_time: float, estimated_tokens: float):
+        self.start_time = start_time
+        self.estimated_tokens = estimated_tokens
+
+
+class AdaptiveLLMRateLimiter:
+    """
+    Shared AIMD concurrency limiter with request and token buckets
+
+    Args:
+        min_concurrency: Lower bound for the adaptive in-flight limit
+        max_concurrency: Upper bound for the adaptive in-flight limit
+        initial_concurrency: Starting in-flight limit
+        requests_per_minute: Request budget (0 = unlimited)
+        tokens_per_minute: Token budget from response usage (0 = unlimited)
+        target_latency_seconds: Calls slower than this shrink the limit (0 = ignore latency)
+        enabled: When False, the concurrency limit and budgets are not enforced (the
+                 shared cooldown after a 429/503 still is) and only metrics are kept
+    """
+
+    def __init__(
+        self,
+        min_concurrency: int = 2,
+        max_concurrency: int = 64,
+        initial_concurrency: int = 16,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        target_latency_seconds: float = 0.0,
+        enabled: bool = True,
+    ):
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.target_latency_seconds = target_latency_seconds
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self._in_flight = 0
+        self._request_bucket = float(requests_per_minute)
+        self._token_bucket = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._avg_tokens_per_call = 0.0
+        self._blocked_until = 0.0
+        self._backoff = _BASE_BACKOFF_SECONDS
+        self._last_decrease = 0.0
+        # (release time, tokens) of recent calls for observed RPM/TPM
+        self._window: Deque[Tuple[float, int]] = deque()
+
+        self.admitted = 0
+        self.throttled = 0
+        self.errors = 0
+        self.waited_seconds = 0.0
+
+    # -------------------------------------------------------------------------
+    # Admission
+    # -------------------------------------------------------------------------
+    def acquire(self) -> LLMRateLimitTicket:
+        """Block the calling thread until a call may be made"""
+        wait_start = time.monotonic()
+        with self._lock:
+            while True:
+                ticket, wait = self._try_acquire_locked()
+                if ticket is not None:
+                    self.waited_seconds += time.monotonic() - wait_start
+                    return ticket
+                # Woken early by release(); otherwise re-check when the bucket/cooldown allows
+                self._released.wait(timeout=min(wait, 1.0) if wait is not None else 1.0)
+
+    async def acquire_async(self) -> LLMRateLimitTicket:
+        """Wait (without blocking the event loop) until a call may be made"""
+        wait_start = time.monotonic()
+        while True:
+            with self._lock:
+                ticket, wait = self._try_acquire_locked()
+            if ticket is not None:
+                with self._lock:
+                    self.waited_seconds += time.monotonic() - wait_start
+                return ticket
+            await asyncio.sleep(min(wait, 1.0) if wait is not None else 0.05)
+
+    def _try_acquire_locked(self) -> Tuple[Optional[LLMRateLimitTicket], Optional[float]]:
+        """
+        Admit a call if concurrency, cooldown and budgets allow (caller holds the lock)
+
+        Returns:
+            (ticket, None) when admitted, else (None, seconds to wait or None to wait for a release)
+        """
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return None, self._blocked_until - now
+        if not self.enabled:
+            return self._admit_locked(now), None
+        if self._in_flight >= int(self._limit):
+            return None, None
+
+        self._refill_locked(now)
+        if self.requests_per_minute and self._request_bucket < 1.0:
+            return None, (1.0 - self._request_bucket) * 60.0 / self.requests_per_minute
+        # Allow one call into token debt, so a single large call can never deadlock
+        if self.tokens_per_minute and self._token_bucket <= 0.0:
+            return None, -self._token_bucket * 60.0 / self.tokens_per_minute + 0.01
+
+        return self._admit_locked(now), None
+
+    def _admit_locked(self, now: float) -> LLMRateLimitTicket:
+        estimated = self._avg_tokens_per_call
+        self._in_flight += 1
+        self._request_bucket -= 1.0
+        self._token_bucket -= estimated
+        self.admitted += 1
+        return LLMRateLimitTicket(now, estimated)
+
+    def _refill_locked(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._request_bucket = min(
+                float(self.requests_per_minute),
+                self._request_bucket + elapsed * self.requests_per_minute / 60.0,
+            )
+        if self.tokens_per_minute:
+            self._token_bucket = min(
+                float(self.tokens_per_minute),
+                self._token_bucket + elapsed * self.tokens_per_minute / 60.0,
+            )
+
+    # -------------------------------------------------------------------------
+    # Feedback
+    # -------------------------------------------------------------------------
+    def release(
+        self,
+        ticket: LLMRateLimitTicket,
+        status_code: Optional[int] = None,
+        usage: Optional[Dict[str, Any]] = None,
+        retry_after: Optional[float] = None,
+        throttled: bool = False,
+    ) -> None:
+        """
+        Report the outcome of an admitted call
+
+        Args:
+            ticket: Ticket returned by acquire()/acquire_async()
+            status_code: HTTP status of the response (None for network errors)
+            usage: Response usage block ({"total_tokens": ...}) for token accounting
+            retry_after: Server-requested pause in seconds (Retry-After header)
+            throttled: Treat as rate limited even without a throttle status code
+                       (e.g. SDK quota exceptions)
+        """
+        now = time.monotonic()
+        latency = now - ticket.start_time
+        tokens = 0
+        if usage:
+            try:
+                tokens = int(usage.get("total_tokens") or 0)
+            except (TypeError, ValueError):
+                tokens = 0
+
+        with self._lock:
+            self._in_flight -= 1
+            self._window.append((now, tokens))
+            while self._window and self._window[0][0] < now - 60.0:
+                self._window.popleft()
+
+            if tokens:
+                # Correct the up-front estimate with the real usage
+                self._token_bucket -= tokens - ticket.estimated_tokens
+                self._avg_tokens_per_call = (
+                    tokens if self._avg_tokens_per_call == 0.0 else 0.9 * self._avg_tokens_per_call + 0.1 * tokens
+                )
+
+            if throttled or status_code in THROTTLE_STATUS_CODES:
+                self.throttled += 1
+                self._on_throttled_locked(now, retry_after)
+            elif status_code == 200:
+                self._backoff = _BASE_BACKOFF_SECONDS
+                if self.target_latency_seconds and latency > self.target_latency_seconds:
+                    self._decrease_locked(now, 0.9)
+                else:
+                    # Additive increase: ~+1 per limit's worth of successful calls
+                    self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+            else:
+                self.errors += 1
+
+            self._released.notify_all()
+
+    def _on_throttled_locked(self, now: float, retry_after: Optional[float]) -> None:
+        pause = retry_after if retry_after and retry_after > 0 else self._backoff
+        pause = min(pause, _MAX_BACKOFF_SECONDS)
+        self._backoff = min(self._backoff * 2.0, _MAX_BACKOFF_SECONDS)
+        if now + pause > self._blocked_until:
+            self._blocked_until = now + pause
+        if self._decrease_locked(now, 0.5):
+            logger.warning(
+                f"🚦 LLM gateway throttled - concurrency limit now {int(self._limit)}, pausing calls for {pause:.1f}s"
+            )
+
+    def _decrease_locked(self, now: float, factor: float) -> bool:
+        if now - self._last_decrease < _DECREASE_COOLDOWN_SECONDS:
+            return False
+        self._last_decrease = now
+        self._limit = max(float(self.min_concurrency), self._limit * factor)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of limiter state and counters for logging and health endpoints"""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "enabled": self.enabled,
+                "concurrency_limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "paused_for_seconds": round(max(0.0, self._blocked_until - now), 2),
+                "observed_rpm": len(self._window),
+                "observed_tpm": sum(tokens for _, tokens in self._window),
+                "avg_tokens_per_call": round(self._avg_tokens_per_call, 1),
+                "admitted": self.admitted,
+                "throttled": self.throttled,
+                "errors": self.errors,
+                "waited_seconds": round(self.waited_seconds, 2),
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-date values are ignored)"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """
+    Whether an exception raised by an LLM SDK means "slow down"
+    Checked in order: exception type, HTTP status (error.code or error.response.status_code),
+    then whole phrases / a standalone 429 in the message
+    """
+    if type(error).__name__ in _THROTTLE_EXCEPTION_NAMES:
+        return True
+    status = getattr(error, "code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int) and status in THROTTLE_STATUS_CODES:
+        return True
+    message = str(error).lower()
+    return any(phrase in message for phrase in _THROTTLE_PHRASES) or re.search(r"\b429\b", message) is not None
+
+
+_rate_limiter: Optional[AdaptiveLLMRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_llm_rate_limiter() -> AdaptiveLLMRateLimiter:
+    """Get or create the process-wide LLM rate limiter from settings"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                from ..core.config import settings
+                _rate_limiter = AdaptiveLLMRateLimiter(
+                    min_concurrency=settings.LLM_MIN_CONCURRENCY,
+                    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                    initial_concurrency=settings.LLM_INITIAL_CONCURRENCY,
+                    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+                    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+                    target_latency_seconds=settings.LLM_TARGET_LATENCY_SECONDS,
+                    enabled=settings.LLM_RATE_LIMITER_ENABLED,
+                )
+                if settings.LLM_RATE_LIMITER_ENABLED:
+                    logger.info(
+                        f"🚦 LLM rate limiter ready - concurrency {settings.LLM_INITIAL_CONCURRENCY} "
+                        f"({settings.LLM_MIN_CONCURRENCY}-{settings.LLM_MAX_CONCURRENCY}), "
+                        f"rpm={settings.LLM_REQUESTS_PER_MINUTE or 'unlimited'}, "
+                        f"tpm={settings.LLM_TOKENS_PER_MINUTE or 'unlimited'}"
+                    )
+    return _rate_limiter
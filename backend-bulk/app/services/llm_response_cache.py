@@ -0,0 +1,293 @@
+"""
+LLM Response Cache Module
+Caches processed LLM responses for identical requests
+
+UI retries, duplicate uploads and re-runs of bulk jobs send the exact same page image,
+prompt and response schema to the LLM again. Responses are keyed by a SHA-256 of
+(provider, model, task, content type, prompt, input data, response_format), so an
+identical request is answered locally instead of paying for tokens and latency again.
+
+Backends (LLM_RESPONSE_CACHE_BACKEND):
+- "memory": per-process LRU dict
+- "sqlite": local SQLite file, shared by every process on the host (WAL mode)
+- "none":   caching disabled (default - a re-analysis must reach the LLM unless a
+           deployment opts in)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache(ABC):
+    """
+    Base class for LLM response cache backends
+
+    Subclasses implement _load/_store/_size; this class handles keys, TTL bookkeeping,
+    serialization (values are stored as JSON, so every hit returns a fresh copy) and
+    hit-rate metrics.
+
+    Args:
+        ttl_seconds: Time-to-live for cached responses
+        max_entries: Maximum number of cached responses (least recently used evicted first)
+    """
+
+    backend_name = "base"
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        task: str,
+        content_type: str,
+        prompt: str,
+        input_data: Optional[str],
+        response_format: Optional[Dict[str, Any]],
+    ) -> str:
+        """Hash of everything that determines the LLM response for a request"""
+        digest = hashlib.sha256()
+        for part in (provider, model, task, content_type, prompt):
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\x00")
+        digest.update(hashlib.sha256((input_data or "").encode("utf-8")).digest())
+        digest.update(json.dumps(response_format or {}, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def is_cacheable(result: Any) -> bool:
+        """Only cache clean, complete responses - never errors or partially parsed JSON"""
+        if not isinstance(result, dict):
+            return False
+        if "error" in result or result.get("_partial"):
+            return False
+        if result.get("reason") == "Parse error":
+            return False
+        return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of the cached response for key, or None"""
+        payload = self._load(key, time.time() - self.ttl_seconds)
+        with self._stats_lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(payload)
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a response (silently skipped if it is not cacheable or not serializable)"""
+        if not self.is_cacheable(result):
+            return
+        cached = {k: v for k, v in result.items() if k != "_timing"}
+        try:
+            payload = json.dumps(cached, default=str)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"LLM response not cacheable: {e}")
+            return
+        self._store(key, payload, time.time())
+        with self._stats_lock:
+            self.stores += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters for logging and health endpoints"""
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend_name,
+                "entries": self._size(),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    @abstractmethod
+    def _load(self, key: str, min_created: float) -> Optional[str]:
+        """Return the stored payload for key if it was created at or after min_created"""
+
+    @abstractmethod
+    def _store(self, key: str, payload: str, created: float) -> None:
+        """Store payload under key, evicting least recently used entries over max_entries"""
+
+    @abstractmethod
+    def _size(self) -> int:
+        """Number of stored entries"""
+
+
+class InMemoryLLMResponseCache(LLMResponseCache):
+    """Per-process LRU response cache"""
+
+    backend_name = "memory"
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        super().__init__(ttl_seconds, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, key: str, min_created: float) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, payload = entry
+            if created < min_created:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def _store(self, key: str, payload: str, created: float) -> None:
+        with self._lock:
+            self._entries[key] = (created, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteLLMResponseCache(LLMResponseCache):
+    """
+    Response cache in a local SQLite file
+
+    Survives restarts and is shared by every worker process on the host. One connection
+    per thread; WAL journaling lets readers proceed while another process writes.
+    """
+
+    backend_name = "sqlite"
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        super().__init__(ttl_seconds, max_entries)
+        self.path = path
+        self._local = threading.local()
+        self._writes_since_prune = 0
+        self._prune_lock = threading.Lock()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses (accessed)")
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _load(self, key: str, min_created: float) -> Optional[str]:
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload FROM llm_responses WHERE key = ? AND created >= ?", (key, min_created)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE llm_responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ LLM response cache read failed: {e}")
+            return None
+
+    def _store(self, key: str, payload: str, created: float) -> None:
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, payload, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, payload, created, created),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ LLM response cache write failed: {e}")
+            return
+
+        # Prune expired and over-cap rows every 100 writes rather than on every insert
+        with self._prune_lock:
+            self._writes_since_prune += 1
+            if self._writes_since_prune < 100:
+                return
+            self._writes_since_prune = 0
+        self._prune()
+
+    def _prune(self) -> None:
+        try:
+            conn = self._connection()
+            conn.execute("DELETE FROM llm_responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ LLM response cache prune failed: {e}")
+
+    def _size(self) -> int:
+        try:
+            return self._connection().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_resolved = False
+_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get or create the process-wide LLM response cache from settings
+    Returns None when LLM_RESPONSE_CACHE_BACKEND is "none"
+    """
+    global _response_cache, _response_cache_resolved
+    if not _response_cache_resolved:
+        with _response_cache_lock:
+            if not _response_cache_resolved:
+                from ..core.config import settings
+                backend = settings.LLM_RESPONSE_CACHE_BACKEND.lower()
+                ttl = settings.LLM_RESPONSE_CACHE_TTL_SECONDS
+                max_entries = settings.LLM_RESPONSE_CACHE_MAX_ENTRIES
+                try:
+                    if backend == "memory":
+                        _response_cache = InMemoryLLMResponseCache(ttl, max_entries)
+                    elif backend == "sqlite":
+                        path = settings.LLM_RESPONSE_CACHE_PATH or os.path.join(
+                            tempfile.gettempdir(), "llm_response_cache.sqlite3"
+                        )
+                        _response_cache = SQLiteLLMResponseCache(path, ttl, max_entries)
+                    elif backend != "none":
+                        logger.warning(f"⚠️ Unknown LLM_RESPONSE_CACHE_BACKEND '{backend}' - response cache disabled")
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"⚠️ LLM response cache disabled - backend '{backend}' failed to start: {e}")
+                    _response_cache = None
+                if _response_cache is not None:
+                    logger.info(f"🗄️ LLM response cache enabled (backend: {backend}, ttl: {ttl}s, max entries: {max_entries})")
+                _response_cache_resolved = True
+    return _response_cache
@@ -0,0 +1,186 @@
+"""
+PDF Document Cache
+Process-wide, content-addressed LRU cache of opened PyMuPDF documents
+
+Documents are keyed by the MD5 of their bytes and bounded by a byte budget and an
+entry count. Each entry is reference counted: a request pins the documents it is
+working on, and eviction only ever closes documents nobody holds a pin on, so one
+request's cleanup can no longer close a document another request is rendering from.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    """A single cached document with its source bytes and pin count"""
+
+    __slots__ = ("document", "pdf_bytes", "size", "refcount")
+
+    def __init__(self, document: Any, pdf_bytes: bytes):
+        self.document = document
+        self.pdf_bytes = pdf_bytes
+        self.size = len(pdf_bytes)
+        self.refcount = 0
+
+
+class PDFDocumentCache:
+    """
+    Thread-safe, reference-counted LRU cache of opened PDF documents
+
+    Args:
+        max_bytes: Byte budget for cached PDF payloads (unpinned entries are evicted above it)
+        max_entries: Maximum number of cached documents
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int = 64):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, digest: str, pdf_bytes: bytes, opener: Callable[[bytes], Any]) -> Any:
+        """
+        Return the cached document for digest, opening it with opener on a miss
+        The returned document is not pinned - use acquire()/release() while it is in use
+        """
+        return self._lookup(digest, pdf_bytes, opener, pin=False)
+
+    def acquire(self, digest: str, pdf_bytes: bytes, opener: Callable[[bytes], Any]) -> Any:
+        """Return the cached document for digest and pin it until release() is called"""
+        return self._lookup(digest, pdf_bytes, opener, pin=True)
+
+    def release(self, digest: str) -> None:
+        """Drop one pin on digest; the document becomes evictable once no pins remain"""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return
+            entry.refcount = max(0, entry.refcount - 1)
+            self._evict_over_budget()
+
+    def evict_unpinned(self) -> int:
+        """
+        Close every document that is not currently pinned
+        Returns the number of documents evicted
+        """
+        with self._lock:
+            victims = [digest for digest, entry in self._entries.items() if entry.refcount == 0]
+            for digest in victims:
+                self._evict(digest)
+            return len(victims)
+
+    def trim(self) -> int:
+        """
+        Evict least-recently-used unpinned documents until the cache is within budget
+        Returns the number of documents evicted
+        """
+        with self._lock:
+            evictions = self.evictions
+            self._evict_over_budget()
+            return self.evictions - evictions
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters for logging and health endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "pinned": sum(1 for entry in self._entries.values() if entry.refcount > 0),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _lookup(self, digest: str, pdf_bytes: bytes, opener: Callable[[bytes], Any], pin: bool) -> Any:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(digest)
+                if pin:
+                    entry.refcount += 1
+                return entry.document
+            self.misses += 1
+
+        # Open outside the lock so a large document does not stall other lookups
+        document = opener(pdf_bytes)
+
+        with self._lock:
+            existing = self._entries.get(digest)
+            if existing is not None:
+                # Another thread opened the same document first - keep theirs
+                self._close(document, digest)
+                entry = existing
+                self._entries.move_to_end(digest)
+            else:
+                entry = _CacheEntry(document, pdf_bytes)
+                self._entries[digest] = entry
+                self._total_bytes += entry.size
+                logger.debug(f"📄 Cached PDF document (hash: {digest[:8]}..., {entry.size} bytes)")
+            if pin:
+                entry.refcount += 1
+            self._evict_over_budget()
+            return entry.document
+
+    def _evict_over_budget(self) -> None:
+        """Evict least-recently-used unpinned entries until within both limits"""
+        if self._total_bytes <= self.max_bytes and len(self._entries) <= self.max_entries:
+            return
+        for digest in list(self._entries.keys()):
+            if self._total_bytes <= self.max_bytes and len(self._entries) <= self.max_entries:
+                return
+            if self._entries[digest].refcount == 0:
+                self._evict(digest)
+        if self._total_bytes > self.max_bytes:
+            logger.debug(
+                f"📄 PDF document cache over budget with only pinned documents "
+                f"({self._total_bytes}/{self.max_bytes} bytes)"
+            )
+
+    def _evict(self, digest: str) -> None:
+        entry = self._entries.pop(digest)
+        self._total_bytes -= entry.size
+        self.evictions += 1
+        self._close(entry.document, digest)
+
+    @staticmethod
+    def _close(document: Any, digest: str) -> None:
+        try:
+            document.close()
+            logger.debug(f"🔒 Closed cached PDF document (hash: {digest[:8]}...)")
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing PDF document (hash: {digest[:8]}...): {e}")
+
+
+_document_cache: Optional[PDFDocumentCache] = None
+_document_cache_lock = threading.Lock()
+
+
+def get_pdf_document_cache() -> PDFDocumentCache:
+    """
+    Get or create the process-wide PDF document cache
+    Shared by every PDFProcessor instance so concurrent requests see one budget
+    """
+    global _document_cache
+    if _document_cache is None:
+        with _document_cache_lock:
+            if _document_cache is None:
+                from ..core.config import settings
+                _document_cache = PDFDocumentCache(
+                    max_bytes=settings.PDF_DOCUMENT_CACHE_MAX_MB * 1024 * 1024,
+                    max_entries=settings.PDF_DOCUMENT_CACHE_MAX_ENTRIES,
+                )
+    return _document_cache
@@ -5,57 +5,150 @@ import cv2
 import numpy as np
 import asyncio
 import hashlib
+import threading
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, List, Dict, Tuple, Any
+from typing import Optional, List, Dict, Tuple, Any, Union
 from PIL import Image
 import logging
+from .pdf_document_cache import PDFDocumentCache, get_pdf_document_cache
+from .pdf_render_pool import get_pdf_render_pool
+from .page_render_cache import PageRenderCache, get_page_render_cache
 
 logger = logging.getLogger(__name__)
 
+
+class PDFDocumentHandle:
+    """
+    Decoded PDF payload shared across all pipeline stages
+    The base64 data URL is decoded exactly once; the raw bytes, content hash
+    and page count are then reused by every page lookup instead of re-decoding
+    and re-hashing the whole file per page
+    """
+
+    __slots__ = ("_pdf_bytes", "_digest", "page_count", "pins")
+
+    def __init__(self, pdf_bytes: Union[bytes, bytearray, memoryview]):
+        # fitz.open(stream=...) needs a bytes-like object it can keep a reference to
+        self._pdf_bytes = pdf_bytes if isinstance(pdf_bytes, bytes) else bytes(pdf_bytes)
+        self._digest: Optional[str] = None
+        self.page_count: Optional[int] = None
+        self.pins = 0  # Document cache pins currently held through this handle
+
+    @classmethod
+    def from_data(cls, pdf_data: "PDFSource") -> "PDFDocumentHandle":
+        """
+        Build a handle from a data URL, raw base64 string, raw bytes or an existing handle
+        Existing handles are returned unchanged so callers can wrap defensively
+        """
+        if isinstance(pdf_data, PDFDocumentHandle):
+            return pdf_data
+        if isinstance(pdf_data, (bytes, bytearray, memoryview)):
+            return cls(pdf_data)
+        base64_data = pdf_data.split("base64,", 1)[1] if "base64," in pdf_data else pdf_data
+        return cls(base64.b64decode(base64_data))
+
+    @property
+    def pdf_bytes(self) -> bytes:
+        """Raw PDF bytes (shared, never copied)"""
+        return self._pdf_bytes
+
+    @property
+    def view(self) -> memoryview:
+        """Zero-copy view over the PDF bytes"""
+        return memoryview(self._pdf_bytes)
+
+    @property
+    def digest(self) -> str:
+        """Content hash, computed on first use and memoized"""
+        if self._digest is None:
+            self._digest = hashlib.md5(self._pdf_bytes).hexdigest()
+        return self._digest
+
+    @property
+    def size(self) -> int:
+        return len(self._pdf_bytes)
+
+    def __len__(self) -> int:
+        return len(self._pdf_bytes)
+
+
+# Anything the PDF methods accept as a document: data URL / base64 string, raw bytes or a decoded handle
+PDFSource = Union[str, bytes, PDFDocumentHandle]
+
+
 class PDFProcessor:
     """
     PDF processing service using PyMuPDF for converting PDF pages to images
     Optimized for page-by-page processing to avoid hallucination
     """
     
-    def __init__(self):
+    # Page render cache key parts - change RENDER_CACHE_VARIANT whenever the
+    # render/enhance/encode path changes so stale renders are not served
+    RENDER_CACHE_SCALE = 5
+    RENDER_CACHE_VARIANT = "a4-thresh-jpeg90"
+    
+    def __init__(
+        self,
+        document_cache: Optional[PDFDocumentCache] = None,
+        render_cache: Optional[PageRenderCache] = None
+    ):
         # PDF processing settings optimized for high accuracy and minimal hallucination
         # Scaling: 8x (576 DPI), A4 size, grayscale + adaptive thresholding, PNG format for lossless quality
         self._last_debug_image = None  # Legacy - kept for backward compatibility
         self._debug_images_by_page: Dict[int, str] = {}  # Store debug images per page number
         # PDF document cache to avoid reopening for each page
-        self._pdf_cache: Dict[str, fitz.Document] = {}
-        self._pdf_bytes_cache: Dict[str, bytes] = {}
+        # Process-wide by default: bounded LRU with per-request pinning (see pdf_document_cache.py)
+        self._document_cache = document_cache if document_cache is not None else get_pdf_document_cache()
+        self._pin_lock = threading.Lock()  # Guards PDFDocumentHandle.pins across page threads
+        # Disk-backed cache of encoded pages and text results, shared across processes
+        # (None when PAGE_RENDER_CACHE_ENABLED is false, see page_render_cache.py)
+        self._render_cache = render_cache if render_cache is not None else get_page_render_cache()
     
-    def get_pdf_page_count(self, pdf_data: str) -> int:
+    def open_document_handle(self, pdf_data: PDFSource) -> PDFDocumentHandle:
+        """
+        Decode PDF data once into a handle that can be passed through every stage
+        
+        Args:
+            pdf_data: Base64 encoded PDF data, data URL, raw bytes or an existing handle
+            
+        Returns:
+            PDFDocumentHandle wrapping the raw PDF bytes
+        """
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        logger.debug(f"📄 PDF document handle ready ({handle.size} bytes)")
+        return handle
+    
+    def get_pdf_page_count(self, pdf_data: PDFSource) -> int:
         """
         Get the total number of pages in a PDF
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL, raw bytes or PDFDocumentHandle
             
         Returns:
             Number of pages in the PDF
         """
         try:
-            base64_data = self.extract_base64_from_data_url(pdf_data)
-            pdf_bytes = base64.b64decode(base64_data)
-            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+            handle = PDFDocumentHandle.from_data(pdf_data)
+            if handle.page_count is not None:
+                return handle.page_count
+            pdf_document = fitz.open(stream=handle.pdf_bytes, filetype="pdf")
             page_count = len(pdf_document)
             pdf_document.close()
+            handle.page_count = page_count
             return page_count
         except Exception as e:
             logger.error(f"Error getting PDF page count: {e}")
             return 0
     
-    def step1_1_decode_base64_pdf(self, pdf_data: str) -> Optional[bytes]:
+    def step1_1_decode_base64_pdf(self, pdf_data: PDFSource) -> Optional[bytes]:
         """
         Step 1.1: Decode Base64 PDF Data
-        Returns: PDF bytes or None
+        Returns: PDF bytes or None (no decoding when given a PDFDocumentHandle)
         """
         try:
-            base64_data = self.extract_base64_from_data_url(pdf_data)
-            pdf_bytes = base64.b64decode(base64_data)
+            pdf_bytes = PDFDocumentHandle.from_data(pdf_data).pdf_bytes
             logger.debug(f"📄 Step 1.1: Base64 PDF data decoded ({len(pdf_bytes)} bytes)")
             return pdf_bytes
         except Exception as e:
@@ -264,13 +357,13 @@ class PDFProcessor:
             logger.error(f"Error in Step 1.5 (Analyze Text Quality): {e}")
             return {"confidence": 0.0, "is_selectable": False}
     
-    def extract_text_from_page(self, pdf_data: str, page_number: int = 0) -> Optional[Dict[str, Any]]:
+    def extract_text_from_page(self, pdf_data: PDFSource, page_number: int = 0) -> Optional[Dict[str, Any]]:
         """
         Extract text from a single PDF page and check if it's selectable/readable
         Uses granular steps for detailed logging
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
             page_number: Page number to extract text from (0-indexed)
             
         Returns:
@@ -283,10 +376,17 @@ class PDFProcessor:
         """
         try:
             # Step 1.1: Decode Base64 PDF Data
+            pdf_data = PDFDocumentHandle.from_data(pdf_data)
             pdf_bytes = self.step1_1_decode_base64_pdf(pdf_data)
             if not pdf_bytes:
                 return None
             
+            if self._render_cache is not None:
+                cached_result = self._render_cache.get_text(pdf_data.digest, page_number)
+                if cached_result is not None:
+                    logger.debug(f"♻️ Text extraction for page {page_number + 1} served from page render cache")
+                    return cached_result
+            
             # Step 1.2: Open PDF Document
             pdf_document = self.step1_2_open_pdf_document(pdf_bytes)
             if not pdf_document:
@@ -320,6 +420,9 @@ class PDFProcessor:
                 "page_number": page_number + 1  # 1-indexed for display
             }
             
+            if self._render_cache is not None:
+                self._render_cache.put_text(pdf_data.digest, page_number, result)
+            
             logger.info(f"📝 Text extraction from page {page_number + 1}:")
             logger.info(f"   Characters: {result['char_count']}, Words: {result['word_count']}")
             logger.info(f"   Text blocks: {result['text_blocks']}, Image blocks: {result['image_blocks']}")
@@ -369,7 +472,7 @@ class PDFProcessor:
     
     def extract_page_content(
         self, 
-        pdf_data: str, 
+        pdf_data: PDFSource, 
         page_number: int = 0,
         prefer_text: bool = True,
         text_confidence_threshold: float = 0.6
@@ -379,7 +482,7 @@ class PDFProcessor:
         otherwise falls back to image conversion
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
             page_number: Page number to extract (0-indexed)
             prefer_text: Whether to prefer text extraction over image conversion
             text_confidence_threshold: Minimum confidence (0-1) to use text extraction
@@ -393,6 +496,9 @@ class PDFProcessor:
                 - metadata: Additional information about the extraction
         """
         try:
+            # Decode once - text and image paths below share the same handle
+            pdf_data = PDFDocumentHandle.from_data(pdf_data)
+            
             metadata = {
                 "page_number": page_number + 1,
                 "extraction_method": None,
@@ -451,33 +557,65 @@ class PDFProcessor:
             logger.error(f"Error extracting page content: {e}")
             return None
     
-    def _get_cached_pdf_document(self, pdf_data: str) -> Tuple[fitz.Document, bytes]:
+    @staticmethod
+    def _open_pdf_stream(pdf_bytes: bytes) -> fitz.Document:
+        """Open PDF bytes as a PyMuPDF document (cache opener)"""
+        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+        if not pdf_document:
+            raise ValueError("Failed to open PDF document")
+        return pdf_document
+    
+    def _get_cached_pdf_document(self, pdf_data: PDFSource) -> Tuple[fitz.Document, bytes]:
         """
         Get or create cached PDF document to avoid reopening for each page
+        The document is not pinned by this call - wrap usage in pin_document()
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
+                      (a handle skips the per-call base64 decode and MD5)
             
         Returns:
             Tuple of (PDF document, PDF bytes)
         """
-        base64_data = self.extract_base64_from_data_url(pdf_data)
-        pdf_bytes = base64.b64decode(base64_data)
-        
-        # Create hash for caching (use first 16 bytes + size for faster hashing)
-        pdf_hash = hashlib.md5(pdf_bytes).hexdigest()
-        
-        if pdf_hash not in self._pdf_cache:
-            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-            if not pdf_document:
-                raise ValueError("Failed to open PDF document")
-            self._pdf_cache[pdf_hash] = pdf_document
-            self._pdf_bytes_cache[pdf_hash] = pdf_bytes
-            logger.debug(f"📄 Cached PDF document (hash: {pdf_hash[:8]}..., pages: {len(pdf_document)})")
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        pdf_document = self._document_cache.get(handle.digest, handle.pdf_bytes, self._open_pdf_stream)
+        return pdf_document, handle.pdf_bytes
+    
+    def _acquire_document(self, pdf_data: PDFSource) -> PDFDocumentHandle:
+        """Pin the cached document for pdf_data and return its handle"""
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        self._document_cache.acquire(handle.digest, handle.pdf_bytes, self._open_pdf_stream)
+        with self._pin_lock:
+            handle.pins += 1
+        return handle
+    
+    def _release_document(self, handle: PDFDocumentHandle) -> None:
+        """Drop a pin taken with _acquire_document"""
+        with self._pin_lock:
+            if handle.pins == 0:
+                return
+            handle.pins -= 1
+        self._document_cache.release(handle.digest)
+    
+    @contextmanager
+    def pin_document(self, pdf_data: PDFSource):
+        """
+        Keep the cached document for pdf_data open for the duration of a request
+        Pinned documents are never evicted, regardless of the cache byte budget
         
-        return self._pdf_cache[pdf_hash], self._pdf_bytes_cache[pdf_hash]
+        Args:
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
+            
+        Yields:
+            PDFDocumentHandle for the pinned document
+        """
+        handle = self._acquire_document(pdf_data)
+        try:
+            yield handle
+        finally:
+            self._release_document(handle)
     
-    def step1_get_pdf_page(self, pdf_data: str, page_number: int) -> Optional[Tuple[fitz.Document, fitz.Page]]:
+    def step1_get_pdf_page(self, pdf_data: PDFSource, page_number: int) -> Optional[Tuple[fitz.Document, fitz.Page]]:
         """
         Step 1: PDF caching & page extraction
         Returns: (pdf_document, page) tuple or None
@@ -497,14 +635,13 @@ class PDFProcessor:
             logger.error(f"Error in Step 1 for page {page_number + 1}: {e}")
             return None
     
-    def step1_7_decode_base64_pdf_fallback(self, pdf_data: str) -> Optional[bytes]:
+    def step1_7_decode_base64_pdf_fallback(self, pdf_data: PDFSource) -> Optional[bytes]:
         """
         Step 1.7 (Fallback): Decode Base64 PDF Data
-        Returns: PDF bytes or None
+        Returns: PDF bytes or None (no decoding when given a PDFDocumentHandle)
         """
         try:
-            base64_data = self.extract_base64_from_data_url(pdf_data)
-            pdf_bytes = base64.b64decode(base64_data)
+            pdf_bytes = PDFDocumentHandle.from_data(pdf_data).pdf_bytes
             logger.debug(f"📄 Step 1.7 (Fallback): Base64 PDF data decoded ({len(pdf_bytes)} bytes)")
             return pdf_bytes
         except Exception as e:
@@ -670,7 +807,7 @@ class PDFProcessor:
     
     def convert_pdf_page_to_image(
         self, 
-        pdf_data: str, 
+        pdf_data: PDFSource, 
         page_number: int = 0
     ) -> Optional[Dict[str, Image.Image]]:
         """
@@ -680,13 +817,18 @@ class PDFProcessor:
         For pipeline processing, use the individual step methods.
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
             page_number: Page number to convert (0-indexed)
             
         Returns:
             Dictionary with "processed" and "original" PIL Images, or None if conversion fails
         """
+        handle = None
         try:
+            # Pin the cached document so a concurrent eviction cannot close it mid-render
+            handle = self._acquire_document(pdf_data)
+            pdf_data = handle
+            
             # Step 1: Get PDF page
             step1_result = self.step1_get_pdf_page(pdf_data, page_number)
             if not step1_result:
@@ -719,6 +861,9 @@ class PDFProcessor:
         except Exception as e:
             logger.error(f"Error converting PDF page {page_number} to image: {e}")
             return None
+        finally:
+            if handle is not None:
+                self._release_document(handle)
     
     # Fully removed: combined image logic; this method intentionally does not exist anymore.
     
@@ -854,13 +999,47 @@ class PDFProcessor:
         logger.debug(f"Encoded image: {len(img_bytes)} bytes in JPEG format (quality=90)")
         return f"data:image/jpeg;base64,{img_base64}"
 
-    async def convert_pdf_to_images(self, pdf_data: str) -> List[str]:
+    def render_page_image(self, pdf_data: PDFSource, page_number: int) -> Optional[str]:
+        """
+        Render, enhance and encode a single page (blocking - call from a worker thread)
+        Streaming pipelines use this to render pages just ahead of extraction instead of
+        holding every page of the document in memory. Uses the page render cache.
+
+        Args:
+            pdf_data: PDFDocumentHandle (or base64 data / data URL)
+            page_number: Page number to render (0-indexed)
+
+        Returns:
+            Base64 encoded image data URL, or None if the page could not be rendered
+        """
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        if self._render_cache is not None:
+            image = self._render_cache.get_image(
+                handle.digest, page_number, self.RENDER_CACHE_SCALE, self.RENDER_CACHE_VARIANT
+            )
+            if image is not None:
+                return image
+
+        image_data = self.convert_pdf_page_to_image(handle, page_number)
+        processed_image_pil = image_data.get("processed") if image_data else None
+        if processed_image_pil is None:
+            return None
+
+        image = self._encode_image_simple(processed_image_pil)
+        del image_data, processed_image_pil
+        if self._render_cache is not None:
+            self._render_cache.put_image(
+                handle.digest, page_number, self.RENDER_CACHE_SCALE, self.RENDER_CACHE_VARIANT, image
+            )
+        return image
+
+    async def convert_pdf_to_images(self, pdf_data: PDFSource) -> List[str]:
         """
         Convert all pages of a PDF to images (parallel version)
         Uses cached PDF document for improved performance
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
             
         Returns:
             List of base64 encoded image data URLs
@@ -868,18 +1047,36 @@ class PDFProcessor:
         try:
             from ..core.config import settings
             
+            # Decode once - every page conversion below reuses the same handle
+            pdf_data = self.open_document_handle(pdf_data)
+            
             # Get page count first
             page_count = self.get_pdf_page_count(pdf_data)
             if page_count == 0:
                 logger.warning("PDF has no pages")
                 return []
             
-            logger.info(f"Converting PDF with {page_count} pages to images (parallel)")
+            # Pages rendered by an earlier analysis of the same bytes come from the render cache
+            cached_images = self._get_cached_page_images(pdf_data, page_count)
+            pages_to_render = [page_num for page_num in range(page_count) if page_num not in cached_images]
+            if not pages_to_render:
+                logger.info(f"♻️ All {page_count} pages served from page render cache")
+                return [cached_images[page_num] for page_num in range(page_count)]
+            
+            if settings.PDF_RENDER_MODE == "process":
+                rendered = await self._convert_pdf_to_images_in_processes(pdf_data, pages_to_render)
+                if rendered is not None:
+                    return self._collect_rendered_pages(pdf_data, page_count, cached_images, rendered)
+            
+            logger.info(f"Converting PDF with {len(pages_to_render)}/{page_count} pages to images (parallel)")
             
             # Use thread pool executor for parallel conversion
             max_workers = settings.PDF_PROCESSING_MAX_WORKERS
             thread_pool = ThreadPoolExecutor(max_workers=max_workers)
             
+            # Pin the document for the whole conversion so concurrent cache cleanup cannot close it
+            pinned_handle = self._acquire_document(pdf_data)
+            
             # CRITICAL FIX #1: Wrap in try-finally to ensure thread pool shutdown
             try:
                 loop = asyncio.get_event_loop()
@@ -914,15 +1111,13 @@ class PDFProcessor:
                         logger.warning(f"Failed to convert page {page_num + 1}: {e}")
                     return None
                 
-                # Convert all pages in parallel
-                tasks = [convert_page_async(page_num) for page_num in range(page_count)]
+                # Convert all uncached pages in parallel
+                tasks = [convert_page_async(page_num) for page_num in pages_to_render]
                 results = await asyncio.gather(*tasks)
                 
-                # Filter out None results and maintain order
-                images = [img for img in results if img is not None]
-                
-                logger.info(f"Successfully converted {len(images)} pages to images")
-                return images
+                return self._collect_rendered_pages(
+                    pdf_data, page_count, cached_images, dict(zip(pages_to_render, results))
+                )
                 
             finally:
                 # CRITICAL FIX #1: Always shutdown thread pool, even on errors
@@ -932,7 +1127,10 @@ class PDFProcessor:
                 except Exception as e:
                     logger.warning(f"⚠️ Error shutting down thread pool: {e}")
                 
+                self._release_document(pinned_handle)
+                
                 # CRITICAL FIX #2: Always clear PDF cache, even on errors
+                # (pins are released; the cache budget decides what stays open)
                 try:
                     self.clear_pdf_cache()
                 except Exception as e:
@@ -942,6 +1140,65 @@ class PDFProcessor:
             logger.error(f"Error converting PDF to images: {e}")
             return []
 
+    async def _convert_pdf_to_images_in_processes(
+        self,
+        handle: PDFDocumentHandle,
+        page_numbers: List[int]
+    ) -> Optional[Dict[int, Optional[str]]]:
+        """
+        Render pages in the worker processes of the render pool (PDF_RENDER_MODE=process)
+        
+        Returns:
+            Dict of page number -> data URL (None for failed pages), or None if the process
+            pool is unavailable (e.g. inside a daemonic worker process) and the caller should
+            use threads instead
+        """
+        try:
+            logger.info(f"Converting {len(page_numbers)} PDF pages to images (process pool)")
+            return await get_pdf_render_pool().render_pages(handle.pdf_bytes, handle.digest, page_numbers)
+        except Exception as e:
+            logger.warning(f"⚠️ Process rendering unavailable, falling back to threads: {e}")
+            return None
+
+    def _get_cached_page_images(self, handle: PDFDocumentHandle, page_count: int) -> Dict[int, str]:
+        """Look up every page of a document in the page render cache"""
+        if self._render_cache is None:
+            return {}
+        cached_images = {}
+        for page_num in range(page_count):
+            image = self._render_cache.get_image(
+                handle.digest, page_num, self.RENDER_CACHE_SCALE, self.RENDER_CACHE_VARIANT
+            )
+            if image is not None:
+                cached_images[page_num] = image
+        if cached_images:
+            logger.info(f"♻️ {len(cached_images)}/{page_count} pages found in page render cache")
+        return cached_images
+
+    def _collect_rendered_pages(
+        self,
+        handle: PDFDocumentHandle,
+        page_count: int,
+        cached_images: Dict[int, str],
+        rendered: Dict[int, Optional[str]]
+    ) -> List[str]:
+        """Store freshly rendered pages in the render cache and merge with cached ones in page order"""
+        if self._render_cache is not None:
+            for page_num, image in rendered.items():
+                if image is not None:
+                    self._render_cache.put_image(
+                        handle.digest, page_num, self.RENDER_CACHE_SCALE, self.RENDER_CACHE_VARIANT, image
+                    )
+        
+        images = []
+        for page_num in range(page_count):
+            image = cached_images.get(page_num) or rendered.get(page_num)
+            if image is not None:
+                images.append(image)
+        
+        logger.info(f"Successfully converted {len(images)} pages to images")
+        return images
+
     def convert_signature_coordinates(
         self,
         bbox: List[int],
@@ -1174,19 +1431,17 @@ class PDFProcessor:
     
     def clear_pdf_cache(self):
         """
-        Clear PDF document cache (call after processing complete)
-        This closes all cached PDF documents and frees memory
+        Trim the PDF document cache after processing (call after processing complete)
+        Pins are released by whoever took them (pin_document, release_pdf_document), so
+        documents other tasks are still using are never touched; unpinned documents stay
+        cached between tasks until the cache's byte/entry budget closes them
         """
-        for pdf_hash, pdf_document in self._pdf_cache.items():
-            try:
-                pdf_document.close()
-                logger.debug(f"🔒 Closed cached PDF document (hash: {pdf_hash[:8]}...)")
-            except Exception as e:
-                logger.warning(f"⚠️ Error closing PDF document (hash: {pdf_hash[:8]}...): {e}")
-        
-        self._pdf_cache.clear()
-        self._pdf_bytes_cache.clear()
-        logger.debug("🧹 Cleared PDF document cache")
+        evicted = self._document_cache.trim()
+        logger.debug(f"🧹 Trimmed PDF document cache ({evicted} document(s) evicted over budget)")
+    
+    def get_pdf_cache_stats(self) -> Dict[str, Any]:
+        """Get PDF document cache counters (hits, misses, evictions, bytes)"""
+        return self._document_cache.get_stats()
 
     def _create_debug_image_with_all_bboxes(self, page_image_data: str, signatures: List[dict]):
         """
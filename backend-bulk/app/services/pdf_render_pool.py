@@ -0,0 +1,180 @@
+"""
+PDF Render Process Pool
+Optional multiprocessing backend for CPU-bound page rendering
+
+PyMuPDF rendering, adaptive thresholding and PNG encoding all hold the GIL for most of
+their runtime, so the thread-based conversion path tops out at roughly one core per API
+worker. In "process" mode (PDF_RENDER_MODE=process) convert_pdf_to_images hands page
+ranges to a pool of worker processes instead:
+
+- The PDF is written once to a tmpfs-backed file (/dev/shm when available) and workers
+  open it by path - no per-task pickling of the PDF bytes
+- Each worker keeps its most recently used documents open, so every page range after
+  the first one for a document skips the read and open
+- Workers render, enhance and encode with their own PDFProcessor (the same
+  convert_pdf_page_to_image path as thread mode) and return only the encoded data URLs
+
+Worker processes are started with the "spawn" method - the API process runs many
+threads and forking it is not safe.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Number of PDFs each worker process keeps around
+_WORKER_DOCUMENT_LIMIT = 2
+
+_worker_processor: Any = None
+_worker_handles: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def _init_worker() -> None:
+    """Process initializer: build the worker's PDFProcessor once"""
+    global _worker_processor
+    from .pdf_processor import PDFProcessor
+    _worker_processor = PDFProcessor()
+
+
+def _load_worker_handle(pdf_path: str, digest: str) -> Any:
+    """Read the spilled PDF once per worker; the processor's document cache keeps it open"""
+    handle = _worker_handles.get(digest)
+    if handle is not None:
+        _worker_handles.move_to_end(digest)
+        return handle
+
+    from .pdf_processor import PDFDocumentHandle
+    with open(pdf_path, "rb") as f:
+        handle = PDFDocumentHandle(f.read())
+    _worker_handles[digest] = handle
+    while len(_worker_handles) > _WORKER_DOCUMENT_LIMIT:
+        _worker_handles.popitem(last=False)
+    return handle
+
+
+def _render_page_range(pdf_path: str, digest: str, page_numbers: List[int]) -> List[Tuple[int, Optional[str]]]:
+    """
+    Worker task: render, enhance and encode a range of pages
+
+    Uses the same convert_pdf_page_to_image + _encode_image_simple path as thread mode,
+    so both modes produce identical images.
+
+    Returns:
+        List of (page_number, data URL or None) tuples
+    """
+    handle = _load_worker_handle(pdf_path, digest)
+    results: List[Tuple[int, Optional[str]]] = []
+    with _worker_processor.pin_document(handle):
+        for page_number in page_numbers:
+            try:
+                image_data = _worker_processor.convert_pdf_page_to_image(handle, page_number)
+                processed_img = image_data.get("processed") if image_data else None
+                if processed_img is None:
+                    results.append((page_number, None))
+                    continue
+                results.append((page_number, _worker_processor._encode_image_simple(processed_img)))
+            except Exception as e:
+                logger.warning(f"Failed to render page {page_number + 1} in worker process: {e}")
+                results.append((page_number, None))
+    return results
+
+
+class PDFRenderProcessPool:
+    """
+    Lazily started pool of rendering worker processes
+
+    Args:
+        processes: Number of worker processes (0 = one per CPU core)
+        pages_per_task: Pages rendered per submitted task
+    """
+
+    def __init__(self, processes: int = 0, pages_per_task: int = 4):
+        self.processes = processes if processes > 0 else (os.cpu_count() or 1)
+        self.pages_per_task = max(1, pages_per_task)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._spill_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if multiprocessing.current_process().daemon:
+            # e.g. a Celery prefork child - daemonic processes cannot start children
+            raise RuntimeError("render process pool cannot be started from a daemonic process")
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                    )
+                    logger.info(f"🧮 Started PDF render process pool ({self.processes} processes)")
+        return self._executor
+
+    def _spill(self, pdf_bytes: bytes) -> str:
+        fd, path = tempfile.mkstemp(prefix="pdf-render-", suffix=".pdf", dir=self._spill_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        return path
+
+    async def render_pages(self, pdf_bytes: bytes, digest: str, page_numbers: List[int]) -> Dict[int, Optional[str]]:
+        """
+        Render pages of a PDF in the worker processes
+
+        Args:
+            pdf_bytes: Raw PDF bytes
+            digest: Content digest of pdf_bytes (used as the workers' document cache key)
+            page_numbers: Pages to render (0-indexed)
+
+        Returns:
+            Dict of page number -> data URL (None for pages that failed)
+        """
+        executor = self._get_executor()
+        pdf_path = self._spill(pdf_bytes)
+        try:
+            page_ranges = [
+                page_numbers[start:start + self.pages_per_task]
+                for start in range(0, len(page_numbers), self.pages_per_task)
+            ]
+            chunks = await asyncio.gather(*[
+                asyncio.wrap_future(executor.submit(_render_page_range, pdf_path, digest, page_range))
+                for page_range in page_ranges
+            ])
+        finally:
+            try:
+                os.unlink(pdf_path)
+            except OSError:
+                pass
+
+        return {page_number: image for chunk in chunks for page_number, image in chunk}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_render_pool: Optional[PDFRenderProcessPool] = None
+_render_pool_lock = threading.Lock()
+
+
+def get_pdf_render_pool() -> PDFRenderProcessPool:
+    """Get or create the process-wide render process pool"""
+    global _render_pool
+    if _render_pool is None:
+        with _render_pool_lock:
+            if _render_pool is None:
+                from ..core.config import settings
+                _render_pool = PDFRenderProcessPool(
+                    processes=settings.PDF_RENDER_PROCESSES,
+                    pages_per_task=settings.PDF_RENDER_PAGES_PER_TASK,
+                )
+    return _render_pool
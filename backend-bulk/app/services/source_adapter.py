@@ -3,10 +3,25 @@ Source Adapter Interface
 Abstract base class for different document sources
 """
 
+import json
+import logging
+import os
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
+# Microsoft Graph base URL for OneDrive requests
+_GRAPH_API_URL = "https://graph.microsoft.com/v1.0"
+
+# Entries per storage.list() call when counting Supabase Storage documents
+_SUPABASE_COUNT_PAGE_SIZE = 1000
+
+# Proxy variables cleared around Supabase calls (httpx/supabase proxy conflict)
+_PROXY_ENV_VARS = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
+
 
 @dataclass
 class DocumentInfo:
@@ -18,6 +33,13 @@ class DocumentInfo:
     metadata: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class DiscoveryPage:
+    """One page of discovered documents"""
+    documents: List[DocumentInfo]
+    cursor: Optional[str]  # Pass back to iter_document_pages to continue after this page (None = source exhausted)
+
+
 class SourceAdapter(ABC):
     """Abstract base class for source adapters"""
     
@@ -39,6 +61,30 @@ class SourceAdapter(ABC):
         """
         pass
     
+    def iter_document_pages(
+        self,
+        config: Dict[str, Any],
+        cursor: Optional[str] = None,
+        page_size: int = 100
+    ) -> Iterator[DiscoveryPage]:
+        """
+        Discover every document in the source, one page at a time
+        
+        Each page carries an opaque cursor; passing it back resumes discovery after that
+        page, so a discovery task can persist it and continue in a later task. The last
+        page has cursor None.
+        
+        The default returns discover_documents() as a single page - adapters for
+        sources that can be large override this with real pagination.
+        
+        Args:
+            config: Source-specific configuration
+            cursor: Cursor of the last page already handled (None = from the start)
+            page_size: Documents (or listed entries) per page
+        """
+        if cursor is None:
+            yield DiscoveryPage(self.discover_documents(config, batch_size=page_size), None)
+    
     @abstractmethod
     def get_document_content(self, source_path: str) -> bytes:
         """
@@ -105,20 +151,25 @@ class FolderSourceAdapter(SourceAdapter):
             
             try:
                 supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
-                file_list = supabase.storage.from_(bucket_name).list(prefix)
+                bucket = supabase.storage.from_(bucket_name)
                 
                 count = 0
                 file_types_lower = [ext.lower().lstrip('.') for ext in file_types]
                 
-                for file_obj in file_list:
-                    filename = file_obj.get('name', '')
-                    ext = filename.split('.')[-1].lower() if '.' in filename else ''
-                    if ext in file_types_lower:
-                        count += 1
-                        if max_count and count >= max_count:
-                            return count
-                
-                return count
+                # storage.list() returns 100 entries unless paged
+                offset = 0
+                while True:
+                    file_list = _list_supabase_page(bucket, prefix, offset, _SUPABASE_COUNT_PAGE_SIZE)
+                    offset += len(file_list)
+                    for file_obj in file_list:
+                        filename = file_obj.get('name', '')
+                        ext = filename.split('.')[-1].lower() if '.' in filename else ''
+                        if ext in file_types_lower:
+                            count += 1
+                            if max_count and count >= max_count:
+                                return count
+                    if len(file_list) < _SUPABASE_COUNT_PAGE_SIZE:
+                        return count
                 
             except Exception as e:
                 import logging
@@ -171,10 +222,21 @@ class FolderSourceAdapter(SourceAdapter):
         config: Dict[str, Any],
         batch_size: int = 50
     ) -> List[DocumentInfo]:
-        """Discover documents from folder or Supabase Storage"""
-        import os
-        from pathlib import Path
+        """Discover up to batch_size documents from folder or Supabase Storage (first page of iter_document_pages)"""
+        return next(self.iter_document_pages(config, page_size=batch_size), DiscoveryPage([], None)).documents
+    
+    def iter_document_pages(
+        self,
+        config: Dict[str, Any],
+        cursor: Optional[str] = None,
+        page_size: int = 100
+    ) -> Iterator[DiscoveryPage]:
+        """
+        Discover every document in a folder or Supabase Storage prefix, page by page
         
+        Cursors: local folders resume after the relative path of the last document
+        (files are walked in sorted order); Supabase Storage resumes at a listing offset.
+        """
         folder_path = config.get("path")
         file_types = config.get("file_types", ["pdf", "jpg", "jpeg", "png"])
         recursive = config.get("recursive", True)
@@ -182,45 +244,76 @@ class FolderSourceAdapter(SourceAdapter):
         if not folder_path:
             raise ValueError("Folder path is required")
         
-        # Check if it's a Supabase Storage path
         if folder_path.startswith('supabase://'):
-            # Extract bucket and session path from supabase://bucket/session-id
-            from app.core.config import settings
-            from supabase import create_client
-            import os as os_module
-            
-            # Parse: supabase://backendbucket/session-id
-            parts = folder_path.replace('supabase://', '').split('/', 1)
-            bucket_name = parts[0] if len(parts) > 0 else settings.SUPABASE_STORAGE_BUCKET
-            prefix = parts[1] if len(parts) > 1 else ""
-            
-            # Clear proxy environment variables to avoid httpx/supabase conflict
-            proxy_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-            saved_proxies = {}
-            for var in proxy_vars:
-                if var in os_module.environ:
-                    saved_proxies[var] = os_module.environ.pop(var)
+            yield from self._iter_supabase_pages(folder_path, file_types, cursor, page_size)
+            return
+        
+        # Local folder path
+        if not os.path.exists(folder_path):
+            raise ValueError(f"Folder path does not exist: {folder_path}")
+        
+        # Normalize file types to lowercase for case-insensitive matching
+        file_types_lower = [ext.lower().lstrip('.') for ext in file_types]
+        after = tuple(cursor.split('/')) if cursor else None
+        
+        documents: List[DocumentInfo] = []
+        last_parts: Tuple[str, ...] = ()
+        for parts, entry in _walk_sorted(folder_path, recursive, after):
+            ext = os.path.splitext(entry.name)[1]
+            if ext.lower().lstrip('.') not in file_types_lower:
+                continue
+            documents.append(DocumentInfo(
+                source_path=entry.path,
+                filename=entry.name,
+                file_size=entry.stat().st_size,
+                mime_type=self._guess_mime_type(ext)
+            ))
+            last_parts = parts
+            if len(documents) >= page_size:
+                yield DiscoveryPage(documents, '/'.join(last_parts))
+                documents = []
+        
+        yield DiscoveryPage(documents, None)
+    
+    def _iter_supabase_pages(
+        self,
+        folder_path: str,
+        file_types: List[str],
+        cursor: Optional[str],
+        page_size: int
+    ) -> Iterator[DiscoveryPage]:
+        """Pages of a Supabase Storage prefix (supabase://bucket/prefix); cursor is the listing offset"""
+        from app.core.config import settings
+        from supabase import create_client
+        
+        # Parse: supabase://backendbucket/session-id
+        parts = folder_path.replace('supabase://', '').split('/', 1)
+        bucket_name = parts[0] if len(parts) > 0 else settings.SUPABASE_STORAGE_BUCKET
+        prefix = parts[1] if len(parts) > 1 else ""
+        file_types_lower = [ft.lower().lstrip('.') for ft in file_types]
+        
+        try:
+            with _proxy_env_cleared():
+                supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
+                bucket = supabase.storage.from_(bucket_name)
             
+            # Try to load filename mapping
+            filename_mapping = {}
+            mapping_path = f"{prefix}/.filenames.json" if prefix else ".filenames.json"
             try:
-                supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
-                
-                # Try to load filename mapping
-                filename_mapping = {}
-                mapping_path = f"{prefix}/.filenames.json" if prefix else ".filenames.json"
-                try:
-                    mapping_content = supabase.storage.from_(bucket_name).download(mapping_path)
-                    import json
-                    filename_mapping = json.loads(mapping_content.decode('utf-8'))
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.info(f"✅ Loaded filename mapping with {len(filename_mapping)} entries")
-                except Exception as e:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"⚠️ No filename mapping found: {e}")
-                
-                # List files in the bucket with prefix
-                file_list = supabase.storage.from_(bucket_name).list(prefix)
+                with _proxy_env_cleared():
+                    mapping_content = bucket.download(mapping_path)
+                filename_mapping = json.loads(mapping_content.decode('utf-8'))
+                logger.info(f"✅ Loaded filename mapping with {len(filename_mapping)} entries")
+            except Exception as e:
+                logger.warning(f"⚠️ No filename mapping found: {e}")
+            
+            offset = int(cursor) if cursor else 0
+            while True:
+                # List files in the bucket with prefix, one page at a time
+                with _proxy_env_cleared():
+                    file_list = _list_supabase_page(bucket, prefix, offset, page_size)
+                offset += len(file_list)
                 
                 documents = []
                 for file_obj in file_list:
@@ -230,78 +323,27 @@ class FolderSourceAdapter(SourceAdapter):
                     if storage_filename == '.filenames.json':
                         continue
                     
-                    file_path = f"{prefix}/{storage_filename}" if prefix else storage_filename
-                    
-                    # Get original filename from mapping, fallback to storage filename
-                    original_filename = filename_mapping.get(storage_filename, storage_filename)
-                    
                     # Check file extension
                     ext = storage_filename.split('.')[-1].lower() if '.' in storage_filename else ''
-                    if ext in [ft.lower().lstrip('.') for ft in file_types]:
-                        documents.append(DocumentInfo(
-                            source_path=file_path,  # Relative path in bucket (UUID filename)
-                            filename=original_filename,  # Original filename for display
-                            file_size=file_obj.get('metadata', {}).get('size'),
-                            mime_type=file_obj.get('metadata', {}).get('mimetype', self._guess_mime_type(f'.{ext}'))
-                        ))
-                        
-                        if len(documents) >= batch_size:
-                            break
+                    if ext not in file_types_lower:
+                        continue
+                    
+                    metadata = file_obj.get('metadata') or {}
+                    documents.append(DocumentInfo(
+                        source_path=f"{prefix}/{storage_filename}" if prefix else storage_filename,  # Relative path in bucket (UUID filename)
+                        filename=filename_mapping.get(storage_filename, storage_filename),  # Original filename for display
+                        file_size=metadata.get('size'),
+                        mime_type=metadata.get('mimetype', self._guess_mime_type(f'.{ext}'))
+                    ))
                 
-                return documents[:batch_size]
+                if len(file_list) < page_size:
+                    yield DiscoveryPage(documents, None)
+                    return
+                yield DiscoveryPage(documents, str(offset))
                 
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"❌ Failed to discover documents from Supabase Storage: {e}")
-                raise ValueError(f"Failed to discover documents from Supabase Storage: {e}")
-            finally:
-                # Restore proxy environment variables
-                for var, value in saved_proxies.items():
-                    os_module.environ[var] = value
-        
-        # Local folder path
-        if not os.path.exists(folder_path):
-            raise ValueError(f"Folder path does not exist: {folder_path}")
-        
-        documents = []
-        path = Path(folder_path)
-        
-        # Normalize file types to lowercase for case-insensitive matching
-        file_types_lower = [ext.lower() for ext in file_types]
-        
-        # Search for files - iterate through all files and check extension
-        # This is more reliable than pattern matching, especially for case sensitivity
-        if recursive:
-            for file_path in path.rglob("*"):
-                if file_path.is_file():
-                    # Get file extension (case-insensitive)
-                    ext = file_path.suffix.lower().lstrip('.')
-                    if ext in file_types_lower:
-                        documents.append(DocumentInfo(
-                            source_path=str(file_path),
-                            filename=file_path.name,
-                            file_size=file_path.stat().st_size,
-                            mime_type=self._guess_mime_type(file_path.suffix)
-                        ))
-                        if len(documents) >= batch_size:
-                            break
-        else:
-            for file_path in path.iterdir():
-                if file_path.is_file():
-                    # Get file extension (case-insensitive)
-                    ext = file_path.suffix.lower().lstrip('.')
-                    if ext in file_types_lower:
-                        documents.append(DocumentInfo(
-                            source_path=str(file_path),
-                            filename=file_path.name,
-                            file_size=file_path.stat().st_size,
-                            mime_type=self._guess_mime_type(file_path.suffix)
-                        ))
-                        if len(documents) >= batch_size:
-                            break
-        
-        return documents[:batch_size]
+        except Exception as e:
+            logger.error(f"❌ Failed to discover documents from Supabase Storage: {e}")
+            raise ValueError(f"Failed to discover documents from Supabase Storage: {e}")
     
     def get_document_content(self, source_path: str) -> bytes:
         """Read document from file system or Supabase Storage"""
@@ -499,7 +541,16 @@ class GoogleDriveSourceAdapter(SourceAdapter):
         config: Dict[str, Any],
         batch_size: int = 50
     ) -> List[DocumentInfo]:
-        """Discover documents from Google Drive"""
+        """Discover up to batch_size documents from Google Drive (first page of iter_document_pages)"""
+        return next(self.iter_document_pages(config, page_size=batch_size), DiscoveryPage([], None)).documents
+    
+    def iter_document_pages(
+        self,
+        config: Dict[str, Any],
+        cursor: Optional[str] = None,
+        page_size: int = 100
+    ) -> Iterator[DiscoveryPage]:
+        """Discover documents from Google Drive, page by page (cursor is the Drive pageToken)"""
         service = self._get_service(config)
         
         folder_id = config.get("folder_id")
@@ -507,8 +558,6 @@ class GoogleDriveSourceAdapter(SourceAdapter):
         recursive = config.get("recursive", True)
         shared_drive_id = config.get("shared_drive_id")
         
-        documents = []
-        
         # Build query
         query_parts = []
         
@@ -528,8 +577,8 @@ class GoogleDriveSourceAdapter(SourceAdapter):
         
         # Build request parameters
         params = {
-            'pageSize': min(batch_size, 1000),
-            'fields': 'files(id, name, mimeType, size, parents, createdTime, modifiedTime)',
+            'pageSize': min(page_size, 1000),
+            'fields': 'nextPageToken, files(id, name, mimeType, size, parents, createdTime, modifiedTime)',
             'q': query
         }
         
@@ -539,12 +588,19 @@ class GoogleDriveSourceAdapter(SourceAdapter):
             params['supportsAllDrives'] = True
             params['corpora'] = 'drive'
         
-        try:
-            # Execute request
-            results = service.files().list(**params).execute()
-            files = results.get('files', [])
+        page_token = cursor
+        while True:
+            if page_token:
+                params['pageToken'] = page_token
             
-            for file in files[:batch_size]:
+            try:
+                # Execute request
+                results = service.files().list(**params).execute()
+            except Exception as e:
+                raise RuntimeError(f"Failed to discover Google Drive documents: {e}")
+            
+            documents = []
+            for file in results.get('files', []):
                 documents.append(DocumentInfo(
                     source_path=file['id'],  # Store file ID as source_path
                     filename=file['name'],
@@ -561,10 +617,10 @@ class GoogleDriveSourceAdapter(SourceAdapter):
             # TODO: Implement recursive discovery if needed
             # This would require iterating through subfolders
             
-        except Exception as e:
-            raise RuntimeError(f"Failed to discover Google Drive documents: {e}")
-        
-        return documents
+            page_token = results.get('nextPageToken')
+            yield DiscoveryPage(documents, page_token)
+            if not page_token:
+                return
     
     def get_document_content(self, source_path: str, config: Optional[Dict[str, Any]] = None) -> bytes:
         """
@@ -709,7 +765,9 @@ class OneDriveSourceAdapter(SourceAdapter):
             'Content-Type': 'application/json'
         }
         
-        response = requests.get(f"https://graph.microsoft.com/v1.0{endpoint}", headers=headers)
+        # @odata.nextLink continuation URLs are absolute
+        url = endpoint if endpoint.startswith('https://') else f"{_GRAPH_API_URL}{endpoint}"
+        response = requests.get(url, headers=headers)
         response.raise_for_status()
         return response.json()
     
@@ -718,13 +776,21 @@ class OneDriveSourceAdapter(SourceAdapter):
         config: Dict[str, Any],
         batch_size: int = 50
     ) -> List[DocumentInfo]:
-        """Discover documents from OneDrive"""
+        """Discover up to batch_size documents from OneDrive (first page of iter_document_pages)"""
+        return next(self.iter_document_pages(config, page_size=batch_size), DiscoveryPage([], None)).documents
+    
+    def iter_document_pages(
+        self,
+        config: Dict[str, Any],
+        cursor: Optional[str] = None,
+        page_size: int = 100
+    ) -> Iterator[DiscoveryPage]:
+        """Discover documents from OneDrive, page by page (cursor is the Graph @odata.nextLink)"""
         folder_path = config.get("folder_path")
         file_types = config.get("file_types", [".pdf", ".jpg", ".jpeg", ".png"])
         drive_id = config.get("drive_id")
         site_id = config.get("site_id")
-        
-        documents = []
+        file_types_lower = [ft.lower() for ft in file_types]
         
         # Build endpoint
         if site_id and drive_id:
@@ -742,20 +808,24 @@ class OneDriveSourceAdapter(SourceAdapter):
             endpoint += f":/{folder_path.strip('/')}:"
         
         # List children
-        endpoint += "/children"
+        endpoint += f"/children?$top={min(page_size, 999)}"
         
-        try:
-            response = self._make_graph_request(endpoint, config)
-            items = response.get('value', [])
+        next_link = cursor or endpoint
+        while next_link:
+            try:
+                response = self._make_graph_request(next_link, config)
+            except Exception as e:
+                raise RuntimeError(f"Failed to discover OneDrive documents: {e}")
             
-            for item in items[:batch_size]:
+            documents = []
+            for item in response.get('value', []):
                 # Check if it's a file (not a folder)
                 if 'file' in item:
                     # Check file extension
                     name = item.get('name', '')
                     ext = '.' + name.split('.')[-1].lower() if '.' in name else ''
                     
-                    if ext in [ft.lower() for ft in file_types]:
+                    if ext in file_types_lower:
                         documents.append(DocumentInfo(
                             source_path=item['id'],  # Store item ID as source_path
                             filename=name,
@@ -770,12 +840,10 @@ class OneDriveSourceAdapter(SourceAdapter):
                             }
                         ))
             
-            # TODO: Implement recursive discovery and pagination if needed
+            # TODO: Implement recursive discovery if needed
             
-        except Exception as e:
-            raise RuntimeError(f"Failed to discover OneDrive documents: {e}")
-        
-        return documents
+            next_link = response.get('@odata.nextLink')
+            yield DiscoveryPage(documents, next_link)
     
     def get_document_content(self, source_path: str) -> bytes:
         """Retrieve document content from OneDrive"""
@@ -833,6 +901,61 @@ class OneDriveSourceAdapter(SourceAdapter):
             return False
 
 
+@contextmanager
+def _proxy_env_cleared():
+    """Remove proxy environment variables for the duration of a Supabase call"""
+    saved_proxies = {var: os.environ.pop(var) for var in _PROXY_ENV_VARS if var in os.environ}
+    try:
+        yield
+    finally:
+        os.environ.update(saved_proxies)
+
+
+def _list_supabase_page(bucket, prefix: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+    """One page of a Supabase Storage listing, in name order so offsets are stable"""
+    return bucket.list(prefix, {
+        "limit": limit,
+        "offset": offset,
+        "sortBy": {"column": "name", "order": "asc"}
+    }) or []
+
+
+def _walk_sorted(
+    root: str,
+    recursive: bool,
+    after: Optional[Tuple[str, ...]] = None
+) -> Iterator[Tuple[Tuple[str, ...], os.DirEntry]]:
+    """
+    Yield (relative path parts, entry) for files under root, in sorted path order
+    
+    Entries are sorted by name at every level, so the order matches comparing the
+    parts tuples - files up to and including `after` are skipped, and directories
+    that sort entirely before it are not listed at all.
+    """
+    def walk(dir_path: str, rel: Tuple[str, ...]):
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            logger.warning(f"⚠️ Cannot list {dir_path}: {e}")
+            return
+        
+        for entry in entries:
+            parts = rel + (entry.name,)
+            if entry.is_dir(follow_symlinks=False):  # Like rglob, don't descend into symlinked dirs
+                if not recursive:
+                    continue
+                if after is not None and parts < after[:len(parts)]:
+                    continue  # Whole subtree is before the cursor
+                yield from walk(entry.path, parts)
+            elif entry.is_file():
+                if after is not None and parts <= after:
+                    continue
+                yield parts, entry
+    
+    yield from walk(root, ())
+
+
 class SourceAdapterFactory:
     """Factory for creating source adapters"""
     
@@ -3,7 +3,9 @@ Celery Application Configuration
 """
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 from app.core.config import settings
+from app.workers.worker_resources import init_worker_resources, shutdown_worker_resources
 
 # Create Celery app
 celery_app = Celery(
@@ -44,6 +46,13 @@ celery_app.conf.update(
     },
 )
 
+# Process-scoped services, page thread pools and event loop (see worker_resources.py)
+# Prefork children build theirs after the fork; solo/threads pools create them lazily
+# in the main process and release them on worker_shutdown
+worker_process_init.connect(init_worker_resources, weak=False)
+worker_process_shutdown.connect(shutdown_worker_resources, weak=False)
+worker_shutdown.connect(shutdown_worker_resources, weak=False)
+
 # Optional: Configure periodic tasks (for continuous processing mode)
 celery_app.conf.beat_schedule = {
     # Database connection keep-alive (prevents 30-min session pooler timeout)
@@ -4,24 +4,35 @@ Discovers documents from various sources
 """
 
 from app.workers.celery_app import celery_app
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import logging
-import os
-from pathlib import Path
+import time
 from uuid import uuid4
 from datetime import datetime
+from app.core.config import settings
 from app.core.database import get_sync_db
 from app.models.database import BulkJob, BulkJobDocument
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# Columns written for each discovered document, in row order
+_DOCUMENT_COLUMNS = (
+    'id', 'job_id', 'source_path', 'filename', 'file_size', 'mime_type', 'status',
+)
+
 
 @celery_app.task(bind=True, name='app.workers.discovery.discover_documents')
 def discover_documents(self, job_id: str, source_config: Dict[str, Any]):
     """
     Discover documents from a source
     
+    The source is listed page by page (discovery_batch_size documents per page); each
+    page's documents are inserted and queued for processing as soon as it arrives. The
+    job keeps the continuation cursor of the last committed page, so a retried or
+    chained task resumes there instead of starting over.
+    
     Args:
         job_id: Bulk job ID
         source_config: Source configuration (type, path, etc.)
@@ -62,8 +73,9 @@ def discover_documents(self, job_id: str, source_config: Dict[str, Any]):
                 )
                 db.add(doc)
                 
-                # Update job total_documents
+                # Update job total_documents - nothing else to discover
                 job.total_documents = 1
+                job.discovery_completed_at = datetime.utcnow()
                 db.commit()
                 
                 document_id = str(doc.id)
@@ -77,29 +89,15 @@ def discover_documents(self, job_id: str, source_config: Dict[str, Any]):
             finally:
                 db.close()
         
-        # Handle folder-based discovery (Google Drive folder, local folder, etc.)
-        if provider in ['google_drive', 'onedrive']:
-            # Use appropriate source adapter
-            from app.services.source_adapter import SourceAdapterFactory
-            
-            adapter = SourceAdapterFactory.create(provider)
-            discovered_docs = adapter.discover_documents(source_config, batch_size=100)
-            
-            logger.info(f"📄 Found {len(discovered_docs)} documents from {provider}")
-            
-        else:
-            # Folder source (local or Supabase Storage)
-            # Use FolderSourceAdapter for both local and Supabase Storage
-            from app.services.source_adapter import SourceAdapterFactory
-            
-            adapter = SourceAdapterFactory.create('folder')
-            discovered_docs = adapter.discover_documents(source_config, batch_size=100)
-            
-            folder_path = source_config.get('path', '')
-            logger.info(f"📁 Scanned folder: {folder_path}")
-            logger.info(f"📄 Found {len(discovered_docs)} documents")
+        # Folder-based discovery (Google Drive / OneDrive folder, local folder, Supabase Storage):
+        # walk the source page by page, creating and queueing each page's documents as it arrives
+        from app.services.source_adapter import SourceAdapterFactory
+        from app.services.bulk_insert_service import copy_rows_sync
+        from app.workers.processing import enqueue_process_documents
+        
+        adapter_type = provider if provider in ['google_drive', 'onedrive'] else 'folder'
+        adapter = SourceAdapterFactory.create(adapter_type)
         
-        # Create database records for all discovered documents
         db = next(get_sync_db())
         try:
             # Get job
@@ -108,45 +106,67 @@ def discover_documents(self, job_id: str, source_config: Dict[str, Any]):
                 logger.error(f"❌ Job not found: {job_id}")
                 return []
             
-            # Create document records
-            document_ids = []
-            for doc_info in discovered_docs:
-                doc = BulkJobDocument(
-                    id=uuid4(),
-                    job_id=job_id,
-                    source_path=doc_info.source_path,
-                    filename=doc_info.filename,
-                    file_size=doc_info.file_size,
-                    status='pending'
-                )
-                db.add(doc)
-                document_ids.append(str(doc.id))
-                logger.info(f"  ✅ {doc_info.filename}")
+            if job.discovery_completed_at:
+                logger.info(f"✅ Discovery already complete for job {job_id}")
+                return []
             
-            # Update job total_documents
-            job.total_documents = len(document_ids)
-            db.commit()
+            page_size = (job.processing_config or {}).get('discovery_batch_size') or settings.DEFAULT_BATCH_SIZE
+            cursor = job.discovery_cursor
+            total_documents = job.total_documents or 0
+            if cursor:
+                logger.info(f"⏩ Resuming discovery for job {job_id} after {total_documents} documents")
             
-            logger.info(f"✅ Discovery complete for job {job_id}: {len(document_ids)} documents")
+            job_config = {**job_processing_config(job), 'source_config': source_config}
             
-            # Queue processing tasks for discovered documents
-            from app.workers.processing import process_document
+            # Hand the cursor to a fresh task before this one nears the task time limit
+            deadline = time.monotonic() + settings.DISCOVERY_TASK_MAX_SECONDS
+            document_ids = []
             
-            job_config = {
-                'source_config': source_config,
-                'processing_options': job.processing_options if job.processing_options else {},
-                'extraction_task': 'without_template_extraction'
-            }
+            for page in adapter.iter_document_pages(source_config, cursor=cursor, page_size=page_size):
+                # Stop if the job was paused or stopped meanwhile (resume_job picks the cursor up)
+                db.refresh(job)
+                if job.status not in ('pending', 'running'):
+                    logger.info(f"⏸️ Discovery for job {job_id} halted - job is {job.status}")
+                    return document_ids
+                
+                # One COPY per page instead of an ORM object per document; rows go in as
+                # 'pending' and only become 'queued' once their task is published, so a crash
+                # before publishing leaves them for start/resume to pick up
+                page_ids = [str(uuid4()) for _ in page.documents]
+                copy_rows_sync(db, 'bulk_job_documents', _DOCUMENT_COLUMNS, [
+                    (doc_id, job_id, doc_info.source_path, doc_info.filename,
+                     doc_info.file_size, doc_info.mime_type, 'pending')
+                    for doc_id, doc_info in zip(page_ids, page.documents)
+                ])
+                
+                # Documents and cursor are committed together - a retried task resumes after this page
+                total_documents += len(page_ids)
+                job.total_documents = total_documents
+                job.discovery_cursor = page.cursor
+                if page.cursor is None:
+                    job.discovery_completed_at = datetime.utcnow()
+                db.commit()
+                
+                # Queue processing tasks for this page's documents
+                failed_ids = enqueue_process_documents(page_ids, job_id, job_config)
+                failed = set(failed_ids)
+                _record_enqueued(db, job, [doc_id for doc_id in page_ids if doc_id not in failed])
+                
+                document_ids.extend(page_ids)
+                logger.info(
+                    f"📄 Discovered {len(page_ids)} documents ({total_documents} so far), "
+                    f"queued {len(page_ids) - len(failed_ids)} for processing"
+                )
+                
+                if page.cursor is not None and time.monotonic() > deadline:
+                    discover_documents.delay(job_id, source_config)
+                    logger.info(f"⏭️ Discovery for job {job_id} continues in a new task")
+                    return document_ids
             
-            queued_count = 0
-            for doc_id in document_ids:
-                try:
-                    process_document.delay(doc_id, job_id, job_config)
-                    queued_count += 1
-                except Exception as e:
-                    logger.error(f"   ❌ Failed to queue document {doc_id}: {e}")
+            logger.info(f"✅ Discovery complete for job {job_id}: {total_documents} documents")
             
-            logger.info(f"📤 Queued {queued_count}/{len(document_ids)} documents for processing")
+            # The last page may add nothing - finish the job if its documents are already done
+            _complete_job_if_finished(db, job)
             
             return document_ids
             
@@ -158,6 +178,86 @@ def discover_documents(self, job_id: str, source_config: Dict[str, Any]):
         raise self.retry(exc=exc, countdown=60, max_retries=3)
 
 
+def _record_enqueued(db: Session, job: BulkJob, queued_ids: List[str]) -> int:
+    """
+    Mark published documents queued and advance the job's queued_documents counter
+    
+    Only documents still 'pending' are marked (a worker may already have started one) and
+    the counter grows by the number actually marked. Returns that number.
+    """
+    if not queued_ids:
+        return 0
+    marked = db.query(BulkJobDocument).filter(
+        BulkJobDocument.id.in_(queued_ids),
+        BulkJobDocument.status == 'pending'
+    ).update({'status': 'queued', 'queued_at': datetime.utcnow()}, synchronize_session=False)
+    job.queued_documents = func.coalesce(BulkJob.queued_documents, 0) + marked
+    db.commit()
+    return marked
+
+
+def job_processing_config(job: BulkJob) -> Dict[str, Any]:
+    """process_document job_config for a job"""
+    return {
+        'source_config': job.source_config,
+        'processing_options': job.processing_options if job.processing_options else {},
+        'extraction_task': 'without_template_extraction'
+    }
+
+
+def queue_pending_documents(job_id: str) -> Tuple[int, int]:
+    """
+    Publish process_document tasks for every 'pending' document of a job
+    
+    Used by start_job (uploaded documents) and resume_job (documents that were inserted but
+    never published, e.g. discovery crashed or the job was paused in between). Each chunk
+    is published first and only then marked queued (_record_enqueued), so a crash leaves
+    the unpublished documents 'pending' for the next call.
+    
+    Returns:
+        (documents queued, pending documents found)
+    """
+    from app.workers.processing import enqueue_process_documents
+    
+    db = next(get_sync_db())
+    try:
+        job = db.query(BulkJob).filter(BulkJob.id == job_id).first()
+        if not job:
+            return 0, 0
+        
+        # Only the ids are needed - no ORM object per document
+        document_ids = [str(doc_id) for (doc_id,) in db.query(BulkJobDocument.id).filter(
+            BulkJobDocument.job_id == job_id,
+            BulkJobDocument.status == 'pending'
+        ).all()]
+        job_config = job_processing_config(job)
+        
+        queued = 0
+        for start in range(0, len(document_ids), settings.ENQUEUE_CHUNK_SIZE):
+            chunk = document_ids[start:start + settings.ENQUEUE_CHUNK_SIZE]
+            failed = set(enqueue_process_documents(chunk, job_id, job_config))
+            queued += _record_enqueued(db, job, [doc_id for doc_id in chunk if doc_id not in failed])
+        return queued, len(document_ids)
+    finally:
+        db.close()
+
+
+def _complete_job_if_finished(db: Session, job: BulkJob) -> None:
+    """Mark a running job completed once discovery is done and no document is left to process"""
+    if job.status != 'running' or job.discovery_cursor is not None:
+        return
+    
+    unfinished = db.query(BulkJobDocument.id).filter(
+        BulkJobDocument.job_id == job.id,
+        BulkJobDocument.status.notin_(['completed', 'failed', 'needs_review'])
+    ).first()
+    if unfinished is None:
+        job.status = 'completed'
+        job.completed_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"✅ Job {job.id} completed")
+
+
 @celery_app.task(name='app.workers.discovery.periodic_discovery')
 def periodic_discovery(job_id: str):
     """
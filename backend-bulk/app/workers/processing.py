@@ -4,18 +4,27 @@ Processes PDFs using Gemini Vision for OCR and structured data extraction
 """
 
 from app.workers.celery_app import celery_app
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Callable, Deque
 from uuid import UUID
 import logging
 import time
+from collections import deque
 from datetime import datetime
-import asyncio
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import math
+from concurrent.futures import Executor, Future, FIRST_COMPLETED, wait
 
 logger = logging.getLogger(__name__)
 
 
+# Columns written by insert_extracted_fields_batch, in row order
+_EXTRACTED_FIELD_COLUMNS = (
+    'document_id', 'job_id', 'field_name', 'field_label', 'field_type', 'field_value',
+    'field_group', 'confidence_score', 'page_number', 'field_order', 'extraction_method',
+    'tokens_used', 'processing_time_ms', 'model_version', 'validation_status',
+    'needs_manual_review', 'section_name', 'source_location', 'extraction_context',
+    'field_metadata',
+)
+
+
 def insert_extracted_fields_batch(
     db,
     document_id: str,
@@ -41,11 +50,13 @@ def insert_extracted_fields_batch(
         extraction_model: Model used for extraction
         extraction_task: Task type (e.g., 'without_template_extraction')
     
+    Rows are written with a single COPY (or batched INSERT, see WORKER_BULK_INSERT_METHOD)
+    on the session's connection instead of one ORM object per field.
+    
     Returns:
         Number of fields inserted
     """
-    from app.models.database import BulkExtractedField
-    import json
+    from app.services.bulk_insert_service import copy_rows_sync
     
     def flatten_data(data: Any, prefix: str = "", group: str = None) -> List[Dict[str, Any]]:
         """
@@ -202,7 +213,7 @@ def insert_extracted_fields_batch(
             })
             return fields
     
-    fields_inserted = 0
+    rows = []
     global_field_order = 0  # Track order across all pages for document-level ordering
 
     for page_result in page_results:
@@ -247,35 +258,34 @@ def insert_extracted_fields_batch(
                     context_str = str(field_value)[:200]
                     extraction_context = context_str if context_str else None
                 
-                extracted_field = BulkExtractedField(
-                    document_id=document_id,
-                    job_id=job_id,
-                    field_name=field.get('field_name', 'unknown'),
-                    field_label=field.get('field_label') or field.get('field_name', 'unknown'),
-                    field_type=field.get('field_type', 'text'),
-                    field_value=field_value,
-                    field_group=field.get('field_group'),
-                    confidence_score=confidence,
-                    page_number=page_num,
-                    field_order=global_field_order,  # Set explicit order
-                    extraction_method='gemini_vision',
-                    tokens_used=tokens_used,
-                    processing_time_ms=int(extraction_time_s * 1000),
-                    model_version=extraction_model,
-                    validation_status='pending',
-                    needs_manual_review=needs_review,
+                # Same column order as _EXTRACTED_FIELD_COLUMNS
+                rows.append((
+                    document_id,
+                    job_id,
+                    field.get('field_name', 'unknown'),
+                    field.get('field_label') or field.get('field_name', 'unknown'),
+                    field.get('field_type', 'text'),
+                    field_value,
+                    field.get('field_group'),
+                    confidence,
+                    page_num,
+                    global_field_order,  # Set explicit order
+                    'gemini_vision',
+                    tokens_used,
+                    int(extraction_time_s * 1000),
+                    extraction_model,
+                    'pending',
+                    needs_review,
                     # NEW: Transcript metadata
-                    section_name=section_name,
-                    source_location=source_location,
-                    extraction_context=extraction_context,
-                    field_metadata={
+                    section_name,
+                    source_location,
+                    extraction_context,
+                    {
                         'extraction_task': extraction_task,
                         'bounding_box': field.get('bounding_box'),
                         'ocr_text': field.get('ocr_text')
                     }
-                )
-                db.add(extracted_field)
-                fields_inserted += 1
+                ))
                 global_field_order += 1  # Increment order for next field
                 
             except Exception as field_error:
@@ -283,6 +293,7 @@ def insert_extracted_fields_batch(
                 continue
     
     try:
+        fields_inserted = copy_rows_sync(db, 'bulk_extracted_fields', _EXTRACTED_FIELD_COLUMNS, rows)
         db.commit()
         logger.info(f"   💾 Inserted {fields_inserted} fields into database (100% granular extraction)")
     except Exception as commit_error:
@@ -400,58 +411,543 @@ def process_single_page_with_retry(
     }
 
 
-def process_page_batch(
+def process_page_batch_with_retry(
     page_indices: List[int],
     page_images: List[str],
     prompt: str,
-    response_format: Dict,
-    extraction_mode: str,
+    response_format: Dict[str, Any],
+    extraction_task: str,
+    document_filename: str,
+    llm_client,
+    max_retries: int = 3,
+    retry_backoff_base: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Process several pages with one multi-page LLM call
+    
+    The response is split back into per-page results shaped like those of
+    process_single_page_with_retry. Pages the response leaves out - or the whole batch,
+    if the call keeps failing - are redone one at a time with process_single_page_with_retry.
+    
+    Args:
+        page_indices: Page numbers (0-indexed), in page order
+        page_images: Base64 encoded images, aligned with page_indices
+        prompt: Extraction prompt (the same for every page)
+        response_format: JSON schema for one page's response
+        extraction_task: Task type
+        document_filename: Document name for logging
+        llm_client: LLM client instance
+        max_retries: Maximum retry attempts
+        retry_backoff_base: Base seconds for exponential backoff
+    
+    Returns:
+        Page extraction result dictionaries, aligned with page_indices
+    """
+    from requests.exceptions import ReadTimeout, ConnectionError
+    
+    batch_start = time.time()
+    page_numbers = [page_idx + 1 for page_idx in page_indices]
+    page_label = f"pages {page_numbers[0]}-{page_numbers[-1]}"
+    batch_results = None
+    
+    for attempt in range(1, max_retries + 1):
+        try:
+            batch_results = llm_client.call_api_sync_pages(
+                prompt=prompt,
+                page_images=page_images,
+                page_numbers=page_numbers,
+                response_format=response_format,
+                task=extraction_task,
+                document_name=f"{document_filename} ({page_label})"
+            )
+            break
+        except Exception as error:
+            error_type = type(error).__name__
+            is_network_error = isinstance(error, (ReadTimeout, ConnectionError))
+            
+            if attempt < max_retries and (is_network_error or 'timeout' in str(error).lower() or 'connection' in str(error).lower()):
+                wait_time = retry_backoff_base * (2 ** (attempt - 1))
+                logger.warning(
+                    f"   ⚠️ {page_label.capitalize()}: {error_type} on attempt {attempt}/{max_retries}, "
+                    f"retrying in {wait_time}s..."
+                )
+                time.sleep(wait_time)
+            else:
+                logger.error(
+                    f"   ❌ {page_label.capitalize()}: {error_type} - {str(error)[:100]} - falling back to single pages"
+                )
+                break
+    
+    batch_time = time.time() - batch_start
+    results = []
+    batched_count = 0
+    batched_tokens = 0
+    
+    for position, page_idx in enumerate(page_indices):
+        page_result = batch_results[position] if batch_results else None
+        if page_result is None or 'error' in page_result:
+            # Not covered by the batched response - redo this page on its own
+            results.append(process_single_page_with_retry(
+                page_idx,
+                page_images[position],
+                prompt,
+                response_format,
+                extraction_task,
+                document_filename,
+                llm_client,
+                max_retries,
+                retry_backoff_base
+            ))
+            continue
+        
+        hierarchical_data = page_result.get('hierarchical_data', {})
+        fields = page_result.get('fields', [])
+        usage = page_result.get('usage', {})
+        tokens_used = usage.get('total_tokens', 0)
+        batched_count += 1
+        batched_tokens += tokens_used
+        
+        results.append({
+            'page_number': page_idx + 1,
+            'extraction_time_s': round(batch_time / len(page_indices), 2),
+            'tokens_used': tokens_used,
+            'fields_extracted': len(fields) if fields else len(hierarchical_data.keys()),
+            'hierarchical_data': hierarchical_data,
+            'fields': fields,
+            'usage': usage,
+            'finish_reason': page_result.get('finish_reason'),
+            'batched_pages': len(page_indices)
+        })
+    
+    if batched_count:
+        logger.info(
+            f"   ✅ {page_label.capitalize()}: {batched_count}/{len(page_indices)} pages from one call, "
+            f"{batched_tokens} tokens, {batch_time:.2f}s"
+        )
+    
+    return results
+
+
+def run_page_pipeline(
+    page_indices: List[int],
+    render_page: Callable[[int], Optional[str]],
+    get_page_prompt: Callable[[int], Tuple[str, Dict[str, Any]]],
+    extraction_task: str,
     document_filename: str,
     llm_client,
     max_retries: int,
-    retry_backoff_base: int
+    retry_backoff_base: int,
+    parallel_workers: int,
+    render_executor: Executor,
+    llm_executor: Executor,
+    window: int,
+    checkpoint_interval: int,
+    on_checkpoint: Callable[[List[Dict[str, Any]]], None],
+    pages_per_call: int = 1,
+    call_token_budget: int = 0
 ) -> List[Dict[str, Any]]:
     """
-    Process a batch of pages sequentially in a single thread.
+    Render, extract and persist pages in a rolling window.
     
-    This function is designed to be called by ThreadPoolExecutor where each thread
-    processes multiple pages sequentially rather than one page per thread.
+    A page takes a window slot when its render is submitted and frees it when its
+    extraction result is back, so at most `window` encoded images exist at once
+    (instead of the whole document) and upcoming pages render while earlier pages
+    wait on the LLM.
+    
+    The executors are the worker process's persistent pools (see worker_resources.py)
+    and may be larger than this document's share; at most parallel_workers of its
+    extractions run at once, further rendered pages wait in the window.
+    
+    With pages_per_call > 1, rendered pages are packed into multi-page LLM calls
+    (process_page_batch_with_retry): up to pages_per_call pages, and no more than
+    call_token_budget estimated tokens (estimate_page_tokens), per call. A call waits for
+    more pages while renders are still running, so it is only sent short when the budget
+    is reached or nothing else is coming. Every page of a call gets the prompt of the
+    call's first page, so get_page_prompt must not depend on the page in this mode.
     
     Args:
-        page_indices: List of page indices to process in this batch
-        page_images: Full list of all page images (base64)
-        prompt: Extraction prompt
-        response_format: Response schema
-        extraction_mode: 'normal' or 'bank_statement'
+        page_indices: Pages to process (0-indexed), rendered in this order
+        render_page: Renders one page to a base64 data URL (None on failure)
+        get_page_prompt: Returns (prompt, response_format) for a page
+        extraction_task: Task type
         document_filename: Document name for logging
         llm_client: LLM client instance
         max_retries: Retry attempts per page
         retry_backoff_base: Base backoff time in seconds
+        parallel_workers: Concurrent LLM calls
+        render_executor: Pool that renders pages
+        llm_executor: Pool that runs extractions
+        window: Maximum pages rendered but not yet extracted
+        checkpoint_interval: Finished pages per on_checkpoint call
+        on_checkpoint: Persists finished page results (sorted by page); called on the
+                       calling thread, so it may use the worker's database session
+        pages_per_call: Maximum pages per LLM call (1 = one call per page)
+        call_token_budget: Maximum estimated tokens per multi-page call (0 = no limit)
     
     Returns:
-        List of results (one per page in batch)
+        List of results (one per page, in page order)
+    """
+    from app.services.llm_client import estimate_page_tokens
+    
+    results: Dict[int, Dict[str, Any]] = {}
+    unsaved: List[Dict[str, Any]] = []
+    pending: Dict[Future, Tuple[str, Tuple[int, ...]]] = {}
+    rendered: Deque[Tuple[int, str, int]] = deque()  # (page, image, estimated tokens) waiting for an extraction slot
+    next_position = 0
+    in_window = 0
+    rendering = 0
+    extracting = 0
+    pages_per_call = max(1, pages_per_call)
+    window = max(1, window, 2 * pages_per_call if pages_per_call > 1 else 1)  # Room to fill a call while the last one extracts
+    parallel_workers = max(1, parallel_workers)
+    
+    try:
+        while next_position < len(page_indices) or pending or rendered:
+            # Top up the window with renders of the next pages
+            while next_position < len(page_indices) and in_window < window:
+                page_idx = page_indices[next_position]
+                pending[render_executor.submit(render_page, page_idx)] = ("render", (page_idx,))
+                next_position += 1
+                in_window += 1
+                rendering += 1
+            
+            # Hand rendered pages to the extraction pool, parallel_workers calls at a time
+            while rendered and extracting < parallel_workers:
+                batch = [rendered.popleft()]
+                batch_tokens = batch[0][2]
+                call_full = len(batch) >= pages_per_call
+                while rendered and not call_full:
+                    if call_token_budget and batch_tokens + rendered[0][2] > call_token_budget:
+                        call_full = True
+                        break
+                    batch.append(rendered.popleft())
+                    batch_tokens += batch[-1][2]
+                    call_full = len(batch) >= pages_per_call
+                
+                if not call_full and rendering:
+                    # Wait for the pages still rendering to fill this call
+                    rendered.extendleft(reversed(batch))
+                    break
+                
+                batch.sort(key=lambda item: item[0])
+                batch_pages = tuple(page_idx for page_idx, _, _ in batch)
+                prompt, response_format = get_page_prompt(batch_pages[0])
+                if len(batch) == 1:
+                    extract_future = llm_executor.submit(
+                        process_single_page_with_retry,
+                        batch_pages[0],
+                        batch[0][1],
+                        prompt,
+                        response_format,
+                        extraction_task,
+                        document_filename,
+                        llm_client,
+                        max_retries,
+                        retry_backoff_base
+                    )
+                else:
+                    extract_future = llm_executor.submit(
+                        process_page_batch_with_retry,
+                        list(batch_pages),
+                        [page_image for _, page_image, _ in batch],
+                        prompt,
+                        response_format,
+                        extraction_task,
+                        document_filename,
+                        llm_client,
+                        max_retries,
+                        retry_backoff_base
+                    )
+                pending[extract_future] = ("extract", batch_pages)
+                extracting += 1
+                del batch  # The pool's work item holds the only reference to the images now
+            
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, batch_pages = pending.pop(future)
+                
+                if stage == "render":
+                    rendering -= 1
+                    page_idx = batch_pages[0]
+                    try:
+                        page_image = future.result()
+                    except Exception as exc:
+                        logger.error(f"   ❌ Page {page_idx + 1} render exception: {exc}")
+                        page_image = None
+                    
+                    if page_image is not None:
+                        page_tokens = estimate_page_tokens(page_image) if pages_per_call > 1 else 0
+                        rendered.append((page_idx, page_image, page_tokens))
+                        if len(rendered) > 1 and rendered[-2][0] > page_idx:
+                            # Renders finish out of order - keep calls to runs of neighbouring pages
+                            rendered = deque(sorted(rendered, key=lambda item: item[0]))
+                        del page_image
+                        continue
+                    
+                    page_results = [{
+                        'page_number': page_idx + 1,
+                        'error': f"Failed to render page {page_idx + 1}",
+                        'error_type': 'RenderError'
+                    }]
+                else:
+                    extracting -= 1
+                    try:
+                        page_results = future.result()
+                        if isinstance(page_results, dict):
+                            page_results = [page_results]
+                    except Exception as exc:
+                        logger.error(f"   ❌ Pages {[page_idx + 1 for page_idx in batch_pages]} exception: {exc}")
+                        page_results = [
+                            {
+                                'page_number': page_idx + 1,
+                                'error': str(exc),
+                                'error_type': type(exc).__name__
+                            }
+                            for page_idx in batch_pages
+                        ]
+                
+                for page_idx, result in zip(batch_pages, page_results):
+                    in_window -= 1
+                    results[page_idx] = result
+                    unsaved.append(result)
+            
+            # CHECKPOINT: persist finished pages
+            all_finished = not pending and not rendered and next_position >= len(page_indices)
+            if unsaved and (len(unsaved) >= checkpoint_interval or all_finished):
+                on_checkpoint(sorted(unsaved, key=lambda r: r['page_number']))
+                unsaved = []
+    finally:
+        # The pools outlive this document - drop its queued work if it is bailing out
+        for future in pending:
+            future.cancel()
+    
+    return [results[page_idx] for page_idx in page_indices if page_idx in results]
+
+
+def _load_document_content(document, job_config: Dict[str, Any]) -> bytes:
+    """Fetch a document's bytes from its source (folder, Supabase Storage or cloud drive)"""
+    from app.services.source_adapter import get_source_adapter
+    
+    source_config = job_config.get('source_config', {})
+    provider = source_config.get('provider', 'folder')  # Default to folder
+    
+    # Use appropriate adapter based on source type
+    source_adapter = get_source_adapter(provider if provider else 'folder')
+    
+    # Pass config for cloud sources that need initialization
+    if provider in ['google_drive', 'onedrive']:
+        pdf_bytes = source_adapter.get_document_content(document.source_path, source_config)
+    else:
+        pdf_bytes = source_adapter.get_document_content(document.source_path)
+    
+    if not pdf_bytes:
+        raise ValueError(f"Failed to load document from {document.source_path}")
+    
+    return pdf_bytes
+
+
+def _staging_path(document_id: str) -> str:
+    import os
+    import tempfile
+    from app.core.config import settings
+    
+    directory = settings.PAGE_TASK_STAGING_DIR or os.path.join(tempfile.gettempdir(), "page_range_staging")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{document_id}.pdf")
+
+
+def _stage_document_content(document_id: str, pdf_bytes: bytes) -> Optional[str]:
+    """
+    Write a split document's bytes where its page-range tasks can read them
+    
+    Returns the staged path, or None if staging failed (range tasks then load the
+    document from its source themselves).
+    """
+    import os
+    import tempfile
+    
+    try:
+        path = _staging_path(document_id)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+        return path
+    except OSError as e:
+        logger.warning(f"⚠️ Could not stage document {document_id} for page-range tasks: {e}")
+        return None
+
+
+def _load_staged_content(staged_path: Optional[str], document, job_config: Dict[str, Any]) -> bytes:
+    """Read a staged document, falling back to its source (e.g. staged on another host)"""
+    if staged_path:
+        try:
+            with open(staged_path, "rb") as f:
+                return f.read()
+        except OSError as e:
+            logger.warning(f"⚠️ Staged copy {staged_path} unavailable, loading from source: {e}")
+    return _load_document_content(document, job_config)
+
+
+def _discard_staged_content(document_id: str) -> None:
+    import os
+    
+    try:
+        os.unlink(_staging_path(document_id))
+    except OSError:
+        pass
+
+
+def _finalize_document(
+    db,
+    document,
+    job_id: str,
+    extraction_task: str,
+    extracted_pages: List[Dict[str, Any]],
+    page_count: int,
+    total_fields_inserted: int,
+    total_time: float,
+    token_usage: Dict[str, Any]
+) -> None:
+    """
+    Generate the transcript, set the final document status and advance job progress
+    
+    Shared by process_document and finalize_page_ranges once every page has a result.
+    
+    Args:
+        db: Database session
+        document: BulkJobDocument being finished
+        job_id: Bulk job ID
+        extraction_task: Task type
+        extracted_pages: Page results (successful or with 'error'), in page order
+        page_count: Pages in the document
+        total_fields_inserted: Fields saved to bulk_extracted_fields
+        total_time: Processing time in seconds
+        token_usage: Caller-specific summary entries (timing, processing_mode, ...)
     """
-    batch_results = []
-    
-    logger.info(f"   🔄 Processing batch: pages {[idx+1 for idx in page_indices]}")
-    
-    for page_idx in page_indices:
-        logger.info(f"   ⏳ Starting page {page_idx + 1}...")
-        result = process_single_page_with_retry(
-            page_num=page_idx,
-            page_image=page_images[page_idx],
-            prompt=prompt,
-            response_format=response_format,
-            extraction_task=extraction_mode,
-            document_filename=document_filename,
-            llm_client=llm_client,
-            max_retries=max_retries,
-            retry_backoff_base=retry_backoff_base
+    from app.models.database import BulkJob, BulkJobDocument
+    from sqlalchemy import func
+    
+    successful_pages = sum(1 for page in extracted_pages if 'error' not in page)
+    failed_pages = [page['page_number'] for page in extracted_pages if 'error' in page]
+    total_tokens_used = sum(page.get('tokens_used', 0) for page in extracted_pages if 'error' not in page)
+    
+    # Step 4.5: Generate transcript for template-based mapping
+    document.processing_stage = 'Generating searchable transcript...'
+    db.commit()
+    
+    logger.info(f"[4.5/5] 📝 Generating searchable transcript...")
+    transcript_start = time.time()
+    
+    try:
+        from app.services.transcript_service import TranscriptService
+        from app.models.database import BulkDocumentTranscript
+        
+        transcript_service = TranscriptService()
+        transcript_data = transcript_service.generate_transcript(
+            extracted_pages=extracted_pages,
+            document_name=document.filename
+        )
+        
+        # Save transcript to database
+        transcript_record = BulkDocumentTranscript(
+            document_id=document.id,
+            job_id=UUID(job_id),
+            full_transcript=transcript_data['full_transcript'],
+            page_transcripts=transcript_data['page_transcripts'],
+            section_index=transcript_data['section_index'],
+            field_locations=transcript_data['field_locations'],
+            total_pages=transcript_data['total_pages'],
+            total_sections=transcript_data['total_sections'],
+            generation_time_ms=transcript_data['generation_time_ms']
+        )
+        
+        db.add(transcript_record)
+        db.commit()
+        
+        transcript_time = time.time() - transcript_start
+        logger.info(
+            f"[4.5/5] ✅ Transcript generated in {transcript_time:.2f}s "
+            f"({transcript_data['total_sections']} sections, {len(transcript_data['field_locations'])} fields)"
         )
-        batch_results.append(result)
-        logger.info(f"   ✅ Completed page {page_idx + 1}")
+        
+    except Exception as transcript_error:
+        logger.warning(f"⚠️ Transcript generation failed (non-critical): {transcript_error}")
+        db.rollback()
+        # Continue processing even if transcript fails
+    
+    # Step 5: Update document status and metadata
+    document.processing_stage = 'Saving results...'
+    db.commit()
+    
+    # Store summary in token_usage field (for backward compatibility)
+    document.token_usage = {
+        'extraction_task': extraction_task,
+        'page_count': page_count,
+        'pages_extracted': successful_pages,
+        'pages_failed': len(failed_pages),
+        'failed_page_numbers': failed_pages,
+        'total_tokens_used': total_tokens_used,
+        'total_fields_extracted': total_fields_inserted,
+        **token_usage
+    }
+    
+    # Determine final status
+    if failed_pages and successful_pages == 0:
+        document.status = 'failed'
+        document.error_message = f"All {len(failed_pages)} pages failed to process"
+    elif failed_pages:
+        document.status = 'needs_review'
+        document.error_message = f"{len(failed_pages)} pages failed: {failed_pages[:5]}"
+        
+        # Add to review queue
+        from app.models.database import BulkManualReviewQueue
+        review_item = BulkManualReviewQueue(
+            document_id=document.id,
+            job_id=job_id,
+            reason=f"Partial processing failure: {len(failed_pages)}/{page_count} pages failed",
+            error_message=document.error_message,
+            error_type="Partial Processing Failure",
+            priority=2,  # Medium-high priority
+            status="pending"
+        )
+        db.add(review_item)
+        logger.info(f"📋 Added document to review queue: {len(failed_pages)} pages failed")
+    else:
+        document.status = 'completed'
+    
+    document.processing_completed_at = datetime.utcnow()
+    document.extraction_time_seconds = total_time
+    document.total_fields_extracted = total_fields_inserted
+    document.total_tokens_used = total_tokens_used
+    document.pages_processed = len(extracted_pages)
     
-    return batch_results
+    db.commit()
+    
+    # Update job progress
+    job = db.query(BulkJob).filter(BulkJob.id == job_id).first()
+    if job:
+        job.processed_documents = (job.processed_documents or 0) + 1
+        if document.status == 'failed':
+            job.failed_documents = (job.failed_documents or 0) + 1
+        
+        # Check if all documents are processed
+        total_docs = db.query(func.count(BulkJobDocument.id)).filter(
+            BulkJobDocument.job_id == job_id
+        ).scalar()
+        
+        completed_docs = db.query(func.count(BulkJobDocument.id)).filter(
+            BulkJobDocument.job_id == job_id,
+            BulkJobDocument.status.in_(['completed', 'failed', 'needs_review'])
+        ).scalar()
+        
+        # Update job status if all documents are done (and discovery has found them all)
+        if completed_docs == total_docs and job.status == 'running' and job.discovery_cursor is None:
+            job.status = 'completed'
+            job.completed_at = datetime.utcnow()
+            logger.info(f"✅ Job {job_id} completed! {completed_docs}/{total_docs} documents processed")
+        
+        db.commit()
 
 
 @celery_app.task(bind=True, name='app.workers.processing.process_document', max_retries=3)
@@ -461,11 +957,14 @@ def process_document(self, document_id: str, job_id: str, job_config: Dict[str,
     
     Workflow:
     1. Load PDF from file
-    2. Convert PDF pages to images (parallel)
-    3. Process all pages in PARALLEL batches (10 pages at a time)
-    4. Insert extracted fields into bulk_extracted_fields table (every 10 pages)
+    2. Stream pages through a rolling window: render just ahead of extraction
+    3. Extract pages with PARALLEL LLM calls (optionally several pages per call) while the next pages render
+    4. Insert extracted fields into bulk_extracted_fields table (every checkpoint_interval pages)
     5. Update document status
     
+    Documents with at least PAGE_TASK_MIN_PAGES pages are instead split into
+    process_page_range tasks after step 2; finalize_page_ranges does step 5.
+    
     Args:
         document_id: Document ID
         job_id: Bulk job ID
@@ -482,15 +981,13 @@ def process_document(self, document_id: str, job_id: str, job_config: Dict[str,
         from app.core.database import get_sync_db
         from app.core.config import settings
         from app.models.database import BulkJobDocument
-        from app.services.source_adapter import get_source_adapter
-        from app.services.pdf_processor import PDFProcessor
-        from app.services.llm_client import LLMClient
-        from app.services.prompt_service import PromptService
+        from app.workers.worker_resources import get_worker_resources
         
-        # Initialize services
-        pdf_processor = PDFProcessor()
-        llm_client = LLMClient()
-        prompt_service = PromptService()
+        # Services and page pools shared by every document this worker process handles
+        resources = get_worker_resources()
+        pdf_processor = resources.pdf_processor
+        llm_client = resources.llm_client
+        prompt_service = resources.prompt_service
         
         # Get extraction task from job config
         extraction_task = job_config.get('extraction_task', 'without_template_extraction')
@@ -506,20 +1003,17 @@ def process_document(self, document_id: str, job_id: str, job_config: Dict[str,
         
         # Get configuration - use job-specific config if available, otherwise fall back to settings
         parallel_workers = processing_options.get('parallel_workers', settings.PARALLEL_PAGE_WORKERS)
-        pages_per_thread = processing_options.get('pages_per_thread', getattr(settings, 'PAGES_PER_THREAD', 5))
         checkpoint_interval = processing_options.get('checkpoint_interval', settings.PROGRESS_CHECKPOINT_INTERVAL)
         max_retries = processing_options.get('max_retries', settings.MAX_RETRIES_PER_PAGE)
         retry_backoff = processing_options.get('retry_delay', settings.RETRY_BACKOFF_BASE)
+        pages_per_call = processing_options.get('pages_per_call') or settings.LLM_PAGES_PER_CALL
+        call_token_budget = processing_options.get('call_token_budget', settings.LLM_CALL_TOKEN_BUDGET)
         
         logger.info(
-            f"📊 Processing Config: workers={parallel_workers}, pages/thread={pages_per_thread}, "
-            f"checkpoint={checkpoint_interval}, retries={max_retries}"
+            f"📊 Processing Config: workers={parallel_workers}, "
+            f"checkpoint={checkpoint_interval}, retries={max_retries}, pages/call={pages_per_call}"
         )
         
-        # OPTIMIZATION: Calculate optimal thread distribution
-        # Example: 50 pages with 10 threads = each thread processes 5 pages
-        # Example: 25 pages with 10 threads = each thread processes 2-3 pages
-        
         # Get database session
         db = next(get_sync_db())
         
@@ -541,59 +1035,54 @@ def process_document(self, document_id: str, job_id: str, job_config: Dict[str,
             logger.info(f"[1/5] Document loaded: {document.filename}")
             
             # Step 2: Load document content from source
-            source_config = job_config.get('source_config', {})
-            provider = source_config.get('provider', 'folder')  # Default to folder
-            
-            # Use appropriate adapter based on source type
-            source_adapter = get_source_adapter(provider if provider else 'folder')
-            
-            # Pass config for cloud sources that need initialization
-            if provider in ['google_drive', 'onedrive']:
-                pdf_bytes = source_adapter.get_document_content(document.source_path, source_config)
-            else:
-                pdf_bytes = source_adapter.get_document_content(document.source_path)
-            
-            if not pdf_bytes:
-                raise ValueError(f"Failed to load document from {document.source_path}")
+            pdf_bytes = _load_document_content(document, job_config)
             
-            # Convert to base64 for PDFProcessor
-            import base64
-            pdf_base64 = base64.b64encode(pdf_bytes).decode('utf-8')
-            pdf_data_url = f"data:application/pdf;base64,{pdf_base64}"
+            # Wrap raw bytes in a document handle - no base64 round trip, hashed once
+            pdf_handle = pdf_processor.open_document_handle(pdf_bytes)
             
             load_time = time.time() - start_time
             logger.info(f"[2/5] ✅ PDF loaded ({len(pdf_bytes)} bytes) in {load_time:.2f}s")
             
-            # Step 3: Convert PDF to images
-            page_count = pdf_processor.get_pdf_page_count(pdf_data_url)
-            
-            # Update stage - Converting to images
-            document.processing_stage = f'Converting {page_count} pages to images...'
-            document.total_pages = page_count
-            db.commit()
-            
-            logger.info(f"[3/5] Converting PDF ({page_count} pages) to images for Vision API...")
-            
-            convert_start = time.time()
+            # Step 3: Plan the page pipeline - pages are rendered just ahead of extraction
+            # in Step 4 instead of converting the whole document up front
+            page_count = pdf_processor.get_pdf_page_count(pdf_handle)
             
-            # Use async function in sync context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                page_images = loop.run_until_complete(
-                    pdf_processor.convert_pdf_to_images(pdf_data_url)
+            # Page-range mode: large documents fan out as page-range tasks across the cluster.
+            # Bank statements stay in this task - their header carryover is sequential.
+            page_task_min_pages = processing_options.get('page_task_min_pages', settings.PAGE_TASK_MIN_PAGES)
+            if page_task_min_pages and page_count >= page_task_min_pages and not is_bank_statement:
+                pdf_processor.clear_pdf_cache()
+                return _dispatch_page_ranges(
+                    db,
+                    document,
+                    job_id,
+                    job_config,
+                    pdf_bytes,
+                    page_count,
+                    processing_options.get('page_task_range_size') or settings.PAGE_TASK_RANGE_SIZE
                 )
-            finally:
-                loop.close()
             
-            convert_time = time.time() - convert_start
-            logger.info(f"[3/5] ✅ Converted {len(page_images)} pages to images in {convert_time:.2f}s")
+            render_workers = settings.PDF_PROCESSING_MAX_THREADS
+            page_window = processing_options.get('page_window') or settings.PAGE_PIPELINE_WINDOW or 2 * parallel_workers
             
-            # Update stage - Extracting data
-            document.processing_stage = f'Extracting data from {len(page_images)} pages...'
+            document.processing_stage = f'Extracting data from {page_count} pages...'
+            document.total_pages = page_count
             document.pages_processed = 0
             db.commit()
             
+            logger.info(
+                f"[3/5] Streaming {page_count} pages: {render_workers} render threads, "
+                f"window of {page_window} pages"
+            )
+            
+            render_times: List[float] = []  # Per-page render seconds (list.append is thread-safe)
+            
+            def render_page(page_idx: int) -> Optional[str]:
+                render_start = time.time()
+                page_image = pdf_processor.render_page_image(pdf_handle, page_idx)
+                render_times.append(time.time() - render_start)
+                return page_image
+            
             # Step 4: Extract data from pages using PARALLEL processing
             logger.info(
                 f"[4/5] Extracting data using Gemini Vision ({extraction_task}) - "
@@ -607,316 +1096,192 @@ def process_document(self, document_id: str, job_id: str, job_config: Dict[str,
             successful_pages = 0
             failed_pages = []
             
-            # For bank statements, we need special sequential processing for header carryover
-            bank_statement_headers = []  # Table headers from first page with table
-            
-            if is_bank_statement:
-                # ==========================================
-                # BANK STATEMENT MODE - Smart Header Detection
-                # ==========================================
-                # Don't assume page 1 has headers - some banks put headers on page 2+
-                # Process pages sequentially until we find headers, then parallel for rest
-                logger.info("   📊 Bank Statement mode: Smart header detection enabled")
+            def persist_pages(page_results: List[Dict[str, Any]]):
+                """Count finished pages and save their fields (runs on this thread - owns db)"""
+                nonlocal total_tokens_used, total_fields_inserted, successful_pages
                 
-                headers_found = False
-                pages_processed_for_headers = 0
-                max_pages_to_check_for_headers = min(3, len(page_images))  # Check up to first 3 pages
+                for result in page_results:
+                    extracted_pages.append(result)
+                    if 'error' not in result:
+                        successful_pages += 1
+                        total_tokens_used += result.get('tokens_used', 0)
+                    else:
+                        failed_pages.append(result['page_number'])
                 
-                # Process pages until we find table headers
-                for page_idx in range(max_pages_to_check_for_headers):
-                    if headers_found:
-                        break
+                try:
+                    fields_inserted = insert_extracted_fields_batch(
+                        db=db,
+                        document_id=document_id,
+                        job_id=job_id,
+                        page_results=page_results,
+                        extraction_model=llm_client.extraction_model,
+                        extraction_task=extraction_task
+                    )
+                    total_fields_inserted += fields_inserted
                     
-                    page_image = page_images[page_idx]
-                    logger.info(f"   📄 Processing page {page_idx + 1} to detect table headers...")
+                    # Update document progress
+                    document.total_fields_extracted = total_fields_inserted
+                    document.pages_processed = len(extracted_pages)
+                    document.processing_stage = f'Extracting page {len(extracted_pages)}/{page_count}...'
+                    db.commit()
                     
-                    # Use first-page prompt (which asks LLM to detect and report headers)
-                    prompt, response_format = prompt_service.get_task_prompt(
-                        task=extraction_task,
-                        templates=templates,
-                        content_type="image",
-                        document_type=document_type,
-                        context={
-                            "is_first_page": True,  # Always use header-detection prompt
-                            "table_headers": [],
-                            "page_number": page_idx + 1
-                        }
+                    logger.info(
+                        f"   ✅ Checkpoint: {len(extracted_pages)}/{page_count} pages processed, "
+                        f"{total_fields_inserted} fields saved"
                     )
+                except Exception as checkpoint_error:
+                    logger.error(f"   ⚠️ Checkpoint failed: {checkpoint_error}")
+                    # Continue processing even if checkpoint fails
+            
+            # For bank statements, we need special sequential processing for header carryover
+            bank_statement_headers = []  # Table headers from first page with table
+            
+            # Keep the document open (and out of cache eviction) for all page renders
+            with pdf_processor.pin_document(pdf_handle):
+                if is_bank_statement:
+                    # ==========================================
+                    # BANK STATEMENT MODE - Smart Header Detection
+                    # ==========================================
+                    # Don't assume page 1 has headers - some banks put headers on page 2+
+                    # Process pages sequentially until we find headers, then stream the rest
+                    logger.info("   📊 Bank Statement mode: Smart header detection enabled")
                     
-                    result = process_single_page_with_retry(
-                        page_idx,
-                        page_image,
-                        prompt,
-                        response_format,
-                        extraction_task,
-                        document.filename,
-                        llm_client,
-                        max_retries,
-                        retry_backoff
-                    )
+                    headers_found = False
+                    pages_processed_for_headers = 0
+                    max_pages_to_check_for_headers = min(3, page_count)  # Check up to first 3 pages
                     
-                    extracted_pages.append(result)
-                    pages_processed_for_headers += 1
-                    
-                    if 'error' not in result:
-                        successful_pages += 1
-                        total_tokens_used += result.get('tokens_used', 0)
+                    # Process pages until we find table headers
+                    for page_idx in range(max_pages_to_check_for_headers):
+                        if headers_found:
+                            break
                         
-                        # Try to extract headers from this page
-                        hierarchical_data = result.get('hierarchical_data', {})
-                        if hierarchical_data and isinstance(hierarchical_data, dict):
-                            # Check for explicit _table_headers
-                            found_headers = hierarchical_data.get('_table_headers', [])
-                            if found_headers:
-                                bank_statement_headers = found_headers
-                                headers_found = True
-                                logger.info(f"   📋 Found table headers on page {page_idx + 1}: {bank_statement_headers}")
-                            else:
-                                # Try to infer from transactions
-                                transactions = hierarchical_data.get('transactions', [])
-                                if transactions and isinstance(transactions, list) and len(transactions) > 0:
-                                    first_row = transactions[0]
-                                    if isinstance(first_row, dict) and len(first_row.keys()) > 2:
-                                        bank_statement_headers = list(first_row.keys())
-                                        headers_found = True
-                                        logger.info(f"   📋 Inferred headers from transactions on page {page_idx + 1}: {bank_statement_headers}")
-                    else:
-                        failed_pages.append(page_idx + 1)
-                    
-                    # Save this page's results
-                    try:
-                        fields_inserted = insert_extracted_fields_batch(
-                            db=db,
-                            document_id=document_id,
-                            job_id=job_id,
-                            page_results=[result],
-                            extraction_model=llm_client.extraction_model,
-                            extraction_task=extraction_task
+                        logger.info(f"   📄 Processing page {page_idx + 1} to detect table headers...")
+                        page_image = render_page(page_idx)
+                        pages_processed_for_headers += 1
+                        
+                        if page_image is None:
+                            persist_pages([{
+                                'page_number': page_idx + 1,
+                                'error': f"Failed to render page {page_idx + 1}",
+                                'error_type': 'RenderError'
+                            }])
+                            continue
+                        
+                        # Use first-page prompt (which asks LLM to detect and report headers)
+                        prompt, response_format = prompt_service.get_task_prompt(
+                            task=extraction_task,
+                            templates=templates,
+                            content_type="image",
+                            document_type=document_type,
+                            context={
+                                "is_first_page": True,  # Always use header-detection prompt
+                                "table_headers": [],
+                                "page_number": page_idx + 1
+                            }
                         )
-                        total_fields_inserted += fields_inserted
-                        document.total_fields_extracted = total_fields_inserted
-                        document.pages_processed = pages_processed_for_headers
-                        document.processing_stage = f'Extracting page {pages_processed_for_headers}/{len(page_images)}...'
-                        db.commit()
-                        logger.info(f"   ✅ Page {page_idx + 1}: {fields_inserted} fields saved")
-                    except Exception as e:
-                        logger.error(f"   ⚠️ Error saving page {page_idx + 1}: {e}")
-                
-                if not headers_found:
-                    logger.warning("   ⚠️ No table headers found in first 3 pages, will let LLM detect per page")
-                
-                # Step 2: Process remaining pages
-                remaining_start_idx = pages_processed_for_headers
-                if remaining_start_idx < len(page_images):
-                    remaining_images = page_images[remaining_start_idx:]
-                    logger.info(f"   🚀 Processing pages {remaining_start_idx + 1}-{len(page_images)} {'with detected headers' if headers_found else 'with auto-detection'}")
-                    
-                    # Process remaining pages in parallel batches
-                    for batch_start in range(0, len(remaining_images), checkpoint_interval):
-                        batch_end = min(batch_start + checkpoint_interval, len(remaining_images))
-                        batch_images = remaining_images[batch_start:batch_end]
-                        actual_page_start = batch_start + remaining_start_idx + 1
                         
-                        logger.info(f"   Processing batch: pages {actual_page_start}-{actual_page_start + len(batch_images) - 1}")
+                        result = process_single_page_with_retry(
+                            page_idx,
+                            page_image,
+                            prompt,
+                            response_format,
+                            extraction_task,
+                            document.filename,
+                            llm_client,
+                            max_retries,
+                            retry_backoff
+                        )
+                        del page_image
                         
-                        batch_results = []
-                        with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
-                            future_to_page = {}
-                            
-                            for i, page_image in enumerate(batch_images):
-                                actual_page_num = batch_start + remaining_start_idx + i
-                                
-                                # If we found headers, use continuation prompt; otherwise use detection prompt
-                                if headers_found:
-                                    page_prompt, page_format = prompt_service.get_task_prompt(
-                                        task=extraction_task,
-                                        templates=templates,
-                                        content_type="image",
-                                        document_type=document_type,
-                                        context={
-                                            "is_first_page": False,
-                                            "table_headers": bank_statement_headers,
-                                            "page_number": actual_page_num + 1
-                                        }
-                                    )
+                        if 'error' not in result:
+                            # Try to extract headers from this page
+                            hierarchical_data = result.get('hierarchical_data', {})
+                            if hierarchical_data and isinstance(hierarchical_data, dict):
+                                # Check for explicit _table_headers
+                                found_headers = hierarchical_data.get('_table_headers', [])
+                                if found_headers:
+                                    bank_statement_headers = found_headers
+                                    headers_found = True
+                                    logger.info(f"   📋 Found table headers on page {page_idx + 1}: {bank_statement_headers}")
                                 else:
-                                    # No headers found - let each page detect its own
-                                    page_prompt, page_format = prompt_service.get_task_prompt(
-                                        task=extraction_task,
-                                        templates=templates,
-                                        content_type="image",
-                                        document_type=document_type,
-                                        context={
-                                            "is_first_page": True,  # Use detection mode
-                                            "table_headers": [],
-                                            "page_number": actual_page_num + 1
-                                        }
-                                    )
-                                
-                                future = executor.submit(
-                                    process_single_page_with_retry,
-                                    actual_page_num,
-                                    page_image,
-                                    page_prompt,
-                                    page_format,
-                                    extraction_task,
-                                    document.filename,
-                                    llm_client,
-                                    max_retries,
-                                    retry_backoff
-                                )
-                                future_to_page[future] = actual_page_num
-                            
-                            for future in as_completed(future_to_page):
-                                page_num = future_to_page[future]
-                                try:
-                                    result = future.result()
-                                    batch_results.append(result)
-                                    
-                                    if 'error' not in result:
-                                        successful_pages += 1
-                                        total_tokens_used += result.get('tokens_used', 0)
-                                    else:
-                                        failed_pages.append(page_num + 1)
-                                except Exception as exc:
-                                    logger.error(f"   ❌ Page {page_num + 1} exception: {exc}")
-                                    batch_results.append({
-                                        'page_number': page_num + 1,
-                                        'error': str(exc)
-                                    })
-                                    failed_pages.append(page_num + 1)
+                                    # Try to infer from transactions
+                                    transactions = hierarchical_data.get('transactions', [])
+                                    if transactions and isinstance(transactions, list) and len(transactions) > 0:
+                                        first_row = transactions[0]
+                                        if isinstance(first_row, dict) and len(first_row.keys()) > 2:
+                                            bank_statement_headers = list(first_row.keys())
+                                            headers_found = True
+                                            logger.info(f"   📋 Inferred headers from transactions on page {page_idx + 1}: {bank_statement_headers}")
                         
-                        extracted_pages.extend(batch_results)
-                        
-                        # Save batch
-                        try:
-                            fields_inserted = insert_extracted_fields_batch(
-                                db=db,
-                                document_id=document_id,
-                                job_id=job_id,
-                                page_results=batch_results,
-                                extraction_model=llm_client.extraction_model,
-                                extraction_task=extraction_task
-                            )
-                            total_fields_inserted += fields_inserted
-                            document.total_fields_extracted = total_fields_inserted
-                            document.pages_processed = remaining_start_idx + len(extracted_pages) - pages_processed_for_headers
-                            document.processing_stage = f'Extracting page {document.pages_processed}/{len(page_images)}...'
-                            db.commit()
-                            logger.info(f"   ✅ Batch complete: {total_fields_inserted} total fields saved")
-                        except Exception as e:
-                            logger.error(f"   ⚠️ Batch save error: {e}")
-                
-            else:
-                # ==========================================
-                # NORMAL MODE - Parallel Batch Processing with Page Batching
-                # ==========================================
-                # Get prompt and response format for the extraction task (no special context)
-                prompt, response_format = prompt_service.get_task_prompt(
-                    task=extraction_task,
-                    templates=templates,
-                    content_type="image"
-                )
-            
-                # Process pages in checkpoints with batch-based threading
-                for checkpoint_start in range(0, len(page_images), checkpoint_interval):
-                    checkpoint_end = min(checkpoint_start + checkpoint_interval, len(page_images))
-                    checkpoint_images = page_images[checkpoint_start:checkpoint_end]
+                        # Save this page's results
+                        persist_pages([result])
                     
-                    logger.info(f"   Processing checkpoint: pages {checkpoint_start + 1}-{checkpoint_end} ({len(checkpoint_images)} pages)")
+                    if not headers_found:
+                        logger.warning("   ⚠️ No table headers found in first 3 pages, will let LLM detect per page")
                     
-                    # Divide checkpoint pages into batches for threading
-                    # Each thread will process pages_per_thread pages sequentially
-                    total_pages_in_checkpoint = len(checkpoint_images)
-                    num_batches = math.ceil(total_pages_in_checkpoint / pages_per_thread)
-                    
-                    page_batches = []
-                    for batch_idx in range(num_batches):
-                        batch_start_idx = batch_idx * pages_per_thread
-                        batch_end_idx = min((batch_idx + 1) * pages_per_thread, total_pages_in_checkpoint)
-                        # Create list of page indices for this batch (relative to checkpoint_start)
-                        batch_page_indices = list(range(batch_start_idx, batch_end_idx))
-                        # Convert to absolute page indices
-                        absolute_indices = [checkpoint_start + idx for idx in batch_page_indices]
-                        page_batches.append(absolute_indices)
+                    def get_page_prompt(page_idx: int) -> Tuple[str, Dict[str, Any]]:
+                        # If we found headers, use continuation prompt; otherwise let each page detect its own
+                        return prompt_service.get_task_prompt(
+                            task=extraction_task,
+                            templates=templates,
+                            content_type="image",
+                            document_type=document_type,
+                            context={
+                                "is_first_page": not headers_found,
+                                "table_headers": bank_statement_headers if headers_found else [],
+                                "page_number": page_idx + 1
+                            }
+                        )
                     
-                    logger.info(f"   Divided into {num_batches} batches ({pages_per_thread} pages/batch)")
+                    # Step 2: Stream remaining pages
+                    remaining_pages = list(range(pages_processed_for_headers, page_count))
+                    if remaining_pages:
+                        logger.info(f"   🚀 Processing pages {remaining_pages[0] + 1}-{page_count} {'with detected headers' if headers_found else 'with auto-detection'}")
                     
-                    # Process batches in parallel using ThreadPoolExecutor
-                    checkpoint_results = []
-                    with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
-                        # Submit each batch to a thread
-                        future_to_batch = {
-                            executor.submit(
-                                process_page_batch,
-                                batch_indices,
-                                page_images,  # Pass full list, function will index into it
-                                prompt,
-                                response_format,
-                                extraction_task,
-                                document.filename,
-                                llm_client,
-                                max_retries,
-                                retry_backoff
-                            ): batch_indices
-                            for batch_indices in page_batches
-                        }
-                        
-                        # Collect results as batches complete
-                        for future in as_completed(future_to_batch):
-                            batch_indices = future_to_batch[future]
-                            try:
-                                batch_results = future.result()  # List of results from this batch
-                                checkpoint_results.extend(batch_results)
-                                
-                                # Update counters
-                                for result in batch_results:
-                                    if 'error' not in result:
-                                        successful_pages += 1
-                                        total_tokens_used += result.get('tokens_used', 0)
-                                    else:
-                                        failed_pages.append(result['page_number'])
-                                        
-                            except Exception as exc:
-                                logger.error(f"   ❌ Batch {batch_indices} exception: {exc}")
-                                # Create error results for all pages in failed batch
-                                for page_idx in batch_indices:
-                                    checkpoint_results.append({
-                                        'page_number': page_idx + 1,
-                                        'error': str(exc),
-                                        'error_type': type(exc).__name__
-                                    })
-                                    failed_pages.append(page_idx + 1)
+                    # Prompts carry the page number - one call per page
+                    pages_per_call = 1
+                else:
+                    # ==========================================
+                    # NORMAL MODE - Rolling page pipeline
+                    # ==========================================
+                    # Get prompt and response format for the extraction task (no special context)
+                    prompt, response_format = prompt_service.get_task_prompt(
+                        task=extraction_task,
+                        templates=templates,
+                        content_type="image"
+                    )
                     
-                    # Add checkpoint results to all results
-                    extracted_pages.extend(checkpoint_results)
+                    def get_page_prompt(page_idx: int) -> Tuple[str, Dict[str, Any]]:
+                        return prompt, response_format
                     
-                    # CHECKPOINT: Insert batch into database
-                    try:
-                        fields_inserted = insert_extracted_fields_batch(
-                            db=db,
-                            document_id=document_id,
-                            job_id=job_id,
-                            page_results=checkpoint_results,
-                            extraction_model=llm_client.extraction_model,
-                            extraction_task=extraction_task
-                        )
-                        total_fields_inserted += fields_inserted
-                        
-                        # Update document progress
-                        document.total_fields_extracted = total_fields_inserted
-                        document.pages_processed = checkpoint_end
-                        document.processing_stage = f'Extracting page {checkpoint_end}/{page_count}...'
-                        db.commit()
-                        
-                        logger.info(
-                            f"   ✅ Checkpoint: {checkpoint_end}/{page_count} pages processed, "
-                            f"{total_fields_inserted} fields saved"
+                    remaining_pages = list(range(page_count))
+                
+                if remaining_pages:
+                    with resources.llm_executor(parallel_workers) as llm_executor:
+                        run_page_pipeline(
+                            remaining_pages,
+                            render_page,
+                            get_page_prompt,
+                            extraction_task,
+                            document.filename,
+                            llm_client,
+                            max_retries,
+                            retry_backoff,
+                            parallel_workers=parallel_workers,
+                            render_executor=resources.render_executor,
+                            llm_executor=llm_executor,
+                            window=page_window,
+                            checkpoint_interval=checkpoint_interval,
+                            on_checkpoint=persist_pages,
+                            pages_per_call=pages_per_call,
+                            call_token_budget=call_token_budget
                         )
-                        
-                    except Exception as checkpoint_error:
-                        logger.error(f"   ⚠️ Checkpoint failed: {checkpoint_error}")
-                    # Continue processing even if checkpoint fails
+            
+            # pin_document released this task's pins - the cache budget decides what stays open
+            pdf_processor.clear_pdf_cache()
+            pdf_processor.clear_debug_images()  # The processor is shared with later documents
+            convert_time = sum(render_times)  # Render thread-seconds, overlapped with extraction
+            extracted_pages.sort(key=lambda r: r['page_number'])
             
             extract_time = time.time() - extract_start
             logger.info(
@@ -926,104 +1291,30 @@ def process_document(self, document_id: str, job_id: str, job_config: Dict[str,
             if failed_pages:
                 logger.warning(f"   ⚠️ {len(failed_pages)} pages failed: {failed_pages[:10]}")
             
-            # Step 4.5: Generate transcript for template-based mapping
-            document.processing_stage = 'Generating searchable transcript...'
-            db.commit()
-            
-            logger.info(f"[4.5/5] 📝 Generating searchable transcript...")
-            transcript_start = time.time()
-            
-            try:
-                from app.services.transcript_service import TranscriptService
-                from app.models.database import BulkDocumentTranscript
-                
-                transcript_service = TranscriptService()
-                transcript_data = transcript_service.generate_transcript(
-                    extracted_pages=extracted_pages,
-                    document_name=document.filename
-                )
-                
-                # Save transcript to database
-                transcript_record = BulkDocumentTranscript(
-                    document_id=document.id,
-                    job_id=UUID(job_id),
-                    full_transcript=transcript_data['full_transcript'],
-                    page_transcripts=transcript_data['page_transcripts'],
-                    section_index=transcript_data['section_index'],
-                    field_locations=transcript_data['field_locations'],
-                    total_pages=transcript_data['total_pages'],
-                    total_sections=transcript_data['total_sections'],
-                    generation_time_ms=transcript_data['generation_time_ms']
-                )
-                
-                db.add(transcript_record)
-                db.commit()
-                
-                transcript_time = time.time() - transcript_start
-                logger.info(
-                    f"[4.5/5] ✅ Transcript generated in {transcript_time:.2f}s "
-                    f"({transcript_data['total_sections']} sections, {len(transcript_data['field_locations'])} fields)"
-                )
-                
-            except Exception as transcript_error:
-                logger.warning(f"⚠️ Transcript generation failed (non-critical): {transcript_error}")
-                # Continue processing even if transcript fails
-            
-            # Step 5: Update document status and metadata
-            document.processing_stage = 'Saving results...'
-            db.commit()
-            
+            # Step 4.5 / 5: Transcript, final status and job progress
             total_time = time.time() - start_time
-            
-            # Store summary in token_usage field (for backward compatibility)
-            document.token_usage = {
-                'extraction_task': extraction_task,
-                'page_count': page_count,
-                'pages_extracted': successful_pages,
-                'pages_failed': len(failed_pages),
-                'failed_page_numbers': failed_pages,
-                'total_tokens_used': total_tokens_used,
-                'total_fields_extracted': total_fields_inserted,
-                'timing': {
-                    'load_time_s': round(load_time, 2),
-                    'convert_time_s': round(convert_time, 2),
-                    'extract_time_s': round(extract_time, 2),
-                    'total_time_s': round(total_time, 2)
-                },
-                'processing_mode': 'parallel',
-                'parallel_workers': parallel_workers
-            }
-            
-            # Determine final status
-            if failed_pages and successful_pages == 0:
-                document.status = 'failed'
-                document.error_message = f"All {len(failed_pages)} pages failed to process"
-            elif failed_pages:
-                document.status = 'needs_review'
-                document.error_message = f"{len(failed_pages)} pages failed: {failed_pages[:5]}"
-                
-                # Add to review queue
-                from app.models.database import BulkManualReviewQueue
-                review_item = BulkManualReviewQueue(
-                    document_id=document.id,
-                    job_id=job_id,
-                    reason=f"Partial processing failure: {len(failed_pages)}/{page_count} pages failed",
-                    error_message=document.error_message,
-                    error_type="Partial Processing Failure",
-                    priority=2,  # Medium-high priority
-                    status="pending"
-                )
-                db.add(review_item)
-                logger.info(f"📋 Added document to review queue: {len(failed_pages)} pages failed")
-            else:
-                document.status = 'completed'
-            
-            document.processing_completed_at = datetime.utcnow()
-            document.extraction_time_seconds = total_time
-            document.total_fields_extracted = total_fields_inserted
-            document.total_tokens_used = total_tokens_used
-            
-            db.commit()
+            _finalize_document(
+                db,
+                document,
+                job_id,
+                extraction_task,
+                extracted_pages,
+                page_count,
+                total_fields_inserted,
+                total_time,
+                {
+                    'timing': {
+                        'load_time_s': round(load_time, 2),
+                        'convert_time_s': round(convert_time, 2),
+                        'extract_time_s': round(extract_time, 2),
+                        'total_time_s': round(total_time, 2)
+                    },
+                    'processing_mode': 'parallel',
+                    'parallel_workers': parallel_workers,
+                    'page_window': page_window,
+                    'pages_per_call': pages_per_call
+                }
+            )
             
             logger.info(
                 f"[5/5] ✅ Document {document_id} processed!\n"
@@ -1039,33 +1330,6 @@ def process_document(self, document_id: str, job_id: str, job_config: Dict[str,
                 f"      - Failed pages: {len(failed_pages)}"
             )
             
-            # Update job progress
-            from app.models.database import BulkJob
-            from sqlalchemy import func
-            job = db.query(BulkJob).filter(BulkJob.id == job_id).first()
-            if job:
-                job.processed_documents = (job.processed_documents or 0) + 1
-                if document.status == 'failed':
-                    job.failed_documents = (job.failed_documents or 0) + 1
-                
-                # Check if all documents are processed
-                total_docs = db.query(func.count(BulkJobDocument.id)).filter(
-                    BulkJobDocument.job_id == job_id
-                ).scalar()
-                
-                completed_docs = db.query(func.count(BulkJobDocument.id)).filter(
-                    BulkJobDocument.job_id == job_id,
-                    BulkJobDocument.status.in_(['completed', 'failed', 'needs_review'])
-                ).scalar()
-                
-                # Update job status if all documents are done
-                if completed_docs == total_docs and job.status == 'running':
-                    job.status = 'completed'
-                    job.completed_at = datetime.utcnow()
-                    logger.info(f"✅ Job {job_id} completed! {completed_docs}/{total_docs} documents processed")
-                
-                db.commit()
-            
             return {
                 "document_id": document_id,
                 "status": document.status,
@@ -1113,3 +1377,381 @@ def process_document(self, document_id: str, job_id: str, job_config: Dict[str,
                 "success": False,
                 "error": str(exc)
             }
+
+
+def _dispatch_page_ranges(
+    db,
+    document,
+    job_id: str,
+    job_config: Dict[str, Any],
+    pdf_bytes: bytes,
+    page_count: int,
+    range_size: int
+) -> Dict[str, Any]:
+    """
+    Split a document into page-range tasks joined by a chord
+    
+    Every range is its own process_page_range task, so the pages of one large document
+    spread over all worker processes in the cluster; finalize_page_ranges runs once all
+    ranges have returned. The already downloaded PDF is staged once (PAGE_TASK_STAGING_DIR)
+    and the ranges read it from there instead of each downloading it again.
+    """
+    from celery import chord
+    
+    range_size = max(1, range_size)
+    ranges = [(first, min(first + range_size, page_count)) for first in range(0, page_count, range_size)]
+    
+    document.total_pages = page_count
+    document.pages_processed = 0
+    document.total_fields_extracted = 0
+    document.processing_stage = f'Extracting data from {page_count} pages ({len(ranges)} page ranges)...'
+    db.commit()
+    
+    staged_path = _stage_document_content(str(document.id), pdf_bytes)
+    
+    chord(
+        process_page_range.s(str(document.id), job_id, job_config, first, end, staged_path)
+        for first, end in ranges
+    )(finalize_page_ranges.s(str(document.id), job_id, job_config))
+    
+    logger.info(f"[3/5] 🔀 Split {page_count} pages into {len(ranges)} page-range tasks of up to {range_size} pages")
+    
+    return {
+        "document_id": str(document.id),
+        "status": "processing",
+        "success": True,
+        "page_ranges": len(ranges),
+        "processing_mode": "page_ranges"
+    }
+
+
+def _compact_page_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a page result finalize_page_ranges needs (travels through the result backend)"""
+    if 'error' in result:
+        return {
+            'page_number': result['page_number'],
+            'error': result['error'],
+            'error_type': result.get('error_type')
+        }
+    return {
+        'page_number': result['page_number'],
+        'tokens_used': result.get('tokens_used', 0),
+        'hierarchical_data': result.get('hierarchical_data', {})
+    }
+
+
+@celery_app.task(bind=True, name='app.workers.processing.process_page_range', max_retries=3)
+def process_page_range(
+    self,
+    document_id: str,
+    job_id: str,
+    job_config: Dict[str, Any],
+    first_page: int,
+    end_page: int,
+    staged_path: Optional[str] = None,
+    done: Optional[Dict[str, Any]] = None
+):
+    """
+    Extract pages [first_page, end_page) of a document (page-range mode)
+    
+    Fields are checkpointed into bulk_extracted_fields as pages finish. Pages that still
+    fail after their in-call retries are retried by re-running this task for those pages
+    only: results of finished pages travel with the retry in `done`. A redelivered task
+    (worker lost) first clears the range's fields not in `done`, so at most one range
+    of work is redone.
+    
+    Never raises once retries are exhausted - unfinished pages are reported as failed
+    so the chord still finalizes the document.
+    
+    Args:
+        document_id: Document ID
+        job_id: Bulk job ID
+        job_config: Job configuration (source, template, extraction_task, etc.)
+        first_page: First page of the range (0-indexed)
+        end_page: Page after the last page of the range (0-indexed, exclusive)
+        staged_path: The document's PDF staged by _dispatch_page_ranges (None = load from source)
+        done: Results carried over from earlier attempts ({pages, fields_inserted}); a
+              page and its fields are recorded together when they are checkpointed
+    
+    Returns:
+        {'pages': compact page results in page order, 'fields_inserted': int}
+    """
+    from celery.exceptions import Retry
+    
+    done = done or {'pages': [], 'fields_inserted': 0}
+    done_numbers = {page['page_number'] for page in done['pages']}
+    page_indices = [page_idx for page_idx in range(first_page, end_page) if page_idx + 1 not in done_numbers]
+    
+    logger.info(f"📄 Processing pages {first_page + 1}-{end_page} of document {document_id} ({len(page_indices)} to extract)")
+    
+    try:
+        from app.core.database import get_sync_db
+        from app.core.config import settings
+        from app.models.database import BulkJobDocument, BulkExtractedField
+        from app.workers.worker_resources import get_worker_resources
+        from sqlalchemy import func
+        
+        resources = get_worker_resources()
+        pdf_processor = resources.pdf_processor
+        llm_client = resources.llm_client
+        
+        extraction_task = job_config.get('extraction_task', 'without_template_extraction')
+        processing_options = job_config.get('processing_options', {}) or {}
+        parallel_workers = processing_options.get('parallel_workers', settings.PARALLEL_PAGE_WORKERS)
+        checkpoint_interval = processing_options.get('checkpoint_interval', settings.PROGRESS_CHECKPOINT_INTERVAL)
+        max_retries = processing_options.get('max_retries', settings.MAX_RETRIES_PER_PAGE)
+        retry_backoff = processing_options.get('retry_delay', settings.RETRY_BACKOFF_BASE)
+        page_window = processing_options.get('page_window') or settings.PAGE_PIPELINE_WINDOW or 2 * parallel_workers
+        pages_per_call = processing_options.get('pages_per_call') or settings.LLM_PAGES_PER_CALL
+        call_token_budget = processing_options.get('call_token_budget', settings.LLM_CALL_TOKEN_BUDGET)
+        
+        db = next(get_sync_db())
+        try:
+            document = db.query(BulkJobDocument).filter(
+                BulkJobDocument.id == document_id
+            ).first()
+            if not document:
+                raise ValueError(f"Document {document_id} not found")
+            
+            # Drop fields a lost earlier attempt saved for pages that are about to be redone
+            db.query(BulkExtractedField).filter(
+                BulkExtractedField.document_id == document_id,
+                BulkExtractedField.page_number.in_([page_idx + 1 for page_idx in page_indices])
+            ).delete(synchronize_session=False)
+            db.commit()
+            
+            pdf_handle = pdf_processor.open_document_handle(_load_staged_content(staged_path, document, job_config))
+            prompt, response_format = resources.prompt_service.get_task_prompt(
+                task=extraction_task,
+                templates=job_config.get('templates', None),
+                content_type="image"
+            )
+            
+            page_results: List[Dict[str, Any]] = []
+            
+            def persist_pages(results: List[Dict[str, Any]]):
+                """Save finished pages and advance the document's progress (shared by all its ranges)"""
+                fields_inserted = insert_extracted_fields_batch(
+                    db=db,
+                    document_id=document_id,
+                    job_id=job_id,
+                    page_results=results,
+                    extraction_model=llm_client.extraction_model,
+                    extraction_task=extraction_task
+                )
+                page_results.extend(results)
+                # Saved pages and their fields go into `done` together, so a retry neither
+                # redoes these pages nor counts their fields twice
+                done['pages'].extend(_compact_page_result(result) for result in results if 'error' not in result)
+                done['fields_inserted'] += fields_inserted
+                
+                # Other ranges of this document update the same row, and a retried or redelivered
+                # range saves its pages again - set the progress from the saved rows instead of
+                # incrementing it (pages without fields are counted by finalize_page_ranges)
+                saved_fields = db.query(BulkExtractedField).filter(BulkExtractedField.document_id == document_id)
+                db.query(BulkJobDocument).filter(BulkJobDocument.id == document_id).update({
+                    BulkJobDocument.pages_processed: saved_fields.with_entities(
+                        func.count(func.distinct(BulkExtractedField.page_number))
+                    ).scalar_subquery(),
+                    BulkJobDocument.total_fields_extracted: saved_fields.with_entities(
+                        func.count(BulkExtractedField.id)
+                    ).scalar_subquery()
+                }, synchronize_session=False)
+                db.commit()
+            
+            try:
+                with pdf_processor.pin_document(pdf_handle), resources.llm_executor(parallel_workers) as llm_executor:
+                    run_page_pipeline(
+                        page_indices,
+                        lambda page_idx: pdf_processor.render_page_image(pdf_handle, page_idx),
+                        lambda page_idx: (prompt, response_format),
+                        extraction_task,
+                        f"{document.filename} [{first_page + 1}-{end_page}]",
+                        llm_client,
+                        max_retries,
+                        retry_backoff,
+                        parallel_workers=parallel_workers,
+                        render_executor=resources.render_executor,
+                        llm_executor=llm_executor,
+                        window=page_window,
+                        checkpoint_interval=checkpoint_interval,
+                        on_checkpoint=persist_pages,
+                        pages_per_call=pages_per_call,
+                        call_token_budget=call_token_budget
+                    )
+            finally:
+                pdf_processor.clear_pdf_cache()
+        finally:
+            db.close()
+        
+        failed = [result for result in page_results if 'error' in result]
+        
+        if failed and self.request.retries < self.max_retries:
+            countdown = 60 * (2 ** self.request.retries)  # 60s, 120s, 240s
+            logger.warning(
+                f"   ⚠️ {len(failed)} pages failed in range {first_page + 1}-{end_page}, "
+                f"retrying them in {countdown}s (attempt {self.request.retries + 1}/{self.max_retries})"
+            )
+            raise self.retry(kwargs={'done': done}, countdown=countdown)
+        
+        done['pages'].extend(_compact_page_result(result) for result in failed)
+        done['pages'].sort(key=lambda page: page['page_number'])
+        return done
+    
+    except Retry:
+        raise
+    except Exception as exc:
+        logger.error(f"❌ Page range {first_page + 1}-{end_page} of document {document_id} failed: {exc}", exc_info=True)
+        
+        if self.request.retries < self.max_retries:
+            countdown = 60 * (2 ** self.request.retries)
+            raise self.retry(exc=exc, kwargs={'done': done}, countdown=countdown)
+        
+        # Give up on the unfinished pages - report them so the document still finalizes
+        finished = {page['page_number'] for page in done['pages']}
+        done['pages'].extend(
+            {'page_number': page_idx + 1, 'error': str(exc), 'error_type': type(exc).__name__}
+            for page_idx in range(first_page, end_page) if page_idx + 1 not in finished
+        )
+        done['pages'].sort(key=lambda page: page['page_number'])
+        return done
+
+
+@celery_app.task(name='app.workers.processing.finalize_page_ranges')
+def finalize_page_ranges(
+    range_results: List[Dict[str, Any]],
+    document_id: str,
+    job_id: str,
+    job_config: Dict[str, Any]
+):
+    """
+    Chord callback of page-range mode: merge the ranges and finish the document
+    
+    Args:
+        range_results: process_page_range results, one per range
+        document_id: Document ID
+        job_id: Bulk job ID
+        job_config: Job configuration
+    
+    Returns:
+        Processing result with statistics
+    """
+    from app.core.database import get_sync_db
+    from app.models.database import BulkJobDocument, BulkExtractedField
+    from sqlalchemy import func
+    
+    _discard_staged_content(document_id)
+    
+    extracted_pages = sorted(
+        (page for range_result in range_results for page in range_result['pages']),
+        key=lambda page: page['page_number']
+    )
+    extraction_task = job_config.get('extraction_task', 'without_template_extraction')
+    
+    db = next(get_sync_db())
+    try:
+        # Count the saved rows rather than summing the ranges' counters - a redelivered
+        # range deletes and re-inserts its fields, so the rows are the only exact total
+        total_fields_inserted = db.query(func.count(BulkExtractedField.id)).filter(
+            BulkExtractedField.document_id == document_id
+        ).scalar() or 0
+        
+        document = db.query(BulkJobDocument).filter(
+            BulkJobDocument.id == document_id
+        ).first()
+        if not document:
+            logger.error(f"❌ Document {document_id} not found")
+            return {"document_id": document_id, "status": "failed", "success": False}
+        
+        started_at = document.processing_started_at
+        total_time = (datetime.now(started_at.tzinfo) - started_at).total_seconds() if started_at else 0.0
+        
+        _finalize_document(
+            db,
+            document,
+            job_id,
+            extraction_task,
+            extracted_pages,
+            document.total_pages or len(extracted_pages),
+            total_fields_inserted,
+            total_time,
+            {
+                'timing': {'total_time_s': round(total_time, 2)},
+                'processing_mode': 'page_ranges',
+                'page_ranges': len(range_results)
+            }
+        )
+        
+        failed_pages = sum(1 for page in extracted_pages if 'error' in page)
+        logger.info(
+            f"[5/5] ✅ Document {document_id} processed in {len(range_results)} page ranges: "
+            f"{document.status}, {len(extracted_pages) - failed_pages}/{len(extracted_pages)} pages, "
+            f"{total_fields_inserted:,} fields, {total_time:.2f}s"
+        )
+        
+        return {
+            "document_id": document_id,
+            "status": document.status,
+            "success": document.status in ['completed', 'needs_review'],
+            "pages_processed": len(extracted_pages) - failed_pages,
+            "pages_failed": failed_pages,
+            "fields_extracted": total_fields_inserted,
+            "processing_time_s": round(total_time, 2),
+            "processing_mode": "page_ranges"
+        }
+    finally:
+        db.close()
+
+
+def enqueue_process_documents(
+    document_ids: List[str],
+    job_id: str,
+    job_config: Dict[str, Any],
+    chunk_size: Optional[int] = None
+) -> List[str]:
+    """
+    Publish process_document tasks for many documents
+    
+    Tasks are published in chunks of ENQUEUE_CHUNK_SIZE, each chunk over a single
+    producer (one broker connection and channel) instead of a connection checkout
+    per delay() call.
+    
+    Args:
+        document_ids: Documents to process
+        job_id: Bulk job ID
+        job_config: Job configuration passed to every task
+        chunk_size: Tasks per producer; defaults to settings.ENQUEUE_CHUNK_SIZE
+    
+    Returns:
+        IDs of documents whose task could not be published
+    """
+    from app.core.config import settings
+    
+    chunk_size = chunk_size or settings.ENQUEUE_CHUNK_SIZE
+    failed_ids = []
+    
+    for start in range(0, len(document_ids), chunk_size):
+        chunk = document_ids[start:start + chunk_size]
+        pending = deque(chunk)
+        failed_before = len(failed_ids)
+        try:
+            with celery_app.producer_or_acquire() as producer:
+                while pending:
+                    doc_id = pending.popleft()
+                    try:
+                        process_document.apply_async((doc_id, job_id, job_config), producer=producer)
+                    except Exception as e:
+                        logger.error(f"   ❌ Failed to queue document {doc_id}: {e}")
+                        failed_ids.append(doc_id)
+        except Exception as e:
+            # No producer (broker connection) - the rest of this chunk was not published
+            logger.error(f"   ❌ Failed to queue {len(pending)} documents: {e}")
+            failed_ids.extend(pending)
+        
+        chunk_failed = len(failed_ids) - failed_before
+        logger.info(
+            f"📤 Queued {len(chunk) - chunk_failed}/{len(chunk)} documents of this chunk "
+            f"({chunk_failed} failed), {start + len(chunk) - len(failed_ids)}/{len(document_ids)} overall"
+        )
+    
+    return failed_ids
@@ -0,0 +1,178 @@
+"""
+Worker Process Resources
+Services, thread pools and an event loop shared by every task a worker process runs
+
+process_document used to build a PDFProcessor, LLMClient and PromptService per document,
+and the page pipeline created its thread pools per document. LLMClient keeps one
+keep-alive requests session per thread, so fresh pool threads meant fresh connection
+pools and TLS handshakes for every document.
+
+Celery's worker_process_init signal (connected in celery_app.py) builds one
+WorkerResources per worker process after the fork:
+
+- pdf_processor, llm_client, prompt_service: shared service instances
+- render_executor / llm_executor(): persistent page pools - their threads, and the HTTP
+  sessions bound to them, survive from one document to the next (the extraction pool is
+  leased per job, so growing it never shuts down a pool another job is still using)
+- run_async(): runs coroutines on a long-lived event loop in a daemon thread, so async
+  clients (LLMClient's httpx pool) stay bound to a single loop
+
+worker_process_shutdown closes the pools, HTTP sessions and loop. Outside a prefork
+child (solo/threads pools, eager tasks) get_worker_resources() creates them on first use.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the HTTP client to close when the process shuts down
+_SHUTDOWN_TIMEOUT_SECONDS = 10
+
+
+class WorkerResources:
+    """Process-scoped service instances, page thread pools and event loop"""
+
+    def __init__(self):
+        from app.core.config import settings
+        from app.services.pdf_processor import PDFProcessor
+        from app.services.llm_client import LLMClient
+        from app.services.prompt_service import PromptService
+
+        self.pid = os.getpid()
+        self.pdf_processor = PDFProcessor()
+        self.llm_client = LLMClient()
+        self.prompt_service = PromptService()
+
+        self.render_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.PDF_PROCESSING_MAX_THREADS),
+            thread_name_prefix="page-render"
+        )
+        self._llm_executor: Optional[ThreadPoolExecutor] = None
+        self._llm_workers = 0
+        self._llm_leases: Dict[ThreadPoolExecutor, int] = {}  # Pool -> jobs currently using it
+        self._lock = threading.Lock()
+        self._grow_llm_executor_locked(settings.PARALLEL_PAGE_WORKERS)
+
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="worker-event-loop",
+            daemon=True
+        )
+        self._loop_thread.start()
+        self._closed = False
+
+        logger.info(
+            f"🔧 Worker resources ready (pid {self.pid}): "
+            f"{settings.PDF_PROCESSING_MAX_THREADS} render threads, "
+            f"{self._llm_workers} extraction threads"
+        )
+
+    @contextmanager
+    def llm_executor(self, workers: int) -> Iterator[ThreadPoolExecutor]:
+        """
+        Lease the extraction pool with at least `workers` threads for the duration of a block
+
+        The pool only grows: a job asking for more parallel workers than the current pool
+        gets a new, larger one. The replaced pool keeps serving the jobs still holding a
+        lease on it and is shut down when the last of them returns it. Jobs asking for
+        fewer workers share the pool and limit their own in-flight calls.
+        """
+        workers = max(1, workers)
+        with self._lock:
+            pool = self._grow_llm_executor_locked(workers)
+            self._llm_leases[pool] = self._llm_leases.get(pool, 0) + 1
+        try:
+            yield pool
+        finally:
+            with self._lock:
+                self._llm_leases[pool] -= 1
+                self._retire_if_idle_locked(pool)
+
+    def _grow_llm_executor_locked(self, workers: int) -> ThreadPoolExecutor:
+        if self._llm_executor is None or workers > self._llm_workers:
+            previous = self._llm_executor
+            self._llm_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page-extract")
+            self._llm_workers = workers
+            if previous is not None:
+                logger.info(f"🔄 Extraction pool grown to {workers} threads")
+                self._retire_if_idle_locked(previous)
+        return self._llm_executor
+
+    def _retire_if_idle_locked(self, pool: ThreadPoolExecutor) -> None:
+        # Only a replaced pool nobody holds a lease on is shut down - its callers are done submitting
+        if pool is self._llm_executor or self._llm_leases.get(pool):
+            return
+        self._llm_leases.pop(pool, None)
+        pool.shutdown(wait=False)
+
+    def run_async(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the worker's event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def shutdown(self) -> None:
+        """Stop the pools, close HTTP sessions and the event loop (idempotent)"""
+        if self._closed:
+            return
+        self._closed = True
+
+        self.render_executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            pools = set(self._llm_leases)
+            if self._llm_executor is not None:
+                pools.add(self._llm_executor)
+            self._llm_leases.clear()
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        self.llm_client.close_sync_sessions()
+        try:
+            self.run_async(self.llm_client.close(), timeout=_SHUTDOWN_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing async HTTP client: {e}")
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=_SHUTDOWN_TIMEOUT_SECONDS)
+        if not self._loop.is_running():
+            self._loop.close()
+
+        logger.info(f"🔌 Worker resources released (pid {self.pid})")
+
+
+_resources: Optional[WorkerResources] = None
+_resources_lock = threading.Lock()
+
+
+def get_worker_resources() -> WorkerResources:
+    """Get or create this worker process's resources"""
+    global _resources
+    # A forked child must not reuse its parent's threads and event loop
+    if _resources is None or _resources.pid != os.getpid():
+        with _resources_lock:
+            if _resources is None or _resources.pid != os.getpid():
+                _resources = WorkerResources()
+    return _resources
+
+
+def init_worker_resources(**kwargs) -> None:
+    """worker_process_init handler - build resources before the first task arrives"""
+    try:
+        get_worker_resources()
+    except Exception as e:
+        # Tasks retry the lazy initialisation; don't take the worker process down
+        logger.error(f"❌ Failed to initialise worker resources: {e}")
+
+
+def shutdown_worker_resources(**kwargs) -> None:
+    """worker_process_shutdown / worker_shutdown handler"""
+    global _resources
+    with _resources_lock:
+        resources, _resources = _resources, None
+    if resources is not None and resources.pid == os.getpid():
+        resources.shutdown()
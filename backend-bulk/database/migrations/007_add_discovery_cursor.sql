@@ -0,0 +1,15 @@
+-- Migration: Resumable, paginated document discovery
+-- Purpose: Discovery walks the whole source page by page; the continuation token of the
+--          last page it committed is kept on the job so an interrupted or chained
+--          discovery task resumes where it stopped
+-- Run this in Supabase SQL Editor
+
+ALTER TABLE public.bulk_jobs
+ADD COLUMN IF NOT EXISTS discovery_cursor TEXT,
+ADD COLUMN IF NOT EXISTS discovery_completed_at TIMESTAMP WITH TIME ZONE;
+
+-- Verify columns added
+SELECT column_name, data_type
+FROM information_schema.columns
+WHERE table_name = 'bulk_jobs'
+AND column_name IN ('discovery_cursor', 'discovery_completed_at');
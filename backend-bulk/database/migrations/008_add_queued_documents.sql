@@ -0,0 +1,13 @@
+-- Migration: Job enqueue progress counter
+-- Purpose: Starting a job or discovering a source publishes processing tasks in chunks;
+--          queued_documents counts the documents whose task has been published so far
+-- Run this in Supabase SQL Editor
+
+ALTER TABLE public.bulk_jobs
+ADD COLUMN IF NOT EXISTS queued_documents INTEGER DEFAULT 0;
+
+-- Verify column added
+SELECT column_name, data_type
+FROM information_schema.columns
+WHERE table_name = 'bulk_jobs'
+AND column_name = 'queued_documents';
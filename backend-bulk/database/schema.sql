@@ -97,6 +97,9 @@ CREATE TABLE public.bulk_jobs (
   completed_at timestamp with time zone,
   updated_at timestamp with time zone DEFAULT now(),
   template_id character varying,
+  discovery_cursor text,
+  discovery_completed_at timestamp with time zone,
+  queued_documents integer DEFAULT 0,
   CONSTRAINT bulk_jobs_pkey PRIMARY KEY (id),
   CONSTRAINT bulk_jobs_user_id_fkey FOREIGN KEY (user_id) REFERENCES auth.users(id)
 );
@@ -99,6 +99,30 @@ class TestFolderSourceAdapter:
             documents = adapter.discover_documents(config, batch_size=10)
             assert len(documents) == 2
     
+    def test_iter_document_pages_resumes_from_cursor(self):
+        """Test paged discovery covers every file and resumes after a cursor"""
+        adapter = FolderSourceAdapter()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            subdir = Path(tmpdir) / "b"
+            subdir.mkdir()
+            for name in ["a1.pdf", "a2.pdf", "c.pdf"]:
+                (Path(tmpdir) / name).write_text("test")
+            for name in ["b1.pdf", "b2.pdf"]:
+                (subdir / name).write_text("test")
+            
+            config = {"path": tmpdir, "file_types": ["pdf"], "recursive": True}
+            
+            pages = list(adapter.iter_document_pages(config, page_size=2))
+            filenames = [doc.filename for page in pages for doc in page.documents]
+            assert filenames == ["a1.pdf", "a2.pdf", "b1.pdf", "b2.pdf", "c.pdf"]
+            assert pages[-1].cursor is None
+            
+            # Resuming after the first page yields only the remaining files
+            resumed = adapter.iter_document_pages(config, cursor=pages[0].cursor, page_size=2)
+            remaining = [doc.filename for page in resumed for doc in page.documents]
+            assert remaining == ["b1.pdf", "b2.pdf", "c.pdf"]
+    
     def test_get_document_content(self):
         """Test getting document content"""
         adapter = FolderSourceAdapter()
@@ -0,0 +1,180 @@
+"""
+API Service Dependencies
+Lazily-created service singletons, injected into routes with FastAPI Depends
+
+routes.py used to construct every service (LLM client, type detector, orchestrator with
+its YOLO detectors, ...) at import time, so a new container could not answer /health
+until all of them - and the torch models - were ready. Each service is now created on
+first request (or by warm_up_services) and shared for the life of the process:
+
+    async def analyze_document(..., document_service=Depends(get_document_service))
+
+Dependencies are plain functions, so FastAPI runs the first (slow) construction in its
+threadpool rather than on the event loop. YOLO detectors are cheap to construct and load
+their model on first use; warm_up_services() forces that as well.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from ..core.startup_profile import startup_profile
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_services: Dict[str, Any] = {}
+# Re-entrant: factories resolve their own dependencies through the getters below
+_services_lock = threading.RLock()
+_warming_up = threading.local()
+
+
+def _get_or_create(name: str, factory: Callable[[], T]) -> T:
+    """Return the named singleton, creating it on first use"""
+    service = _services.get(name)
+    if service is None:
+        with _services_lock:
+            service = _services.get(name)
+            if service is None:
+                start = time.perf_counter()
+                service = factory()
+                seconds = time.perf_counter() - start
+                startup_profile.record_service(name, seconds, during_warmup=getattr(_warming_up, "active", False))
+                logger.info(f"⚙️ Initialized {name} in {seconds:.2f}s")
+                _services[name] = service
+    return service
+
+
+def get_initialized_service(name: str) -> Optional[Any]:
+    """Singleton if it has been created already (never creates one, e.g. at shutdown)"""
+    return _services.get(name)
+
+
+# ============================================================================
+# Service getters
+# ============================================================================
+
+def get_llm_client():
+    from ..services.modules.llm_client import LLMClient
+    return _get_or_create("llm_client", LLMClient)
+
+
+def get_prompt_service():
+    from ..services.modules.prompt_service import PromptService
+    return _get_or_create("prompt_service", PromptService)
+
+
+def get_document_type_detector():
+    from ..services.modules.document_type_detector import DocumentTypeDetector
+    return _get_or_create("document_type_detector", lambda: DocumentTypeDetector(llm_client=get_llm_client()))
+
+
+def get_document_service():
+    def create():
+        from ..core.supabase_client import get_supabase_client
+        from ..services.modules import BucketManager, DatabaseService, DocumentAnalysisService, DocumentProcessingOrchestrator
+        return DocumentProcessingOrchestrator(
+            type_detector=get_document_type_detector(),
+            document_analyzer=DocumentAnalysisService(),
+            bucket_manager=BucketManager(get_supabase_client()),
+            database_service=DatabaseService()
+        )
+    return _get_or_create("document_service", create)
+
+
+def get_organize_documents_service():
+    from ..services.organize_documents import OrganizeDocumentsService
+    return _get_or_create("organize_documents_service", OrganizeDocumentsService)
+
+
+def get_organize_smart_folders_service():
+    from ..services.organize_smart_folders import OrganizeSmartFoldersService
+    return _get_or_create("organize_smart_folders_service", OrganizeSmartFoldersService)
+
+
+def get_auto_organize_service():
+    # Module-level instance, created when the module is first imported
+    from ..services.auto_organize_service import auto_organize_service
+    return auto_organize_service
+
+
+def get_generate_form_app_service():
+    from ..services.generate_form_app import GenerateFormAppService
+    return _get_or_create("generate_form_app_service", GenerateFormAppService)
+
+
+def get_generate_embeddings_service():
+    from ..services.generate_embeddings import GenerateEmbeddingsService
+    return _get_or_create("generate_embeddings_service", GenerateEmbeddingsService)
+
+
+def get_pdf_processor():
+    from ..services.pdf_processor import PDFProcessor
+    return _get_or_create("pdf_processor", PDFProcessor)
+
+
+def get_form_creation_service():
+    from ..services.modules.form_creation_service import FormCreationService
+    return _get_or_create("form_creation_service", lambda: FormCreationService(get_llm_client(), get_prompt_service()))
+
+
+# Order matters only for readability of the profile: dependencies come first
+_WARMUP_GETTERS: List[Callable[[], Any]] = [
+    get_llm_client,
+    get_prompt_service,
+    get_document_type_detector,
+    get_document_service,
+    get_pdf_processor,
+    get_form_creation_service,
+    get_generate_embeddings_service,
+    get_generate_form_app_service,
+    get_organize_documents_service,
+    get_organize_smart_folders_service,
+    get_auto_organize_service,
+]
+
+
+def warm_up_services() -> Dict[str, Any]:
+    """
+    Create every service and load the YOLO models ahead of the first request
+
+    Blocking; run it in a thread from async code. Failures are logged and reported, never
+    raised - the service is retried on its first real request.
+
+    Returns:
+        Dictionary with warm-up duration and any failures
+    """
+    start = time.perf_counter()
+    failures: Dict[str, str] = {}
+    _warming_up.active = True
+    try:
+        for getter in _WARMUP_GETTERS:
+            try:
+                getter()
+            except Exception as e:
+                failures[getter.__name__] = str(e)
+                logger.warning(f"⚠️ Warm-up of {getter.__name__} failed (will retry on first use): {e}")
+
+        document_service = get_initialized_service("document_service")
+        analyzer = getattr(document_service, "document_analyzer", None)
+        for name in ("yolo_detector", "face_detector"):
+            detector = getattr(analyzer, name, None)
+            if detector is None:
+                continue
+            model_start = time.perf_counter()
+            try:
+                loaded = detector.ensure_loaded()
+            except Exception as e:
+                failures[name] = str(e)
+                logger.warning(f"⚠️ Warm-up of {name} model failed: {e}")
+                continue
+            if loaded:
+                startup_profile.record_service(f"{name}_model", time.perf_counter() - model_start, during_warmup=True)
+    finally:
+        _warming_up.active = False
+
+    seconds = time.perf_counter() - start
+    logger.info(f"🔥 Service warm-up completed in {seconds:.2f}s ({len(failures)} failure(s))")
+    return {"seconds": round(seconds, 3), "failures": failures}
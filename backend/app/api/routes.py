@@ -1,5 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any, Optional, List
+from fastapi import APIRouter, HTTPException, Depends, File, Form, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Optional, List, AsyncIterator
+import asyncio
+import json
 import logging
 from datetime import datetime
 import uuid
@@ -99,17 +103,16 @@ class EnsureBucketResponse(BaseModel):
     created: bool
     error: Optional[str] = None
 
-from ..services.modules import DocumentAnalysisService, DocumentTypeDetector, BucketManager, DocumentProcessingOrchestrator, DatabaseService
-from ..services.modules.semantic_search_service import SemanticSearchService
+from ..services.modules import BucketManager
 from ..services.modules.rag_service import RAGService
-from ..services.modules.form_creation_service import FormCreationService
-from ..services.modules.llm_client import LLMClient
-from ..services.modules.prompt_service import PromptService
-from ..services.pdf_processor import PDFProcessor
-from ..services.organize_documents import OrganizeDocumentsService
-from ..services.organize_smart_folders import OrganizeSmartFoldersService
-from ..services.generate_form_app import GenerateFormAppService
-from ..services.generate_embeddings import GenerateEmbeddingsService
+from ..services.spooled_pdf import UploadTooLargeError, release_spooled_pdf, spool_upload
+from ..services.analysis_events import close_analysis_event_stream, open_analysis_event_stream
+from .dependencies import (
+    get_llm_client, get_document_type_detector, get_document_service,
+    get_organize_documents_service, get_organize_smart_folders_service, get_auto_organize_service,
+    get_generate_form_app_service, get_generate_embeddings_service, get_pdf_processor,
+    get_form_creation_service
+)
 
 logger = logging.getLogger(__name__)
 
@@ -150,33 +153,8 @@ def _cleanup_stale_tokens():
                 _cancellation_tokens.pop(token_id, None)
             logger.debug(f"🧹 Cleaned up {len(tokens_to_remove)} stale cancellation tokens")
 
-# Initialize services
-# Initialize LLM client first (needed by document type detector)
-llm_client = LLMClient()
-prompt_service = PromptService()
-
-# Initialize document type detector with LLM client
-document_type_detector = DocumentTypeDetector(llm_client=llm_client)
-
-# Initialize the new document processing orchestrator with all dependencies
-document_service = DocumentProcessingOrchestrator(
-    type_detector=document_type_detector,
-    document_analyzer=DocumentAnalysisService(),
-    bucket_manager=BucketManager(get_supabase_client()),
-    database_service=DatabaseService()
-)
-
-from ..services.auto_organize_service import auto_organize_service
-
-semantic_search_service = SemanticSearchService()
-organize_documents_service = OrganizeDocumentsService()
-organize_smart_folders_service = OrganizeSmartFoldersService()
-generate_form_app_service = GenerateFormAppService()
-generate_embeddings_service = GenerateEmbeddingsService()
-pdf_processor = PDFProcessor()
-
-# Initialize form creation service
-form_creation_service = FormCreationService(llm_client, prompt_service)
+# Services are lazily-created singletons injected with Depends (see dependencies.py),
+# so importing this module does not construct them or load any models
 
 # Request/Response models for image preview
 class ImagePreviewRequest(BaseModel):
@@ -189,12 +167,167 @@ class ImagePreviewResponse(BaseModel):
     message: str
 
 @analyze_router.post("/analyze-document", response_model=DocumentAnalysisResponse)
-async def analyze_document(request: DocumentAnalysisRequest):
+async def analyze_document(request: DocumentAnalysisRequest, document_service=Depends(get_document_service)):
     """
     Analyze document using AI-powered template matching and field extraction
     """
-    # Generate unique request ID for cancellation support
+    logger.info(f"Document data length: {len(request.documentData) if request.documentData else 0}")
+    logger.info(f"Document data type: {'PDF' if request.documentData and request.documentData.startswith('data:application/pdf') else 'Image' if request.documentData and request.documentData.startswith('data:image/') else 'Text'}")
+    return await _run_document_analysis(request, request.documentData, document_service)
+
+@analyze_router.post("/analyze-document/upload", response_model=DocumentAnalysisResponse)
+async def analyze_document_upload(
+    file: UploadFile = File(...),
+    task: str = Form(...),
+    documentName: Optional[str] = Form(None),
+    userId: Optional[str] = Form(None),
+    saveToDatabase: bool = Form(False),
+    enhancedTemplates: Optional[str] = Form(None),
+    maxWorkers: Optional[int] = Form(None),
+    maxThreads: Optional[int] = Form(None),
+    yoloSignatureEnabled: Optional[bool] = Form(None),
+    yoloFaceEnabled: Optional[bool] = Form(None),
+    documentType: Optional[str] = Form(None),
+    document_service=Depends(get_document_service)
+):
+    """
+    Analyze an uploaded PDF sent as multipart/form-data (same fields as /analyze-document,
+    enhancedTemplates as a JSON string).
+    
+    The file is streamed to a temp file and memory-mapped instead of travelling as a
+    base64 data URL, so large scans never sit in worker memory as JSON + string + bytes.
+    """
+    from ..core.config import settings
+    
+    try:
+        templates = json.loads(enhancedTemplates) if enhancedTemplates else None
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"enhancedTemplates is not valid JSON: {e}")
+    
+    try:
+        pdf_buffer = await spool_upload(
+            file, settings.ANALYZE_UPLOAD_MAX_MB * 1024 * 1024, settings.UPLOAD_SPOOL_DIR
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await file.close()
+    
+    try:
+        if pdf_buffer[:4] != b"%PDF":
+            raise HTTPException(status_code=415, detail="Only PDF uploads are supported on this endpoint")
+        
+        request = DocumentAnalysisRequest(
+            documentData="",
+            task=task,
+            documentName=documentName or file.filename,
+            userId=userId,
+            saveToDatabase=saveToDatabase,
+            enhancedTemplates=templates,
+            maxWorkers=maxWorkers,
+            maxThreads=maxThreads,
+            yoloSignatureEnabled=yoloSignatureEnabled,
+            yoloFaceEnabled=yoloFaceEnabled,
+            documentType=documentType
+        )
+        logger.info(f"Document upload size: {len(pdf_buffer)} bytes (spooled)")
+        return await _run_document_analysis(request, pdf_buffer, document_service)
+    finally:
+        release_spooled_pdf(pdf_buffer)
+
+@analyze_router.post("/analyze-document/stream")
+async def analyze_document_stream(request: DocumentAnalysisRequest, document_service=Depends(get_document_service)):
+    """
+    Analyze document like /analyze-document, streaming progress as server-sent events.
+    
+    Events: started, stage (type detection, extraction, storage, database), pages_started,
+    page_stage, page (one per finished page with its fields), heartbeat, then result (the
+    /analyze-document response) or error.
+    """
+    events = _stream_document_analysis(request, request.documentData, document_service)
+    return StreamingResponse(
+        _format_sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@analyze_router.websocket("/ws/analyze-document")
+async def analyze_document_websocket(websocket: WebSocket, document_service=Depends(get_document_service)):
+    """
+    Analyze document over a WebSocket: the client sends one /analyze-document request body
+    as JSON and receives the same events as /analyze-document/stream, one JSON message each.
+    """
+    await websocket.accept()
+    try:
+        try:
+            request = DocumentAnalysisRequest(**(await websocket.receive_json()))
+        except (ValueError, TypeError) as e:
+            await websocket.send_json({"event": "error", "status": 422, "detail": f"Invalid analysis request: {e}"})
+            await websocket.close(code=1003)
+            return
+        
+        events = _stream_document_analysis(request, request.documentData, document_service)
+        try:
+            async for event in events:
+                await websocket.send_json(jsonable_encoder(event))
+        finally:
+            # Closing the stream early cancels the analysis
+            await events.aclose()
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("Analysis WebSocket client disconnected")
+
+async def _stream_document_analysis(
+    request: DocumentAnalysisRequest, document_data, document_service
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run an analysis in the background and yield its progress events, then its result.
+    
+    If the consumer stops early (client disconnected), the request is cancelled.
+    """
     request_id = str(uuid.uuid4())
+    event_stream = open_analysis_event_stream(request_id)
+    analysis_task = asyncio.create_task(
+        _run_document_analysis(request, document_data, document_service, request_id=request_id)
+    )
+    analysis_task.add_done_callback(lambda task: event_stream.close())
+    
+    try:
+        yield {"event": "started", "requestId": request_id, "task": request.task, "documentName": request.documentName}
+        async for event in event_stream.events():
+            yield event
+        
+        try:
+            result = await analysis_task
+            yield {"event": "result", "requestId": request_id, "result": jsonable_encoder(result)}
+        except HTTPException as e:
+            yield {"event": "error", "requestId": request_id, "status": e.status_code, "detail": e.detail}
+    finally:
+        close_analysis_event_stream(request_id)
+        if not analysis_task.done():
+            logger.info(f"🛑 Streaming client gone - cancelling analysis (Request ID: {request_id})")
+            with _cancellation_lock:
+                cancellation_event = _cancellation_tokens.get(request_id)
+            if cancellation_event:
+                cancellation_event.set()
+            analysis_task.cancel()
+
+async def _format_sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Encode analysis events as server-sent events (heartbeats as SSE comments)"""
+    async for event in events:
+        if event["event"] == "heartbeat":
+            yield ": heartbeat\n\n"
+            continue
+        yield f"event: {event['event']}\ndata: {json.dumps(jsonable_encoder(event))}\n\n"
+
+async def _run_document_analysis(
+    request: DocumentAnalysisRequest, document_data, document_service, request_id: Optional[str] = None
+):
+    """Run the orchestrator for any analyze endpoint with cancellation support"""
+    # Generate unique request ID for cancellation support
+    request_id = request_id or str(uuid.uuid4())
     cancellation_event = threading.Event()
     
     # CRITICAL FIX #7: Cleanup stale tokens periodically
@@ -206,11 +339,9 @@ async def analyze_document(request: DocumentAnalysisRequest):
     try:
         logger.info(f"Received document analysis request for task: {request.task} (Request ID: {request_id})")
         logger.info(f"Document name: {request.documentName}")
-        logger.info(f"Document data length: {len(request.documentData) if request.documentData else 0}")
-        logger.info(f"Document data type: {'PDF' if request.documentData and request.documentData.startswith('data:application/pdf') else 'Image' if request.documentData and request.documentData.startswith('data:image/') else 'Text'}")
         
         result = await document_service.analyze_document(
-            document_data=request.documentData,
+            document_data=document_data,
             task=request.task,
             document_name=request.documentName,
             user_id=request.userId,
@@ -294,6 +425,8 @@ async def direct_save(request: DirectSaveRequest):
         except Exception as e:
             logger.error(f"❌ Error generating vector embeddings: {e}")
             chunks_data = None
+        finally:
+            await embedding_service.close()
         
         # Decide: Update existing document or create new
         if request.documentId:
@@ -341,7 +474,10 @@ async def direct_save(request: DirectSaveRequest):
         )
 
 @analyze_router.post("/organize-existing-documents", response_model=OrganizeDocumentsResponse)
-async def organize_existing_documents(request: OrganizeDocumentsRequest):
+async def organize_existing_documents(
+    request: OrganizeDocumentsRequest,
+    organize_documents_service=Depends(get_organize_documents_service)
+):
     """
     Organize existing documents into a smart folder
     """
@@ -361,7 +497,10 @@ async def organize_existing_documents(request: OrganizeDocumentsRequest):
         )
 
 @analyze_router.post("/organize-smart-folders", response_model=OrganizeSmartFoldersResponse)
-async def organize_smart_folders(request: OrganizeSmartFoldersRequest):
+async def organize_smart_folders(
+    request: OrganizeSmartFoldersRequest,
+    organize_smart_folders_service=Depends(get_organize_smart_folders_service)
+):
     """
     Organize a document into smart folders
     """
@@ -381,7 +520,7 @@ async def organize_smart_folders(request: OrganizeSmartFoldersRequest):
         )
 
 @analyze_router.post("/auto-organize-documents", response_model=AutoOrganizeResponse)
-async def auto_organize_documents(request: AutoOrganizeRequest):
+async def auto_organize_documents(request: AutoOrganizeRequest, auto_organize_service=Depends(get_auto_organize_service)):
     """
     Automatically organize all documents by document type.
     Creates folders for each document type and assigns documents to them.
@@ -402,7 +541,7 @@ async def auto_organize_documents(request: AutoOrganizeRequest):
         )
 
 @analyze_router.post("/process-pending-documents", response_model=ProcessPendingResponse)
-async def process_pending_documents(request: ProcessPendingRequest):
+async def process_pending_documents(request: ProcessPendingRequest, auto_organize_service=Depends(get_auto_organize_service)):
     """
     Process pending documents that haven't been analyzed yet.
     Infers document type and prepares them for organization.
@@ -426,7 +565,7 @@ async def process_pending_documents(request: ProcessPendingRequest):
         )
 
 @analyze_router.post("/generate-form-app", response_model=GenerateFormAppResponse)
-async def generate_form_app(request: GenerateFormAppRequest):
+async def generate_form_app(request: GenerateFormAppRequest, generate_form_app_service=Depends(get_generate_form_app_service)):
     """
     Generate a form application based on the request
     """
@@ -446,7 +585,10 @@ async def generate_form_app(request: GenerateFormAppRequest):
         )
 
 @analyze_router.post("/generate-embeddings", response_model=GenerateEmbeddingsResponse)
-async def generate_embeddings(request: GenerateEmbeddingsRequest):
+async def generate_embeddings(
+    request: GenerateEmbeddingsRequest,
+    generate_embeddings_service=Depends(get_generate_embeddings_service)
+):
     """
     Generate embeddings for text and optionally update document in database
     """
@@ -469,7 +611,7 @@ async def generate_embeddings(request: GenerateEmbeddingsRequest):
         )
 
 @analyze_router.post("/preview-images", response_model=ImagePreviewResponse)
-async def preview_images(request: ImagePreviewRequest):
+async def preview_images(request: ImagePreviewRequest, pdf_processor=Depends(get_pdf_processor)):
     """
     Convert PDF to images and return them for preview
     """
@@ -675,7 +817,7 @@ class FormCreationResponse(BaseModel):
     error: Optional[str] = None
 
 @analyze_router.post("/create-form-from-document", response_model=FormCreationResponse)
-async def create_form_from_document(request: FormCreationRequest):
+async def create_form_from_document(request: FormCreationRequest, form_creation_service=Depends(get_form_creation_service)):
     """
     Create form structure from a document (PDF or image) using AI
     """
@@ -757,7 +899,7 @@ async def cancel_request(cancel_request: CancelRequestRequest):
         )
 
 @analyze_router.post("/warmup", response_model=WarmupResponse)
-async def warmup_connections():
+async def warmup_connections(llm_client=Depends(get_llm_client)):
     """
     Warm up HTTP connections by initializing the connection pool
     This should be called when a user uploads a file to pre-establish connections
@@ -797,7 +939,8 @@ async def warmup_connections():
 @analyze_router.post("/detect-document-type", response_model=DetectDocumentTypeResponse)
 async def detect_document_type(
     file: bytes = Depends(lambda: None),
-    request: DetectDocumentTypeRequest = None
+    request: DetectDocumentTypeRequest = None,
+    document_type_detector=Depends(get_document_type_detector)
 ):
     """
     Detect document type from uploaded PDF.
@@ -825,7 +968,7 @@ async def detect_document_type(
 
 
 @analyze_router.get("/document-types", response_model=GetDocumentTypesResponse)
-async def get_document_types():
+async def get_document_types(document_type_detector=Depends(get_document_type_detector)):
     """
     Get list of all known document types.
     Returns type names, display names, icons, and colors.
@@ -21,13 +21,39 @@ class Settings(BaseSettings):
     # LLM Output Configuration
     LLM_MAX_OUTPUT_TOKENS: int = 16384  # Max output tokens for LLM responses (increase for complex pages)
 
+    # LLM Response Cache Configuration (identical requests are answered without calling the LLM)
+    LLM_RESPONSE_CACHE_BACKEND: str = "none"  # Opt in per deployment: "memory" (per process), "sqlite" (shared on host) or "none"
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 86400  # How long a cached response stays valid
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 5000  # Maximum cached responses (LRU eviction)
+    LLM_RESPONSE_CACHE_PATH: str = ""  # SQLite file for the "sqlite" backend ("" = <system temp>/llm_response_cache.sqlite3)
+
+    # LLM Rate Limiter Configuration (process-wide, shared by every LLM call)
+    LLM_RATE_LIMITER_ENABLED: bool = True  # Enforce the adaptive concurrency limit and budgets (429 cooldown always applies)
+    LLM_MIN_CONCURRENCY: int = 4  # Floor for the adaptive in-flight limit
+    LLM_MAX_CONCURRENCY: int = 100  # Ceiling for the adaptive in-flight limit (matches the pipeline LLM pool)
+    LLM_INITIAL_CONCURRENCY: int = 32  # Starting in-flight limit; grows on success, halves on 429/503
+    LLM_REQUESTS_PER_MINUTE: int = 0  # Gateway request budget (0 = unlimited)
+    LLM_TOKENS_PER_MINUTE: int = 0  # Gateway token budget, tracked from response usage (0 = unlimited)
+    LLM_TARGET_LATENCY_SECONDS: float = 60.0  # Calls slower than this shrink the limit (0 = ignore latency)
+
     # Supabase Configuration (read from backend/.env)
     SUPABASE_URL: str = ""
     SUPABASE_SERVICE_ROLE_KEY: str = ""
+    SUPABASE_ASYNC_MAX_CONNECTIONS: int = 50  # Pooled connections of the async PostgREST client (per event loop)
+    SUPABASE_ASYNC_TIMEOUT_SECONDS: float = 30.0  # Request timeout of the async PostgREST client
 
     # Document Analysis Configuration
     MIN_CONFIDENCE_THRESHOLD: float = 0.6  # 60% minimum confidence
 
+    # Semantic Search Vector Index Configuration (in-process fallback when the SQL vector search fails)
+    VECTOR_INDEX_ENABLED: bool = True  # Keep per-user vector indexes for the fallback search
+    VECTOR_INDEX_DIR: str = ""  # Index directory ("" = <system temp>/semantic_vector_index); share it between API workers
+    VECTOR_INDEX_MAX_USERS: int = 64  # Per-user indexes kept in memory (others stay on disk)
+    VECTOR_INDEX_MAX_AGE_SECONDS: int = 86400  # Rebuild a user's index from the database after this long
+    VECTOR_INDEX_IVF_MIN_ROWS: int = 20000  # Switch from exact to IVF search at this many chunks per user
+    VECTOR_INDEX_IVF_NPROBE: int = 16  # IVF lists scored per query (higher = better recall, slower)
+    VECTOR_INDEX_FLUSH_SECONDS: float = 5.0  # Batch index updates and write them to disk this often (0 = every update)
+
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
@@ -42,10 +68,34 @@ class Settings(BaseSettings):
     # Parallel Processing Configuration
     PDF_PROCESSING_MAX_WORKERS: int = 10  # Number of pages to process concurrently (default: 10)
     
+    # PDF Document Cache Configuration (process-wide, shared by all requests)
+    PDF_DOCUMENT_CACHE_MAX_MB: int = 512  # Byte budget for cached opened PDFs; pinned documents are never evicted
+    PDF_DOCUMENT_CACHE_MAX_ENTRIES: int = 64  # Maximum number of opened PDFs kept in the cache
+    
+    # PDF Rendering Backend Configuration
+    PDF_RENDER_MODE: str = "thread"  # Options: "thread" or "process" (render/enhance/encode pages in worker processes)
+    PDF_RENDER_PROCESSES: int = 0  # Render worker processes in "process" mode (0 = one per CPU core)
+    PDF_RENDER_PAGES_PER_TASK: int = 4  # Pages rendered per worker task in "process" mode
+    
+    # Page Render Cache Configuration (disk-backed, can be shared with backend-bulk)
+    PAGE_RENDER_CACHE_ENABLED: bool = True  # Cache encoded pages and text results on local disk
+    PAGE_RENDER_CACHE_DIR: str = ""  # Cache directory ("" = <system temp>/page_render_cache); share it between services
+    PAGE_RENDER_CACHE_MAX_MB: int = 2048  # Size cap for the page render cache (LRU eviction)
+    
+    # Document Session Configuration (per-request renders shared by type detection and extraction)
+    DOCUMENT_SESSION_MAX_MB: int = 256  # Memory budget for one request's memoized page renders (LRU beyond it)
+    
     # Text Extraction Configuration
     PDF_PREFER_TEXT_EXTRACTION: bool = True  # Prefer text extraction over image conversion when possible
     PDF_TEXT_CONFIDENCE_THRESHOLD: float = 0.6  # Minimum confidence (0-1) to use text extraction
     
+    # Upload Configuration (multipart /analyze-document/upload streams to disk instead of base64 JSON)
+    ANALYZE_UPLOAD_MAX_MB: int = 250  # Largest accepted upload
+    UPLOAD_SPOOL_DIR: str = ""  # Directory for spooled uploads (empty = system temp dir)
+    
+    # Startup Configuration (services and models are created lazily on first use)
+    SERVICE_WARMUP_MODE: str = "background"  # "off" (first request loads), "background" (after startup) or "blocking" (before serving)
+    
     # Logging Configuration
     LOG_FILE_MAX_SIZE: int = 50  # Maximum log file size in MB before rotation
     LOG_FILE_BACKUP_COUNT: int = 5  # Number of backup log files to keep
@@ -65,6 +115,10 @@ class Settings(BaseSettings):
     
     # Shared YOLO Configuration
     YOLO_USE_GPU: bool = False  # Use GPU for YOLO inference (if available)
+    YOLO_BACKEND: str = "torch"  # Inference backend: "torch" (ultralytics), "onnx" or "openvino" (ONNX Runtime, CPU)
+    YOLO_ONNX_MODEL_PATH: str = ""  # Exported signature model (default: YOLO_MODEL_PATH with .onnx suffix)
+    YOLO_FACE_ONNX_MODEL_PATH: str = ""  # Exported face model (default: YOLO_FACE_MODEL_PATH with .onnx suffix)
+    YOLO_ONNX_THREADS: int = 0  # ONNX Runtime intra-op threads (0 = one per core)
     
     # Legacy support - keep YOLO_MODEL_PATH for backward compatibility
     YOLO_MODEL_PATH: str = "models/signature_detector.pt"  # Deprecated: use YOLO_SIGNATURE_MODEL_PATH
@@ -0,0 +1,94 @@
+"""
+Startup Profile
+Where the API process spends its cold start, exposed on /health
+
+main.py imports each router inside a phase; a phase records its wall time and the
+top-level packages it pulled in for the first time (so "app.api.routes: 1.9s, loaded
+fitz, cv2, ..." points at the import to defer). Lazily-created services record their
+construction time when first requested or warmed up. For a per-module breakdown of a
+single phase, run the app once with python -X importtime.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Top-level packages listed per phase
+_MAX_PACKAGES_PER_PHASE = 15
+
+
+class StartupProfile:
+    """Import phases, service initialization times and readiness of this process"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._phases: List[Dict[str, Any]] = []
+        self._services: Dict[str, Dict[str, Any]] = {}
+        self._ready_seconds: Optional[float] = None
+        self._warmup: Dict[str, Any] = {"state": "pending"}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time an import phase and note the packages it loaded"""
+        modules_before = set(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            new_modules = set(sys.modules) - modules_before
+            packages: Dict[str, int] = {}
+            for module_name in new_modules:
+                top_level = module_name.split(".", 1)[0]
+                if top_level.startswith("_"):
+                    continue
+                packages[top_level] = packages.get(top_level, 0) + 1
+            heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:_MAX_PACKAGES_PER_PHASE]
+            with self._lock:
+                self._phases.append({
+                    "name": name,
+                    "seconds": round(seconds, 3),
+                    "modules_loaded": len(new_modules),
+                    "packages": {package: count for package, count in heaviest},
+                })
+
+    def record_service(self, name: str, seconds: float, during_warmup: bool = False) -> None:
+        """Record how long a lazily-created service (or model) took to initialize"""
+        with self._lock:
+            self._services[name] = {
+                "seconds": round(seconds, 3),
+                "during_warmup": during_warmup,
+                "at_seconds": round(time.perf_counter() - self._start, 3),
+            }
+
+    def mark_ready(self) -> None:
+        """Application startup finished (first moment requests can be served)"""
+        with self._lock:
+            if self._ready_seconds is None:
+                self._ready_seconds = time.perf_counter() - self._start
+
+    def set_warmup(self, state: str, **details: Any) -> None:
+        with self._lock:
+            self._warmup = {"state": state, **details}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Profile for /health"""
+        with self._lock:
+            phases = list(self._phases)
+            return {
+                "started_at": self.started_at,
+                "uptime_seconds": round(time.perf_counter() - self._start, 1),
+                "ready_seconds": round(self._ready_seconds, 3) if self._ready_seconds is not None else None,
+                "import_seconds": round(sum(phase["seconds"] for phase in phases), 3),
+                "phases": sorted(phases, key=lambda phase: phase["seconds"], reverse=True),
+                "services": dict(self._services),
+                "warmup": dict(self._warmup),
+            }
+
+
+# Created on first import of this module - main.py imports it before anything heavy
+startup_profile = StartupProfile()
@@ -1,10 +1,25 @@
 import os
+import asyncio
 import logging
+import weakref
 from supabase import create_client, Client
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Async PostgREST client (non-blocking data access for async handlers)
+try:
+    import httpx
+    from postgrest import AsyncPostgrestClient
+    ASYNC_POSTGREST_AVAILABLE = True
+except ImportError:
+    ASYNC_POSTGREST_AVAILABLE = False
+    AsyncPostgrestClient = None  # type: ignore
+    logger.warning("postgrest/httpx not available, async Supabase client disabled")
+
+# One pooled client per event loop - httpx connections belong to the loop that opened them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncPostgrestClient]" = weakref.WeakKeyDictionary()
+
 # Check if supabase is available
 try:
     import supabase
@@ -42,4 +57,69 @@ def get_supabase_client() -> Optional[Client]:
             return None
     except Exception as e:
         logger.error(f"Failed to initialize Supabase client: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def get_async_supabase_client() -> Optional["AsyncPostgrestClient"]:
+    """
+    Get the non-blocking PostgREST client for the running event loop
+
+    Exposes the same table()/rpc() query builders as get_supabase_client(), but
+    `await ....execute()` yields to the event loop instead of blocking the whole
+    uvicorn worker for the round trip. Requests share a pooled HTTP/2 connection set.
+    Storage and auth calls are not covered - keep using the sync client for those.
+
+    Must be called from a coroutine (the client is bound to the running loop).
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is not None:
+        return client
+
+    if not ASYNC_POSTGREST_AVAILABLE:
+        return None
+
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not supabase_url or not supabase_key:
+        logger.warning("Supabase credentials not found in environment variables")
+        return None
+
+    from .config import settings
+
+    rest_url = f"{supabase_url.rstrip('/')}/rest/v1"
+    headers = {
+        "apikey": supabase_key,
+        "Authorization": f"Bearer {supabase_key}",
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+    client_options = dict(
+        base_url=rest_url,
+        headers=headers,
+        timeout=httpx.Timeout(settings.SUPABASE_ASYNC_TIMEOUT_SECONDS, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=settings.SUPABASE_ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPABASE_ASYNC_MAX_CONNECTIONS,
+            keepalive_expiry=30.0,
+        ),
+        follow_redirects=True,
+    )
+    try:
+        http_client = httpx.AsyncClient(http2=True, **client_options)
+    except ImportError:
+        # h2 not installed - HTTP/1.1 keep-alive pooling still avoids per-request handshakes
+        http_client = httpx.AsyncClient(**client_options)
+
+    client = AsyncPostgrestClient(rest_url, headers=headers, http_client=http_client)
+    _async_clients[loop] = client
+    logger.info(f"✅ Async Supabase (PostgREST) client initialized - pool size {settings.SUPABASE_ASYNC_MAX_CONNECTIONS}")
+    return client
+
+
+async def close_async_supabase_client() -> None:
+    """Close the running loop's async PostgREST client (call on shutdown)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+        logger.info("✅ Async Supabase client closed")
@@ -1,3 +1,7 @@
+import asyncio
+import importlib
+
+from .core.startup_profile import startup_profile
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -15,19 +19,26 @@ env_file_path = backend_dir / ".env"
 if env_file_path.exists():
     load_dotenv(env_file_path)
 
-from .api.routes import analyze_router
-from .api.quick_access import router as quick_access_router
-from .api.checkinout import router as checkinout_router
-from .api.ownership_transfers import router as ownership_transfers_router
-from .api.shares import router as shares_router
-from .api.rules import router as rules_router
-from .api.guest import router as guest_router
-from .api.signatures import router as signatures_router
-from .api.watermarks import router as watermarks_router
-from .api.migration import router as migration_router
-from .api.document_editor import router as document_editor_router
-from .api.ai_routes import router as ai_router
-from .core.config import settings
+def _import_router(module_name: str, attribute: str = "router"):
+    """Import a router module as its own startup profile phase"""
+    with startup_profile.phase(f"app{module_name}"):
+        return getattr(importlib.import_module(module_name, __package__), attribute)
+
+with startup_profile.phase("app.core.config"):
+    from .core.config import settings
+
+analyze_router = _import_router(".api.routes", "analyze_router")
+quick_access_router = _import_router(".api.quick_access")
+checkinout_router = _import_router(".api.checkinout")
+ownership_transfers_router = _import_router(".api.ownership_transfers")
+shares_router = _import_router(".api.shares")
+rules_router = _import_router(".api.rules")
+guest_router = _import_router(".api.guest")
+signatures_router = _import_router(".api.signatures")
+watermarks_router = _import_router(".api.watermarks")
+migration_router = _import_router(".api.migration")
+document_editor_router = _import_router(".api.document_editor")
+ai_router = _import_router(".api.ai_routes")
 
 # Configure logging with both console and file handlers
 log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
@@ -160,6 +171,35 @@ app.include_router(migration_router)
 app.include_router(document_editor_router, prefix="/api")
 app.include_router(ai_router)
 
+async def _warm_up_services():
+    """Create services and load models in a worker thread (see SERVICE_WARMUP_MODE)"""
+    from .api.dependencies import warm_up_services
+    startup_profile.set_warmup("running")
+    try:
+        result = await asyncio.to_thread(warm_up_services)
+        startup_profile.set_warmup("done", **result)
+    except Exception as e:
+        logger.warning(f"⚠️ Service warm-up failed (services load on first use): {e}")
+        startup_profile.set_warmup("failed", error=str(e))
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Fast start: no service or model is created at import time. Depending on
+    SERVICE_WARMUP_MODE they are created before serving, right after startup, or on
+    their first request.
+    """
+    mode = settings.SERVICE_WARMUP_MODE.lower()
+    if mode == "blocking":
+        await _warm_up_services()
+    elif mode == "background":
+        app.state.warmup_task = asyncio.create_task(_warm_up_services())
+    else:
+        startup_profile.set_warmup("off")
+    startup_profile.mark_ready()
+    profile = startup_profile.snapshot()
+    logger.info(f"🚀 Ready in {profile['ready_seconds']:.2f}s (imports {profile['import_seconds']:.2f}s, warm-up: {mode})")
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """
@@ -169,8 +209,9 @@ async def shutdown_event():
     try:
         logger.info("🛑 Application shutting down - cleaning up resources...")
         
-        # Close async HTTP client from LLMClient
-        from .api.routes import llm_client
+        # Close async HTTP client from LLMClient (only if it was ever created)
+        from .api.dependencies import get_initialized_service
+        llm_client = get_initialized_service("llm_client")
         if llm_client and hasattr(llm_client, '_http_client') and llm_client._http_client:
             try:
                 await llm_client.close()
@@ -178,6 +219,13 @@ async def shutdown_event():
             except Exception as e:
                 logger.warning(f"⚠️ Error closing async HTTP client: {e}")
         
+        # Close the pooled async Supabase (PostgREST) client
+        from .core.supabase_client import close_async_supabase_client
+        try:
+            await close_async_supabase_client()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing async Supabase client: {e}")
+        
         # Cleanup cancellation tokens
         from .api.routes import _cancellation_tokens, _cancellation_lock
         with _cancellation_lock:
@@ -194,7 +242,7 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "document-analysis-api"}
+    return {"status": "healthy", "service": "document-analysis-api", "startup": startup_profile.snapshot()}
 
 if __name__ == "__main__":
     uvicorn.run(
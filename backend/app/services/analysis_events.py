@@ -0,0 +1,128 @@
+"""
+Analysis Event Streams
+Per-request progress events for the streaming /analyze-document endpoints
+
+/analyze-document only answers once every page is extracted and merged. The streaming
+variants (SSE and WebSocket) open an event stream under the request's ID before starting
+the analysis; code deeper in the pipeline publishes to it by request_id, which is already
+passed down to the parallel page pipeline for cancellation:
+
+    emit_analysis_event(request_id, "page", page=3, fields=[...])
+
+Publishing is a no-op when no stream is open for the request (the plain JSON endpoint),
+and safe from pool threads - events are handed to the stream's event loop.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stream in its queue
+_CLOSED = object()
+
+# Per-page result keys not sent in page events (base64 page images, raw LLM response) -
+# they are part of the final result event
+_PAGE_EVENT_EXCLUDED_KEYS = {"page_image_processed", "page_image_original", "page_result"}
+
+
+class AnalysisEventStream:
+    """Events for one analysis request, consumed by a single streaming response"""
+
+    def __init__(self, request_id: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.request_id = request_id
+        self._loop = loop or asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+
+    def emit(self, event: str, **data: Any) -> None:
+        """Publish an event (callable from any thread)"""
+        if self._closed:
+            return
+        payload = {"event": event, "requestId": self.request_id, "timestamp": time.time(), **data}
+        self._put(payload)
+
+    def close(self) -> None:
+        """End the stream; events() returns once queued events are consumed"""
+        if self._closed:
+            return
+        self._closed = True
+        self._put(_CLOSED)
+
+    async def events(self, heartbeat_seconds: float = 15) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield events until the stream is closed
+
+        A heartbeat event is yielded after heartbeat_seconds without events, so proxies
+        do not drop the connection during a long LLM call.
+        """
+        while True:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield {"event": "heartbeat", "requestId": self.request_id, "timestamp": time.time()}
+                continue
+            if item is _CLOSED:
+                return
+            yield item
+
+    def _put(self, item: Any) -> None:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._queue.put_nowait(item)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop already closed - the client went away
+            pass
+
+
+_streams: Dict[str, AnalysisEventStream] = {}
+_streams_lock = threading.Lock()
+
+
+def open_analysis_event_stream(request_id: str) -> AnalysisEventStream:
+    """Register an event stream for request_id (call from the event loop)"""
+    stream = AnalysisEventStream(request_id)
+    with _streams_lock:
+        _streams[request_id] = stream
+    return stream
+
+
+def close_analysis_event_stream(request_id: str) -> None:
+    """Unregister and close the stream for request_id, if any"""
+    with _streams_lock:
+        stream = _streams.pop(request_id, None)
+    if stream is not None:
+        stream.close()
+
+
+def get_analysis_event_stream(request_id: Optional[str]) -> Optional[AnalysisEventStream]:
+    """Open stream for request_id, or None if nobody is listening"""
+    if not request_id:
+        return None
+    return _streams.get(request_id)
+
+
+def emit_analysis_event(request_id: Optional[str], event: str, **data: Any) -> None:
+    """Publish an event for request_id if a stream is open for it"""
+    stream = get_analysis_event_stream(request_id)
+    if stream is not None:
+        stream.emit(event, **data)
+
+
+def page_event_payload(page_num: int, page_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of a finished page's pipeline result to send in a page event"""
+    payload = {key: value for key, value in page_result.items() if key not in _PAGE_EVENT_EXCLUDED_KEYS}
+    payload["page_num"] = page_num + 1
+    llm_result = page_result.get("page_result") or {}
+    if isinstance(llm_result, dict) and llm_result.get("usage"):
+        payload["usage"] = llm_result["usage"]
+    return payload
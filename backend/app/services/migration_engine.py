@@ -43,6 +43,12 @@ class MigrationEngine:
         self.last_metrics_time: float = 0
         self.metrics_interval: float = 5.0  # Record metrics every 5 seconds
         self.throttle_count: int = 0
+
+    @property
+    def async_db(self):
+        """Non-blocking PostgREST client for the per-file transfer path"""
+        from ..core.supabase_client import get_async_supabase_client
+        return get_async_supabase_client()
         
     async def start_migration(self):
         """Start ultra-fast migration with timing."""
@@ -285,7 +291,8 @@ class MigrationEngine:
             storage_path = f"{user_id}/{timestamp}_{file_name}"
             
             upload_start = time.time()
-            self.supabase.storage.from_('documents').upload(
+            await asyncio.to_thread(
+                self.supabase.storage.from_('documents').upload,
                 storage_path,
                 file_content,
                 {'content-type': item['source_mime_type']}
@@ -293,7 +300,7 @@ class MigrationEngine:
             upload_time = time.time() - upload_start
             
             # Create document + update item in minimal DB calls
-            doc_response = self.supabase.table('documents').insert({
+            doc_response = await self.async_db.table('documents').insert({
                 'user_id': user_id,
                 'file_name': file_name,
                 'file_type': item['source_mime_type'],
@@ -307,7 +314,7 @@ class MigrationEngine:
                 }
             }).execute()
             
-            self.supabase.table('migration_items').update({
+            await self.async_db.table('migration_items').update({
                 'status': 'completed',
                 'target_document_id': doc_response.data[0]['id']
             }).eq('id', item['id']).execute()
@@ -326,7 +333,7 @@ class MigrationEngine:
             self.failed_count += 1
             logger.error(f"❌ {file_name}: {str(e)[:100]}")
             
-            self.supabase.table('migration_items').update({
+            await self.async_db.table('migration_items').update({
                 'status': 'failed',
                 'last_error': str(e)[:500]
             }).eq('id', item['id']).execute()
@@ -4,8 +4,9 @@ Manages Supabase storage bucket for documents.
 All documents are stored in a single 'documents' bucket.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Union
 from supabase import Client
 
 logger = logging.getLogger(__name__)
@@ -131,7 +132,7 @@ class BucketManager:
         self,
         bucket_name: str = None,
         file_path: str = "",
-        file_bytes: bytes = b"",
+        file_bytes: Union[bytes, str] = b"",
         content_type: str = "application/pdf"
     ) -> Dict[str, Any]:
         """
@@ -140,7 +141,7 @@ class BucketManager:
         Args:
             bucket_name: Ignored - all files go to 'documents' bucket (kept for backward compatibility)
             file_path: Path within bucket
-            file_bytes: File content
+            file_bytes: File content, or the path of a local file to stream from
             content_type: MIME type
             
         Returns:
@@ -151,7 +152,9 @@ class BucketManager:
             await self.get_or_create_bucket()
             
             # Always upload to 'documents' bucket
-            result = self.supabase.storage.from_(DEFAULT_BUCKET).upload(
+            # Storage API is sync-only: run it off the event loop (large scans take a while)
+            result = await asyncio.to_thread(
+                self.supabase.storage.from_(DEFAULT_BUCKET).upload,
                 file_path,
                 file_bytes,
                 {"content-type": content_type}
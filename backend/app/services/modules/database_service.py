@@ -3,12 +3,16 @@ Database Service
 Handles all database operations for document analysis
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 import os
 from datetime import datetime
 import uuid
 
+from ..pdf_processor import PDFDocumentHandle
+from ..spooled_pdf import open_pdf_document, storage_upload_source
+
 try:
     from supabase import create_client
     SUPABASE_AVAILABLE = True
@@ -25,6 +29,15 @@ class DatabaseService:
     def __init__(self):
         self.supabase = self._initialize_supabase()
 
+    @property
+    def async_db(self):
+        """
+        Non-blocking PostgREST client for the async methods (same tables as self.supabase)
+        Queries are awaited, so a slow round trip no longer stalls the event loop
+        """
+        from ...core.supabase_client import get_async_supabase_client
+        return get_async_supabase_client()
+
     def _initialize_supabase(self):
         """Initialize Supabase client"""
         try:
@@ -60,7 +73,8 @@ class DatabaseService:
     async def save_document_chunks(
         self,
         document_id: str,
-        chunks_data: List[Dict[str, Any]]
+        chunks_data: List[Dict[str, Any]],
+        user_id: Optional[str] = None
     ) -> bool:
         """
         Save document chunks with embeddings to database.
@@ -68,6 +82,7 @@ class DatabaseService:
         Args:
             document_id: The document ID to associate chunks with
             chunks_data: List of dicts with keys: 'chunk', 'embedding', optionally 'token_count'
+            user_id: Owner of the document; when given, the user's semantic search vector index is updated
             
         Returns:
             True if successful, False otherwise
@@ -82,7 +97,7 @@ class DatabaseService:
                 return False
             
             # First, delete any existing chunks for this document
-            await self.delete_document_chunks(document_id)
+            await self.delete_document_chunks(document_id, user_id)
             
             # Prepare chunk records for insertion
             chunk_records = []
@@ -109,10 +124,13 @@ class DatabaseService:
             
             # Insert all chunks in batch
             logger.info(f"💾 Saving {len(chunk_records)} chunks for document {document_id}")
-            chunk_response = self.supabase.table("document_chunks").insert(chunk_records).execute()
+            chunk_response = await self.async_db.table("document_chunks").insert(chunk_records).execute()
             
             if chunk_response.data:
                 logger.info(f"✅ Saved {len(chunk_response.data)} chunks successfully")
+                if user_id:
+                    # Index updates are CPU-bound and take a lock, keep them off the event loop
+                    await asyncio.to_thread(self._update_vector_index, user_id, document_id, chunk_response.data)
                 return True
             else:
                 logger.error("Failed to save chunks - no response data")
@@ -124,12 +142,38 @@ class DatabaseService:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return False
     
-    async def delete_document_chunks(self, document_id: str) -> bool:
+    def _update_vector_index(self, user_id: str, document_id: str, saved_chunks: List[Dict[str, Any]]) -> None:
+        """Replace the document's rows in the user's in-process vector index (best effort)"""
+        try:
+            from .vector_index import get_vector_index_store, parse_embedding
+            store = get_vector_index_store()
+            if store is None:
+                return
+            store.upsert_document(user_id, document_id, [
+                (chunk["id"], parse_embedding(chunk.get("chunk_embedding")))
+                for chunk in saved_chunks
+                if chunk.get("id")
+            ])
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update vector index for document {document_id}: {e}")
+    
+    def _remove_from_vector_index(self, user_id: str, document_id: str) -> None:
+        """Drop the document's rows from the user's in-process vector index (best effort)"""
+        try:
+            from .vector_index import get_vector_index_store
+            store = get_vector_index_store()
+            if store is not None:
+                store.remove_document(user_id, document_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not remove document {document_id} from vector index: {e}")
+    
+    async def delete_document_chunks(self, document_id: str, user_id: Optional[str] = None) -> bool:
         """
         Delete all chunks for a document.
         
         Args:
             document_id: The document ID
+            user_id: Owner of the document; when given, its rows are dropped from the user's vector index
             
         Returns:
             True if successful, False otherwise
@@ -139,8 +183,10 @@ class DatabaseService:
         
         try:
             logger.info(f"🗑️ Deleting existing chunks for document {document_id}")
-            delete_response = self.supabase.table("document_chunks").delete().eq("document_id", document_id).execute()
+            delete_response = await self.async_db.table("document_chunks").delete().eq("document_id", document_id).execute()
             logger.info(f"✅ Deleted old chunks for document {document_id}")
+            if user_id:
+                await asyncio.to_thread(self._remove_from_vector_index, user_id, document_id)
             return True
         except Exception as e:
             logger.error(f"Error deleting document chunks: {e}")
@@ -154,7 +200,7 @@ class DatabaseService:
         
         try:
             logger.info("📋 Fetching templates from database (document_templates)...")
-            response = self.supabase.table("document_templates").select("*").execute()
+            response = await self.async_db.table("document_templates").select("*").execute()
             templates = response.data if response.data else []
             # Prefer active templates when a status column exists
             try:
@@ -171,7 +217,7 @@ class DatabaseService:
 
     async def save_document_to_database(
         self,
-        document_data: str,
+        document_data: Union[str, PDFDocumentHandle],
         result: Dict[str, Any],
         task: str,
         user_id: str,
@@ -230,48 +276,58 @@ class DatabaseService:
                 import uuid
                 from datetime import datetime
                 
-                data_url = document_data or ""
-                if data_url.startswith("data:"):
-                    # Extract file type and base64 data
-                    mime_part = data_url.split(";", 1)[0]
-                    if mime_part.startswith("data:"):
-                        file_type = mime_part[5:] or file_type
-                    
-                    base64_part = data_url.split("base64,", 1)[1] if "base64," in data_url else ""
-                    if base64_part:
-                        # Calculate file size
-                        import math
-                        padding = base64_part.count("=")
-                        file_size_bytes = math.floor((len(base64_part) * 3) / 4) - padding
-                        
-                        # Upload to Storage bucket
-                        file_ext = file_type.split('/')[-1] if '/' in file_type else 'bin'
-                        file_name = f"{user_id}/{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.{file_ext}"
-                        
-                        # Decode base64 and upload to storage
-                        file_bytes = base64.b64decode(base64_part)
-                        
-                        # Upload to Supabase Storage
-                        storage_response = self.supabase.storage.from_("documents").upload(
-                            file_name, 
-                            file_bytes,
-                            {"content-type": file_type}
-                        )
+                file_bytes = None
+                if isinstance(document_data, PDFDocumentHandle):
+                    # Already-decoded PDF (e.g. a spooled upload) - nothing to parse or decode
+                    file_type = "application/pdf"
+                    file_size_bytes = document_data.size
+                    file_bytes = storage_upload_source(document_data.pdf_bytes)
+                else:
+                    data_url = document_data or ""
+                    if data_url.startswith("data:"):
+                        # Extract file type and base64 data
+                        mime_part = data_url.split(";", 1)[0]
+                        if mime_part.startswith("data:"):
+                            file_type = mime_part[5:] or file_type
                         
-                        # Handle different response formats from Supabase client
-                        if hasattr(storage_response, 'data') and storage_response.data:
-                            storage_path = storage_response.data.get('path', file_name)
-                            logger.info(f"✅ File uploaded to storage: {storage_path}")
-                        elif hasattr(storage_response, 'path'):
-                            storage_path = storage_response.path
-                            logger.info(f"✅ File uploaded to storage: {storage_path}")
-                        elif isinstance(storage_response, dict) and 'path' in storage_response:
-                            storage_path = storage_response['path']
-                            logger.info(f"✅ File uploaded to storage: {storage_path}")
-                        else:
-                            # If we can't determine the path, use the filename we constructed
-                            storage_path = file_name
-                            logger.info(f"✅ File uploaded to storage (path unknown): {storage_path}")
+                        base64_part = data_url.split("base64,", 1)[1] if "base64," in data_url else ""
+                        if base64_part:
+                            # Calculate file size
+                            import math
+                            padding = base64_part.count("=")
+                            file_size_bytes = math.floor((len(base64_part) * 3) / 4) - padding
+                            
+                            # Decode base64 for upload
+                            file_bytes = base64.b64decode(base64_part)
+                
+                if file_bytes is not None:
+                    # Upload to Storage bucket
+                    file_ext = file_type.split('/')[-1] if '/' in file_type else 'bin'
+                    file_name = f"{user_id}/{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.{file_ext}"
+                    
+                    # Upload to Supabase Storage
+                    # Storage API is sync-only: run it off the event loop
+                    storage_response = await asyncio.to_thread(
+                        self.supabase.storage.from_("documents").upload,
+                        file_name, 
+                        file_bytes,
+                        {"content-type": file_type}
+                    )
+                    
+                    # Handle different response formats from Supabase client
+                    if hasattr(storage_response, 'data') and storage_response.data:
+                        storage_path = storage_response.data.get('path', file_name)
+                        logger.info(f"✅ File uploaded to storage: {storage_path}")
+                    elif hasattr(storage_response, 'path'):
+                        storage_path = storage_response.path
+                        logger.info(f"✅ File uploaded to storage: {storage_path}")
+                    elif isinstance(storage_response, dict) and 'path' in storage_response:
+                        storage_path = storage_response['path']
+                        logger.info(f"✅ File uploaded to storage: {storage_path}")
+                    else:
+                        # If we can't determine the path, use the filename we constructed
+                        storage_path = file_name
+                        logger.info(f"✅ File uploaded to storage (path unknown): {storage_path}")
                             
             except Exception as e:
                 logger.warning(f"Storage upload failed: {e}")
@@ -307,13 +363,13 @@ class DatabaseService:
             # This ensures V1 and V2 use the same extraction method
             if document_data and file_type and 'pdf' in file_type.lower():
                 try:
-                    data_url = document_data or ""
-                    if "base64," in data_url:
-                        base64_part = data_url.split("base64,", 1)[1]
-                        file_bytes = base64.b64decode(base64_part)
-                        
-                        import fitz  # PyMuPDF
-                        doc = fitz.open(stream=file_bytes, filetype="pdf")
+                    if isinstance(document_data, PDFDocumentHandle):
+                        pdf_bytes = document_data.pdf_bytes
+                    else:
+                        data_url = document_data or ""
+                        pdf_bytes = base64.b64decode(data_url.split("base64,", 1)[1]) if "base64," in data_url else None
+                    if pdf_bytes:
+                        doc = open_pdf_document(pdf_bytes)
                         text_parts = []
                         for page_num in range(len(doc)):
                             page = doc[page_num]
@@ -392,7 +448,7 @@ class DatabaseService:
             logger.debug("📝 Embeddings will be stored in document_chunks table")
             
             # Insert document (no duplicate check needed - controlled by caller)
-            document_response = self.supabase.table("documents").insert(document).execute()
+            document_response = await self.async_db.table("documents").insert(document).execute()
             
             if not document_response.data:
                 logger.error("Failed to insert document")
@@ -415,7 +471,7 @@ class DatabaseService:
                     "major_version": 1,
                     "minor_version": 0,
                 }
-                version_response = self.supabase.table("document_versions").insert(version_record).execute()
+                version_response = await self.async_db.table("document_versions").insert(version_record).execute()
                 if version_response.data:
                     content_source = 'raw PDF text' if raw_pdf_text_for_versions else ('extracted text' if extracted_text else 'storage path')
                     logger.info(f"✅ Created version 1 record for document {document_id} with {content_source} ({len(version_content)} chars)")
@@ -431,7 +487,7 @@ class DatabaseService:
             # Save document chunks if provided
             if chunks_data:
                 logger.info(f"💾 Saving {len(chunks_data)} chunks for document {document_id}")
-                chunks_saved = await self.save_document_chunks(document_id, chunks_data)
+                chunks_saved = await self.save_document_chunks(document_id, chunks_data, user_id=user_id)
                 if chunks_saved:
                     logger.info(f"✅ Document chunks saved successfully")
                 else:
@@ -470,7 +526,7 @@ class DatabaseService:
                     logger.info(f"📊 hierarchical_data sections: {[k for k in h_data.keys() if not k.startswith('_')]}")
             
             # Verify document exists and belongs to user
-            existing_doc = self.supabase.table("documents").select("id, user_id").eq("id", document_id).execute()
+            existing_doc = await self.async_db.table("documents").select("id, user_id").eq("id", document_id).execute()
             
             if not existing_doc.data:
                 logger.error(f"Document {document_id} not found")
@@ -557,7 +613,7 @@ class DatabaseService:
             
             # Update document
             logger.info(f"💾 Executing database UPDATE for document {document_id}")
-            update_response = self.supabase.table("documents").update(update_data).eq("id", document_id).execute()
+            update_response = await self.async_db.table("documents").update(update_data).eq("id", document_id).execute()
             
             if not update_response.data:
                 logger.error(f"Failed to update document {document_id} - no response data")
@@ -566,7 +622,7 @@ class DatabaseService:
             # Update document chunks if provided
             if chunks_data:
                 logger.info(f"💾 Updating {len(chunks_data)} chunks for document {document_id}")
-                chunks_saved = await self.save_document_chunks(document_id, chunks_data)
+                chunks_saved = await self.save_document_chunks(document_id, chunks_data, user_id=user_id)
                 if chunks_saved:
                     logger.info(f"✅ Document chunks updated successfully")
                 else:
@@ -596,7 +652,7 @@ class DatabaseService:
                 return processed_result
             
             # Fetch template details from database (document_templates)
-            template_response = self.supabase.table("document_templates").select("*").eq("id", matched_template_id).execute()
+            template_response = await self.async_db.table("document_templates").select("*").eq("id", matched_template_id).execute()
             
             if not template_response.data:
                 logger.warning(f"Template with ID {matched_template_id} not found in database")
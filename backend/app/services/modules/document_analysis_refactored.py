@@ -6,11 +6,12 @@ Main orchestrator for document analysis using modular services
 import logging
 import json
 import base64
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 from fastapi import HTTPException
 
 from ...models.schemas import DocumentAnalysisResponse
+from ..pdf_processor import PDFDocumentHandle
 from .llm_client import LLMClient
 from .database_service import DatabaseService
 from .prompt_service import PromptService
@@ -18,6 +19,7 @@ from .pdf_processing_service import PDFProcessingService
 from .embedding_service import EmbeddingService
 from .yolo_signature_detector import YOLOSignatureDetector
 from .yolo_face_detector import YOLOFaceDetector
+from .parallel_page_processor.yolo_batcher import get_yolo_batch_queue
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +43,7 @@ class DocumentAnalysisService:
 
     async def analyze_document(
         self,
-        document_data: str,
+        document_data: Union[str, PDFDocumentHandle],
         task: str,
         document_name: Optional[str] = None,
         templates: Optional[List[Dict[str, Any]]] = None,
@@ -53,10 +55,15 @@ class DocumentAnalysisService:
         yolo_face_enabled: Optional[bool] = None,
         cancellation_token: Optional[Any] = None,
         request_id: Optional[str] = None,
-        document_type: Optional[str] = None
+        document_type: Optional[str] = None,
+        document_session: Optional[Any] = None
     ) -> DocumentAnalysisResponse:
         """
         Main entry point for document analysis
+        
+        document_session: Optional open PDFDocumentSession for document_data - PDF pages
+        are then rendered through it (shared with the request's other consumers). With a
+        session, document_data may be its PDFDocumentHandle instead of a data URL.
         """
         # Store original YOLO enabled states for restoration
         original_yolo_enabled = None
@@ -79,14 +86,15 @@ class DocumentAnalysisService:
                 logger.info(f"🔧 YOLO face detection {'enabled' if yolo_face_enabled else 'disabled'} via request parameter (overriding env: {original_face_enabled})")
             
             # Determine processing approach based on document type and task
-            is_pdf = self._is_pdf_document(document_data)
+            is_pdf = isinstance(document_data, PDFDocumentHandle) or self._is_pdf_document(document_data)
             
             failed_pages_info = []
             if is_pdf:
                 logger.info("📄 Processing PDF document")
                 processed_result, usage_info, converted_images, failed_pages_info = await self._process_pdf_document(
                     document_data, task, document_name, templates, max_workers, max_threads,
-                    cancellation_token=cancellation_token, request_id=request_id, document_type=document_type
+                    cancellation_token=cancellation_token, request_id=request_id, document_type=document_type,
+                    document_session=document_session
                 )
             else:
                 logger.info("🖼️ Processing image document")
@@ -269,10 +277,18 @@ class DocumentAnalysisService:
         max_threads: Optional[int] = None,
         cancellation_token: Optional[Any] = None,
         request_id: Optional[str] = None,
-        document_type: Optional[str] = None
+        document_type: Optional[str] = None,
+        document_session: Optional[Any] = None
     ) -> tuple[Dict[str, Any], Optional[Dict[str, Any]], List[str]]:
         """Process PDF document based on task type"""
         
+        if document_session is not None:
+            # Already decoded and opened by the caller - its handle routes page renders through the session
+            pdf_data = document_session.handle
+        else:
+            # Decode the data URL once and hand the same document handle to every stage
+            pdf_data = self.pdf_processing_service.pdf_processor.open_document_handle(pdf_data)
+        
         # Log document type if provided
         if document_type:
             logger.info(f"📋 Document type: {document_type}")
@@ -393,7 +409,7 @@ class DocumentAnalysisService:
                 logger.debug(f"   Original image: size={original_image.size}, mode={original_image.mode}")
                 
                 # Run YOLO detection on original unprocessed image
-                detections = self.yolo_detector.detect_signatures_in_image(original_image)
+                detections = get_yolo_batch_queue().detect(self.yolo_detector.detect_signatures_in_images_batch, original_image)
                 
                 for detection in detections:
                     if detection.get("is_signature"):
@@ -517,7 +533,7 @@ class DocumentAnalysisService:
                 logger.debug(f"   Original image for face detection: size={original_image.size}, mode={original_image.mode}")
                 
                 # Run YOLO face detection on original unprocessed image
-                detections = self.face_detector.detect_faces_in_image(original_image)
+                detections = get_yolo_batch_queue().detect(self.face_detector.detect_faces_in_images_batch, original_image)
                 
                 for detection in detections:
                     if detection.get("is_face"):
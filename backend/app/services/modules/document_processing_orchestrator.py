@@ -6,10 +6,13 @@ Coordinates parallel execution of document type detection and content extraction
 import logging
 import asyncio
 import threading
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Union
 from datetime import datetime
 import uuid
 
+from ..analysis_events import emit_analysis_event
+from ..spooled_pdf import storage_upload_source
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +22,8 @@ class DocumentProcessingOrchestrator:
     
     Flow:
     1. Receive document
-    2. Start type detection (first 2 pages) and extraction in parallel
+    2. Start type detection (first 2 pages) and extraction in parallel,
+       sharing one document session (PDF opened and pages rendered once)
     3. Wait for both to complete
     4. Save to appropriate bucket based on detected type
     5. Return combined results
@@ -69,6 +73,7 @@ class DocumentProcessingOrchestrator:
         """
         start_time = datetime.now()
         processing_id = str(uuid.uuid4())
+        request_id = (options or {}).get("request_id")
         
         logger.info(f"[{processing_id}] Starting parallel document processing for: {filename}")
         
@@ -89,6 +94,7 @@ class DocumentProcessingOrchestrator:
             logger.info(f"[{processing_id}] Detected type: {document_type} (confidence: {type_result.get('confidence', 0):.2f})")
             
             # Upload to type-specific bucket
+            emit_analysis_event(request_id, "stage", stage="storage", status="started")
             upload_result = await self._upload_to_bucket(
                 pdf_bytes=pdf_bytes,
                 filename=filename,
@@ -110,6 +116,7 @@ class DocumentProcessingOrchestrator:
             
             # Save to database with document type
             if extraction_result.get("success"):
+                emit_analysis_event(request_id, "stage", stage="database", status="started")
                 await self._save_to_database(
                     user_id=user_id,
                     filename=filename,
@@ -143,24 +150,42 @@ class DocumentProcessingOrchestrator:
         """
         Run type detection and extraction in parallel.
         
+        Both draw pages from one shared document session, so the PDF is opened once
+        and the first pages are rasterized once for detection and extraction.
+        
         Returns:
             Tuple of (type_result, extraction_result)
         """
-        # Create tasks for parallel execution
-        type_task = asyncio.create_task(
-            self.type_detector.detect_type(pdf_bytes, filename)
-        )
+        session = await self._open_document_session(pdf_bytes)
+        request_id = options.get("request_id")
         
-        extraction_task = asyncio.create_task(
-            self._run_extraction(pdf_bytes, filename, user_id, template_id, options)
-        )
-        
-        # Wait for both to complete
-        type_result, extraction_result = await asyncio.gather(
-            type_task,
-            extraction_task,
-            return_exceptions=True
-        )
+        try:
+            # Create tasks for parallel execution
+            emit_analysis_event(request_id, "stage", stage="type_detection", status="started")
+            type_task = asyncio.create_task(
+                self.type_detector.detect_type(pdf_bytes, filename, session=session)
+            )
+            # Streaming clients get the type as soon as it is known, before extraction ends
+            type_task.add_done_callback(lambda task: self._emit_type_detected(request_id, task))
+            
+            emit_analysis_event(request_id, "stage", stage="extraction", status="started")
+            extraction_task = asyncio.create_task(
+                self._run_extraction(pdf_bytes, filename, user_id, template_id, options, session=session)
+            )
+            extraction_task.add_done_callback(
+                lambda task: emit_analysis_event(request_id, "stage", stage="extraction", status="completed")
+            )
+            
+            # Wait for both to complete
+            type_result, extraction_result = await asyncio.gather(
+                type_task,
+                extraction_task,
+                return_exceptions=True
+            )
+        finally:
+            if session is not None:
+                logger.info(f"📄 Document session stats: {session.get_stats()}")
+                session.close()
         
         # Handle exceptions
         if isinstance(type_result, Exception):
@@ -180,20 +205,64 @@ class DocumentProcessingOrchestrator:
         
         return type_result, extraction_result
     
+    @staticmethod
+    def _emit_type_detected(request_id: Optional[str], type_task: asyncio.Task) -> None:
+        """Publish the detected document type to a streaming request, if any"""
+        if type_task.cancelled() or type_task.exception() is not None:
+            emit_analysis_event(request_id, "stage", stage="type_detection", status="failed")
+            return
+        type_result = type_task.result()
+        emit_analysis_event(
+            request_id, "stage", stage="type_detection", status="completed",
+            document_type=type_result.get("document_type"),
+            display_name=type_result.get("display_name"),
+            confidence=type_result.get("confidence")
+        )
+    
+    async def _open_document_session(self, pdf_bytes: bytes):
+        """
+        Open a per-request document session for a PDF upload.
+        
+        Pages are rasterized once at the extraction scale; type detection's smaller
+        renders are downsampled from them. Returns None for non-PDF uploads or if the
+        PDF cannot be opened (each consumer then falls back to its own rendering).
+        """
+        if pdf_bytes[:4] != b"%PDF":
+            return None
+        try:
+            from ...core.config import settings
+            from ..pdf_document_session import PDFDocumentSession
+            from ..pdf_processor import PDFProcessor
+            
+            session = PDFDocumentSession(
+                pdf_bytes,
+                base_scale=PDFProcessor.RENDER_CACHE_SCALE,
+                max_bytes=settings.DOCUMENT_SESSION_MAX_MB * 1024 * 1024
+            )
+            return await asyncio.to_thread(session.open)
+        except Exception as e:
+            logger.warning(f"Could not open shared document session, rendering separately: {e}")
+            return None
+    
     async def _run_extraction(
         self,
         pdf_bytes: bytes,
         filename: str,
         user_id: str,
         template_id: Optional[str],
-        options: Dict[str, Any]
+        options: Dict[str, Any],
+        session=None
     ) -> Dict[str, Any]:
         """Run document extraction."""
         try:
-            import base64
-            # Convert bytes to base64 data URL for DocumentAnalysisService
-            base64_data = base64.b64encode(pdf_bytes).decode('utf-8')
-            document_data = f"data:application/pdf;base64,{base64_data}"
+            if session is not None:
+                # The session's handle already holds the decoded document - no base64 round trip
+                document_data = session.handle
+            else:
+                import base64
+                # Convert bytes to base64 data URL for DocumentAnalysisService
+                base64_data = base64.b64encode(pdf_bytes).decode('utf-8')
+                document_data = f"data:application/pdf;base64,{base64_data}"
             
             # Use existing document analyzer with correct parameters
             result = await self.document_analyzer.analyze_document(
@@ -208,7 +277,8 @@ class DocumentProcessingOrchestrator:
                 yolo_signature_enabled=options.get("yolo_signature_enabled"),
                 yolo_face_enabled=options.get("yolo_face_enabled"),
                 cancellation_token=options.get("cancellation_token"),
-                request_id=options.get("request_id")
+                request_id=options.get("request_id"),
+                document_session=session
             )
             
             # result is a DocumentAnalysisResponse object, access its attributes
@@ -249,7 +319,7 @@ class DocumentProcessingOrchestrator:
             # Upload to 'documents' bucket (bucket_name parameter is ignored)
             result = await self.bucket_manager.upload_to_bucket(
                 file_path=file_path,
-                file_bytes=pdf_bytes,
+                file_bytes=storage_upload_source(pdf_bytes),
                 content_type="application/pdf"
             )
             
@@ -279,7 +349,7 @@ class DocumentProcessingOrchestrator:
                 doc_id = saved_doc["id"]
                 # Update the document with document_type
                 if self.database_service.supabase:
-                    self.database_service.supabase.table("documents").update({
+                    await self.database_service.async_db.table("documents").update({
                         "document_type": document_type
                     }).eq("id", doc_id).execute()
                     logger.info(f"Document {doc_id} updated with type: {document_type}")
@@ -331,7 +401,7 @@ class DocumentProcessingOrchestrator:
 
     async def analyze_document(
         self,
-        document_data: str,
+        document_data: Union[str, bytes],
         task: str,
         document_name: Optional[str] = None,
         user_id: str = "",
@@ -348,10 +418,16 @@ class DocumentProcessingOrchestrator:
         """
         Compatibility method that matches the old DocumentAnalysisService signature.
         Converts parameters and calls the new process_document method.
+        
+        document_data is a base64 data URL, or the raw PDF (bytes or a spooled upload)
+        from the multipart upload endpoint.
         """
         try:
+            if not isinstance(document_data, str):
+                # Raw PDF from a streamed upload - used as-is, never base64 encoded
+                pdf_bytes = document_data
             # Convert document_data (base64 data URL) to bytes
-            if document_data.startswith('data:'):
+            elif document_data.startswith('data:'):
                 # Remove data URL prefix
                 import base64
                 header, encoded = document_data.split(',', 1)
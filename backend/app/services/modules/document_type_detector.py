@@ -4,12 +4,15 @@ Detects document type using LLM Vision analysis of first 2 pages
 Uses Gemini's native response_schema for guaranteed structured JSON output
 """
 
+import asyncio
 import logging
 import json
 from typing import Optional, Dict, Any, List
 import fitz  # PyMuPDF
 import base64
 
+from ..spooled_pdf import open_pdf_document
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,7 +35,8 @@ class DocumentTypeDetector:
     async def detect_type(
         self,
         file_bytes: bytes,
-        filename: str = ""
+        filename: str = "",
+        session=None
     ) -> Dict[str, Any]:
         """
         Detect document type using LLM Vision model.
@@ -40,6 +44,8 @@ class DocumentTypeDetector:
         Args:
             file_bytes: PDF or image file content as bytes
             filename: Original filename
+            session: Optional PDFDocumentSession for file_bytes - pages are rendered
+                     through it so other consumers of the request can reuse them
 
         Returns:
             Dict with document_type, confidence, display_name, icon, color
@@ -61,7 +67,7 @@ class DocumentTypeDetector:
             else:
                 # PDF - convert first 2 pages to images
                 logger.info(f"Converting PDF to images: {filename}")
-                images = await self._convert_pdf_to_images(file_bytes)
+                images = await self._convert_pdf_to_images(file_bytes, session=session)
                 
                 if not images:
                     logger.warning("Could not convert PDF to images")
@@ -95,18 +101,22 @@ class DocumentTypeDetector:
         
         return False
 
-    async def _convert_pdf_to_images(self, pdf_bytes: bytes) -> List[bytes]:
+    async def _convert_pdf_to_images(self, pdf_bytes: bytes, session=None) -> List[bytes]:
         """
         Convert first 2 pages of PDF to images.
 
         Args:
             pdf_bytes: PDF file content
+            session: Optional PDFDocumentSession to render through (shares its renders)
 
         Returns:
             List of PNG image bytes for first 2 pages
         """
+        if session is not None:
+            return await asyncio.to_thread(self._convert_session_pages_to_images, session)
+
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            doc = open_pdf_document(pdf_bytes)
             images = []
 
             # Process only first 2 pages
@@ -129,6 +139,22 @@ class DocumentTypeDetector:
             logger.error(f"Error converting PDF to images: {e}")
             return []
 
+    def _convert_session_pages_to_images(self, session) -> List[bytes]:
+        """Render the first 2 pages through the request's document session (runs in a thread)"""
+        try:
+            images = []
+            for page_num in range(min(2, session.page_count)):
+                # 2x scale as above; the session downsamples its full-resolution render
+                png_bytes = session.render_page_png(page_num, 2)
+                if png_bytes:
+                    images.append(png_bytes)
+                    logger.info(f"Converted page {page_num + 1} to image ({len(png_bytes)} bytes, shared session)")
+            return images
+
+        except Exception as e:
+            logger.error(f"Error converting PDF to images: {e}")
+            return []
+
     async def _detect_type_from_images(self, images: List[bytes], filename: str) -> Dict[str, Any]:
         """
         Detect document type from images using LLM Vision with Pydantic schema.
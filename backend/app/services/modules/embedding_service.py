@@ -16,6 +16,12 @@ logger = logging.getLogger(__name__)
 class EmbeddingService:
     """Service for generating vector embeddings from document analysis results."""
     
+    # Texts sent per embeddings request (OpenAI-compatible endpoints accept up to 2048 inputs;
+    # 96 chunks of 1500 characters stays well under per-request token limits)
+    EMBEDDING_BATCH_SIZE = 96
+    # Embedding requests in flight at once for a single batch call
+    EMBEDDING_MAX_CONCURRENT_BATCHES = 4
+    
     def __init__(self):
         """Initialize the embedding service with LiteLLM configuration."""
         env_vars = self._load_env()
@@ -30,8 +36,36 @@ class EmbeddingService:
         self.model = "text-embedding-ada-002"
         self.max_tokens = 8191  # Maximum tokens for ada-002
         
+        # HTTP client with connection pooling (lazy initialization)
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._client_lock = asyncio.Lock()
+        
         logger.info("✅ EmbeddingService initialized with LiteLLM")
     
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get or create the pooled HTTP client for embeddings requests
+        Reuses connections so batches don't each pay for a new TLS handshake
+        """
+        if self._http_client is None:
+            async with self._client_lock:
+                if self._http_client is None:
+                    limits = httpx.Limits(
+                        max_keepalive_connections=self.EMBEDDING_MAX_CONCURRENT_BATCHES,
+                        max_connections=self.EMBEDDING_MAX_CONCURRENT_BATCHES * 2,
+                        keepalive_expiry=30.0
+                    )
+                    self._http_client = httpx.AsyncClient(timeout=60.0, limits=limits)
+                    logger.debug("🌐 Created embeddings HTTP client with connection pooling")
+        return self._http_client
+    
+    async def close(self):
+        """Close the pooled HTTP client (call when done generating embeddings)"""
+        if self._http_client:
+            await self._http_client.aclose()
+            self._http_client = None
+            logger.debug("🔌 Closed embeddings HTTP client")
+    
     def _load_env(self) -> Dict[str, str]:
         """Load environment variables from backend/.env file."""
         try:
@@ -331,15 +365,16 @@ class EmbeddingService:
     async def generate_embeddings_for_chunks(self, text: str, chunk_size: int = 1500, overlap: int = 200) -> List[Dict[str, Any]]:
         """
         Split text into chunks and generate embeddings for each chunk.
+        Chunks are embedded in batched requests (see batch_generate_embeddings).
         Returns a list of dicts: [{"chunk": ..., "embedding": [...]}]
         """
         chunks = self.chunk_text(text, chunk_size=chunk_size, overlap=overlap)
-        results = []
-        for chunk in chunks:
-            embedding = await self.generate_embedding(chunk)
-            if embedding:
-                results.append({"chunk": chunk, "embedding": embedding})
-        return results
+        embeddings = await self.batch_generate_embeddings(chunks)
+        return [
+            {"chunk": chunk, "embedding": embedding}
+            for chunk, embedding in zip(chunks, embeddings)
+            if embedding
+        ]
 
     async def generate_embedding(self, text: str) -> Optional[List[float]]:
         """
@@ -367,11 +402,12 @@ class EmbeddingService:
             # Prepare request body for LiteLLM embeddings endpoint
             request_body = {
                 "model": self.model,
-                "input": cleaned_text
+                "input": [cleaned_text]
             }
             
             # Call LiteLLM embeddings API
-            embedding = await self._call_litellm_embeddings_api(request_body)
+            embeddings = await self._call_litellm_embeddings_api(request_body)
+            embedding = embeddings[0] if embeddings else None
             
             if embedding:
                 logger.info(f"Successfully generated embedding with {len(embedding)} dimensions")
@@ -382,43 +418,53 @@ class EmbeddingService:
             logger.error(f"Unexpected error generating embedding: {e}")
             return None
     
-    async def _call_litellm_embeddings_api(self, request_body: Dict[str, Any], max_retries: int = 3) -> Optional[List[float]]:
-        """Call LiteLLM embeddings API with retry logic."""
+    async def _call_litellm_embeddings_api(self, request_body: Dict[str, Any], max_retries: int = 3) -> Optional[List[Optional[List[float]]]]:
+        """
+        Call LiteLLM embeddings API with retry logic.
+        
+        Args:
+            request_body: {"model": ..., "input": [text, ...]}
+            
+        Returns:
+            Embeddings in the same order as request_body["input"], or None if the request failed
+        """
         last_exception = None
+        input_count = len(request_body["input"])
+        
+        # For embeddings, we need the base URL without /chat/completions
+        base_url = self.litellm_api_url
+        if '/chat/completions' in base_url:
+            # Remove /chat/completions to get base URL for embeddings
+            base_url = base_url.replace('/chat/completions', '')
+        
+        # Construct the embeddings endpoint URL
+        embeddings_url = f"{base_url.rstrip('/')}/embeddings"
+        headers = {
+            "Content-Type": "application/json",
+            self.litellm_header_name: f"{self.litellm_auth_scheme} {self.litellm_api_key}"
+        }
+        client = await self._get_http_client()
         
         for attempt in range(max_retries):
             try:
-                logger.info(f"🌐 Making LiteLLM embeddings API call (attempt {attempt + 1}/{max_retries})")
+                logger.info(f"🌐 Making LiteLLM embeddings API call for {input_count} text(s) (attempt {attempt + 1}/{max_retries})")
                 
-                # For embeddings, we need the base URL without /chat/completions
-                # Extract base URL from the configured URL
-                base_url = self.litellm_api_url
-                if '/chat/completions' in base_url:
-                    # Remove /chat/completions to get base URL for embeddings
-                    base_url = base_url.replace('/chat/completions', '')
+                response = await client.post(embeddings_url, json=request_body, headers=headers)
+                response.raise_for_status()
                 
-                # Construct the embeddings endpoint URL
-                embeddings_url = f"{base_url.rstrip('/')}/embeddings"
+                result = response.json()
                 
-                async with httpx.AsyncClient(timeout=60.0) as client:
-                    headers = {
-                        "Content-Type": "application/json",
-                        self.litellm_header_name: f"{self.litellm_auth_scheme} {self.litellm_api_key}"
-                    }
-                    
-                    response = await client.post(embeddings_url, json=request_body, headers=headers)
-                    response.raise_for_status()
-                    
-                    result = response.json()
-                    
-                    # Extract embedding from response
-                    if "data" in result and len(result["data"]) > 0:
-                        embedding = result["data"][0]["embedding"]
-                        logger.info(f"✅ Embedding generated successfully")
-                        return embedding
-                    else:
-                        logger.error(f"Unexpected response format: {result}")
-                        return None
+                # Extract embeddings from response (ordered by "index", not by arrival)
+                data = result.get("data") if isinstance(result, dict) else None
+                if data and len(data) == input_count:
+                    embeddings: List[Optional[List[float]]] = [None] * input_count
+                    for position, item in enumerate(data):
+                        embeddings[item.get("index", position)] = item["embedding"]
+                    logger.info(f"✅ Generated {input_count} embedding(s) successfully")
+                    return embeddings
+                else:
+                    logger.error(f"Unexpected response format: expected {input_count} embeddings, got {len(data) if data else 0}")
+                    return None
                         
             except httpx.HTTPStatusError as e:
                 last_exception = e
@@ -437,27 +483,64 @@ class EmbeddingService:
             if attempt < max_retries - 1:
                 await asyncio.sleep(2 ** attempt)  # Exponential backoff
         
-        logger.error(f"Failed to generate embedding after {max_retries} attempts: {last_exception}")
+        logger.error(f"Failed to generate embeddings after {max_retries} attempts: {last_exception}")
         return None
     
     async def batch_generate_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
         """
         Generate embeddings for multiple texts in batch.
         
+        Texts are sent as `input: [...]` lists of up to EMBEDDING_BATCH_SIZE per request,
+        with at most EMBEDDING_MAX_CONCURRENT_BATCHES requests in flight over the pooled client.
+        A failed batch is retried one text at a time so a single bad text doesn't drop the rest.
+        
         Args:
             texts: List of texts to generate embeddings for
             
         Returns:
-            List of embedding vectors (or None for failed ones)
+            List of embedding vectors in input order (None for empty texts and texts that failed)
         """
         try:
-            embeddings = []
+            embeddings: List[Optional[List[float]]] = [None] * len(texts)
+            
+            # Empty texts are not sent and stay None
+            indexed_texts = [(index, text.strip()) for index, text in enumerate(texts) if text and text.strip()]
+            batches = [
+                indexed_texts[start:start + self.EMBEDDING_BATCH_SIZE]
+                for start in range(0, len(indexed_texts), self.EMBEDDING_BATCH_SIZE)
+            ]
+            semaphore = asyncio.Semaphore(self.EMBEDDING_MAX_CONCURRENT_BATCHES)
+            
+            async def _embed(batch: List[Any]) -> Optional[List[Optional[List[float]]]]:
+                try:
+                    async with semaphore:
+                        return await self._call_litellm_embeddings_api({
+                            "model": self.model,
+                            "input": [text for _, text in batch]
+                        })
+                except Exception as e:
+                    logger.error(f"Error embedding {len(batch)} text(s): {e}")
+                    return None
+            
+            async def _embed_batch(batch: List[Any]) -> None:
+                batch_embeddings = await _embed(batch)
+                if batch_embeddings:
+                    for (index, _), embedding in zip(batch, batch_embeddings):
+                        embeddings[index] = embedding
+                    return
+                if len(batch) == 1:
+                    return
+                
+                # One bad text fails the whole request - retry item by item so only it stays None
+                logger.warning(f"⚠️ Embedding batch of {len(batch)} failed, retrying texts individually")
+                item_embeddings = await asyncio.gather(*[_embed([item]) for item in batch])
+                for (index, _), result in zip(batch, item_embeddings):
+                    if result:
+                        embeddings[index] = result[0]
             
-            for text in texts:
-                embedding = await self.generate_embedding(text)
-                embeddings.append(embedding)
+            await asyncio.gather(*[_embed_batch(batch) for batch in batches])
             
-            logger.info(f"Generated {len([e for e in embeddings if e is not None])} embeddings out of {len(texts)} texts")
+            logger.info(f"Generated {len([e for e in embeddings if e is not None])} embeddings out of {len(texts)} texts in {len(batches)} request(s)")
             return embeddings
             
         except Exception as e:
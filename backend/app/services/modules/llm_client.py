@@ -17,6 +17,8 @@ from datetime import datetime
 from fastapi import HTTPException
 from dotenv import load_dotenv
 from ...core.config import settings
+from .llm_response_cache import get_llm_response_cache
+from .llm_rate_limiter import THROTTLE_STATUS_CODES, get_llm_rate_limiter, is_throttle_error, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +83,12 @@ class LLMClient:
             # Model configuration - read from .env
             self.extraction_model = os.getenv("EXTRACTION_MODEL", "openrouter/google/gemini-2.5-flash")
         
+        # Response cache for repeated identical requests (None when disabled)
+        self.response_cache = get_llm_response_cache()
+        
+        # Process-wide adaptive concurrency/rate limiter shared by every LLM call
+        self.rate_limiter = get_llm_rate_limiter()
+        
         # HTTP client with connection pooling (lazy initialization)
         self._http_client: Optional[httpx.AsyncClient] = None
         
@@ -278,18 +286,29 @@ class LLMClient:
                 if "model" in request_body:
                     logger.debug(f"🔍 Model: {request_body.get('model')}")
                     
-                    # Fix: Add timeout to async HTTP calls to prevent blocking
-                    response = await client.post(
-                        api_url,
-                        json=request_body,
-                        headers=headers,
-                        timeout=90.0  # 90 second timeout per request
-                    )
+                    ticket = await self.rate_limiter.acquire_async()
+                    response = None
+                    result = None
+                    try:
+                        # Fix: Add timeout to async HTTP calls to prevent blocking
+                        response = await client.post(
+                            api_url,
+                            json=request_body,
+                            headers=headers,
+                            timeout=90.0  # 90 second timeout per request
+                        )
+                        if response.status_code == 200:
+                            result = response.json()
+                    finally:
+                        self._release_rate_limit(ticket, response, result)
                     
                     if response.status_code == 200:
-                        result = response.json()
                         logger.debug(f"✅ {provider_name} API call successful on endpoint: {api_url}")
                         return result
+                    elif response.status_code in THROTTLE_STATUS_CODES and attempt < max_retries - 1:
+                        # The limiter pauses every caller; retry once the shared cooldown ends
+                        logger.warning(f"🚦 {provider_name} throttled ({response.status_code}) on attempt {attempt + 1}, retrying after shared cooldown")
+                        continue
                     else:
                         error_msg = f"API call failed with status {response.status_code}: {response.text}"
                         logger.error(f"❌ {error_msg}")
@@ -316,6 +335,59 @@ class LLMClient:
         logger.error(f"❌ All retries failed for endpoint: {api_url}")
         raise last_exception or Exception(f"All retries failed for endpoint: {api_url}")
 
+    def _release_rate_limit(self, ticket: Any, response: Any = None, result: Any = None) -> None:
+        """Report a call's outcome (httpx/requests response, None on network errors) to the shared limiter"""
+        if response is None:
+            self.rate_limiter.release(ticket)
+            return
+        usage = result.get("usage") if isinstance(result, dict) else None
+        self.rate_limiter.release(
+            ticket,
+            response.status_code,
+            usage=usage,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
+
+    def get_rate_limiter_stats(self) -> Dict[str, Any]:
+        """Concurrency limit, observed RPM/TPM and throttle counters of the shared LLM limiter"""
+        return self.rate_limiter.get_stats()
+
+    def _response_cache_key(self, prompt: str, image_data: Optional[str], response_format: Dict[str, Any],
+                            task: str, model_to_use: str, content_type: str) -> Optional[str]:
+        """Cache key for a request (document_name is left out so re-uploads under another name still hit)"""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.make_key(self.provider, model_to_use, task, content_type, prompt, image_data, response_format)
+
+    def _get_cached_response(self, cache_key: Optional[str], task: str, model_to_use: str, start_time: float) -> Optional[Dict[str, Any]]:
+        """Return the cached processed result for cache_key, marked as a cache hit, or None"""
+        if cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is None:
+            return None
+
+        # No tokens were spent on this call
+        if isinstance(cached.get("usage"), dict):
+            cached["usage"] = {key: 0 for key in cached["usage"]}
+        cached["_cached"] = True
+        duration = time.time() - start_time
+        cached["_timing"] = {
+            "start_time": start_time,
+            "end_time": time.time(),
+            "duration_seconds": duration
+        }
+        logger.info(f"🗄️ LLM response cache hit - Task: {task}, Model: {model_to_use}, Duration: {duration:.3f}s")
+        return cached
+
+    def _store_cached_response(self, cache_key: Optional[str], processed_result: Any) -> None:
+        if cache_key is not None:
+            self.response_cache.set(cache_key, processed_result)
+
+    def get_response_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit-rate metrics of the LLM response cache (None when disabled)"""
+        return self.response_cache.get_stats() if self.response_cache is not None else None
+
     async def call_api(self, prompt: str, image_data: Optional[str], response_format: Dict[str, Any], 
                       task: str, document_name: Optional[str] = None) -> Dict[str, Any]:
         """Make API call to LLM provider with optional LangSmith monitoring"""
@@ -357,6 +429,12 @@ class LLMClient:
                            start_time: float, model_to_use: str, page_number: Optional[int] = None, trace_name: Optional[str] = None) -> Dict[str, Any]:
         """Execute the actual LLM API call for LiteLLM provider (async flow)"""
         try:
+            # Serve repeated identical requests from the response cache
+            cache_key = self._response_cache_key(prompt, image_data, response_format, task, model_to_use, "image")
+            cached_result = self._get_cached_response(cache_key, task, model_to_use, start_time)
+            if cached_result is not None:
+                return cached_result
+            
             # This method is only called for LiteLLM provider (routing done in call_api)
             # Validate LiteLLM API URL is configured
             if not self.litellm_api_url or self.litellm_api_url.strip() == "":
@@ -412,6 +490,7 @@ class LLMClient:
             # Process the result to normalize the structure
             # This is NOT included in LangSmith timing
             processed_result = self.process_api_result(result, task)
+            self._store_cached_response(cache_key, processed_result)
             
             # Calculate duration (total time including prep and processing)
             duration = time.time() - start_time
@@ -547,14 +626,25 @@ class LLMClient:
                 # Measure HTTP request/response time with accurate timing
                 # Note: response.elapsed is the accurate measure from requests library
                 # It measures from when the HTTP request actually starts (socket connection) to when headers are received
-                request_submit_time = time.time()
-                response = session.post(
-                    api_url,
-                    json=request_body,
-                    headers=headers,
-                    timeout=90  # Fix: Reduced to 90s per request to prevent blocking (with retries, total can be up to 270s)
-                )
-                request_complete_time = time.time()
+                ticket = self.rate_limiter.acquire()
+                response = None
+                result = None
+                try:
+                    request_submit_time = time.time()
+                    response = session.post(
+                        api_url,
+                        json=request_body,
+                        headers=headers,
+                        timeout=90  # Fix: Reduced to 90s per request to prevent blocking (with retries, total can be up to 270s)
+                    )
+                    request_complete_time = time.time()
+                    if response.status_code == 200:
+                        # Measure response parsing time
+                        parse_start = time.time()
+                        result = response.json()
+                        parse_time = time.time() - parse_start
+                finally:
+                    self._release_rate_limit(ticket, response, result)
                 
                 # Use response.elapsed as the accurate HTTP request time (from requests library)
                 # This measures from when HTTP request actually starts to when headers are received
@@ -589,10 +679,6 @@ class LLMClient:
                     logger.debug(f"ℹ️ Moderate TTFB ({ttfb:.2f}s) - network latency may be affecting performance")
                 
                 if response.status_code == 200:
-                    # Measure response parsing time
-                    parse_start = time.time()
-                    result = response.json()
-                    parse_time = time.time() - parse_start
                     logger.debug(f"✅ {provider_name} API call successful on endpoint: {api_url}")
                     logger.debug(f"   🔄 JSON parsing took: {parse_time*1000:.1f}ms")
                     
@@ -601,6 +687,10 @@ class LLMClient:
                     logger.debug(f"   ⏱️ Total attempt duration: {attempt_duration:.3f}s")
                     
                     return result
+                elif response.status_code in THROTTLE_STATUS_CODES and attempt < max_retries - 1:
+                    # The limiter pauses every caller; retry once the shared cooldown ends
+                    logger.warning(f"🚦 {provider_name} throttled ({response.status_code}) on attempt {attempt + 1}, retrying after shared cooldown")
+                    continue
                 else:
                     error_msg = f"API call failed with status {response.status_code}: {response.text}"
                     logger.error(f"❌ {error_msg}")
@@ -658,10 +748,18 @@ class LLMClient:
                            start_time: float, model_to_use: str, content_type: str, page_number: Optional[int] = None, trace_name: Optional[str] = None) -> Dict[str, Any]:
         """Execute the actual synchronous LLM API call"""
         try:
+            # Serve repeated identical requests from the response cache
+            cache_key = self._response_cache_key(prompt, image_data, response_format, task, model_to_use, content_type)
+            cached_result = self._get_cached_response(cache_key, task, model_to_use, start_time)
+            if cached_result is not None:
+                return cached_result
+            
             # Log which provider is being used for this call
             if self.provider == "gemini_direct" and self.gemini_model:
                 logger.info(f"🔧 Using Direct Gemini API for {task} (model: {model_to_use})")
-                return self._execute_gemini_direct_call(prompt, image_data, response_format, task, document_name, start_time, content_type)
+                processed_result = self._execute_gemini_direct_call(prompt, image_data, response_format, task, document_name, start_time, content_type)
+                self._store_cached_response(cache_key, processed_result)
+                return processed_result
             else:
                 logger.info(f"🔧 Using LiteLLM provider for {task} (model: {model_to_use})")
             
@@ -723,6 +821,7 @@ class LLMClient:
             # This is NOT included in LangSmith timing
             parse_start = time.time()
             processed_result = self.process_api_result(result, task)
+            self._store_cached_response(cache_key, processed_result)
             parse_time = time.time() - parse_start
             
             # Calculate duration
@@ -830,10 +929,18 @@ class LLMClient:
                         gen_config_params["response_schema"] = gemini_schema
                         logger.debug(f"📋 Using native response_schema: {json.dumps(gemini_schema, indent=2)[:200]}...")
                     
-                    response = self.gemini_model.generate_content(
-                        content_parts,
-                        generation_config=genai.types.GenerationConfig(**gen_config_params)
-                    )
+                    ticket = self.rate_limiter.acquire()
+                    try:
+                        response = self.gemini_model.generate_content(
+                            content_parts,
+                            generation_config=genai.types.GenerationConfig(**gen_config_params)
+                        )
+                    except Exception as e:
+                        self.rate_limiter.release(ticket, throttled=is_throttle_error(e))
+                        raise
+                    self.rate_limiter.release(ticket, 200, usage={
+                        "total_tokens": response.usage_metadata.total_token_count if response.usage_metadata else 0
+                    })
                     api_duration = time.time() - api_start
                     
                     # Log timing
@@ -874,13 +981,11 @@ class LLMClient:
                     
                 except Exception as e:
                     last_error = e
-                    error_str = str(e).lower()
                     
                     # Check for rate limit or quota errors
-                    if "quota" in error_str or "rate" in error_str or "429" in error_str:
-                        wait_time = (attempt + 1) * 5  # 5s, 10s, 15s
-                        logger.warning(f"⚠️ Gemini rate limit hit, waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                        time.sleep(wait_time)
+                    if is_throttle_error(e) and attempt < max_retries - 1:
+                        # The shared limiter pauses every caller; the next acquire() waits out the cooldown
+                        logger.warning(f"⚠️ Gemini rate limit hit, retrying after shared cooldown ({attempt + 1}/{max_retries})")
                     elif attempt < max_retries - 1:
                         logger.warning(f"⚠️ Gemini API error on attempt {attempt + 1}: {e}")
                         time.sleep(1)
@@ -10,6 +10,8 @@ Module Structure:
 - pipeline_stages: Step 8, 9, and encoding/LLM processing stages
 - callbacks: Pipeline callback factory for stage completion handling
 - page_methods: Per-page processing methods for extraction and template matching
+- stage_executors: Process-wide shared stage executors with per-request lanes
+- yolo_batcher: Process-wide micro-batching queue for YOLO inference
 
 Usage:
     from .parallel_page_processor import (
@@ -52,6 +54,16 @@ from .page_methods import (
     process_page_for_template_extraction,
     process_page_for_template_matching,
 )
+from .stage_executors import (
+    StageExecutor,
+    StageLane,
+    StageScheduler,
+    get_stage_scheduler,
+)
+from .yolo_batcher import (
+    YOLOBatchQueue,
+    get_yolo_batch_queue,
+)
 
 __all__ = [
     # Config module
@@ -77,4 +89,12 @@ __all__ = [
     "process_page_for_extraction_sync",
     "process_page_for_template_extraction",
     "process_page_for_template_matching",
+    # Shared stage executors
+    "StageExecutor",
+    "StageLane",
+    "StageScheduler",
+    "get_stage_scheduler",
+    # YOLO micro-batching
+    "YOLOBatchQueue",
+    "get_yolo_batch_queue",
 ]
@@ -13,14 +13,14 @@ from typing import Dict, Any, Optional, TYPE_CHECKING
 from concurrent.futures import ThreadPoolExecutor
 
 if TYPE_CHECKING:
-    from ..pdf_processor import PDFProcessor
+    from ..pdf_processor import PDFProcessor, PDFSource
 
 logger = logging.getLogger(__name__)
 
 
 async def convert_page_to_image_async(
     pdf_processor: 'PDFProcessor',
-    pdf_data: str,
+    pdf_data: 'PDFSource',
     page_num: int,
     thread_pool: ThreadPoolExecutor,
     max_retries: int = 1
@@ -33,7 +33,7 @@ async def convert_page_to_image_async(
     
     Args:
         pdf_processor: PDFProcessor instance
-        pdf_data: Base64 encoded PDF data
+        pdf_data: Base64 encoded PDF data or decoded PDFDocumentHandle
         page_num: Zero-based page number to convert
         thread_pool: ThreadPoolExecutor to run blocking operation in
         max_retries: Number of retry attempts on failure (default: 1)
@@ -82,7 +82,7 @@ async def convert_page_to_image_async(
 
 async def extract_page_content_async(
     pdf_processor: 'PDFProcessor',
-    pdf_data: str,
+    pdf_data: 'PDFSource',
     page_num: int,
     thread_pool: ThreadPoolExecutor,
     prefer_text: bool = True,
@@ -97,7 +97,7 @@ async def extract_page_content_async(
     
     Args:
         pdf_processor: PDFProcessor instance
-        pdf_data: Base64 encoded PDF data
+        pdf_data: Base64 encoded PDF data or decoded PDFDocumentHandle
         page_num: Zero-based page number
         thread_pool: ThreadPoolExecutor to run blocking operations in
         prefer_text: Whether to prefer text extraction over image (default: True)
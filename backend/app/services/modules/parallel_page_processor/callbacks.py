@@ -12,10 +12,11 @@ These callbacks form a chain: Stage N completion triggers Stage N+1 submission.
 """
 
 import logging
+import threading
 import time
 import traceback
 from typing import Dict, Any, List, Optional, Callable, TYPE_CHECKING
-from concurrent.futures import Future, CancelledError, ThreadPoolExecutor
+from concurrent.futures import Future, CancelledError
 
 if TYPE_CHECKING:
     from ..pdf_processor import PDFProcessor
@@ -23,6 +24,7 @@ if TYPE_CHECKING:
     from ..prompt_service import PromptService
     from ..yolo_signature_detector import YOLOSignatureDetector
     from ..yolo_face_detector import YOLOFaceDetector
+    from .stage_executors import StageLane
 
 logger = logging.getLogger(__name__)
 
@@ -90,20 +92,18 @@ class PipelineCallbackFactory:
         self.stage1_6_futures: Dict[Future, int] = {}
         self.stage1_6_face_futures: Dict[Future, int] = {}  # Face detection futures
         self.stage2_futures: Dict[Future, int] = {}
-        self.stage3_futures: Dict[Future, int] = {}
-        self.stage4_futures: Dict[Future, int] = {}
         self.stage5_futures: Dict[Future, int] = {}
         self.stage6_futures: Dict[Future, int] = {}
         self.stage7_futures: Dict[Future, int] = {}
         self.stage8_futures: Dict[Future, int] = {}
         self.stage9_futures: Dict[Future, int] = {}
         
-        # Thread pools (will be set by the pipeline)
-        self.pool1: Optional[ThreadPoolExecutor] = None
-        self.pool2: Optional[ThreadPoolExecutor] = None
-        self.pool3: Optional[ThreadPoolExecutor] = None
-        self.pool4: Optional[ThreadPoolExecutor] = None
-        self.pool_yolo: Optional[ThreadPoolExecutor] = None
+        # Stage lanes on the shared executors (will be set by the pipeline)
+        self.pool1: Optional['StageLane'] = None
+        self.pool2: Optional['StageLane'] = None
+        self.pool3: Optional['StageLane'] = None
+        self.pool4: Optional['StageLane'] = None
+        self.pool_yolo: Optional['StageLane'] = None
         
         # Step methods (will be set by the pipeline)
         self._step1_6_yolo_signature_detection: Optional[Callable] = None
@@ -113,16 +113,72 @@ class PipelineCallbackFactory:
         self._step1_6_yolo_face_detection_full_page: Optional[Callable] = None
         self._step8_parse_response: Optional[Callable] = None
         self._step9_process_signatures: Optional[Callable] = None
+        
+        # Final-result bookkeeping: every page finishes exactly once, success or error
+        self._result_lock = threading.Lock()
+        self._finished_pages: set = set()
+        self._result_listener: Optional[Callable[[int, Dict[str, Any]], None]] = None
+        self._stage_listener: Optional[Callable[[int, str, Dict[str, Any]], None]] = None
+    
+    def set_result_listener(self, listener: Optional[Callable[[int, Dict[str, Any]], None]]):
+        """
+        Register a callable notified (from a pool thread) when a page reaches its final result.
+        
+        The pipeline uses this to wake the waiting coroutine instead of polling.
+        """
+        self._result_listener = listener
+    
+    def set_stage_listener(self, listener: Optional[Callable[[int, str, Dict[str, Any]], None]]):
+        """
+        Register a callable notified (from a pool thread) when a page passes a pipeline milestone.
+        
+        Milestones: "content_ready" (text or image prepared for the LLM), "llm_complete",
+        "parsed". The streaming analyze endpoints forward them as progress events.
+        """
+        self._stage_listener = listener
+    
+    def _notify_stage(self, page_num: int, stage: str, **details: Any):
+        """Report a page milestone to the stage listener, if any"""
+        listener = self._stage_listener
+        if listener is None:
+            return
+        try:
+            listener(page_num, stage, details)
+        except Exception as e:
+            logger.warning(f"⚠️ [Page {page_num + 1}] Stage listener failed: {e}")
+    
+    def _record_page_result(self, page_num: int, result: Dict[str, Any]):
+        """
+        Store the final result for a page and signal completion.
+        
+        Every terminal path (Stage 9 success, early-stage errors, exhausted retries) goes
+        through here, so completion_counts[9] counts finished pages rather than only pages
+        that reached Stage 9. The first final result for a page wins.
+        """
+        with self._result_lock:
+            if page_num in self._finished_pages:
+                logger.debug(f"[Page {page_num + 1}] Ignoring duplicate final result")
+                return
+            self._finished_pages.add(page_num)
+            self.results_dict[page_num] = result
+            self.completion_counts[9] += 1
+            listener = self._result_listener
+        
+        if listener is not None:
+            try:
+                listener(page_num, result)
+            except Exception as e:
+                logger.warning(f"⚠️ [Page {page_num + 1}] Result listener failed: {e}")
     
     def set_pools(
         self,
-        pool1: ThreadPoolExecutor,
-        pool2: ThreadPoolExecutor,
-        pool3: ThreadPoolExecutor,
-        pool4: ThreadPoolExecutor,
-        pool_yolo: Optional[ThreadPoolExecutor] = None
+        pool1: 'StageLane',
+        pool2: 'StageLane',
+        pool3: 'StageLane',
+        pool4: 'StageLane',
+        pool_yolo: Optional['StageLane'] = None
     ):
-        """Set the thread pools used by callbacks."""
+        """Set the stage lanes (per-request views of the shared stage executors) used by callbacks."""
         self.pool1 = pool1
         self.pool2 = pool2
         self.pool3 = pool3
@@ -157,7 +213,7 @@ class PipelineCallbackFactory:
         try:
             page = future.result()
             if not page:
-                self.results_dict[page_num] = {"error": f"Step 1.3 failed for page {page_num + 1}", "page_num": page_num + 1}
+                self._record_page_result(page_num, {"error": f"Step 1.3 failed for page {page_num + 1}", "page_num": page_num + 1})
                 return
 
             self.page_data[page_num]["page"] = page
@@ -170,7 +226,7 @@ class PipelineCallbackFactory:
                 stage1_4_future.add_done_callback(self.on_stage1_4_complete)
         except Exception as e:
             logger.error(f"❌ Error in Step 1.3 for page {page_num + 1}: {e}")
-            self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
+            self._record_page_result(page_num, {"error": str(e), "page_num": page_num + 1})
 
     # =========================================================================
     # Stage 1.4 Callback: Extract Text Content → Stage 1.5
@@ -181,7 +237,7 @@ class PipelineCallbackFactory:
         try:
             text_data = future.result()
             if not text_data:
-                self.results_dict[page_num] = {"error": f"Step 1.4 failed for page {page_num + 1}", "page_num": page_num + 1}
+                self._record_page_result(page_num, {"error": f"Step 1.4 failed for page {page_num + 1}", "page_num": page_num + 1})
                 return
 
             self.page_data[page_num]["text_data"] = text_data
@@ -199,7 +255,7 @@ class PipelineCallbackFactory:
             stage1_5_future.add_done_callback(self.on_stage1_5_complete)
         except Exception as e:
             logger.error(f"❌ Error in Step 1.4 for page {page_num + 1}: {e}")
-            self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
+            self._record_page_result(page_num, {"error": str(e), "page_num": page_num + 1})
 
     # =========================================================================
     # Stage 1.5 Callback: Analyze Text Quality → Decision Point
@@ -210,7 +266,7 @@ class PipelineCallbackFactory:
         try:
             quality_data = future.result()
             if not quality_data:
-                self.results_dict[page_num] = {"error": f"Step 1.5 failed for page {page_num + 1}", "page_num": page_num + 1}
+                self._record_page_result(page_num, {"error": f"Step 1.5 failed for page {page_num + 1}", "page_num": page_num + 1})
                 return
             
             text_data = self.page_data[page_num].get("text_data", {})
@@ -229,7 +285,7 @@ class PipelineCallbackFactory:
                 self._handle_image_fallback_path(page_num)
         except Exception as e:
             logger.error(f"❌ Error in Step 1.5 for page {page_num + 1}: {e}")
-            self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
+            self._record_page_result(page_num, {"error": str(e), "page_num": page_num + 1})
     
     def _handle_text_path(self, page_num: int, text_data: Dict, quality_data: Dict, confidence: float):
         """Handle the TEXT extraction path after quality check passes."""
@@ -276,70 +332,16 @@ class PipelineCallbackFactory:
     
     def _handle_image_fallback_path(self, page_num: int):
         """Handle the IMAGE fallback path when text extraction fails."""
-        # This method handles the nested fallback callbacks
-        pdf_data = self.process_context.get("_pdf_data", "")
-        
-        # Step 1.7: Decode Base64 PDF Data
-        pdf_bytes_future = self.pool1.submit(self.pdf_processor.step1_7_decode_base64_pdf_fallback, pdf_data)
-        fallback_futures = {pdf_bytes_future: page_num}
-        
-        def on_step1_7_complete(fallback_future: Future):
-            page_num_fallback = fallback_futures[fallback_future]
-            try:
-                pdf_bytes = fallback_future.result()
-                if not pdf_bytes:
-                    self.results_dict[page_num_fallback] = {"error": f"Step 1.7 failed for page {page_num_fallback + 1}", "page_num": page_num_fallback + 1}
-                    return
-                
-                # Step 1.8: Open PDF Document
-                pdf_doc_future = self.pool1.submit(self.pdf_processor.step1_8_open_pdf_document_fallback, pdf_bytes)
-                fallback_futures[pdf_doc_future] = page_num_fallback
-                
-                def on_step1_8_complete(doc_future: Future):
-                    page_num_doc = fallback_futures[doc_future]
-                    try:
-                        pdf_document = doc_future.result()
-                        if not pdf_document:
-                            self.results_dict[page_num_doc] = {"error": f"Step 1.8 failed for page {page_num_doc + 1}", "page_num": page_num_doc + 1}
-                            return
-                        
-                        self.page_data[page_num_doc]["pdf_document"] = pdf_document
-                        
-                        # Step 1.9: Get Specific Page
-                        page_future = self.pool1.submit(self.pdf_processor.step1_9_get_specific_page_fallback, pdf_document, page_num_doc)
-                        fallback_futures[page_future] = page_num_doc
-                        
-                        def on_step1_9_complete(page_future_inner: Future):
-                            page_num_page = fallback_futures[page_future_inner]
-                            try:
-                                page = page_future_inner.result()
-                                if not page:
-                                    self.results_dict[page_num_page] = {"error": f"Step 1.9 failed for page {page_num_page + 1}", "page_num": page_num_page + 1}
-                                    return
-                                
-                                self.page_data[page_num_page]["page"] = page
-                                self.completion_counts[1] += 1
-                                logger.debug(f"✅ [Page {page_num_page + 1}] Step 1 (Image conversion fallback) complete ({self.completion_counts[1]}/{self.total_pages})")
-                                
-                                # Continue with image conversion: Step 1.10 (Render to Pixmap)
-                                stage2_future = self.pool1.submit(self.pdf_processor.step1_10_render_page_to_pixmap, page)
-                                self.stage2_futures[stage2_future] = page_num_page
-                                stage2_future.add_done_callback(self.on_stage2_complete)
-                            except Exception as e:
-                                logger.error(f"❌ Error in Step 1.9 for page {page_num_page + 1}: {e}")
-                                self.results_dict[page_num_page] = {"error": str(e), "page_num": page_num_page + 1}
-                        
-                        page_future.add_done_callback(on_step1_9_complete)
-                    except Exception as e:
-                        logger.error(f"❌ Error in Step 1.8 for page {page_num_doc + 1}: {e}")
-                        self.results_dict[page_num_doc] = {"error": str(e), "page_num": page_num_doc + 1}
-                
-                pdf_doc_future.add_done_callback(on_step1_8_complete)
-            except Exception as e:
-                logger.error(f"❌ Error in Step 1.7 for page {page_num_fallback + 1}: {e}")
-                self.results_dict[page_num_fallback] = {"error": str(e), "page_num": page_num_fallback + 1}
-        
-        pdf_bytes_future.add_done_callback(on_step1_7_complete)
+        self.completion_counts[1] += 1
+        logger.debug(f"✅ [Page {page_num + 1}] Step 1 (Image conversion fallback) complete ({self.completion_counts[1]}/{self.total_pages})")
+        self._submit_render(page_num)
+
+    def _submit_render(self, page_num: int):
+        """Submit Stage 2 (render, enhance and encode - served from the page render cache when possible)"""
+        pdf_data = self.process_context.get("_pdf_data")
+        stage2_future = self.pool1.submit(self.pdf_processor.render_page_encoded, pdf_data, page_num)
+        self.stage2_futures[stage2_future] = page_num
+        stage2_future.add_done_callback(self.on_stage2_complete)
 
     # =========================================================================
     # Stage 1.6 Callback: YOLO Signature Detection
@@ -410,84 +412,33 @@ class PipelineCallbackFactory:
             self.page_data[page_num]["yolo_faces"] = []
 
     # =========================================================================
-    # Stage 2 Callback: PDF Rendering → Stage 3
+    # Stage 2 Callback: Page Render (+ Enhancement + Encoding) → Stage 7
     # =========================================================================
     def on_stage2_complete(self, future: Future):
-        """Callback: Move to Stage 3 immediately when Stage 2 completes"""
+        """Callback: Submit the encoded page to Stage 7 as soon as Stage 2 completes"""
         page_num = self.stage2_futures[future]
-        pix = None
         try:
-            pix = future.result()
-            if not pix:
-                self.results_dict[page_num] = {"error": f"Step 2 failed for page {page_num + 1}", "page_num": page_num + 1}
+            rendered = future.result()
+            if not rendered:
+                self._record_page_result(page_num, {"error": f"Step 2 failed for page {page_num + 1}", "page_num": page_num + 1})
                 return
             
-            self.page_data[page_num]["pix"] = pix
+            # original_img is only present for fresh renders; cache hits carry the encoded original
+            self.page_data[page_num]["encoded_image"] = rendered["processed"]
+            self.page_data[page_num]["original_encoded"] = rendered["original"]
+            if rendered["original_img"] is not None:
+                self.page_data[page_num]["original_img"] = rendered["original_img"]
+            self.page_data[page_num]["content_type"] = "image"
             self.completion_counts[2] += 1
-            logger.debug(f"✅ [Page {page_num + 1}] Step 2 (PDF rendering) complete ({self.completion_counts[2]}/{self.total_pages})")
-            
-            # Immediately submit to Stage 3
-            stage3_future = self.pool1.submit(self.pdf_processor.step3_create_pil_image, pix)
-            self.stage3_futures[stage3_future] = page_num
-            stage3_future.add_done_callback(self.on_stage3_complete)
-        except Exception as e:
-            logger.error(f"❌ Error in Step 2 (PDF rendering) for page {page_num + 1}: {e}")
-            self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
-
-    # =========================================================================
-    # Stage 3 Callback: PIL Image Creation → Stage 4
-    # =========================================================================
-    def on_stage3_complete(self, future: Future):
-        """Callback: Move to Stage 4 immediately when Stage 3 completes"""
-        page_num = self.stage3_futures[future]
-        try:
-            img = future.result()
-            if not img:
-                self.results_dict[page_num] = {"error": f"Step 3 failed for page {page_num + 1}", "page_num": page_num + 1}
-                return
-            
-            self.page_data[page_num]["img"] = img
-            self.completion_counts[3] += 1
-            logger.debug(f"✅ [Page {page_num + 1}] Step 3 (PIL image creation) complete ({self.completion_counts[3]}/{self.total_pages})")
-            
-            # Clean up pixmap
-            if "pix" in self.page_data[page_num]:
-                try:
-                    pix = self.page_data[page_num]["pix"]
-                    if hasattr(pix, 'close'):
-                        pix.close()
-                    del self.page_data[page_num]["pix"]
-                except Exception:
-                    pass
-            
-            # Immediately submit to Stage 4 (store original + enhancement - no A4 conversion)
-            stage4_future = self.pool1.submit(self.pdf_processor.step4_store_original_and_enhance, img)
-            self.stage4_futures[stage4_future] = page_num
-            stage4_future.add_done_callback(self.on_stage4_complete)
-        except Exception as e:
-            logger.error(f"❌ Error in Step 3 (PIL image creation) for page {page_num + 1}: {e}")
-            self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
-
-    # =========================================================================
-    # Stage 4 Callback: Store Original + Text Enhancement → Stage 6
-    # =========================================================================
-    def on_stage4_complete(self, future: Future):
-        """Callback: Move to Stage 6 immediately when Stage 4 completes (skipping Stage 5)"""
-        page_num = self.stage4_futures[future]
-        try:
-            processed_img, original_img = future.result()
-            self.page_data[page_num]["processed_img"] = processed_img
-            self.page_data[page_num]["original_img"] = original_img
-            self.completion_counts[4] += 1
-            logger.debug(f"✅ [Page {page_num + 1}] Step 4 (Store original + enhancement) complete ({self.completion_counts[4]}/{self.total_pages})")
+            self.completion_counts[6] += 1
+            source = "render cache" if rendered["cached"] else "rendered"
+            logger.debug(f"✅ [Page {page_num + 1}] Step 2 (Page image, {source}) complete ({self.completion_counts[2]}/{self.total_pages})")
+            self._notify_stage(page_num, "content_ready", content_type="image")
             
-            # Skip Stage 5 - directly submit to Stage 6 (encoding)
-            stage6_future = self.pool2.submit(self.pdf_processor._encode_image_simple, processed_img)
-            self.stage6_futures[stage6_future] = page_num
-            stage6_future.add_done_callback(self.on_stage6_complete)
+            self._submit_image_llm(page_num, rendered["processed"])
         except Exception as e:
-            logger.error(f"❌ Error in Step 4 (Store original + enhancement) for page {page_num + 1}: {e}")
-            self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
+            logger.error(f"❌ Error in Step 2 (PDF rendering) for page {page_num + 1}: {e}", exc_info=True)
+            self._record_page_result(page_num, {"error": str(e), "page_num": page_num + 1})
 
     # =========================================================================
     # Stage 6 Callbacks: Encoding → Stage 7
@@ -507,6 +458,7 @@ class PipelineCallbackFactory:
             self.page_data[page_num]["content_type"] = "text"
             self.completion_counts[6] += 1
             logger.debug(f"✅ [Page {page_num + 1}] Step 6 (Text ready) complete ({self.completion_counts[6]}/{self.total_pages})")
+            self._notify_stage(page_num, "content_ready", content_type="text")
             
             # Submit to Stage 7 (LLM call with text)
             task = self.process_context.get("task")
@@ -542,63 +494,37 @@ class PipelineCallbackFactory:
         except Exception as e:
             logger.error(f"❌ Error in Step 6 (Text path): {e}", exc_info=True)
             if 'page_num' in locals():
-                self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
+                self._record_page_result(page_num, {"error": str(e), "page_num": page_num + 1})
 
-    def on_stage6_complete(self, future: Future):
-        """Callback: Move to Stage 7 immediately when Stage 6 completes (image path)"""
-        try:
-            if future not in self.stage6_futures:
-                logger.error(f"❌ Step 6 (Image path) callback: Future not found")
-                return
-            page_num = self.stage6_futures[future]
-            encoded_image = future.result()
-            self.page_data[page_num]["encoded_image"] = encoded_image
-            self.page_data[page_num]["content_type"] = "image"
-            
-            # Clean up processed_img
-            if "processed_img" in self.page_data[page_num]:
-                try:
-                    del self.page_data[page_num]["processed_img"]
-                except Exception:
-                    pass
-            
-            self.completion_counts[6] += 1
-            logger.debug(f"✅ [Page {page_num + 1}] Step 6 (Base64 encoding) complete ({self.completion_counts[6]}/{self.total_pages})")
-            
-            # Submit to Stage 7 (LLM call with image)
-            task = self.process_context.get("task")
-            document_name = self.process_context.get("document_name", "Unknown")
-            templates = self.process_context.get("templates")
-            db_templates = self.process_context.get("db_templates")
-            document_type = self.process_context.get("document_type")
-            is_first_page = self.process_context.get("is_first_page", True)
-            table_headers = self.process_context.get("table_headers", [])
-            
-            # Build prompt context for bank statements
-            prompt_context = {
-                "is_first_page": is_first_page,
-                "table_headers": table_headers,
-                "page_number": page_num + 1
-            }
-            prompt, response_format = self.prompt_service.get_task_prompt(
-                task, templates, db_templates, content_type="image",
-                document_type=document_type, context=prompt_context
-            )
-            
-            stage7_future = self.pool3.submit(
-                self.llm_client.call_api_sync,
-                prompt, encoded_image, response_format, task,
-                f"{document_name} (page {page_num + 1})",
-                "image"
-            )
-            self.stage7_futures[stage7_future] = page_num
-            stage7_future.add_done_callback(self.on_stage7_complete)
-        except KeyError as e:
-            logger.error(f"❌ Error in Step 6 (Image path): Future not found: {e}")
-        except Exception as e:
-            logger.error(f"❌ Error in Step 6 (Base64 encoding): {e}", exc_info=True)
-            if 'page_num' in locals():
-                self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
+    def _submit_image_llm(self, page_num: int, encoded_image: str):
+        """Submit Stage 7 (LLM call with the encoded page image)"""
+        task = self.process_context.get("task")
+        document_name = self.process_context.get("document_name", "Unknown")
+        templates = self.process_context.get("templates")
+        db_templates = self.process_context.get("db_templates")
+        document_type = self.process_context.get("document_type")
+        is_first_page = self.process_context.get("is_first_page", True)
+        table_headers = self.process_context.get("table_headers", [])
+        
+        # Build prompt context for bank statements
+        prompt_context = {
+            "is_first_page": is_first_page,
+            "table_headers": table_headers,
+            "page_number": page_num + 1
+        }
+        prompt, response_format = self.prompt_service.get_task_prompt(
+            task, templates, db_templates, content_type="image",
+            document_type=document_type, context=prompt_context
+        )
+        
+        stage7_future = self.pool3.submit(
+            self.llm_client.call_api_sync,
+            prompt, encoded_image, response_format, task,
+            f"{document_name} (page {page_num + 1})",
+            "image"
+        )
+        self.stage7_futures[stage7_future] = page_num
+        stage7_future.add_done_callback(self.on_stage7_complete)
 
     # =========================================================================
     # Stage 7 Callback: LLM API Call → Stage 8
@@ -610,6 +536,7 @@ class PipelineCallbackFactory:
             page_result = future.result()
             self.page_data[page_num]["llm_result"] = page_result
             self.completion_counts[7] += 1
+            self._notify_stage(page_num, "llm_complete", completed=self.completion_counts[7], total=self.total_pages)
             
             # Log progress at INFO level for every 5 pages or first/last page
             if self.completion_counts[7] == 1 or self.completion_counts[7] == self.total_pages or self.completion_counts[7] % 5 == 0:
@@ -644,8 +571,8 @@ class PipelineCallbackFactory:
                         
                         # Don't clean up original_img here - face detection may also need it
                     else:
-                        # Fallback to encoded_image
-                        encoded_image = self.page_data[page_num].get("encoded_image")
+                        # Fallback to the encoded page (original when available, e.g. a render cache hit)
+                        encoded_image = self.page_data[page_num].get("original_encoded") or self.page_data[page_num].get("encoded_image")
                         if encoded_image and self.pool_yolo:
                             stage1_6_future = self.pool_yolo.submit(
                                 self._step1_6_yolo_signature_detection_full_page,
@@ -674,8 +601,8 @@ class PipelineCallbackFactory:
                         
                         # Don't clean up original_img here - might be needed for signatures too
                     else:
-                        # Fallback to encoded_image
-                        encoded_image = self.page_data[page_num].get("encoded_image")
+                        # Fallback to the encoded page (original when available, e.g. a render cache hit)
+                        encoded_image = self.page_data[page_num].get("original_encoded") or self.page_data[page_num].get("encoded_image")
                         if encoded_image and self.pool_yolo:
                             face_future = self.pool_yolo.submit(
                                 self._step1_6_yolo_face_detection_full_page,
@@ -740,13 +667,12 @@ class PipelineCallbackFactory:
             stage7_future.add_done_callback(self.on_stage7_complete)
         else:
             logger.error(f"❌ [Page {page_num + 1}] Step 7 failed after {retry_count} retries: {error}")
-            self.results_dict[page_num] = {
+            self._record_page_result(page_num, {
                 "error": str(error),
                 "page_num": page_num + 1,
                 "retry_count": retry_count,
                 "failed_stage": "LLM API call"
-            }
-            self.completion_counts[9] += 1
+            })
 
     # =========================================================================
     # Stage 8 Callback: Response Parsing → Stage 9
@@ -759,6 +685,7 @@ class PipelineCallbackFactory:
             self.page_data[page_num].update(parsed_data)
             self.completion_counts[8] += 1
             logger.debug(f"✅ [Page {page_num + 1}] Step 8 (Response parsing) complete ({self.completion_counts[8]}/{self.total_pages})")
+            self._notify_stage(page_num, "parsed", field_count=len(parsed_data.get("page_fields") or []))
             
             # Reset retry count on success
             if page_num in self.page_retry_counts:
@@ -791,22 +718,20 @@ class PipelineCallbackFactory:
                 stage8_future.add_done_callback(self.on_stage8_complete)
             else:
                 logger.error(f"❌ [Page {page_num + 1}] Cannot retry Step 8: LLM result not available")
-                self.results_dict[page_num] = {
+                self._record_page_result(page_num, {
                     "error": str(error),
                     "page_num": page_num + 1,
                     "retry_count": retry_count,
                     "failed_stage": "Response parsing"
-                }
-                self.completion_counts[9] += 1
+                })
         else:
             logger.error(f"❌ [Page {page_num + 1}] Step 8 failed after {retry_count} retries: {error}")
-            self.results_dict[page_num] = {
+            self._record_page_result(page_num, {
                 "error": str(error),
                 "page_num": page_num + 1,
                 "retry_count": retry_count,
                 "failed_stage": "Response parsing"
-            }
-            self.completion_counts[9] += 1
+            })
 
     # =========================================================================
     # Stage 9 Callback: Signature Processing → Final Result
@@ -816,8 +741,7 @@ class PipelineCallbackFactory:
         page_num = self.stage9_futures[future]
         try:
             final_result = future.result()
-            self.results_dict[page_num] = final_result
-            self.completion_counts[9] += 1
+            self._record_page_result(page_num, final_result)
             
             # Log progress at INFO level for every 5 pages or first/last page
             if self.completion_counts[9] == 1 or self.completion_counts[9] == self.total_pages or self.completion_counts[9] % 5 == 0:
@@ -859,13 +783,12 @@ class PipelineCallbackFactory:
             stage9_future.add_done_callback(self.on_stage9_complete)
         else:
             logger.error(f"❌ [Page {page_num + 1}] Step 9 failed after {retry_count} retries: {error}")
-            self.results_dict[page_num] = {
+            self._record_page_result(page_num, {
                 "error": str(error),
                 "page_num": page_num + 1,
                 "retry_count": retry_count,
                 "failed_stage": "Signature processing"
-            }
-            self.completion_counts[9] += 1
+            })
 
     # =========================================================================
     # Skip-Text Mode Callback
@@ -876,16 +799,14 @@ class PipelineCallbackFactory:
         try:
             page = future.result()
             if not page:
-                self.results_dict[page_num] = {"error": f"Step 1.3 failed for page {page_num + 1}", "page_num": page_num + 1}
+                self._record_page_result(page_num, {"error": f"Step 1.3 failed for page {page_num + 1}", "page_num": page_num + 1})
                 return
             
             self.page_data[page_num]["page"] = page
             logger.debug(f"✅ [Page {page_num + 1}] Step 1.3 complete - SKIPPING TEXT, going to IMAGE")
             
             # Jump directly to Stage 2
-            stage2_future = self.pool1.submit(self.pdf_processor.step1_10_render_page_to_pixmap, page)
-            self.stage2_futures[stage2_future] = page_num
-            stage2_future.add_done_callback(self.on_stage2_complete)
+            self._submit_render(page_num)
         except Exception as e:
             logger.error(f"❌ Error in Step 1.3 for page {page_num + 1}: {e}")
-            self.results_dict[page_num] = {"error": str(e), "page_num": page_num + 1}
+            self._record_page_result(page_num, {"error": str(e), "page_num": page_num + 1})
@@ -18,6 +18,12 @@ LLM_POOL_SIZE = 100         # LLM API calls (I/O bound)
 SIGNATURE_POOL_SIZE = 50    # Signature processing
 YOLO_POOL_SIZE = 20         # YOLO inference (GPU/CPU intensive)
 
+# =============================================================================
+# YOLO Micro-Batching (see yolo_batcher.py)
+# =============================================================================
+YOLO_BATCH_MAX_SIZE = 16     # Most images per batched forward pass
+YOLO_BATCH_MAX_WAIT_MS = 25  # Longest wait for more images to join a batch
+
 # =============================================================================
 # Timeout Configuration (in seconds)
 # =============================================================================
@@ -25,6 +31,7 @@ MAX_TIMEOUT = 300           # Maximum total operation timeout
 POLL_INTERVAL = 0.1         # Interval for checking future completion
 YOLO_TIMEOUT = 30           # Timeout for individual YOLO detection
 YOLO_BATCH_TIMEOUT = 60     # Timeout for batch YOLO detection
+LANE_DRAIN_TIMEOUT = 30     # Longest a request waits for its in-flight stage work at cleanup
 
 # =============================================================================
 # Image Configuration
@@ -15,7 +15,7 @@ from typing import Dict, Any, Optional, TYPE_CHECKING
 from PIL import Image
 
 if TYPE_CHECKING:
-    from ..pdf_processor import PDFProcessor
+    from ..pdf_processor import PDFProcessor, PDFSource
     from ..llm_client import LLMClient
     from ..prompt_service import PromptService
     from concurrent.futures import ThreadPoolExecutor
@@ -28,7 +28,7 @@ async def process_page_for_template_extraction(
     llm_client: 'LLMClient',
     prompt_service: 'PromptService',
     page_num: int,
-    pdf_data: str,
+    pdf_data: 'PDFSource',
     context: Dict[str, Any],
     convert_page_async_func,
     thread_pool: 'ThreadPoolExecutor'
@@ -41,7 +41,7 @@ async def process_page_for_template_extraction(
         llm_client: LLM client instance
         prompt_service: Prompt service instance
         page_num: Zero-based page number
-        pdf_data: Base64 encoded PDF data
+        pdf_data: Base64 encoded PDF data or decoded PDFDocumentHandle
         context: Context dictionary containing:
             - document_name: Document name
         convert_page_async_func: Async function to convert page to image
@@ -111,7 +111,7 @@ async def process_page_for_template_matching(
     llm_client: 'LLMClient',
     prompt_service: 'PromptService',
     page_num: int,
-    pdf_data: str,
+    pdf_data: 'PDFSource',
     context: Dict[str, Any],
     convert_page_async_func,
     thread_pool: 'ThreadPoolExecutor'
@@ -124,7 +124,7 @@ async def process_page_for_template_matching(
         llm_client: LLM client instance
         prompt_service: Prompt service instance
         page_num: Zero-based page number
-        pdf_data: Base64 encoded PDF data
+        pdf_data: Base64 encoded PDF data or decoded PDFDocumentHandle
         context: Context dictionary containing:
             - document_name: Document name
         convert_page_async_func: Async function to convert page to image
@@ -200,7 +200,7 @@ def process_page_for_extraction_sync(
     llm_client: 'LLMClient',
     prompt_service: 'PromptService',
     page_num: int,
-    pdf_data: str,
+    pdf_data: 'PDFSource',
     context: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
@@ -215,7 +215,7 @@ def process_page_for_extraction_sync(
         llm_client: LLM client instance
         prompt_service: Prompt service instance
         page_num: Zero-based page number
-        pdf_data: Base64 encoded PDF data
+        pdf_data: Base64 encoded PDF data or decoded PDFDocumentHandle
         context: Context dictionary containing:
             - task: Task type
             - document_name: Document name
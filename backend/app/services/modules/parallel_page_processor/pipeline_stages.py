@@ -7,15 +7,17 @@ Contains methods for the later stages of the processing pipeline:
 - process_encoding_and_llm: Encoding and LLM call processing
 """
 
+import base64
+import io
 import time
 import logging
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from concurrent.futures import CancelledError
 
 from PIL import Image
 
 if TYPE_CHECKING:
-    from ..pdf_processor import PDFProcessor
+    from ..pdf_processor import PDFProcessor, PDFSource
     from ..yolo_detector import YOLODetector
     from ...llm import GeminiClient
     from ...prompts import PromptService
@@ -60,6 +62,23 @@ def step8_parse_response(
     }
 
 
+def _encoded_original(pdf_processor: 'PDFProcessor', page_data: Dict[str, Any]) -> Optional[str]:
+    """Encoded original page image - reuses the render step's encoding when there is one"""
+    if page_data.get("original_encoded"):
+        return page_data["original_encoded"]
+    original_img = page_data.get("original_img")
+    return pdf_processor._encode_image_simple(original_img) if original_img else None
+
+
+def _original_image(page_data: Dict[str, Any]) -> Optional[Image.Image]:
+    """Original page image, decoded from its encoding when the page came from the render cache"""
+    original_img = page_data.get("original_img")
+    if original_img is None and page_data.get("original_encoded"):
+        base64_data = page_data["original_encoded"].split("base64,", 1)[-1]
+        original_img = Image.open(io.BytesIO(base64.b64decode(base64_data)))
+    return original_img
+
+
 def step9_process_signatures(
     pdf_processor: 'PDFProcessor',
     yolo_detector: 'YOLODetector',
@@ -87,10 +106,7 @@ def step9_process_signatures(
     if not yolo_detector.is_enabled():
         logger.debug(f"[Page {page_num + 1}] YOLO signature detection disabled - skipping signature processing")
         # Return minimal result without signature processing
-        original_img = page_data.get("original_img")
-        page_image_original = None
-        if original_img:
-            page_image_original = pdf_processor._encode_image_simple(original_img)
+        page_image_original = _encoded_original(pdf_processor, page_data)
 
         return {
             "page_result": page_result,
@@ -207,7 +223,7 @@ def step9_process_signatures(
 
         if content_type == "image" and processed_signatures:
             # Only create debug images for scanned PDFs/image documents
-            original_img = page_data.get("original_img")
+            original_img = _original_image(page_data)
 
             if original_img:
                 try:
@@ -303,11 +319,7 @@ def step9_process_signatures(
 
     # Encode original image if not already encoded
     if page_image_original_encoded is None:
-        original_img = page_data.get("original_img")
-        if original_img:
-            page_image_original = pdf_processor._encode_image_simple(original_img)
-        else:
-            page_image_original = None
+        page_image_original = _encoded_original(pdf_processor, page_data)
     else:
         page_image_original = page_image_original_encoded
 
@@ -329,7 +341,7 @@ def process_encoding_and_llm(
     page_num: int,
     page_image_processed_pil: Image.Image,
     page_image_original_pil: Image.Image,
-    pdf_data: str,
+    pdf_data: 'PDFSource',
     context: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
@@ -343,7 +355,7 @@ def process_encoding_and_llm(
         page_num: Zero-based page number
         page_image_processed_pil: Processed PIL Image
         page_image_original_pil: Original PIL Image
-        pdf_data: Base64 encoded PDF data
+        pdf_data: Base64 encoded PDF data or decoded PDFDocumentHandle
         context: Processing context
         
     Returns:
@@ -0,0 +1,240 @@
+"""
+Process-wide stage executors for the parallel page pipeline.
+
+Every request used to create its own set of ThreadPoolExecutors (pool1-pool4 plus
+pool_yolo) and tear them down afterwards, so N concurrent requests meant N times the
+configured threads. This module keeps one long-lived executor per pipeline stage,
+sized from config.py, and hands each request a lightweight StageLane per stage:
+
+- Global limit: a stage never runs more than its configured pool size at once
+- Per-request limit: a lane never runs more than the request's max_workers at once
+- Fair sharing: queued work is dispatched round-robin across requests, so one large
+  document cannot starve the small ones queued behind it
+- Metrics: queue depth, running tasks and active requests per stage (get_stats())
+
+StageLane exposes submit()/shutdown() like a ThreadPoolExecutor, so the callback
+factory and pipeline cleanup code use it unchanged.
+"""
+
+import itertools
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+_WorkItem = Tuple[Future, Callable, tuple, dict]
+
+
+class StageExecutor:
+    """
+    Shared executor for one pipeline stage with fair, bounded per-request dispatch.
+
+    Work is only handed to the underlying ThreadPoolExecutor when a slot is free, so its
+    internal queue stays empty and the dispatch order is decided here.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"stage-{name}")
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # Requests with queued work, in round-robin order
+        self._queues: "OrderedDict[str, Deque[_WorkItem]]" = OrderedDict()
+        self._running: Dict[str, int] = {}
+        self._limits: Dict[str, int] = {}
+        # Lanes shut down while their work was still running - dropped once it drains
+        self._closed: Set[str] = set()
+        self._in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.peak_queue_depth = 0
+
+    def lane(self, request_key: str, max_concurrency: int) -> "StageLane":
+        """Open a per-request lane limited to max_concurrency running tasks"""
+        with self._lock:
+            self._limits[request_key] = max(1, min(max_concurrency, self.max_workers))
+            self._running.setdefault(request_key, 0)
+        return StageLane(self, request_key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and throughput counters for this stage"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self._in_flight,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "active_requests": len(self._limits),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "peak_queue_depth": self.peak_queue_depth,
+            }
+
+    def _submit(self, request_key: str, fn: Callable, args: tuple, kwargs: dict) -> Future:
+        future: Future = Future()
+        with self._lock:
+            self._queues.setdefault(request_key, deque()).append((future, fn, args, kwargs))
+            self.submitted += 1
+            depth = sum(len(queue) for queue in self._queues.values())
+            if depth > self.peak_queue_depth:
+                self.peak_queue_depth = depth
+        self._dispatch()
+        return future
+
+    def _dispatch(self) -> None:
+        """Start queued work round-robin across requests while global and per-request slots are free"""
+        to_start = []
+        with self._lock:
+            while self._in_flight < self.max_workers and self._queues:
+                picked = None
+                for request_key in self._queues:
+                    if self._running.get(request_key, 0) < self._limits.get(request_key, self.max_workers):
+                        picked = request_key
+                        break
+                if picked is None:
+                    break
+
+                queue = self._queues[picked]
+                item = queue.popleft()
+                if queue:
+                    self._queues.move_to_end(picked)
+                else:
+                    del self._queues[picked]
+                self._running[picked] = self._running.get(picked, 0) + 1
+                self._in_flight += 1
+                to_start.append((picked, item))
+
+        for request_key, item in to_start:
+            self._pool.submit(self._run, request_key, item)
+
+    def _run(self, request_key: str, item: _WorkItem) -> None:
+        future, fn, args, kwargs = item
+        outcome: Optional[Tuple[bool, Any]] = None
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    outcome = (True, fn(*args, **kwargs))
+                except BaseException as e:
+                    outcome = (False, e)
+        finally:
+            # Free the slot before resolving the future, so callbacks that submit the
+            # next stage of this page see the capacity they just released
+            with self._lock:
+                self._running[request_key] -= 1
+                self._in_flight -= 1
+                self.completed += 1
+                if request_key in self._closed:
+                    self._forget_if_idle(request_key)
+                self._idle.notify_all()
+            self._dispatch()
+
+        if outcome is not None:
+            succeeded, value = outcome
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _cancel_queued(self, request_key: str) -> int:
+        with self._lock:
+            queue = self._queues.pop(request_key, None)
+        if not queue:
+            return 0
+        for future, _, _, _ in queue:
+            future.cancel()
+        return len(queue)
+
+    def _wait_idle(self, request_key: str) -> None:
+        with self._lock:
+            while self._running.get(request_key, 0) > 0 or self._queues.get(request_key):
+                self._idle.wait(timeout=1.0)
+
+    def _close_lane(self, request_key: str) -> None:
+        with self._lock:
+            self._closed.add(request_key)
+            self._forget_if_idle(request_key)
+
+    def _forget_if_idle(self, request_key: str) -> None:
+        """Drop a closed lane's bookkeeping once it has nothing running or queued (lock held)"""
+        if self._running.get(request_key, 0) == 0 and not self._queues.get(request_key):
+            self._running.pop(request_key, None)
+            self._limits.pop(request_key, None)
+            self._closed.discard(request_key)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+class StageLane:
+    """
+    A request's handle on a shared StageExecutor.
+
+    Mirrors the ThreadPoolExecutor submit()/shutdown() surface: shutdown() only waits for
+    (or cancels) this request's work, the shared threads stay alive for other requests.
+    """
+
+    def __init__(self, executor: StageExecutor, request_key: str):
+        self._executor = executor
+        self._request_key = request_key
+        self._closed = False
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        if self._closed:
+            raise RuntimeError(f"cannot schedule new futures after {self._executor.name} lane shutdown")
+        return self._executor._submit(self._request_key, fn, args, kwargs)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self._closed = True
+        if cancel_futures:
+            cancelled = self._executor._cancel_queued(self._request_key)
+            if cancelled:
+                logger.debug(f"   Cancelled {cancelled} queued {self._executor.name} task(s) for {self._request_key}")
+        if wait:
+            self._executor._wait_idle(self._request_key)
+        self._executor._close_lane(self._request_key)
+
+
+class StageScheduler:
+    """The set of shared stage executors used by every pipeline run in this process"""
+
+    def __init__(self):
+        self.conversion = StageExecutor("conversion", config.CONVERSION_POOL_SIZE)
+        self.encoding = StageExecutor("encoding", config.ENCODING_POOL_SIZE)
+        self.llm = StageExecutor("llm", config.LLM_POOL_SIZE)
+        self.signature = StageExecutor("signature", config.SIGNATURE_POOL_SIZE)
+        self.yolo = StageExecutor("yolo", config.YOLO_POOL_SIZE)
+        self._request_ids = itertools.count(1)
+
+    def new_request_key(self, request_id: Optional[str] = None) -> str:
+        """Unique lane key for a pipeline run (request ids can repeat across retries)"""
+        return f"{request_id or 'request'}#{next(self._request_ids)}"
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            executor.name: executor.get_stats()
+            for executor in (self.conversion, self.encoding, self.llm, self.signature, self.yolo)
+        }
+
+
+_scheduler: Optional[StageScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_stage_scheduler() -> StageScheduler:
+    """Get or create the process-wide stage scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = StageScheduler()
+                logger.info(
+                    f"🧵 Stage scheduler ready - conversion={config.CONVERSION_POOL_SIZE}, "
+                    f"encoding={config.ENCODING_POOL_SIZE}, llm={config.LLM_POOL_SIZE}, "
+                    f"signature={config.SIGNATURE_POOL_SIZE}, yolo={config.YOLO_POOL_SIZE} threads"
+                )
+    return _scheduler
@@ -0,0 +1,161 @@
+"""
+Process-wide micro-batching queue for YOLO inference.
+
+The pipeline used to run one page at a time on pool_yolo, so up to YOLO_POOL_SIZE
+threads called the same CPU torch model concurrently and mostly fought over its intra-op
+threads. Pages now enqueue their images here instead and wait on a future:
+
+- One dispatcher thread owns inference; it collects images across pages and concurrent
+  requests until YOLO_BATCH_MAX_SIZE images are queued or YOLO_BATCH_MAX_WAIT_MS has
+  passed since the first one arrived
+- Each flush runs one batched forward pass per model (signature and face requests that
+  arrive in the same window are served by the same flush) and scatters the per-image
+  results back to the waiting futures
+- Metrics: batches, images and average batch size (get_stats())
+
+The batch functions are the detectors' own detect_*_in_images_batch methods, so the
+per-image output format and the batch -> individual fallbacks are unchanged.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# detect_*_in_images_batch(images) -> one detection list per image
+BatchFunction = Callable[[List[Image.Image]], List[List[Dict[str, Any]]]]
+
+_QueueItem = Tuple[BatchFunction, Image.Image, Future]
+
+
+class YOLOBatchQueue:
+    """
+    Collects YOLO requests into micro-batches run by a single dispatcher thread.
+
+    Args:
+        max_batch_size: Most images per flush (across all models)
+        max_wait_ms: Longest time the first queued image waits for others to join its batch
+    """
+
+    def __init__(self, max_batch_size: int, max_wait_ms: float):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Deque[_QueueItem] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.images = 0
+        self.peak_batch_size = 0
+
+    def submit(self, batch_fn: BatchFunction, image: Image.Image) -> Future:
+        """Queue one image for batch_fn; the future resolves to that image's detections"""
+        future: Future = Future()
+        with self._lock:
+            self._ensure_dispatcher()
+            self._queue.append((batch_fn, image, future))
+            self._not_empty.notify()
+        return future
+
+    def detect(self, batch_fn: BatchFunction, image: Image.Image) -> List[Dict[str, Any]]:
+        """Blocking single-image detection through the batch queue"""
+        return self.submit(batch_fn, image).result()
+
+    def detect_many(self, batch_fn: BatchFunction, images: List[Image.Image]) -> List[List[Dict[str, Any]]]:
+        """Blocking detection for several images (e.g. a page's image blocks), one result per image"""
+        futures = [self.submit(batch_fn, image) for image in images]
+        return [future.result() for future in futures]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of batching counters"""
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+                "queued": len(self._queue),
+                "batches": self.batches,
+                "images": self.images,
+                "avg_batch_size": round(self.images / self.batches, 2) if self.batches else 0.0,
+                "peak_batch_size": self.peak_batch_size,
+            }
+
+    def _ensure_dispatcher(self) -> None:
+        """Start the dispatcher thread on first use (caller holds the lock)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._dispatch_loop, name="yolo-batcher", daemon=True)
+            self._thread.start()
+
+    def _next_batch(self) -> List[_QueueItem]:
+        """Wait for work, then gather until the batch is full or the wait window closes"""
+        with self._lock:
+            while not self._queue:
+                self._not_empty.wait()
+            deadline = time.monotonic() + self.max_wait_seconds
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(timeout=remaining)
+            batch = [self._queue.popleft() for _ in range(min(self.max_batch_size, len(self._queue)))]
+            self.batches += 1
+            self.images += len(batch)
+            self.peak_batch_size = max(self.peak_batch_size, len(batch))
+        return batch
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+
+            # One forward pass per model; bound methods of the same detector compare equal
+            groups: Dict[BatchFunction, List[Tuple[Image.Image, Future]]] = {}
+            for batch_fn, image, future in batch:
+                if future.set_running_or_notify_cancel():
+                    groups.setdefault(batch_fn, []).append((image, future))
+
+            for batch_fn, items in groups.items():
+                self._run_group(batch_fn, items)
+
+    @staticmethod
+    def _run_group(batch_fn: BatchFunction, items: List[Tuple[Image.Image, Future]]) -> None:
+        batch_start = time.time()
+        try:
+            results = batch_fn([image for image, _ in items])
+            if len(results) != len(items):
+                raise RuntimeError(f"YOLO batch returned {len(results)} results for {len(items)} images")
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        logger.debug(f"   YOLO micro-batch of {len(items)} image(s) took {time.time() - batch_start:.2f}s")
+        for (_, future), detections in zip(items, results):
+            future.set_result(detections)
+
+
+_batch_queue: Optional[YOLOBatchQueue] = None
+_batch_queue_lock = threading.Lock()
+
+
+def get_yolo_batch_queue() -> YOLOBatchQueue:
+    """Get or create the process-wide YOLO batch queue"""
+    global _batch_queue
+    if _batch_queue is None:
+        with _batch_queue_lock:
+            if _batch_queue is None:
+                _batch_queue = YOLOBatchQueue(
+                    max_batch_size=config.YOLO_BATCH_MAX_SIZE,
+                    max_wait_ms=config.YOLO_BATCH_MAX_WAIT_MS,
+                )
+                logger.info(
+                    f"🎯 YOLO batch queue ready - up to {config.YOLO_BATCH_MAX_SIZE} images "
+                    f"per batch, {config.YOLO_BATCH_MAX_WAIT_MS}ms max wait"
+                )
+    return _batch_queue
@@ -16,6 +16,8 @@ from typing import Dict, List, Any, TYPE_CHECKING
 
 from PIL import Image
 
+from .yolo_batcher import get_yolo_batch_queue
+
 if TYPE_CHECKING:
     import fitz
     from ..pdf_processor import PDFProcessor
@@ -70,7 +72,8 @@ def step1_6_yolo_face_detection(
         # Run batch YOLO detection on all images at once (much faster than sequential)
         batch_start = time.time()
         try:
-            batch_detections = face_detector.detect_faces_in_images_batch(block_images)
+            # Queued with other pages' images - one micro-batched forward pass per flush
+            batch_detections = get_yolo_batch_queue().detect_many(face_detector.detect_faces_in_images_batch, block_images)
             batch_time = time.time() - batch_start
             logger.debug(f"   [Page {page_num + 1}] Batch YOLO face detection took {batch_time:.2f}s for {len(block_images)} images")
         except AttributeError as compat_error:
@@ -181,7 +184,7 @@ def step1_6_yolo_face_detection_full_page_from_pil(
         logger.debug(f"   Original image: size={original_image.size}, mode={original_image.mode}")
 
         # Run YOLO detection on original unprocessed image
-        detections = face_detector.detect_faces_in_image(original_image)
+        detections = get_yolo_batch_queue().detect(face_detector.detect_faces_in_images_batch, original_image)
 
         yolo_faces = []
         for detection in detections:
@@ -303,7 +306,7 @@ def step1_6_yolo_face_detection_full_page(
         full_page_image = Image.open(io.BytesIO(image_bytes))
 
         # Run YOLO detection on full page image
-        detections = face_detector.detect_faces_in_image(full_page_image)
+        detections = get_yolo_batch_queue().detect(face_detector.detect_faces_in_images_batch, full_page_image)
 
         yolo_faces = []
         for detection in detections:
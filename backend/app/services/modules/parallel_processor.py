@@ -18,10 +18,11 @@ import time
 import hashlib
 import base64
 from concurrent.futures import ThreadPoolExecutor, Future
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, AsyncIterator, Tuple
 from PIL import Image
 import fitz  # PyMuPDF
-from ..pdf_processor import PDFProcessor
+from ..pdf_processor import PDFProcessor, PDFSource
+from ..analysis_events import get_analysis_event_stream, page_event_payload
 from .llm_client import LLMClient
 from .prompt_service import PromptService
 from .yolo_signature_detector import YOLOSignatureDetector
@@ -44,6 +45,8 @@ from .parallel_page_processor import (
     process_page_for_extraction_sync as modular_process_page_for_extraction_sync,
     process_page_for_template_extraction as modular_process_page_for_template_extraction,
     process_page_for_template_matching as modular_process_page_for_template_matching,
+    StageLane,
+    get_stage_scheduler,
 )
 
 logger = logging.getLogger(__name__)
@@ -71,7 +74,7 @@ class ParallelPageProcessor:
         # Face detector for photo ID detection
         self.face_detector = face_detector if face_detector is not None else YOLOFaceDetector()
 
-    async def _convert_page_to_image_async(self, pdf_data: str, page_num: int, thread_pool: ThreadPoolExecutor) -> Optional[Dict[str, str]]:
+    async def _convert_page_to_image_async(self, pdf_data: PDFSource, page_num: int, thread_pool: ThreadPoolExecutor) -> Optional[Dict[str, str]]:
         """
         Convert a PDF page to image asynchronously using thread pool executor
 
@@ -108,7 +111,7 @@ class ParallelPageProcessor:
 
     async def _extract_page_content_async(
         self,
-        pdf_data: str,
+        pdf_data: PDFSource,
         page_num: int,
         prefer_text: Optional[bool] = None,
         text_confidence_threshold: Optional[float] = None
@@ -213,7 +216,7 @@ class ParallelPageProcessor:
         page_num: int,
         page_image_processed_pil: Image.Image,
         page_image_original_pil: Image.Image,
-        pdf_data: str,
+        pdf_data: PDFSource,
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Process encoding and LLM call for a single page. Delegates to modular function."""
@@ -234,7 +237,7 @@ class ParallelPageProcessor:
     def process_page_for_extraction_sync(
         self,
         page_num: int,
-        pdf_data: str,
+        pdf_data: PDFSource,
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
@@ -253,7 +256,7 @@ class ParallelPageProcessor:
     async def process_page_for_template_extraction(
         self,
         page_num: int,
-        pdf_data: str,
+        pdf_data: PDFSource,
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Process a single page for template-guided extraction. Delegates to modular function."""
@@ -272,7 +275,7 @@ class ParallelPageProcessor:
     async def process_page_for_template_matching(
         self,
         page_num: int,
-        pdf_data: str,
+        pdf_data: PDFSource,
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Process a single page for template matching. Delegates to modular function."""
@@ -293,7 +296,7 @@ class ParallelPageProcessor:
     # =========================================================================
     async def process_pages_parallel(
         self,
-        pdf_data: str,
+        pdf_data: PDFSource,
         total_pages: int,
         process_page_fn: Callable[[int, str, Dict[str, Any]], Dict[str, Any]],
         process_context: Optional[Dict[str, Any]] = None,
@@ -306,15 +309,67 @@ class ParallelPageProcessor:
         """
         Process multiple PDF pages using multi-stage pipeline with true step-level parallelism.
         
+        Collects the results of stream_pages_parallel() and returns them in page order.
+        
+        Args:
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle. It is decoded
+                      once here and the handle is passed to every stage and page callback.
+            start_page: Starting page index (0-based). Pages before this are skipped.
+        """
+        results_by_page: Dict[int, Dict[str, Any]] = {}
+        async for page_num, page_result in self.stream_pages_parallel(
+            pdf_data,
+            total_pages,
+            process_context=process_context,
+            max_workers=max_workers,
+            max_threads=max_threads,
+            cancellation_token=cancellation_token,
+            request_id=request_id,
+            start_page=start_page,
+        ):
+            results_by_page[page_num] = page_result
+
+        if not results_by_page:
+            return []
+
+        first_page = min(start_page, min(results_by_page))
+        return [results_by_page.get(page_num, {"error": f"Missing result for page {page_num + 1}", "page_num": page_num + 1})
+                for page_num in range(first_page, total_pages)]
+
+    async def stream_pages_parallel(
+        self,
+        pdf_data: PDFSource,
+        total_pages: int,
+        process_context: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        max_threads: Optional[int] = None,
+        cancellation_token: Optional[Any] = None,
+        request_id: Optional[str] = None,
+        start_page: int = 0,
+        timeout: float = 600,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Run the multi-stage pipeline and yield (page_index, result) as each page finishes.
+        
         This method orchestrates the entire pipeline using PipelineCallbackFactory for
-        stage completion handling.
+        stage completion handling. The factory signals every final page result onto an
+        asyncio queue via loop.call_soon_threadsafe, so the caller wakes up as soon as a
+        page is done instead of polling - results arrive in completion order, not page order.
+        
+        If a streaming analyze endpoint opened an event stream for request_id, page
+        milestones and every finished page are published to it as they happen.
         
         Args:
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
+            total_pages: Total number of pages in the document
             start_page: Starting page index (0-based). Pages before this are skipped.
+            timeout: Seconds to wait for all pages before the rest are reported as timed out
         """
         if process_context is None:
             process_context = {}
 
+        pdf_data = self.pdf_processor.open_document_handle(pdf_data)
+
         effective_max_workers = max_workers if max_workers is not None else (max_threads if max_threads is not None else self.max_workers)
         
         prefer_text = process_context.get("prefer_text", True)
@@ -324,7 +379,7 @@ class ParallelPageProcessor:
         pages_to_process = total_pages - start_page
         if pages_to_process <= 0:
             logger.info(f"📄 No pages to process (start_page={start_page}, total_pages={total_pages})")
-            return []
+            return
         
         if prefer_text:
             logger.info(f"🔤 Text extraction ENABLED (confidence threshold: {text_confidence_threshold:.1%})")
@@ -333,11 +388,14 @@ class ParallelPageProcessor:
 
         logger.info(f"🚀 Starting parallel processing: pages {start_page + 1}-{total_pages} ({pages_to_process} pages) with {effective_max_workers} concurrent workers")
 
-        # Create thread pools
-        pool1 = ThreadPoolExecutor(max_workers=min(effective_max_workers, 50))
-        pool2 = ThreadPoolExecutor(max_workers=min(effective_max_workers, 50))
-        pool3 = ThreadPoolExecutor(max_workers=min(effective_max_workers, 100))
-        pool3_max_workers = min(effective_max_workers, 100)
+        # Open per-request lanes on the process-wide stage executors (threads are shared
+        # across requests; each lane is capped at this request's worker budget)
+        scheduler = get_stage_scheduler()
+        lane_key = scheduler.new_request_key(request_id)
+        pool1 = scheduler.conversion.lane(lane_key, effective_max_workers)
+        pool2 = scheduler.encoding.lane(lane_key, effective_max_workers)
+        pool3 = scheduler.llm.lane(lane_key, effective_max_workers)
+        pool3_max_workers = min(effective_max_workers, pp_config.LLM_POOL_SIZE)
         
         try:
             self.llm_client._get_sync_session(pool_connections=1, max_connections=pool3_max_workers)
@@ -345,8 +403,8 @@ class ParallelPageProcessor:
         except Exception as e:
             logger.warning(f"⚠️ Failed to pre-initialize HTTP session: {e}")
             
-        pool4 = ThreadPoolExecutor(max_workers=min(effective_max_workers, 50))
-        pool_yolo = ThreadPoolExecutor(max_workers=min(effective_max_workers, 20)) if self.yolo_detector.is_enabled() else None
+        pool4 = scheduler.signature.lane(lane_key, effective_max_workers)
+        pool_yolo = scheduler.yolo.lane(lane_key, effective_max_workers) if self.yolo_detector.is_enabled() else None
 
         try:
             # Initialize shared data structures
@@ -355,7 +413,7 @@ class ParallelPageProcessor:
             completion_counts = {i: 0 for i in range(1, 11)}
             page_retry_counts: Dict[int, int] = {}
 
-            # Store PDF data in context for callbacks
+            # Store decoded PDF handle in context for callbacks
             process_context["_pdf_data"] = pdf_data
 
             # Create callback factory
@@ -387,16 +445,42 @@ class ParallelPageProcessor:
                 step1_6_face_full=self._step1_6_yolo_face_detection_full_page,
             )
 
-            # Pre-process PDF document (shared across all pages)
-            pdf_bytes_shared = self.pdf_processor.step1_1_decode_base64_pdf(pdf_data)
-            if not pdf_bytes_shared:
+            # Completion signal: pool threads hand finished pages to the event loop
+            loop = asyncio.get_running_loop()
+            finished_pages: asyncio.Queue = asyncio.Queue()
+
+            def notify_page_finished(page_num: int, page_result: Dict[str, Any]):
+                try:
+                    loop.call_soon_threadsafe(finished_pages.put_nowait, (page_num, page_result))
+                except RuntimeError:
+                    # Event loop already closed - the request was abandoned
+                    pass
+
+            callback_factory.set_result_listener(notify_page_finished)
+            pdf_document_shared = None
+
+            # Progress events for the streaming analyze endpoints (None for plain requests)
+            event_stream = get_analysis_event_stream(request_id)
+            if event_stream is not None:
+                callback_factory.set_stage_listener(
+                    lambda page_num, stage, details: event_stream.emit("page_stage", page=page_num + 1, stage=stage, **details)
+                )
+                event_stream.emit("pages_started", startPage=start_page + 1, totalPages=total_pages, pagesToProcess=pages_to_process)
+
+            # Pre-process PDF document (shared across all pages) - handle is already decoded
+            if not pdf_data.pdf_bytes:
                 logger.error("❌ Failed to decode PDF data")
-                return [{"error": "Failed to decode PDF data", "page_num": i + 1} for i in range(total_pages)]
+                for i in range(total_pages):
+                    yield i, {"error": "Failed to decode PDF data", "page_num": i + 1}
+                return
 
-            pdf_document_shared = self.pdf_processor.step1_2_open_pdf_document(pdf_bytes_shared)
+            # Pinned cached document (the one a document session holds), released in finally
+            pdf_document_shared = self.pdf_processor.step1_2_acquire_pdf_document(pdf_data)
             if not pdf_document_shared:
                 logger.error("❌ Failed to open PDF document")
-                return [{"error": "Failed to open PDF document", "page_num": i + 1} for i in range(total_pages)]
+                for i in range(total_pages):
+                    yield i, {"error": "Failed to open PDF document", "page_num": i + 1}
+                return
 
             # Store shared PDF document in page_data
             for page_num in range(start_page, total_pages):
@@ -418,58 +502,68 @@ class ParallelPageProcessor:
                     skip_futures[future] = page_num
                     future.add_done_callback(lambda f: callback_factory.on_skip_text_get_page_complete(f, skip_futures))
 
-            # Poll for completion
+            # Wait for completion signals
             start_time = time.time()
-            timeout = 600  # 10 minutes timeout
-            poll_interval = 0.1
-
-            while completion_counts[9] < pages_to_process:
-                await asyncio.sleep(poll_interval)
-                elapsed = time.time() - start_time
-                
-                if elapsed > timeout:
-                    logger.error(f"❌ Pipeline timeout after {elapsed:.1f}s")
-                    for page_num in range(start_page, total_pages):
-                        if page_num not in results_dict:
-                            results_dict[page_num] = {"error": "Pipeline timeout", "page_num": page_num + 1}
-                    break
-                
-                # Dynamic poll interval
-                if elapsed > 30 and poll_interval < 0.5:
-                    poll_interval = 0.5
-                elif elapsed > 120 and poll_interval < 1.0:
-                    poll_interval = 1.0
-
-            logger.info(f"✅ All pages completed: {completion_counts[9]}/{pages_to_process} pages processed in {elapsed:.1f}s")
+            pending_pages = set(range(start_page, total_pages))
 
-            # Close shared PDF document
-            if pdf_document_shared:
+            while pending_pages:
+                remaining = timeout - (time.time() - start_time)
+                if remaining <= 0:
+                    break
                 try:
-                    pdf_document_shared.close()
-                    logger.debug(f"🔒 Closed shared PDF document")
-                except Exception as e:
-                    logger.warning(f"⚠️ Error closing shared PDF document: {e}")
-
-            # Sort results by page number (only return pages we processed)
-            page_results = [results_dict.get(page_num, {"error": f"Missing result for page {page_num + 1}", "page_num": page_num + 1})
-                           for page_num in range(start_page, total_pages)]
-
-            success_count = sum(1 for r in page_results if "error" not in r)
+                    page_num, page_result = await asyncio.wait_for(finished_pages.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if page_num not in pending_pages:
+                    continue
+                pending_pages.discard(page_num)
+                if event_stream is not None:
+                    event_stream.emit(
+                        "page",
+                        completed=pages_to_process - len(pending_pages),
+                        total=pages_to_process,
+                        result=page_event_payload(page_num, page_result)
+                    )
+                yield page_num, page_result
+
+            elapsed = time.time() - start_time
+            if pending_pages:
+                logger.error(f"❌ Pipeline timeout after {elapsed:.1f}s ({len(pending_pages)} page(s) unfinished)")
+                completed_pages = pages_to_process - len(pending_pages)
+                for page_num in sorted(pending_pages):
+                    timeout_result = {"error": "Pipeline timeout", "page_num": page_num + 1}
+                    completed_pages += 1
+                    if event_stream is not None:
+                        event_stream.emit("page", completed=completed_pages, total=pages_to_process,
+                                          result=page_event_payload(page_num, timeout_result))
+                    yield page_num, timeout_result
+
+            success_count = sum(1 for r in results_dict.values() if "error" not in r)
             error_count = pages_to_process - success_count
+            logger.info(f"✅ All pages completed: {completion_counts[9]}/{pages_to_process} pages processed in {elapsed:.1f}s")
             logger.info(f"📊 Pipeline complete: {success_count} successful, {error_count} errors out of {pages_to_process} pages")
 
-            return page_results
-
         finally:
-            # Cleanup thread pools
-            self._cleanup_thread_pools(pool1, pool2, pool3, pool4, pool_yolo, callback_factory if 'callback_factory' in locals() else None)
-            
-            # Clear PDF cache
+            if 'callback_factory' in locals():
+                callback_factory.set_result_listener(None)
+                callback_factory.set_stage_listener(None)
+
+            # Drain the lanes and drop the shared PDF pin on a worker thread so the event loop
+            # waits at most LANE_DRAIN_TIMEOUT; past that, the thread still unpins the document
+            # once the stragglers are done with it
+            shared_pdf = pdf_data if 'pdf_document_shared' in locals() and pdf_document_shared else None
             try:
-                self.pdf_processor.clear_pdf_cache()
-                logger.debug("✅ PDF cache cleared")
-            except Exception as e:
-                logger.warning(f"⚠️ Error clearing PDF cache: {e}")
+                await asyncio.wait_for(
+                    asyncio.to_thread(
+                        self._finish_request,
+                        pool1, pool2, pool3, pool4, pool_yolo,
+                        callback_factory if 'callback_factory' in locals() else None,
+                        shared_pdf
+                    ),
+                    timeout=pp_config.LANE_DRAIN_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Stage work still running after {pp_config.LANE_DRAIN_TIMEOUT}s - cleanup continues in the background")
 
             # Clear data structures
             if 'page_data' in locals():
@@ -477,40 +571,52 @@ class ParallelPageProcessor:
             if 'results_dict' in locals():
                 results_dict.clear()
 
+    def _finish_request(
+        self,
+        pool1: StageLane,
+        pool2: StageLane,
+        pool3: StageLane,
+        pool4: StageLane,
+        pool_yolo: Optional[StageLane],
+        callback_factory: Optional[PipelineCallbackFactory],
+        shared_pdf: Optional[PDFSource]
+    ):
+        """Release the request's lanes, then its PDF document pin (blocking - run off the event loop)"""
+        self._cleanup_thread_pools(pool1, pool2, pool3, pool4, pool_yolo, callback_factory)
+
+        # Release the shared PDF document pin (after the pools, so no stage is still reading it)
+        try:
+            if shared_pdf is not None:
+                self.pdf_processor.release_pdf_document(shared_pdf)
+            self.pdf_processor.clear_pdf_cache()
+            logger.debug("✅ PDF cache cleared")
+        except Exception as e:
+            logger.warning(f"⚠️ Error clearing PDF cache: {e}")
+
     def _cleanup_thread_pools(
         self,
-        pool1: ThreadPoolExecutor,
-        pool2: ThreadPoolExecutor,
-        pool3: ThreadPoolExecutor,
-        pool4: ThreadPoolExecutor,
-        pool_yolo: Optional[ThreadPoolExecutor],
+        pool1: StageLane,
+        pool2: StageLane,
+        pool3: StageLane,
+        pool4: StageLane,
+        pool_yolo: Optional[StageLane],
         callback_factory: Optional[PipelineCallbackFactory]
     ):
-        """Clean up all thread pools and clear future dictionaries."""
+        """
+        Release this request's stage lanes and clear future dictionaries.
+        
+        Queued work the request no longer needs is cancelled; shutting down a lane then waits
+        for the request's own running work only, the shared stage threads keep serving other
+        requests.
+        """
         try:
             logger.debug("🧹 Shutting down thread pools...")
 
-            # Shutdown YOLO pool first (if it exists)
+            # Shutdown YOLO pool first (if it exists) - wait for in-flight detections like the
+            # other lanes rather than abandoning them to finish against released page data
             if pool_yolo is not None:
                 try:
-                    if self.yolo_detector.is_enabled() and callback_factory:
-                        yolo_wait_start = time.time()
-                        yolo_wait_timeout = 30
-                        pending_yolo_count = sum(1 for f in callback_factory.stage1_6_futures.keys() if not f.done())
-                        if pending_yolo_count > 0:
-                            logger.debug(f"   Waiting for {pending_yolo_count} pending YOLO task(s)...")
-                            for yolo_future in list(callback_factory.stage1_6_futures.keys()):
-                                if not yolo_future.done():
-                                    remaining_time = max(1, yolo_wait_timeout - (time.time() - yolo_wait_start))
-                                    if remaining_time <= 0:
-                                        break
-                                    try:
-                                        yolo_future.result(timeout=min(remaining_time, 5))
-                                    except Exception:
-                                        pass
-                                if time.time() - yolo_wait_start > yolo_wait_timeout:
-                                    break
-                    pool_yolo.shutdown(wait=False)
+                    pool_yolo.shutdown(wait=True, cancel_futures=True)
                     logger.debug("   ✅ YOLO pool shut down")
                 except Exception as e:
                     logger.warning(f"   ⚠️ Error shutting down YOLO pool: {e}")
@@ -518,7 +624,7 @@ class ParallelPageProcessor:
             # Shutdown main thread pools
             for pool_name, pool in [("pool1", pool1), ("pool2", pool2), ("pool3", pool3), ("pool4", pool4)]:
                 try:
-                    pool.shutdown(wait=True)
+                    pool.shutdown(wait=True, cancel_futures=True)
                     logger.debug(f"   ✅ {pool_name} shut down")
                 except Exception as e:
                     logger.warning(f"   ⚠️ Error shutting down {pool_name}: {e}")
@@ -535,8 +641,6 @@ class ParallelPageProcessor:
                 callback_factory.stage1_5_futures.clear()
                 callback_factory.stage1_6_futures.clear()
                 callback_factory.stage2_futures.clear()
-                callback_factory.stage3_futures.clear()
-                callback_factory.stage4_futures.clear()
                 callback_factory.stage5_futures.clear()
                 callback_factory.stage6_futures.clear()
                 callback_factory.stage7_futures.clear()
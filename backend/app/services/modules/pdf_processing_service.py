@@ -6,7 +6,7 @@ Handles PDF processing logic for document analysis
 import json
 import logging
 from typing import Dict, Any, List, Optional, Tuple
-from ..pdf_processor import PDFProcessor
+from ..pdf_processor import PDFProcessor, PDFSource
 from .llm_client import LLMClient
 from .prompt_service import PromptService
 from .parallel_processor import ParallelPageProcessor
@@ -62,7 +62,7 @@ class PDFProcessingService:
 
     async def process_pdf_multi_page(
         self,
-        pdf_data: str,
+        pdf_data: PDFSource,
         task: str,
         document_name: Optional[str],
         templates: Optional[List[Dict[str, Any]]] = None,
@@ -74,6 +74,9 @@ class PDFProcessingService:
     ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], List[str], List[Dict[str, Any]]]:
         """Process PDF with multi-page approach"""
         try:
+            # Decode once; every downstream stage reuses the same handle
+            pdf_data = self.pdf_processor.open_document_handle(pdf_data)
+            
             # For template_matching, use field-first approach
             if task == "template_matching":
                 return await self._process_template_matching_field_first(
@@ -143,7 +146,7 @@ class PDFProcessingService:
 
     async def _process_template_matching_field_first(
         self,
-        pdf_data: str,
+        pdf_data: PDFSource,
         task: str,
         document_name: Optional[str],
         templates: Optional[List[Dict[str, Any]]] = None,
@@ -359,7 +362,7 @@ Please analyze the extracted fields and match them to the most appropriate templ
 
     async def _process_template_guided_extraction_two_step(
         self,
-        pdf_data: str,
+        pdf_data: PDFSource,
         document_name: Optional[str],
         templates: Optional[List[Dict[str, Any]]] = None,
         db_templates: Optional[List[Dict[str, Any]]] = None,
@@ -753,7 +756,7 @@ Return:
 
     async def _process_bank_statement_pages(
         self,
-        pdf_data: str,
+        pdf_data: PDFSource,
         total_pages: int,
         task: str,
         document_name: Optional[str],
@@ -880,7 +883,7 @@ Return:
 
     async def process_pdf_page_by_page(
         self,
-        pdf_data: str,
+        pdf_data: PDFSource,
         task: str,
         document_name: Optional[str],
         templates: Optional[List[Dict[str, Any]]] = None,
@@ -894,6 +897,9 @@ Return:
         """Process PDF with page-by-page approach"""
         logger.debug(f"🚀 PDF Processing Service: Starting process_pdf_page_by_page for task: {task}")
         try:
+            # Decode once; page count, bank statement passes and the pipeline share the handle
+            pdf_data = self.pdf_processor.open_document_handle(pdf_data)
+            
             # Get total page count
             total_pages = self.pdf_processor.get_pdf_page_count(pdf_data)
             logger.debug(f"📄 Processing PDF with {total_pages} pages individually")
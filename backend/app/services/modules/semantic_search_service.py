@@ -3,6 +3,7 @@ Semantic Search Service
 Handles vector similarity search for document retrieval using embeddings.
 """
 
+import asyncio
 import logging
 import os
 from typing import Dict, Any, List, Optional, Tuple
@@ -29,6 +30,12 @@ class SemanticSearchService:
         
         logger.info("✅ SemanticSearchService initialized")
     
+    @property
+    def async_db(self):
+        """Non-blocking PostgREST client for the async search paths (same tables as self.supabase)"""
+        from ...core.supabase_client import get_async_supabase_client
+        return get_async_supabase_client()
+    
     def _initialize_supabase(self):
         """Initialize Supabase client."""
         try:
@@ -189,7 +196,7 @@ class SemanticSearchService:
                 
                 logger.info("🚀 Using VECTOR SEARCH (SQL function) for fast similarity search")
                 
-                response = self.supabase.rpc(
+                response = await self.async_db.rpc(
                     'search_document_chunks_by_similarity',
                     {
                         'query_embedding': query_vector_str,
@@ -209,14 +216,7 @@ class SemanticSearchService:
                     return []
             except Exception as e:
                 logger.error(f"❌ VECTOR SEARCH failed: {e}")
-                return []
-            
-            if response.data:
-                logger.info(f"✅ Vector search returned {len(response.data)} results")
-                return response.data
-            else:
-                logger.warning("No results returned from vector search, trying manual calculation")
-                # Try manual similarity search when SQL returns no results
+                # Fall back to the in-process vector index
                 return await self._manual_similarity_search(query_embedding, user_id, similarity_threshold, limit)
                 
         except Exception as e:
@@ -234,7 +234,7 @@ class SemanticSearchService:
         try:
             logger.info("🔄 Falling back to text search")
             
-            query = self.supabase.table("documents").select("*").eq("user_id", user_id)
+            query = self.async_db.table("documents").select("*").eq("user_id", user_id)
             
             if filters:
                 if filters.get("file_type"):
@@ -244,7 +244,7 @@ class SemanticSearchService:
                 if filters.get("date_to"):
                     query = query.lte("created_at", filters["date_to"])
             
-            response = query.limit(limit).execute()
+            response = await query.limit(limit).execute()
             
             if response.data:
                 # Add dummy similarity scores for fallback results
@@ -263,81 +263,71 @@ class SemanticSearchService:
     async def _manual_similarity_search(self, query_embedding: List[float], user_id: str, 
                                       similarity_threshold: float, limit: int) -> List[Dict[str, Any]]:
         """
-        Manual similarity search fallback using document_chunks table.
-        Python-based cosine similarity calculation when SQL vector operations fail.
+        Manual similarity search fallback using the in-process vector index.
+        All of the user's chunks are scored in one matrix product (see vector_index.py);
+        chunk text and document metadata are only fetched for the top hits.
         """
         try:
-            import json
-            import numpy as np
+            from .vector_index import get_vector_index_store, parse_embedding
             
-            logger.info("🔄 Performing MANUAL SEARCH on document_chunks (Python-based similarity)...")
+            store = get_vector_index_store()
+            if store is None:
+                logger.warning("Vector index disabled, manual search unavailable")
+                return []
             
-            # Get all chunks for the user's documents
-            response = self.supabase.table("document_chunks").select(
-                "id, document_id, chunk_index, chunk_text, chunk_embedding, "
-                "documents!inner(id, user_id, file_name, file_type, file_size, storage_path, "
-                "processing_status, analysis_result, created_at, updated_at)"
-            ).eq("documents.user_id", user_id).execute()
+            query_vector = parse_embedding(query_embedding)
+            if not query_vector:
+                return []
             
-            logger.info(f"📋 Database response: {len(response.data) if response.data else 0} chunks")
+            logger.info("🔄 Performing MANUAL SEARCH with in-process vector index...")
             
-            if not response.data:
-                logger.info("No chunks found for manual search")
+            # Scoring is CPU-bound (numpy releases the GIL), keep it off the event loop
+            hits = await asyncio.to_thread(
+                store.search,
+                user_id,
+                query_vector,
+                limit,
+                similarity_threshold,
+                lambda: self._load_user_chunk_embeddings(user_id)
+            )
+            if not hits:
+                logger.info("No chunks matched in manual search")
                 return []
             
+            # Fetch text and document data for the hits only
+            response = await self.async_db.table("document_chunks").select(
+                "id, chunk_index, chunk_text, "
+                "documents!inner(id, user_id, file_name, file_type, file_size, storage_path, "
+                "processing_status, analysis_result, created_at, updated_at)"
+            ).in_("id", [chunk_id for chunk_id, _, _ in hits]).execute()
+            chunks_by_id = {str(chunk.get("id")): chunk for chunk in (response.data or [])}
+            
             results = []
-            query_vector = np.array(query_embedding)
-            query_norm = query_vector / np.linalg.norm(query_vector)
-            
-            for chunk in response.data:
-                try:
-                    chunk_embedding = chunk.get('chunk_embedding')
-                    if not chunk_embedding:
-                        continue
-                    
-                    # Parse vector from JSON string if needed
-                    if isinstance(chunk_embedding, str):
-                        chunk_vector = json.loads(chunk_embedding)
-                    else:
-                        chunk_vector = chunk_embedding
-                    
-                    if not isinstance(chunk_vector, list) or len(chunk_vector) != len(query_embedding):
-                        continue
-                    
-                    # Calculate cosine similarity
-                    chunk_vector_np = np.array(chunk_vector)
-                    chunk_norm = chunk_vector_np / np.linalg.norm(chunk_vector_np)
-                    similarity = float(np.dot(query_norm, chunk_norm))
-                    
-                    if similarity >= similarity_threshold:
-                        # Get document data (nested in chunks query)
-                        doc_data = chunk.get('documents', {})
-                        
-                        result = {
-                            'id': doc_data.get('id'),
-                            'user_id': doc_data.get('user_id'),
-                            'file_name': doc_data.get('file_name'),
-                            'file_type': doc_data.get('file_type'),
-                            'file_size': doc_data.get('file_size'),
-                            'storage_path': doc_data.get('storage_path'),
-                            'processing_status': doc_data.get('processing_status'),
-                            'analysis_result': doc_data.get('analysis_result'),
-                            'created_at': doc_data.get('created_at'),
-                            'updated_at': doc_data.get('updated_at'),
-                            'chunk_text': chunk.get('chunk_text'),
-                            'chunk_index': chunk.get('chunk_index'),
-                            'similarity_score': similarity
-                        }
-                        
-                        results.append(result)
-                        
-                except Exception as e:
-                    logger.warning(f"Error processing chunk: {e}")
+            for chunk_id, _, similarity in hits:
+                chunk = chunks_by_id.get(chunk_id)
+                if chunk is None:
+                    # Deleted since the index was last updated
                     continue
-            
-            # Sort by similarity score (descending) and limit results
-            results.sort(key=lambda x: x['similarity_score'], reverse=True)
-            results = results[:limit]
+                
+                doc_data = chunk.get('documents') or {}
+                if doc_data.get('user_id') != user_id:
+                    continue
+                
+                results.append({
+                    'id': doc_data.get('id'),
+                    'user_id': doc_data.get('user_id'),
+                    'file_name': doc_data.get('file_name'),
+                    'file_type': doc_data.get('file_type'),
+                    'file_size': doc_data.get('file_size'),
+                    'storage_path': doc_data.get('storage_path'),
+                    'processing_status': doc_data.get('processing_status'),
+                    'analysis_result': doc_data.get('analysis_result'),
+                    'created_at': doc_data.get('created_at'),
+                    'updated_at': doc_data.get('updated_at'),
+                    'chunk_text': chunk.get('chunk_text'),
+                    'chunk_index': chunk.get('chunk_index'),
+                    'similarity_score': similarity
+                })
             
             logger.info(f"✅ MANUAL SEARCH completed - returned {len(results)} results from chunks")
             return results
@@ -346,6 +336,28 @@ class SemanticSearchService:
             logger.error(f"Error in manual similarity search: {e}")
             return []
     
+    def _load_user_chunk_embeddings(self, user_id: str, page_size: int = 1000) -> List[Tuple[str, str, List[float]]]:
+        """Load (chunk id, document id, embedding) for all of a user's chunks, page by page"""
+        from .vector_index import parse_embedding
+        
+        rows: List[Tuple[str, str, List[float]]] = []
+        start = 0
+        while True:
+            response = self.supabase.table("document_chunks").select(
+                "id, document_id, chunk_embedding, documents!inner(user_id)"
+            ).eq("documents.user_id", user_id).order("id").range(start, start + page_size - 1).execute()
+            page = response.data or []
+            for chunk in page:
+                embedding = parse_embedding(chunk.get('chunk_embedding'))
+                if embedding:
+                    rows.append((str(chunk['id']), str(chunk['document_id']), embedding))
+            if len(page) < page_size:
+                break
+            start += page_size
+        
+        logger.info(f"📋 Loaded {len(rows)} chunk embeddings for vector index build")
+        return rows
+    
     def _process_search_results(
         self,
         results: List[Dict[str, Any]],
@@ -476,7 +488,7 @@ class SemanticSearchService:
             
             # Get the document's embedding
             # Get first chunk embedding from the document (using chunk_index = 0)
-            chunk_response = self.supabase.table("document_chunks").select("chunk_embedding").eq("document_id", document_id).eq("chunk_index", 0).execute()
+            chunk_response = await self.async_db.table("document_chunks").select("chunk_embedding").eq("document_id", document_id).eq("chunk_index", 0).execute()
             
             if not chunk_response.data or not chunk_response.data[0].get("chunk_embedding"):
                 logger.warning(f"Document {document_id} not found or has no embedding chunks")
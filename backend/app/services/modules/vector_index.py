@@ -0,0 +1,605 @@
+"""
+Vector Index Module
+Per-user in-process vector index for the semantic search fallback path
+
+The manual similarity search used to download every chunk of a user (including the
+documents' analysis_result blobs), json.loads each embedding and score chunks one at a
+time in Python. Each user now gets a UserVectorIndex instead:
+
+- A contiguous float32 matrix of L2-normalized embeddings, so cosine similarity for all
+  chunks is one matrix-vector product and top-k is an argpartition
+- Above VECTOR_INDEX_IVF_MIN_ROWS chunks an inverted-file layer (spherical k-means
+  centroids, ~sqrt(n) lists) limits scoring to the VECTOR_INDEX_IVF_NPROBE closest lists,
+  so search cost grows with sqrt(n) instead of n
+- Rows hold only (chunk id, document id); chunk text and document metadata are fetched
+  for the top-k hits only
+- Kept current by DatabaseService.save_document_chunks and persisted as .npy files that
+  are memory-mapped on load; updates are flushed in batches by a background timer and
+  other API workers pick up a newer file on their next search
+"""
+
+import atexit
+import fcntl
+import hashlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Spherical k-means settings for the IVF layer
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLES_PER_LIST = 40
+# Rows scored per block when (re)assigning rows to IVF lists
+_ASSIGN_BLOCK_ROWS = 8192
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def parse_embedding(value: Any) -> Optional[List[float]]:
+    """Embeddings come back from PostgREST as lists or as pgvector text ("[0.1,...]")"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, list) and value else None
+
+
+class UserVectorIndex:
+    """
+    Vector index over one user's document chunks
+
+    Args:
+        dim: Embedding dimension
+        ivf_min_rows: Row count at which the IVF layer is trained (0 = always exact search)
+        nprobe: IVF lists scored per query
+    """
+
+    def __init__(self, dim: int, ivf_min_rows: int = 20000, nprobe: int = 16):
+        self.dim = dim
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._count = 0
+        self._alive = np.empty(0, dtype=bool)
+        self._dead = 0
+        self._chunk_ids: List[str] = []
+        self._document_ids: List[str] = []
+        self._rows_by_document: Dict[str, List[int]] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._trained_rows = 0
+        self.built_at = time.time()
+
+    def __len__(self) -> int:
+        return self._count - self._dead
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+    def upsert_document(self, document_id: str, chunks: Iterable[Tuple[str, List[float]]]) -> int:
+        """Replace a document's rows with (chunk id, embedding) pairs; returns rows added"""
+        self.remove_document(document_id)
+        chunk_ids, vectors = [], []
+        for chunk_id, embedding in chunks:
+            if embedding is not None and len(embedding) == self.dim:
+                chunk_ids.append(str(chunk_id))
+                vectors.append(embedding)
+        if not vectors:
+            return 0
+
+        block = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+        start = self._count
+        self._ensure_capacity(start + len(block))
+        self._vectors[start:start + len(block)] = block
+        self._alive[start:start + len(block)] = True
+        self._chunk_ids.extend(chunk_ids)
+        self._document_ids.extend([document_id] * len(chunk_ids))
+        self._rows_by_document[document_id] = list(range(start, start + len(block)))
+        self._count += len(block)
+
+        if self._centroids is not None:
+            self._assignments[start:self._count] = self._assign(self._vectors[start:self._count])
+        self._maybe_train()
+        return len(block)
+
+    def remove_document(self, document_id: str) -> None:
+        rows = self._rows_by_document.pop(document_id, None)
+        if not rows:
+            return
+        self._make_writable()
+        self._alive[rows] = False
+        self._dead += len(rows)
+        if self._dead > 1024 and self._dead * 4 > self._count:
+            self._compact()
+
+    def _make_writable(self) -> None:
+        # Indexes loaded from disk are read-only memory maps until the first update
+        if not self._vectors.flags.writeable:
+            self._vectors = np.array(self._vectors)
+            self._alive = np.array(self._alive)
+            self._assignments = np.array(self._assignments)
+            if self._centroids is not None:
+                self._centroids = np.array(self._centroids)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        self._make_writable()
+        capacity = len(self._vectors)
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, 256)
+        vectors = np.empty((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._count] = self._vectors[:self._count]
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._count] = self._alive[:self._count]
+        assignments = np.zeros(new_capacity, dtype=np.int32)
+        assignments[:self._count] = self._assignments[:self._count]
+        self._vectors, self._alive, self._assignments = vectors, alive, assignments
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self._alive[:self._count])
+        self._vectors = np.ascontiguousarray(self._vectors[keep])
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._assignments = np.ascontiguousarray(self._assignments[keep])
+        self._chunk_ids = [self._chunk_ids[row] for row in keep]
+        self._document_ids = [self._document_ids[row] for row in keep]
+        self._count = len(keep)
+        self._dead = 0
+        self._rebuild_document_rows()
+
+    def _rebuild_document_rows(self) -> None:
+        self._rows_by_document = {}
+        for row in range(self._count):
+            if self._alive[row]:
+                self._rows_by_document.setdefault(self._document_ids[row], []).append(row)
+
+    # -------------------------------------------------------------------------
+    # IVF layer
+    # -------------------------------------------------------------------------
+    def _maybe_train(self) -> None:
+        live = len(self)
+        if not self.ivf_min_rows or live < self.ivf_min_rows:
+            return
+        if self._centroids is not None and live < self._trained_rows * 2:
+            return
+        self._train()
+
+    def _train(self) -> None:
+        """Spherical k-means over a sample of live rows, then assign every row to a list"""
+        started = time.time()
+        live_rows = np.flatnonzero(self._alive[:self._count])
+        nlist = max(1, int(np.sqrt(len(live_rows))))
+        rng = np.random.default_rng(0)
+        sample_size = min(len(live_rows), nlist * _KMEANS_SAMPLES_PER_LIST)
+        sample = self._vectors[rng.choice(live_rows, size=sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = ~np.bincount(labels, minlength=nlist).astype(bool)
+            sums[empty] = centroids[empty]
+            centroids = _normalize_rows(sums)
+
+        self._make_writable()
+        self._centroids = centroids
+        self._assignments[:self._count] = self._assign(self._vectors[:self._count])
+        self._trained_rows = len(live_rows)
+        logger.info(f"🧭 Trained vector index IVF layer: {nlist} lists over {len(live_rows)} rows in {time.time() - started:.2f}s")
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), _ASSIGN_BLOCK_ROWS):
+            block = vectors[start:start + _ASSIGN_BLOCK_ROWS]
+            labels[start:start + len(block)] = np.argmax(block @ self._centroids.T, axis=1)
+        return labels
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+    def search(self, query: List[float], k: int, threshold: float = -1.0) -> List[Tuple[str, str, float]]:
+        """
+        Top-k chunks by cosine similarity
+
+        Returns:
+            List of (chunk id, document id, similarity) tuples, best first
+        """
+        if len(self) == 0 or len(query) != self.dim or k <= 0:
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm == 0:
+            return []
+        q /= norm
+
+        if self._centroids is not None:
+            nprobe = min(self.nprobe, len(self._centroids))
+            probe = np.argpartition(-(self._centroids @ q), nprobe - 1)[:nprobe]
+            rows = np.flatnonzero(self._alive[:self._count] & np.isin(self._assignments[:self._count], probe))
+            scores = self._vectors[rows] @ q
+        else:
+            rows = None
+            scores = self._vectors[:self._count] @ q
+            scores[~self._alive[:self._count]] = -np.inf
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for position in top:
+            score = float(scores[position])
+            if score < threshold or score == -np.inf:
+                break
+            row = int(rows[position]) if rows is not None else int(position)
+            results.append((self._chunk_ids[row], self._document_ids[row], score))
+        return results
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+    def save(self, path_prefix: str) -> None:
+        """Write the index as <prefix>.vectors.npy / .ivf.npy / .meta.json (atomic renames)"""
+        if self._dead:
+            self._compact()
+        directory = os.path.dirname(path_prefix)
+        arrays = {"vectors": self._vectors[:self._count], "assignments": self._assignments[:self._count]}
+        if self._centroids is not None:
+            arrays["centroids"] = self._centroids
+        for name, array in arrays.items():
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, f"{path_prefix}.{name}.npy")
+        if self._centroids is None:
+            try:
+                os.unlink(f"{path_prefix}.centroids.npy")
+            except OSError:
+                pass
+
+        # Metadata is renamed last: a reader only trusts array files older than it
+        meta = {
+            "dim": self.dim,
+            "count": self._count,
+            "chunk_ids": self._chunk_ids,
+            "document_ids": self._document_ids,
+            "trained_rows": self._trained_rows,
+            "built_at": self.built_at,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, f"{path_prefix}.meta.json")
+
+    @classmethod
+    def load(cls, path_prefix: str, ivf_min_rows: int, nprobe: int) -> "UserVectorIndex":
+        """Load an index with its arrays memory-mapped read-only"""
+        with open(f"{path_prefix}.meta.json") as f:
+            meta = json.load(f)
+        index = cls(meta["dim"], ivf_min_rows=ivf_min_rows, nprobe=nprobe)
+        vectors = np.load(f"{path_prefix}.vectors.npy", mmap_mode="r")
+        assignments = np.load(f"{path_prefix}.assignments.npy", mmap_mode="r")
+        if len(vectors) != meta["count"] or len(assignments) != meta["count"]:
+            raise ValueError("vector index files are out of sync")
+        index._vectors = vectors
+        index._assignments = assignments
+        index._count = meta["count"]
+        index._alive = np.ones(index._count, dtype=bool)
+        index._chunk_ids = meta["chunk_ids"]
+        index._document_ids = meta["document_ids"]
+        index._trained_rows = meta.get("trained_rows", 0)
+        index.built_at = meta.get("built_at", time.time())
+        if os.path.exists(f"{path_prefix}.centroids.npy"):
+            index._centroids = np.load(f"{path_prefix}.centroids.npy", mmap_mode="r")
+        index._rebuild_document_rows()
+        return index
+
+
+class VectorIndexStore:
+    """
+    Process-wide registry of per-user vector indexes backed by a directory
+
+    Each user's index has its own lock, so one user's index build never blocks another
+    user's search. Chunks are loaded from the database and indexes are built outside any
+    lock; the result is installed only if nothing changed the user's index meanwhile.
+    Updates mark an index dirty and a background flush writes dirty indexes at most every
+    flush_seconds, instead of rewriting the files on every saved document. API workers
+    sharing the directory never overwrite each other's updates: a flush that finds a file
+    newer than its own copy invalidates the index instead, and every worker rebuilds it.
+
+    Args:
+        directory: Directory for persisted indexes (created if missing)
+        max_users: Indexes kept in memory (least recently used are dropped; they stay on disk)
+        max_age_seconds: Rebuild an index from the database once it is this old
+        ivf_min_rows: Row count at which indexes switch to IVF search
+        nprobe: IVF lists scored per query
+        flush_seconds: Delay before dirty indexes are written (0 = write on every update)
+    """
+
+    def __init__(self, directory: str, max_users: int = 64, max_age_seconds: int = 86400,
+                 ivf_min_rows: int = 20000, nprobe: int = 16, flush_seconds: float = 5.0):
+        self.directory = directory
+        self.max_users = max_users
+        self.max_age_seconds = max_age_seconds
+        self.ivf_min_rows = ivf_min_rows
+        self.nprobe = nprobe
+        self.flush_seconds = flush_seconds
+        self._indexes: "OrderedDict[str, Tuple[UserVectorIndex, float]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._version_counter = itertools.count(1)
+        self._dirty: Set[str] = set()
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        # Guards the registry only - never held across file or database I/O
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path_prefix(self, user_id: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(user_id.encode("utf-8")).hexdigest())
+
+    def _disk_mtime(self, user_id: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(f"{self._path_prefix(user_id)}.meta.json")
+        except OSError:
+            return None
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        with self._lock:
+            lock = self._user_locks.get(user_id)
+            if lock is None:
+                lock = self._user_locks[user_id] = threading.Lock()
+            return lock
+
+    def _version(self, user_id: str) -> int:
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def _is_fresh(self, index: Optional[UserVectorIndex]) -> bool:
+        return index is not None and time.time() - index.built_at <= self.max_age_seconds
+
+    def _get(self, user_id: str) -> Optional[UserVectorIndex]:
+        """
+        In-memory index, reloaded when another process saved a newer one (caller holds the
+        user's lock); indexes with unsaved updates are never replaced from disk
+        """
+        disk_mtime = self._disk_mtime(user_id)
+        with self._lock:
+            entry = self._indexes.get(user_id)
+            if entry is not None and (user_id in self._dirty or disk_mtime is None or disk_mtime <= entry[1]):
+                self._indexes.move_to_end(user_id)
+                return entry[0]
+        if disk_mtime is None:
+            return None
+        try:
+            index = UserVectorIndex.load(self._path_prefix(user_id), self.ivf_min_rows, self.nprobe)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable vector index for user {user_id}: {e}")
+            return None
+        self._install(user_id, index, disk_mtime)
+        return index
+
+    def _install(self, user_id: str, index: UserVectorIndex, mtime: float, dirty: bool = False) -> None:
+        with self._lock:
+            self._indexes[user_id] = (index, mtime)
+            self._indexes.move_to_end(user_id)
+            self._versions[user_id] = next(self._version_counter)
+            if dirty:
+                self._dirty.add(user_id)
+            self._trim_locked()
+        if dirty:
+            self._schedule_flush()
+
+    def _trim_locked(self) -> None:
+        # Indexes with unsaved updates stay in memory until flushed (caller holds self._lock)
+        excess = len(self._indexes) - self.max_users
+        if excess > 0:
+            for evicted in [uid for uid in self._indexes if uid not in self._dirty][:excess]:
+                del self._indexes[evicted]
+                self._versions.pop(evicted, None)
+
+    def _mark_dirty(self, user_id: str) -> None:
+        with self._lock:
+            self._versions[user_id] = next(self._version_counter)
+            self._dirty.add(user_id)
+        self._schedule_flush()
+
+    def search(
+        self,
+        user_id: str,
+        query: List[float],
+        k: int,
+        threshold: float,
+        load_chunks: Callable[[], List[Tuple[str, str, List[float]]]],
+    ) -> List[Tuple[str, str, float]]:
+        """
+        Search a user's index, building it first with load_chunks() when missing or stale
+
+        Args:
+            load_chunks: Returns every (chunk id, document id, embedding) of the user
+        """
+        user_lock = self._user_lock(user_id)
+        with user_lock:
+            index = self._get(user_id)
+            if self._is_fresh(index):
+                return index.search(query, k, threshold)
+            version = self._version(user_id)
+
+        # Database fetch and build run unlocked; concurrent searches for a user may both build.
+        # The index is as current as the moment loading started - a save by another worker
+        # after that makes flush() invalidate it rather than overwrite the newer file
+        loaded_at = time.time()
+        built = self._build(user_id, load_chunks(), len(query))
+
+        with user_lock:
+            if self._version(user_id) == version:
+                self._install(user_id, built, loaded_at, dirty=True)
+                return built.search(query, k, threshold)
+            # Another search installed an index or a document changed while building
+            current = self._get(user_id)
+            if self._is_fresh(current):
+                return current.search(query, k, threshold)
+        # Not installed, so this thread is the only one using it
+        return built.search(query, k, threshold)
+
+    def _build(self, user_id: str, rows: List[Tuple[str, str, List[float]]], dim: int) -> UserVectorIndex:
+        started = time.time()
+        index = UserVectorIndex(dim, ivf_min_rows=self.ivf_min_rows, nprobe=self.nprobe)
+        by_document: Dict[str, List[Tuple[str, List[float]]]] = {}
+        for chunk_id, document_id, embedding in rows:
+            by_document.setdefault(document_id, []).append((chunk_id, embedding))
+        for document_id, chunks in by_document.items():
+            index.upsert_document(document_id, chunks)
+        logger.info(f"🧱 Built vector index for user {user_id}: {len(index)} chunks in {time.time() - started:.2f}s")
+        return index
+
+    def upsert_document(self, user_id: str, document_id: str, chunks: List[Tuple[str, List[float]]]) -> None:
+        """
+        Replace a document's chunks in the user's index
+
+        Users without an index are skipped - their index is built in full on first search,
+        and starting one from a single document would hide all their older chunks.
+        """
+        with self._user_lock(user_id):
+            index = self._get(user_id)
+            if index is None:
+                # A build in flight may have loaded the chunks before this document
+                with self._lock:
+                    self._versions[user_id] = next(self._version_counter)
+                return
+            index.upsert_document(document_id, chunks)
+            self._mark_dirty(user_id)
+
+    def remove_document(self, user_id: str, document_id: str) -> None:
+        with self._user_lock(user_id):
+            index = self._get(user_id)
+            if index is None:
+                with self._lock:
+                    self._versions[user_id] = next(self._version_counter)
+                return
+            index.remove_document(document_id)
+            self._mark_dirty(user_id)
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+    def _schedule_flush(self) -> None:
+        if self.flush_seconds <= 0:
+            threading.Thread(target=self.flush, name="vector-index-flush", daemon=True).start()
+            return
+        with self._lock:
+            if self._flush_timer is not None:
+                return
+            timer = self._flush_timer = threading.Timer(self.flush_seconds, self.flush)
+            timer.daemon = True
+        timer.start()
+
+    @contextmanager
+    def _file_lock(self, user_id: str) -> Iterator[None]:
+        """Exclusive lock on a user's index files, shared by every process using the directory"""
+        with open(f"{self._path_prefix(user_id)}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _invalidate_locked(self, user_id: str, dim: int) -> None:
+        """
+        Replace a user's index on disk with an empty, expired one and drop it from memory
+        (caller holds the user's lock and file lock); every worker reloads the newer file
+        and rebuilds from the database on its next search
+        """
+        stale = UserVectorIndex(dim, ivf_min_rows=self.ivf_min_rows, nprobe=self.nprobe)
+        stale.built_at = 0.0
+        stale.save(self._path_prefix(user_id))
+        with self._lock:
+            self._indexes.pop(user_id, None)
+            self._versions[user_id] = next(self._version_counter)
+            self._dirty.discard(user_id)
+        logger.info(f"♻️ Vector index for user {user_id} was updated by another worker - invalidated for rebuild")
+
+    def flush(self) -> int:
+        """Write every index with unsaved updates; returns the number of indexes written"""
+        with self._lock:
+            self._flush_timer = None
+            user_ids = list(self._dirty)
+        written = 0
+        for user_id in user_ids:
+            with self._user_lock(user_id):
+                with self._lock:
+                    entry = self._indexes.get(user_id)
+                    if entry is None or user_id not in self._dirty:
+                        continue
+                index, loaded_mtime = entry
+                try:
+                    with self._file_lock(user_id):
+                        disk_mtime = self._disk_mtime(user_id)
+                        if disk_mtime is not None and disk_mtime > loaded_mtime:
+                            # Another API worker saved since this copy was loaded or built - neither
+                            # copy has both workers' updates, so make every worker rebuild instead
+                            self._invalidate_locked(user_id, index.dim)
+                            continue
+                        index.save(self._path_prefix(user_id))
+                    mtime = self._disk_mtime(user_id) or time.time()
+                    written += 1
+                except OSError as e:
+                    logger.warning(f"⚠️ Failed to persist vector index for user {user_id}: {e}")
+                    mtime = time.time()
+                with self._lock:
+                    self._dirty.discard(user_id)
+                    if user_id in self._indexes:
+                        self._indexes[user_id] = (index, mtime)
+                    self._trim_locked()
+        if written:
+            logger.debug(f"💾 Flushed {written} vector index(es)")
+        return written
+
+
+_vector_index_store: Optional[VectorIndexStore] = None
+_vector_index_store_resolved = False
+_vector_index_store_lock = threading.Lock()
+
+
+def get_vector_index_store() -> Optional[VectorIndexStore]:
+    """
+    Get or create the process-wide vector index store
+    Returns None when VECTOR_INDEX_ENABLED is false or the directory is unusable
+    """
+    global _vector_index_store, _vector_index_store_resolved
+    if not _vector_index_store_resolved:
+        with _vector_index_store_lock:
+            if not _vector_index_store_resolved:
+                from ...core.config import settings
+                if settings.VECTOR_INDEX_ENABLED:
+                    directory = settings.VECTOR_INDEX_DIR or os.path.join(tempfile.gettempdir(), "semantic_vector_index")
+                    try:
+                        _vector_index_store = VectorIndexStore(
+                            directory=directory,
+                            max_users=settings.VECTOR_INDEX_MAX_USERS,
+                            max_age_seconds=settings.VECTOR_INDEX_MAX_AGE_SECONDS,
+                            ivf_min_rows=settings.VECTOR_INDEX_IVF_MIN_ROWS,
+                            nprobe=settings.VECTOR_INDEX_IVF_NPROBE,
+                            flush_seconds=settings.VECTOR_INDEX_FLUSH_SECONDS,
+                        )
+                        atexit.register(_vector_index_store.flush)
+                        logger.info(f"🧭 Vector index store at {directory}")
+                    except OSError as e:
+                        logger.warning(f"⚠️ Vector index disabled - cannot use {directory}: {e}")
+                _vector_index_store_resolved = True
+    return _vector_index_store
@@ -8,10 +8,13 @@ both signatures and photo IDs from documents like applications, forms, etc.
 
 import logging
 import os
+import threading
 from typing import List, Dict, Any, Optional
 from PIL import Image
 import numpy as np
 
+from .yolo_onnx_backend import ONNX_BACKENDS, get_yolo_backend, load_onnx_model, resolve_onnx_model_path
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,15 +27,40 @@ class YOLOFaceDetector:
         self.confidence_threshold = float(os.getenv("YOLO_FACE_CONFIDENCE_THRESHOLD", "0.5"))
         self.iou_threshold = float(os.getenv("YOLO_FACE_IOU_THRESHOLD", "0.45"))
         self.use_gpu = os.getenv("YOLO_USE_GPU", "false").lower() == "true"
+        self.backend = get_yolo_backend()
+        self.onnx_model_path = resolve_onnx_model_path(self.model_path, os.getenv("YOLO_FACE_ONNX_MODEL_PATH"))
         self.model = None
+        # The model is loaded on first use (or ensure_loaded()), not here, so constructing
+        # the detector never pays for the torch import and model load
+        self._load_pending = self.enabled
+        self._load_lock = threading.Lock()
         
-        if self.enabled:
-            self._load_model()
-        else:
+        if not self.enabled:
             logger.info("🔧 YOLO face detection disabled (set YOLO_FACE_ENABLED=true to enable)")
     
+    def ensure_loaded(self) -> bool:
+        """
+        Load the model if that has not happened yet (thread-safe)
+        
+        Returns:
+            True if the model is loaded and detection is enabled
+        """
+        if self._load_pending:
+            with self._load_lock:
+                if self._load_pending:
+                    self._load_model()
+                    self._load_pending = False
+        return self.enabled and self.model is not None
+    
     def _load_model(self):
         """Load YOLO model for face detection with compatibility handling"""
+        if self.backend in ONNX_BACKENDS:
+            # Exported model on ONNX Runtime - no torch import and no warm-up inference
+            self.model = load_onnx_model(self.onnx_model_path, "face")
+            if self.model is None:
+                self.enabled = False
+            return
+
         try:
             # Try to import ultralytics (YOLOv8/v11)
             try:
@@ -116,6 +144,7 @@ class YOLOFaceDetector:
             List of detected faces with bbox and confidence
             Format: [{"bbox": [xmin, ymin, xmax, ymax], "confidence": float, "is_face": True, "class": "face"}, ...]
         """
+        self.ensure_loaded()
         if not self.enabled or self.model is None:
             return []
         
@@ -152,7 +181,7 @@ class YOLOFaceDetector:
                 for box in boxes:
                     cls = int(box.cls[0])
                     conf = float(box.conf[0])
-                    bbox = box.xyxy[0].cpu().numpy().tolist()
+                    bbox = box.xyxy[0].tolist()
                     
                     # Get class name
                     class_name = result.names.get(cls, "unknown")
@@ -217,6 +246,7 @@ class YOLOFaceDetector:
             List of detection results, one per input image
             Format: [[{"bbox": [...], "confidence": float, "is_face": True}, ...], ...]
         """
+        self.ensure_loaded()
         if not self.enabled or self.model is None or not images:
             return [[] for _ in images]
         
@@ -268,7 +298,7 @@ class YOLOFaceDetector:
                     for box in boxes:
                         cls = int(box.cls[0])
                         conf = float(box.conf[0])
-                        bbox = box.xyxy[0].cpu().numpy().tolist()
+                        bbox = box.xyxy[0].tolist()
                         
                         class_name = result.names.get(cls, "unknown")
                         is_face = class_name.lower() in ["face", "person", "photo", "photo_id", "portrait"] or cls == 0
@@ -334,10 +364,11 @@ class YOLOFaceDetector:
     
     def is_enabled(self) -> bool:
         """Check if face detection is enabled"""
-        return self.enabled and self.model is not None
+        return self.ensure_loaded()
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model"""
+        self.ensure_loaded()
         if not self.enabled or self.model is None:
             return {
                 "enabled": False,
@@ -351,6 +382,7 @@ class YOLOFaceDetector:
             "confidence_threshold": self.confidence_threshold,
             "iou_threshold": self.iou_threshold,
             "use_gpu": self.use_gpu,
+            "backend": self.backend,
             "num_classes": len(self.model.names) if hasattr(self.model, 'names') else 0,
             "class_names": list(self.model.names.values()) if hasattr(self.model, 'names') else []
         }
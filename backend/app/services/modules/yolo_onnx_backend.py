@@ -0,0 +1,265 @@
+"""
+YOLO ONNX Runtime Backend
+CPU inference for exported YOLO detection models without PyTorch/ultralytics
+
+Selected with YOLO_BACKEND=onnx (ONNX Runtime CPU) or YOLO_BACKEND=openvino (ONNX Runtime
+with the OpenVINO execution provider, from the onnxruntime-openvino package). The model
+is the detector's .pt exported once with ultralytics:
+
+    yolo export model=models/signature_detector.pt format=onnx dynamic=True
+
+YOLOOnnxModel mirrors the slice of the ultralytics API the detectors use - calling it
+with one image or a list returns results with .names and .boxes (each box exposing
+cls/conf/xyxy) - so both backends go through the same detection-dict code. Preprocessing
+(letterbox) and post-processing (per-class NMS, box rescaling) follow ultralytics'
+predictor step for step; test_yolo_onnx_parity.py checks the two backends agree.
+"""
+
+import ast
+import logging
+import os
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Same constants as ultralytics' predictor
+_LETTERBOX_PAD_VALUE = 114
+_MAX_NMS_CANDIDATES = 30000
+_MAX_DETECTIONS = 300
+_CLASS_OFFSET = 7680  # Per-class NMS: boxes of different classes never overlap after the offset
+
+ONNX_BACKENDS = ("onnx", "openvino")
+
+
+class YOLOOnnxBox:
+    """One detection, shaped like an ultralytics box (cls/conf as (1,), xyxy as (1, 4))"""
+
+    __slots__ = ("cls", "conf", "xyxy")
+
+    def __init__(self, xyxy: np.ndarray, conf: float, cls: int):
+        self.xyxy = xyxy.reshape(1, 4)
+        self.conf = np.array([conf], dtype=np.float32)
+        self.cls = np.array([cls], dtype=np.float32)
+
+
+class YOLOOnnxResult:
+    """Detections for one input image"""
+
+    __slots__ = ("names", "boxes", "orig_shape")
+
+    def __init__(self, names: Dict[int, str], boxes: List[YOLOOnnxBox], orig_shape: Tuple[int, int]):
+        self.names = names
+        self.boxes = boxes
+        self.orig_shape = orig_shape
+
+
+class YOLOOnnxModel:
+    """
+    Exported YOLO detection model run with ONNX Runtime
+
+    Args:
+        model_path: Path to the exported .onnx file
+        backend: "onnx" (CPU execution provider) or "openvino" (OpenVINO execution provider)
+        num_threads: Intra-op threads for ONNX Runtime (0 = runtime default, one per core)
+    """
+
+    def __init__(self, model_path: str, backend: str = "onnx", num_threads: int = 0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+
+        providers = ["CPUExecutionProvider"]
+        if backend == "openvino":
+            if "OpenVINOExecutionProvider" in ort.get_available_providers():
+                providers.insert(0, "OpenVINOExecutionProvider")
+            else:
+                logger.warning("⚠️ OpenVINO execution provider not available (install onnxruntime-openvino) - using ONNX Runtime CPU")
+
+        self.model_path = model_path
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=providers)
+        self.providers = self.session.get_providers()
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names: Dict[int, str] = ast.literal_eval(metadata["names"]) if "names" in metadata else {}
+        self.stride = int(ast.literal_eval(metadata.get("stride", "32")))
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        _, _, height, width = model_input.shape
+        # Exports with dynamic=True leave batch/height/width symbolic
+        self.dynamic_shape = not (isinstance(height, int) and isinstance(width, int))
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+        if self.dynamic_shape:
+            imgsz = ast.literal_eval(metadata.get("imgsz", "[640, 640]"))
+            self.imgsz = (int(imgsz[0]), int(imgsz[1])) if isinstance(imgsz, (list, tuple)) else (int(imgsz), int(imgsz))
+        else:
+            self.imgsz = (height, width)
+
+    def __call__(
+        self,
+        source: Union[Image.Image, Sequence[Image.Image]],
+        conf: float = 0.25,
+        iou: float = 0.7,
+        verbose: bool = False
+    ) -> List[YOLOOnnxResult]:
+        """
+        Run detection on one image or a list of images
+
+        Args:
+            source: RGB PIL image(s)
+            conf: Minimum class score kept before NMS
+            iou: NMS IoU threshold
+            verbose: Ignored (accepted for ultralytics call compatibility)
+
+        Returns:
+            One YOLOOnnxResult per image, boxes sorted by confidence
+        """
+        images = [source] if isinstance(source, Image.Image) else list(source)
+        if not images:
+            return []
+
+        arrays = [np.asarray(image.convert("RGB") if image.mode != "RGB" else image) for image in images]
+        # Like ultralytics: minimal (stride-aligned) padding only when every image has the same shape
+        auto = self.dynamic_shape and all(a.shape == arrays[0].shape for a in arrays)
+        batch = np.stack([self._letterbox(a, auto) for a in arrays])
+        batch = np.ascontiguousarray(batch.transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+
+        if self.dynamic_batch:
+            predictions = self.session.run(None, {self.input_name: batch})[0]
+        else:
+            predictions = np.concatenate([
+                self.session.run(None, {self.input_name: batch[i:i + 1]})[0] for i in range(len(batch))
+            ])
+
+        input_shape = batch.shape[2:]
+        return [
+            YOLOOnnxResult(self.names, self._postprocess(prediction, input_shape, array.shape[:2], conf, iou), array.shape[:2])
+            for prediction, array in zip(predictions, arrays)
+        ]
+
+    # -------------------------------------------------------------------------
+    # Pre/post-processing
+    # -------------------------------------------------------------------------
+    def _letterbox(self, image: np.ndarray, auto: bool) -> np.ndarray:
+        """Resize keeping aspect ratio and pad to the model input shape (ultralytics LetterBox)"""
+        height, width = image.shape[:2]
+        new_h, new_w = self.imgsz
+        ratio = min(new_h / height, new_w / width)
+        unpad_w, unpad_h = int(round(width * ratio)), int(round(height * ratio))
+        dw, dh = new_w - unpad_w, new_h - unpad_h
+        if auto:
+            dw, dh = np.mod(dw, self.stride), np.mod(dh, self.stride)
+        dw /= 2
+        dh /= 2
+
+        if (width, height) != (unpad_w, unpad_h):
+            image = cv2.resize(image, (unpad_w, unpad_h), interpolation=cv2.INTER_LINEAR)
+        top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+        left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+        return cv2.copyMakeBorder(
+            image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(_LETTERBOX_PAD_VALUE,) * 3
+        )
+
+    @staticmethod
+    def _postprocess(
+        prediction: np.ndarray,
+        input_shape: Tuple[int, int],
+        orig_shape: Tuple[int, int],
+        conf_threshold: float,
+        iou_threshold: float
+    ) -> List[YOLOOnnxBox]:
+        """Confidence filter, per-class NMS and rescaling to original image coordinates"""
+        # (4 + num_classes, anchors) -> (anchors, 4 + num_classes)
+        prediction = prediction.T
+        scores = prediction[:, 4:]
+        class_ids = scores.argmax(axis=1)
+        confidences = scores[np.arange(len(scores)), class_ids]
+        keep = confidences > conf_threshold
+        if not keep.any():
+            return []
+
+        xywh = prediction[keep, :4]
+        confidences = confidences[keep]
+        class_ids = class_ids[keep]
+        boxes = np.empty_like(xywh)
+        boxes[:, 0] = xywh[:, 0] - xywh[:, 2] / 2
+        boxes[:, 1] = xywh[:, 1] - xywh[:, 3] / 2
+        boxes[:, 2] = xywh[:, 0] + xywh[:, 2] / 2
+        boxes[:, 3] = xywh[:, 1] + xywh[:, 3] / 2
+
+        order = np.argsort(-confidences, kind="stable")[:_MAX_NMS_CANDIDATES]
+        boxes, confidences, class_ids = boxes[order], confidences[order], class_ids[order]
+
+        kept = _nms(boxes + class_ids[:, None] * _CLASS_OFFSET, confidences, iou_threshold)[:_MAX_DETECTIONS]
+        boxes, confidences, class_ids = boxes[kept], confidences[kept], class_ids[kept]
+
+        # Undo the letterbox (ultralytics scale_boxes + clip_boxes)
+        gain = min(input_shape[0] / orig_shape[0], input_shape[1] / orig_shape[1])
+        pad_x = round((input_shape[1] - orig_shape[1] * gain) / 2 - 0.1)
+        pad_y = round((input_shape[0] - orig_shape[0] * gain) / 2 - 0.1)
+        boxes[:, [0, 2]] -= pad_x
+        boxes[:, [1, 3]] -= pad_y
+        boxes /= gain
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, orig_shape[1])
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, orig_shape[0])
+
+        return [
+            YOLOOnnxBox(box.astype(np.float32), float(confidence), int(class_id))
+            for box, confidence, class_id in zip(boxes, confidences, class_ids)
+        ]
+
+
+def _nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy NMS (torchvision.ops.nms semantics) - indices of kept boxes, highest score first"""
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        inter_w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        overlap = inter / (areas[i] + areas[rest] - inter)
+        order = rest[overlap <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+def get_yolo_backend() -> str:
+    """Configured YOLO inference backend: "torch" (ultralytics), "onnx" or "openvino" """
+    return os.getenv("YOLO_BACKEND", "torch").lower()
+
+
+def resolve_onnx_model_path(model_path: str, onnx_model_path: Optional[str]) -> str:
+    """Explicit ONNX path, else the .pt path with an .onnx suffix (ultralytics' export location)"""
+    if onnx_model_path:
+        return onnx_model_path
+    return os.path.splitext(model_path)[0] + ".onnx"
+
+
+def load_onnx_model(model_path: str, label: str) -> Optional[YOLOOnnxModel]:
+    """
+    Load an exported model for the configured ONNX backend
+
+    Returns None (caller disables detection) if onnxruntime or the model file is missing
+    """
+    backend = get_yolo_backend()
+    if not os.path.exists(model_path):
+        logger.warning(f"⚠️ YOLO {label} ONNX model not found at {model_path}. Export it with: yolo export model=<.pt> format=onnx dynamic=True")
+        return None
+    try:
+        model = YOLOOnnxModel(model_path, backend=backend, num_threads=int(os.getenv("YOLO_ONNX_THREADS", "0")))
+    except ImportError:
+        logger.warning("⚠️ onnxruntime not installed. Install with: pip install onnxruntime (or onnxruntime-openvino)")
+        return None
+    logger.info(f"✅ YOLO {label} detector loaded ({backend}) - Model: {model_path}, Providers: {model.providers}")
+    return model
@@ -5,10 +5,13 @@ Detects signatures in image blocks using YOLO model
 
 import logging
 import os
+import threading
 from typing import List, Dict, Any, Optional
 from PIL import Image
 import numpy as np
 
+from .yolo_onnx_backend import ONNX_BACKENDS, get_yolo_backend, load_onnx_model, resolve_onnx_model_path
+
 logger = logging.getLogger(__name__)
 
 class YOLOSignatureDetector:
@@ -20,15 +23,40 @@ class YOLOSignatureDetector:
         self.confidence_threshold = float(os.getenv("YOLO_CONFIDENCE_THRESHOLD", "0.5"))
         self.iou_threshold = float(os.getenv("YOLO_IOU_THRESHOLD", "0.45"))
         self.use_gpu = os.getenv("YOLO_USE_GPU", "false").lower() == "true"
+        self.backend = get_yolo_backend()
+        self.onnx_model_path = resolve_onnx_model_path(self.model_path, os.getenv("YOLO_ONNX_MODEL_PATH"))
         self.model = None
+        # The model is loaded on first use (or ensure_loaded()), not here, so constructing
+        # the detector never pays for the torch import and model load
+        self._load_pending = self.enabled
+        self._load_lock = threading.Lock()
         
-        if self.enabled:
-            self._load_model()
-        else:
+        if not self.enabled:
             logger.info("🔧 YOLO signature detection disabled (set YOLO_SIGNATURE_ENABLED=true to enable)")
     
+    def ensure_loaded(self) -> bool:
+        """
+        Load the model if that has not happened yet (thread-safe)
+        
+        Returns:
+            True if the model is loaded and detection is enabled
+        """
+        if self._load_pending:
+            with self._load_lock:
+                if self._load_pending:
+                    self._load_model()
+                    self._load_pending = False
+        return self.enabled and self.model is not None
+    
     def _load_model(self):
         """Load YOLO model with compatibility handling"""
+        if self.backend in ONNX_BACKENDS:
+            # Exported model on ONNX Runtime - no torch import and no warm-up inference
+            self.model = load_onnx_model(self.onnx_model_path, "signature")
+            if self.model is None:
+                self.enabled = False
+            return
+
         try:
             # Try to import ultralytics (YOLOv8)
             try:
@@ -123,6 +151,7 @@ class YOLOSignatureDetector:
             List of detected signatures with bbox and confidence
             Format: [{"bbox": [xmin, ymin, xmax, ymax], "confidence": float, "is_signature": True}, ...]
         """
+        self.ensure_loaded()
         if not self.enabled or self.model is None:
             return []
         
@@ -166,7 +195,7 @@ class YOLOSignatureDetector:
                     conf = float(box.conf[0])
                     
                     # Get bounding box (xyxy format: [xmin, ymin, xmax, ymax])
-                    bbox = box.xyxy[0].cpu().numpy().tolist()
+                    bbox = box.xyxy[0].tolist()
                     
                     # Check if this is a signature class
                     # Assuming class 0 is signature, or check class name
@@ -253,6 +282,7 @@ class YOLOSignatureDetector:
             Each result is a list of detected signatures with bbox and confidence
             Format: [[{"bbox": [...], "confidence": float, "is_signature": True}, ...], ...]
         """
+        self.ensure_loaded()
         if not self.enabled or self.model is None or not images:
             return [[] for _ in images]
         
@@ -324,7 +354,7 @@ class YOLOSignatureDetector:
                     for box in boxes:
                         cls = int(box.cls[0])
                         conf = float(box.conf[0])
-                        bbox = box.xyxy[0].cpu().numpy().tolist()
+                        bbox = box.xyxy[0].tolist()
                         
                         # Check if this is a signature class
                         class_name = result.names.get(cls, "unknown")
@@ -452,5 +482,5 @@ class YOLOSignatureDetector:
     
     def is_enabled(self) -> bool:
         """Check if YOLO detection is enabled"""
-        return self.enabled and self.model is not None
+        return self.ensure_loaded()
 
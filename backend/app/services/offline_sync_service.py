@@ -3,6 +3,7 @@ Offline Sync Service
 Handles offline document management and sync operations.
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
@@ -25,7 +26,13 @@ class OfflineSyncService:
     
     def __init__(self):
         self.supabase = get_supabase_client()
-    
+
+    @property
+    def async_db(self):
+        """Non-blocking PostgREST client for the async methods (same tables as self.supabase)"""
+        from ..core.supabase_client import get_async_supabase_client
+        return get_async_supabase_client()
+
     async def prepare_documents_for_offline(
         self, 
         user_id: str, 
@@ -42,7 +49,7 @@ class OfflineSyncService:
             logger.info(f"📥 Preparing {len(document_ids)} documents for offline (user: {user_id})")
             
             # Fetch documents
-            response = self.supabase.table('documents').select(
+            response = await self.async_db.table('documents').select(
                 'id, file_name, file_type, file_size, storage_path, metadata, '
                 'extracted_text, document_type, processing_status, created_at, updated_at'
             ).eq('user_id', user_id).in_('id', document_ids).eq('is_deleted', False).execute()
@@ -59,7 +66,9 @@ class OfflineSyncService:
                 download_url = None
                 if doc.get('storage_path'):
                     try:
-                        url_response = self.supabase.storage.from_('documents').create_signed_url(
+                        # Storage API is sync-only - keep it off the event loop
+                        url_response = await asyncio.to_thread(
+                            self.supabase.storage.from_('documents').create_signed_url,
                             doc['storage_path'],
                             3600  # 1 hour
                         )
@@ -166,7 +175,7 @@ class OfflineSyncService:
         logger.info(f"🔧 Resolving conflict for document {document_id} with strategy: {resolution}")
         
         # Get current server version
-        response = self.supabase.table('documents').select('*').eq('id', document_id).eq('user_id', user_id).single().execute()
+        response = await self.async_db.table('documents').select('*').eq('id', document_id).eq('user_id', user_id).single().execute()
         
         if not response.data:
             raise ValueError(f"Document {document_id} not found")
@@ -189,7 +198,7 @@ class OfflineSyncService:
             }
             update_data['updated_at'] = datetime.utcnow().isoformat()
             
-            self.supabase.table('documents').update(update_data).eq('id', document_id).execute()
+            await self.async_db.table('documents').update(update_data).eq('id', document_id).execute()
             
             # Increment version
             new_version = self._increment_version(document_id)
@@ -205,7 +214,7 @@ class OfflineSyncService:
             merged = self._smart_merge(server_doc, merged_data)
             merged['updated_at'] = datetime.utcnow().isoformat()
             
-            self.supabase.table('documents').update(merged).eq('id', document_id).execute()
+            await self.async_db.table('documents').update(merged).eq('id', document_id).execute()
             
             new_version = self._increment_version(document_id)
             
@@ -221,7 +230,7 @@ class OfflineSyncService:
         
         try:
             # Get offline access records
-            offline_response = self.supabase.table('offline_access').select(
+            offline_response = await self.async_db.table('offline_access').select(
                 'document_id, file_size'
             ).eq('user_id', user_id).execute()
             
@@ -264,7 +273,7 @@ class OfflineSyncService:
         try:
             if offline:
                 # Get document info
-                doc_response = self.supabase.table('documents').select(
+                doc_response = await self.async_db.table('documents').select(
                     'id, file_size'
                 ).eq('id', document_id).eq('user_id', user_id).single().execute()
                 
@@ -272,7 +281,7 @@ class OfflineSyncService:
                     return False
                 
                 # Upsert offline access record
-                self.supabase.table('offline_access').upsert({
+                await self.async_db.table('offline_access').upsert({
                     'user_id': user_id,
                     'document_id': document_id,
                     'file_size': doc_response.data.get('file_size', 0),
@@ -283,7 +292,7 @@ class OfflineSyncService:
                 logger.info(f"📥 Marked document {document_id} for offline access")
             else:
                 # Remove offline access record
-                self.supabase.table('offline_access').delete().eq(
+                await self.async_db.table('offline_access').delete().eq(
                     'user_id', user_id
                 ).eq('document_id', document_id).execute()
                 
@@ -341,7 +350,7 @@ class OfflineSyncService:
             return None
         
         # Get server document
-        response = self.supabase.table('documents').select('*').eq('id', document_id).eq('user_id', user_id).single().execute()
+        response = await self.async_db.table('documents').select('*').eq('id', document_id).eq('user_id', user_id).single().execute()
         
         if not response.data:
             if operation.type == SyncOperationType.UPDATE:
@@ -387,7 +396,7 @@ class OfflineSyncService:
         try:
             if operation.type == SyncOperationType.CREATE:
                 data = {**operation.data, 'user_id': user_id}
-                self.supabase.table(operation.table).insert(data).execute()
+                await self.async_db.table(operation.table).insert(data).execute()
                 
             elif operation.type == SyncOperationType.UPDATE:
                 document_id = operation.data.get('id')
@@ -397,7 +406,7 @@ class OfflineSyncService:
                 }
                 update_data['updated_at'] = datetime.utcnow().isoformat()
                 
-                self.supabase.table(operation.table).update(update_data).eq(
+                await self.async_db.table(operation.table).update(update_data).eq(
                     'id', document_id
                 ).eq('user_id', user_id).execute()
                 
@@ -406,7 +415,7 @@ class OfflineSyncService:
             elif operation.type == SyncOperationType.DELETE:
                 document_id = operation.data.get('id')
                 # Soft delete
-                self.supabase.table(operation.table).update({
+                await self.async_db.table(operation.table).update({
                     'is_deleted': True,
                     'deleted_at': datetime.utcnow().isoformat()
                 }).eq('id', document_id).eq('user_id', user_id).execute()
@@ -425,7 +434,7 @@ class OfflineSyncService:
         """Record that documents were downloaded for offline access."""
         try:
             # Get document sizes
-            response = self.supabase.table('documents').select(
+            response = await self.async_db.table('documents').select(
                 'id, file_size'
             ).in_('id', document_ids).execute()
             
@@ -440,7 +449,7 @@ class OfflineSyncService:
                 })
             
             if records:
-                self.supabase.table('offline_access').upsert(records).execute()
+                await self.async_db.table('offline_access').upsert(records).execute()
                 
         except Exception as e:
             # Non-critical, just log
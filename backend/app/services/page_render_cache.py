@@ -0,0 +1,218 @@
+"""
+Page Render Cache
+Persistent, content-addressed cache of rendered pages and text-extraction results
+
+Re-analysing a document with a different task (template matching, extraction, document
+type detection) used to render and encode every page again. Results are stored on local
+disk keyed by (PDF digest, page, render scale, variant), so a repeat analysis of the same
+bytes reads the encoded page instead of rendering it.
+
+- Entries are plain files under <PAGE_RENDER_CACHE_DIR>/<digest[:2]>/<digest>/, written
+  atomically (temp file + rename) so several processes can share one directory - point
+  the API and bulk services at the same path to share renders between them
+- Total size is capped by PAGE_RENDER_CACHE_MAX_MB; least recently used entries (by
+  mtime, refreshed on every hit) are evicted first
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PageRenderCache:
+    """
+    Disk-backed page cache with a size cap
+
+    Args:
+        directory: Cache root directory (created if missing)
+        max_bytes: Size budget for all entries; LRU entries are evicted above it
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def image_key(digest: str, page_number: int, scale: float, variant: str) -> Tuple[str, str]:
+        """Key for an encoded page image (variant names the enhancement/encoding applied)"""
+        return digest, f"image-p{page_number}-x{scale:g}-{variant}.txt"
+
+    @staticmethod
+    def text_key(digest: str, page_number: int) -> Tuple[str, str]:
+        """Key for a page's text-extraction result"""
+        return digest, f"text-p{page_number}.json"
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+    def get_image(self, digest: str, page_number: int, scale: float, variant: str) -> Optional[str]:
+        """Return the cached encoded image (data URL) for a page, or None"""
+        data = self._read(self.image_key(digest, page_number, scale, variant))
+        return data.decode("ascii") if data is not None else None
+
+    def put_image(self, digest: str, page_number: int, scale: float, variant: str, data_url: str) -> None:
+        """Store the encoded image (data URL) for a page"""
+        self._write(self.image_key(digest, page_number, scale, variant), data_url.encode("ascii"))
+
+    def get_text(self, digest: str, page_number: int) -> Optional[Dict[str, Any]]:
+        """Return the cached text-extraction result for a page, or None"""
+        data = self._read(self.text_key(digest, page_number))
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def put_text(self, digest: str, page_number: int, result: Dict[str, Any]) -> None:
+        """Store the text-extraction result for a page"""
+        self._write(self.text_key(digest, page_number), json.dumps(result).encode("utf-8"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters for logging and health endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "directory": self.directory,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+    def _path(self, key: Tuple[str, str]) -> str:
+        digest, name = key
+        return os.path.join(self.directory, digest[:2], digest, name)
+
+    def _read(self, key: Tuple[str, str]) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # Refresh LRU position
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def _write(self, key: Tuple[str, str], data: bytes) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to write page render cache entry {path}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict_lru()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict_lru(self) -> None:
+        """Delete least recently used entries until under 90% of the budget (caller holds the lock)"""
+        entries = sorted(self._entries())
+        # Rescan: other processes sharing the directory may have added or removed entries
+        self._total_bytes = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                os.unlink(path)
+                self._total_bytes -= size
+                self.evictions += 1
+            except OSError:
+                continue
+            parent = os.path.dirname(path)
+            try:
+                os.rmdir(parent)  # Only succeeds once the document directory is empty
+            except OSError:
+                pass
+        logger.debug(f"🧹 Page render cache evicted down to {self._total_bytes}/{self.max_bytes} bytes")
+
+
+_page_render_cache: Optional[PageRenderCache] = None
+_page_render_cache_resolved = False
+_page_render_cache_lock = threading.Lock()
+
+
+def get_page_render_cache() -> Optional[PageRenderCache]:
+    """
+    Get or create the process-wide page render cache
+    Returns None when PAGE_RENDER_CACHE_ENABLED is false or the directory is unusable
+    """
+    global _page_render_cache, _page_render_cache_resolved
+    if not _page_render_cache_resolved:
+        with _page_render_cache_lock:
+            if not _page_render_cache_resolved:
+                from ..core.config import settings
+                if settings.PAGE_RENDER_CACHE_ENABLED:
+                    directory = settings.PAGE_RENDER_CACHE_DIR or os.path.join(tempfile.gettempdir(), "page_render_cache")
+                    try:
+                        _page_render_cache = PageRenderCache(
+                            directory=directory,
+                            max_bytes=settings.PAGE_RENDER_CACHE_MAX_MB * 1024 * 1024,
+                        )
+                        logger.info(f"🗂️ Page render cache at {directory} ({settings.PAGE_RENDER_CACHE_MAX_MB} MB)")
+                    except OSError as e:
+                        logger.warning(f"⚠️ Page render cache disabled - cannot use {directory}: {e}")
+                _page_render_cache_resolved = True
+    return _page_render_cache
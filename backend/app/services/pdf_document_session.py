@@ -0,0 +1,216 @@
+"""
+PDF Document Session
+Per-request view of one PDF, shared by every consumer of that request
+
+DocumentProcessingOrchestrator runs type detection and extraction concurrently on the
+same upload. The detector used to open the PDF itself and rasterize the first pages at
+2x while extraction rendered every page again at 5x. A session opens the document once
+(pinned in the process-wide document cache) and memoizes rendered pages:
+
+- render_page(page, scale) rasterizes a page once and hands the same RGB image to every
+  caller; concurrent callers for the same page wait for the first render
+- With base_scale set, smaller scales are derived by downsampling the base render, so a
+  page is rasterized once no matter how many scales are requested
+- Memoized renders are bounded by max_bytes (least recently used dropped first) and
+  dropped when the session closes
+
+Extraction finds the session through its document handle (handle.session), so the page
+pipeline needs no extra arguments.
+"""
+
+import io
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from .pdf_document_cache import PDFDocumentCache, get_pdf_document_cache
+from .pdf_processor import PDFDocumentHandle, PDFProcessor, PDFSource
+
+logger = logging.getLogger(__name__)
+
+
+class PDFDocumentSession:
+    """
+    Opened PDF plus memoized page renders for the lifetime of one request
+
+    Use as a context manager (or call open()/close()). Images returned by render_page are
+    shared between callers and must be treated as read-only.
+
+    Args:
+        pdf_data: Raw PDF bytes, base64 data / data URL or an existing PDFDocumentHandle
+        base_scale: Scale every page is rasterized at; requests for smaller scales are
+                    downsampled from it (None = rasterize each requested scale separately)
+        max_bytes: Memory budget for memoized renders
+        document_cache: Document cache to pin the opened PDF in (process-wide by default)
+    """
+
+    def __init__(
+        self,
+        pdf_data: PDFSource,
+        base_scale: Optional[float] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        document_cache: Optional[PDFDocumentCache] = None
+    ):
+        self.handle = PDFDocumentHandle.from_data(pdf_data)
+        self.base_scale = float(base_scale) if base_scale else None
+        self.max_bytes = max_bytes
+        self._document_cache = document_cache if document_cache is not None else get_pdf_document_cache()
+        self._document: Any = None
+        self._lock = threading.Lock()
+        self._page_locks: Dict[int, threading.Lock] = {}
+        self._renders: "OrderedDict[Tuple[int, float], Image.Image]" = OrderedDict()
+        self._render_bytes = 0
+        self.rasterized = 0
+        self.derived = 0
+        self.hits = 0
+
+    def __enter__(self) -> "PDFDocumentSession":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> "PDFDocumentSession":
+        """Open (and pin) the document and attach the session to its handle"""
+        with self._lock:
+            if self._document is None:
+                self._document = self._document_cache.acquire(
+                    self.handle.digest, self.handle.pdf_bytes, PDFProcessor._open_pdf_stream
+                )
+                self.handle.page_count = len(self._document)
+                self.handle.session = self
+        return self
+
+    def close(self) -> None:
+        """Drop memoized renders and release the document pin"""
+        with self._lock:
+            if self._document is None:
+                return
+            logger.debug(
+                f"📄 Document session closed - {self.rasterized} rasterized, "
+                f"{self.derived} downsampled, {self.hits} reused"
+            )
+            self._renders.clear()
+            self._render_bytes = 0
+            self._document = None
+            if self.handle.session is self:
+                self.handle.session = None
+        self._document_cache.release(self.handle.digest)
+
+    @property
+    def page_count(self) -> int:
+        return self.handle.page_count or 0
+
+    # -------------------------------------------------------------------------
+    # Rendering
+    # -------------------------------------------------------------------------
+    def render_page(self, page_number: int, scale: float) -> Optional[Image.Image]:
+        """
+        Render a page at the given scale, reusing an earlier render when possible
+
+        Args:
+            page_number: Page to render (0-indexed)
+            scale: Zoom factor relative to 72 DPI
+
+        Returns:
+            RGB PIL Image (shared, read-only) or None if the page does not exist
+        """
+        scale = float(scale)
+        key = (page_number, scale)
+        image = self._get(key)
+        if image is not None:
+            return image
+
+        with self._page_lock(page_number):
+            # Another consumer may have rendered it while we waited
+            image = self._get(key)
+            if image is not None:
+                return image
+
+            if self.base_scale is not None and scale < self.base_scale:
+                base = self._get((page_number, self.base_scale))
+                if base is None:
+                    base = self._rasterize(page_number, self.base_scale)
+                    if base is None:
+                        return None
+                    self._put((page_number, self.base_scale), base)
+                size = (max(1, round(base.width * scale / self.base_scale)),
+                        max(1, round(base.height * scale / self.base_scale)))
+                image = base.resize(size, Image.LANCZOS)
+                with self._lock:
+                    self.derived += 1
+            else:
+                image = self._rasterize(page_number, scale)
+                if image is None:
+                    return None
+
+            self._put(key, image)
+            return image
+
+    def render_page_png(self, page_number: int, scale: float) -> Optional[bytes]:
+        """Render a page (see render_page) and encode it as PNG bytes"""
+        image = self.render_page(page_number, scale)
+        if image is None:
+            return None
+        buf = io.BytesIO()
+        image.save(buf, format="PNG")
+        return buf.getvalue()
+
+    def _rasterize(self, page_number: int, scale: float) -> Optional[Image.Image]:
+        document = self._document
+        if document is None:
+            raise RuntimeError("Document session is not open")
+        if page_number >= len(document):
+            logger.warning(f"Page {page_number} requested but PDF only has {len(document)} pages")
+            return None
+        pix = document[page_number].get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        with self._lock:
+            self.rasterized += 1
+        logger.debug(f"🖼️ Session rasterized page {page_number + 1} at {scale:g}x ({pix.width}x{pix.height})")
+        return image
+
+    # -------------------------------------------------------------------------
+    # Memo
+    # -------------------------------------------------------------------------
+    def _page_lock(self, page_number: int) -> threading.Lock:
+        with self._lock:
+            lock = self._page_locks.get(page_number)
+            if lock is None:
+                lock = self._page_locks[page_number] = threading.Lock()
+            return lock
+
+    def _get(self, key: Tuple[int, float]) -> Optional[Image.Image]:
+        with self._lock:
+            image = self._renders.get(key)
+            if image is not None:
+                self._renders.move_to_end(key)
+                self.hits += 1
+            return image
+
+    def _put(self, key: Tuple[int, float], image: Image.Image) -> None:
+        size = image.width * image.height * len(image.getbands())
+        with self._lock:
+            if self._document is None:
+                return  # Closed while rendering
+            self._renders[key] = image
+            self._render_bytes += size
+            # Keep the newest render even if it alone exceeds the budget
+            while self._render_bytes > self.max_bytes and len(self._renders) > 1:
+                _, evicted = self._renders.popitem(last=False)
+                self._render_bytes -= evicted.width * evicted.height * len(evicted.getbands())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of session counters for logging"""
+        with self._lock:
+            return {
+                "rasterized": self.rasterized,
+                "derived": self.derived,
+                "hits": self.hits,
+                "memoized_pages": len(self._renders),
+                "memoized_bytes": self._render_bytes,
+            }
@@ -5,13 +5,89 @@ import cv2
 import numpy as np
 import asyncio
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, List, Dict, Tuple, Any
+import threading
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Tuple, Any, Union
 from PIL import Image
 import logging
+from .pdf_document_cache import PDFDocumentCache, get_pdf_document_cache
+from .pdf_render_pool import get_pdf_render_pool
+from .page_render_cache import PageRenderCache, get_page_render_cache
+from .spooled_pdf import SpooledPDFBuffer, open_pdf_document
 
 logger = logging.getLogger(__name__)
 
+
+class PDFDocumentHandle:
+    """
+    Decoded PDF payload shared across all pipeline stages
+    The base64 data URL is decoded exactly once; the raw bytes, content hash
+    and page count are then reused by every page lookup instead of re-decoding
+    and re-hashing the whole file per page
+    
+    session is set while a PDFDocumentSession owns the handle - page renders then
+    come from (and are shared through) the session instead of being rasterized here
+    """
+
+    __slots__ = ("_pdf_bytes", "_digest", "page_count", "session", "pins")
+
+    def __init__(self, pdf_bytes: Union[bytes, bytearray, memoryview, SpooledPDFBuffer]):
+        # fitz.open(stream=...) needs a bytes-like object it can keep a reference to;
+        # spooled uploads are opened from their file and stay memory-mapped
+        if isinstance(pdf_bytes, SpooledPDFBuffer):
+            self._pdf_bytes = pdf_bytes
+            self._digest: Optional[str] = pdf_bytes.digest
+        else:
+            self._pdf_bytes = pdf_bytes if isinstance(pdf_bytes, bytes) else bytes(pdf_bytes)
+            self._digest = None
+        self.page_count: Optional[int] = None
+        self.session: Any = None
+        self.pins = 0  # Document cache pins currently held through this handle
+
+    @classmethod
+    def from_data(cls, pdf_data: "PDFSource") -> "PDFDocumentHandle":
+        """
+        Build a handle from a data URL, raw base64 string, raw bytes, a spooled upload or
+        an existing handle
+        Existing handles are returned unchanged so callers can wrap defensively
+        """
+        if isinstance(pdf_data, PDFDocumentHandle):
+            return pdf_data
+        if isinstance(pdf_data, (bytes, bytearray, memoryview, SpooledPDFBuffer)):
+            return cls(pdf_data)
+        base64_data = pdf_data.split("base64,", 1)[1] if "base64," in pdf_data else pdf_data
+        return cls(base64.b64decode(base64_data))
+
+    @property
+    def pdf_bytes(self) -> bytes:
+        """Raw PDF bytes (shared, never copied)"""
+        return self._pdf_bytes
+
+    @property
+    def view(self) -> memoryview:
+        """Zero-copy view over the PDF bytes"""
+        return memoryview(self._pdf_bytes)
+
+    @property
+    def digest(self) -> str:
+        """Content hash, computed on first use and memoized"""
+        if self._digest is None:
+            self._digest = hashlib.md5(self._pdf_bytes).hexdigest()
+        return self._digest
+
+    @property
+    def size(self) -> int:
+        return len(self._pdf_bytes)
+
+    def __len__(self) -> int:
+        return len(self._pdf_bytes)
+
+
+# Anything the PDF methods accept as a document: data URL / base64 string, raw bytes,
+# a spooled upload or a decoded handle
+PDFSource = Union[str, bytes, SpooledPDFBuffer, PDFDocumentHandle]
+
+
 class PDFProcessor:
     """
     PDF processing service using PyMuPDF for converting PDF pages to images
@@ -19,44 +95,73 @@ class PDFProcessor:
     Supports dynamic page sizes - no fixed A4 constraint
     """
     
-    def __init__(self):
+    # Page render cache key parts - change RENDER_CACHE_VARIANT whenever the
+    # render/enhance/encode path changes so stale renders are not served
+    RENDER_CACHE_SCALE = 5
+    RENDER_CACHE_VARIANT = "gray-thresh-png"
+    RENDER_CACHE_ORIGINAL_VARIANT = "original-jpeg"  # Unenhanced page kept alongside (page pipeline)
+    
+    def __init__(
+        self,
+        document_cache: Optional[PDFDocumentCache] = None,
+        render_cache: Optional[PageRenderCache] = None
+    ):
         # PDF processing settings optimized for high accuracy and minimal hallucination
         # Scaling: 5x (360 DPI), dynamic page size, grayscale + adaptive thresholding
         self._last_debug_image = None  # Legacy - kept for backward compatibility
         self._debug_images_by_page: Dict[int, str] = {}  # Store debug images per page number
         # PDF document cache to avoid reopening for each page
-        self._pdf_cache: Dict[str, fitz.Document] = {}
-        self._pdf_bytes_cache: Dict[str, bytes] = {}
+        # Process-wide by default: bounded LRU with per-request pinning (see pdf_document_cache.py)
+        self._document_cache = document_cache if document_cache is not None else get_pdf_document_cache()
+        self._pin_lock = threading.Lock()  # Guards PDFDocumentHandle.pins across page threads
+        # Disk-backed cache of encoded pages and text results, shared across processes
+        # (None when PAGE_RENDER_CACHE_ENABLED is false, see page_render_cache.py)
+        self._render_cache = render_cache if render_cache is not None else get_page_render_cache()
+    
+    def open_document_handle(self, pdf_data: PDFSource) -> PDFDocumentHandle:
+        """
+        Decode PDF data once into a handle that can be passed through every stage
+        
+        Args:
+            pdf_data: Base64 encoded PDF data, data URL, raw bytes or an existing handle
+            
+        Returns:
+            PDFDocumentHandle wrapping the raw PDF bytes
+        """
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        logger.debug(f"📄 PDF document handle ready ({handle.size} bytes)")
+        return handle
     
-    def get_pdf_page_count(self, pdf_data: str) -> int:
+    def get_pdf_page_count(self, pdf_data: PDFSource) -> int:
         """
         Get the total number of pages in a PDF
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL, raw bytes or PDFDocumentHandle
             
         Returns:
             Number of pages in the PDF
         """
         try:
-            base64_data = self.extract_base64_from_data_url(pdf_data)
-            pdf_bytes = base64.b64decode(base64_data)
-            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+            handle = PDFDocumentHandle.from_data(pdf_data)
+            if handle.page_count is not None:
+                return handle.page_count
+            pdf_document = open_pdf_document(handle.pdf_bytes)
             page_count = len(pdf_document)
             pdf_document.close()
+            handle.page_count = page_count
             return page_count
         except Exception as e:
             logger.error(f"Error getting PDF page count: {e}")
             return 0
     
-    def step1_1_decode_base64_pdf(self, pdf_data: str) -> Optional[bytes]:
+    def step1_1_decode_base64_pdf(self, pdf_data: PDFSource) -> Optional[bytes]:
         """
         Step 1.1: Decode Base64 PDF Data
-        Returns: PDF bytes or None
+        Returns: PDF bytes or None (no decoding when given a PDFDocumentHandle)
         """
         try:
-            base64_data = self.extract_base64_from_data_url(pdf_data)
-            pdf_bytes = base64.b64decode(base64_data)
+            pdf_bytes = PDFDocumentHandle.from_data(pdf_data).pdf_bytes
             logger.debug(f"📄 Step 1.1: Base64 PDF data decoded ({len(pdf_bytes)} bytes)")
             return pdf_bytes
         except Exception as e:
@@ -69,7 +174,7 @@ class PDFProcessor:
         Returns: PDF document or None
         """
         try:
-            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+            pdf_document = open_pdf_document(pdf_bytes)
             if not pdf_document:
                 raise ValueError("Failed to open PDF document")
             logger.debug(f"📄 Step 1.2: PDF document opened ({len(pdf_document)} pages)")
@@ -78,6 +183,28 @@ class PDFProcessor:
             logger.error(f"Error in Step 1.2 (Open PDF Document): {e}")
             return None
     
+    def step1_2_acquire_pdf_document(self, pdf_data: PDFSource) -> Optional[fitz.Document]:
+        """
+        Step 1.2: Pin the request's PDF in the document cache
+        Returns the cached document - the same one a document session on the handle holds -
+        so the page pipeline never opens a second copy; drop the pin with release_pdf_document(pdf_data)
+        Returns: PDF document or None
+        """
+        try:
+            handle = PDFDocumentHandle.from_data(pdf_data)
+            pdf_document = self._document_cache.acquire(handle.digest, handle.pdf_bytes, self._open_pdf_stream)
+            with self._pin_lock:
+                handle.pins += 1
+            logger.debug(f"📄 Step 1.2: PDF document pinned ({len(pdf_document)} pages)")
+            return pdf_document
+        except Exception as e:
+            logger.error(f"Error in Step 1.2 (Acquire PDF Document): {e}")
+            return None
+    
+    def release_pdf_document(self, pdf_data: PDFSource) -> None:
+        """Drop the pin taken by step1_2_acquire_pdf_document (other callers' pins are kept)"""
+        self._release_document(PDFDocumentHandle.from_data(pdf_data))
+    
     def step1_3_get_specific_page(self, pdf_document: fitz.Document, page_number: int) -> Optional[fitz.Page]:
         """
         Step 1.3: Get Specific Page
@@ -265,13 +392,13 @@ class PDFProcessor:
             logger.error(f"Error in Step 1.5 (Analyze Text Quality): {e}")
             return {"confidence": 0.0, "is_selectable": False}
     
-    def extract_text_from_page(self, pdf_data: str, page_number: int = 0) -> Optional[Dict[str, Any]]:
+    def extract_text_from_page(self, pdf_data: PDFSource, page_number: int = 0) -> Optional[Dict[str, Any]]:
         """
         Extract text from a single PDF page and check if it's selectable/readable
         Uses granular steps for detailed logging
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
             page_number: Page number to extract text from (0-indexed)
             
         Returns:
@@ -284,10 +411,17 @@ class PDFProcessor:
         """
         try:
             # Step 1.1: Decode Base64 PDF Data
+            pdf_data = PDFDocumentHandle.from_data(pdf_data)
             pdf_bytes = self.step1_1_decode_base64_pdf(pdf_data)
             if not pdf_bytes:
                 return None
             
+            if self._render_cache is not None:
+                cached_result = self._render_cache.get_text(pdf_data.digest, page_number)
+                if cached_result is not None:
+                    logger.debug(f"♻️ Text extraction for page {page_number + 1} served from page render cache")
+                    return cached_result
+            
             # Step 1.2: Open PDF Document
             pdf_document = self.step1_2_open_pdf_document(pdf_bytes)
             if not pdf_document:
@@ -321,6 +455,9 @@ class PDFProcessor:
                 "page_number": page_number + 1  # 1-indexed for display
             }
             
+            if self._render_cache is not None:
+                self._render_cache.put_text(pdf_data.digest, page_number, result)
+            
             logger.info(f"📝 Text extraction from page {page_number + 1}:")
             logger.info(f"   Characters: {result['char_count']}, Words: {result['word_count']}")
             logger.info(f"   Text blocks: {result['text_blocks']}, Image blocks: {result['image_blocks']}")
@@ -370,7 +507,7 @@ class PDFProcessor:
     
     def extract_page_content(
         self, 
-        pdf_data: str, 
+        pdf_data: PDFSource, 
         page_number: int = 0,
         prefer_text: Optional[bool] = None,
         text_confidence_threshold: Optional[float] = None
@@ -380,7 +517,7 @@ class PDFProcessor:
         otherwise falls back to image conversion
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
             page_number: Page number to extract (0-indexed)
             prefer_text: Whether to prefer text extraction over image conversion
                         (if None, reads from PDF_PREFER_TEXT_EXTRACTION env config)
@@ -396,7 +533,10 @@ class PDFProcessor:
                 - metadata: Additional information about the extraction
         """
         try:
-            from ...core.config import settings
+            from ..core.config import settings
+            
+            # Decode once - text and image paths below share the same handle
+            pdf_data = PDFDocumentHandle.from_data(pdf_data)
             
             # Use environment config if parameters not provided
             if prefer_text is None:
@@ -464,33 +604,65 @@ class PDFProcessor:
             logger.error(f"Error extracting page content: {e}")
             return None
     
-    def _get_cached_pdf_document(self, pdf_data: str) -> Tuple[fitz.Document, bytes]:
+    @staticmethod
+    def _open_pdf_stream(pdf_bytes: bytes) -> fitz.Document:
+        """Open PDF bytes as a PyMuPDF document (cache opener)"""
+        pdf_document = open_pdf_document(pdf_bytes)
+        if not pdf_document:
+            raise ValueError("Failed to open PDF document")
+        return pdf_document
+    
+    def _get_cached_pdf_document(self, pdf_data: PDFSource) -> Tuple[fitz.Document, bytes]:
         """
         Get or create cached PDF document to avoid reopening for each page
+        The document is not pinned by this call - wrap usage in pin_document()
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
+                      (a handle skips the per-call base64 decode and MD5)
             
         Returns:
             Tuple of (PDF document, PDF bytes)
         """
-        base64_data = self.extract_base64_from_data_url(pdf_data)
-        pdf_bytes = base64.b64decode(base64_data)
-        
-        # Create hash for caching (use first 16 bytes + size for faster hashing)
-        pdf_hash = hashlib.md5(pdf_bytes).hexdigest()
-        
-        if pdf_hash not in self._pdf_cache:
-            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-            if not pdf_document:
-                raise ValueError("Failed to open PDF document")
-            self._pdf_cache[pdf_hash] = pdf_document
-            self._pdf_bytes_cache[pdf_hash] = pdf_bytes
-            logger.debug(f"📄 Cached PDF document (hash: {pdf_hash[:8]}..., pages: {len(pdf_document)})")
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        pdf_document = self._document_cache.get(handle.digest, handle.pdf_bytes, self._open_pdf_stream)
+        return pdf_document, handle.pdf_bytes
+    
+    def _acquire_document(self, pdf_data: PDFSource) -> PDFDocumentHandle:
+        """Pin the cached document for pdf_data and return its handle"""
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        self._document_cache.acquire(handle.digest, handle.pdf_bytes, self._open_pdf_stream)
+        with self._pin_lock:
+            handle.pins += 1
+        return handle
+    
+    def _release_document(self, handle: PDFDocumentHandle) -> None:
+        """Drop a pin taken with _acquire_document"""
+        with self._pin_lock:
+            if handle.pins == 0:
+                return
+            handle.pins -= 1
+        self._document_cache.release(handle.digest)
+    
+    @contextmanager
+    def pin_document(self, pdf_data: PDFSource):
+        """
+        Keep the cached document for pdf_data open for the duration of a request
+        Pinned documents are never evicted, regardless of the cache byte budget
         
-        return self._pdf_cache[pdf_hash], self._pdf_bytes_cache[pdf_hash]
+        Args:
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
+            
+        Yields:
+            PDFDocumentHandle for the pinned document
+        """
+        handle = self._acquire_document(pdf_data)
+        try:
+            yield handle
+        finally:
+            self._release_document(handle)
     
-    def step1_get_pdf_page(self, pdf_data: str, page_number: int) -> Optional[Tuple[fitz.Document, fitz.Page]]:
+    def step1_get_pdf_page(self, pdf_data: PDFSource, page_number: int) -> Optional[Tuple[fitz.Document, fitz.Page]]:
         """
         Step 1: PDF caching & page extraction
         Returns: (pdf_document, page) tuple or None
@@ -510,14 +682,13 @@ class PDFProcessor:
             logger.error(f"Error in Step 1 for page {page_number + 1}: {e}")
             return None
     
-    def step1_7_decode_base64_pdf_fallback(self, pdf_data: str) -> Optional[bytes]:
+    def step1_7_decode_base64_pdf_fallback(self, pdf_data: PDFSource) -> Optional[bytes]:
         """
         Step 1.7 (Fallback): Decode Base64 PDF Data
-        Returns: PDF bytes or None
+        Returns: PDF bytes or None (no decoding when given a PDFDocumentHandle)
         """
         try:
-            base64_data = self.extract_base64_from_data_url(pdf_data)
-            pdf_bytes = base64.b64decode(base64_data)
+            pdf_bytes = PDFDocumentHandle.from_data(pdf_data).pdf_bytes
             logger.debug(f"📄 Step 1.7 (Fallback): Base64 PDF data decoded ({len(pdf_bytes)} bytes)")
             return pdf_bytes
         except Exception as e:
@@ -530,7 +701,7 @@ class PDFProcessor:
         Returns: PDF document or None
         """
         try:
-            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+            pdf_document = open_pdf_document(pdf_bytes)
             if not pdf_document:
                 raise ValueError("Failed to open PDF document")
             logger.debug(f"📄 Step 1.8 (Fallback): PDF document opened ({len(pdf_document)} pages)")
@@ -622,7 +793,7 @@ class PDFProcessor:
     
     def convert_pdf_page_to_image(
         self, 
-        pdf_data: str, 
+        pdf_data: PDFSource, 
         page_number: int = 0
     ) -> Optional[Dict[str, Image.Image]]:
         """
@@ -631,26 +802,19 @@ class PDFProcessor:
         Preserves original page dimensions (no A4 size enforcement).
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
             page_number: Page number to convert (0-indexed)
             
         Returns:
             Dictionary with "processed", "original" PIL Images and "dimensions" dict, or None if conversion fails
         """
+        handle = None
         try:
-            # Step 1: Get PDF page
-            step1_result = self.step1_get_pdf_page(pdf_data, page_number)
-            if not step1_result:
-                return None
-            pdf_document, page = step1_result
-            
-            # Step 2: Render PDF page
-            pix = self.step2_render_pdf_page(page)
-            if not pix:
-                return None
+            # Pin the cached document so a concurrent eviction cannot close it mid-render
+            handle = self._acquire_document(pdf_data)
             
-            # Step 3: Create PIL image
-            img = self.step3_create_pil_image(pix)
+            # Steps 1-3: Rasterize the page (through the request's session when there is one)
+            img = self.render_page_image(handle, page_number)
             if not img:
                 return None
             
@@ -671,6 +835,75 @@ class PDFProcessor:
         except Exception as e:
             logger.error(f"Error converting PDF page {page_number} to image: {e}")
             return None
+        finally:
+            if handle is not None:
+                self._release_document(handle)
+    
+    def render_page_image(self, pdf_data: PDFSource, page_number: int) -> Optional[Image.Image]:
+        """
+        Steps 1-3 for one page: rasterize it at RENDER_CACHE_SCALE into an RGB PIL image
+        When a document session owns the handle the page is rendered through it, so a render
+        another consumer (e.g. type detection) already made is reused; otherwise the page is
+        rendered from the cached document
+        
+        Args:
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
+            page_number: Page number to render (0-indexed)
+            
+        Returns:
+            PIL Image (shared and read-only when it comes from a session) or None
+        """
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        if handle.session is not None:
+            return handle.session.render_page(page_number, self.RENDER_CACHE_SCALE)
+        
+        step1_result = self.step1_get_pdf_page(handle, page_number)
+        if not step1_result:
+            return None
+        _, page = step1_result
+        
+        pix = self.step2_render_pdf_page(page)
+        if not pix:
+            return None
+        return self.step3_create_pil_image(pix)
+    
+    def render_page_encoded(self, pdf_data: PDFSource, page_number: int) -> Optional[Dict[str, Any]]:
+        """
+        Per-page render step of the page pipeline: encoded processed and original images
+        The page render cache is consulted first, so a repeat analysis of the same bytes skips
+        rendering entirely; on a miss the page is rendered, enhanced, encoded and stored
+        
+        Args:
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
+            page_number: Page number to render (0-indexed)
+            
+        Returns:
+            Dictionary with "processed" and "original" data URLs, "original_img" (PIL Image,
+            None on a cache hit) and "cached", or None if the page could not be rendered
+        """
+        handle = PDFDocumentHandle.from_data(pdf_data)
+        scale = self.RENDER_CACHE_SCALE
+        
+        if self._render_cache is not None:
+            processed = self._render_cache.get_image(handle.digest, page_number, scale, self.RENDER_CACHE_VARIANT)
+            original = processed and self._render_cache.get_image(
+                handle.digest, page_number, scale, self.RENDER_CACHE_ORIGINAL_VARIANT
+            )
+            if processed and original:
+                logger.debug(f"♻️ Page {page_number + 1} served from page render cache")
+                return {"processed": processed, "original": original, "original_img": None, "cached": True}
+        
+        image_data = self.convert_pdf_page_to_image(handle, page_number)
+        if not image_data:
+            return None
+        
+        processed = self._encode_image_simple(image_data["processed"])
+        original = self._encode_image_simple(image_data["original"])
+        if self._render_cache is not None:
+            self._render_cache.put_image(handle.digest, page_number, scale, self.RENDER_CACHE_VARIANT, processed)
+            self._render_cache.put_image(handle.digest, page_number, scale, self.RENDER_CACHE_ORIGINAL_VARIANT, original)
+        
+        return {"processed": processed, "original": original, "original_img": image_data["original"], "cached": False}
     
     # Fully removed: combined image logic and A4 conversion methods
     # Page dimensions are now preserved as-is from PDF rendering
@@ -743,19 +976,22 @@ class PDFProcessor:
         else:
             return f"data:image/jpeg;base64,{img_base64}"
 
-    async def convert_pdf_to_images(self, pdf_data: str) -> List[str]:
+    async def convert_pdf_to_images(self, pdf_data: PDFSource) -> List[str]:
         """
         Convert all pages of a PDF to images (parallel version)
         Uses cached PDF document for improved performance
         
         Args:
-            pdf_data: Base64 encoded PDF data or data URL
+            pdf_data: Base64 encoded PDF data, data URL or PDFDocumentHandle
             
         Returns:
             List of base64 encoded image data URLs
         """
         try:
-            from ...core.config import settings
+            from ..core.config import settings
+            
+            # Decode once - every page conversion below reuses the same handle
+            pdf_data = self.open_document_handle(pdf_data)
             
             # Get page count first
             page_count = self.get_pdf_page_count(pdf_data)
@@ -763,11 +999,30 @@ class PDFProcessor:
                 logger.warning("PDF has no pages")
                 return []
             
-            logger.info(f"Converting PDF with {page_count} pages to images (parallel)")
-            
-            # Use thread pool executor for parallel conversion
+            # Pages rendered by an earlier analysis of the same bytes come from the render cache
+            cached_images = self._get_cached_page_images(pdf_data, page_count)
+            pages_to_render = [page_num for page_num in range(page_count) if page_num not in cached_images]
+            if not pages_to_render:
+                logger.info(f"♻️ All {page_count} pages served from page render cache")
+                return [cached_images[page_num] for page_num in range(page_count)]
+            
+            # Session-owned documents render in-process so the session's page renders are shared
+            if settings.PDF_RENDER_MODE == "process" and pdf_data.session is None:
+                rendered = await self._convert_pdf_to_images_in_processes(pdf_data, pages_to_render)
+                if rendered is not None:
+                    return self._collect_rendered_pages(pdf_data, page_count, cached_images, rendered)
+            
+            logger.info(f"Converting PDF with {len(pages_to_render)}/{page_count} pages to images (parallel)")
+            
+            # Run conversions on a lane of the process-wide conversion stage executor
+            # (shared threads, capped at this call's worker budget)
+            from .modules.parallel_page_processor.stage_executors import get_stage_scheduler
+            scheduler = get_stage_scheduler()
             max_workers = settings.PDF_PROCESSING_MAX_WORKERS
-            thread_pool = ThreadPoolExecutor(max_workers=max_workers)
+            thread_pool = scheduler.conversion.lane(scheduler.new_request_key("convert_pdf_to_images"), max_workers)
+            
+            # Pin the document for the whole conversion so concurrent cache cleanup cannot close it
+            pinned_handle = self._acquire_document(pdf_data)
             
             # CRITICAL FIX #1: Wrap in try-finally to ensure thread pool shutdown
             try:
@@ -803,25 +1058,26 @@ class PDFProcessor:
                         logger.warning(f"Failed to convert page {page_num + 1}: {e}")
                     return None
                 
-                # Convert all pages in parallel
-                tasks = [convert_page_async(page_num) for page_num in range(page_count)]
+                # Convert all uncached pages in parallel
+                tasks = [convert_page_async(page_num) for page_num in pages_to_render]
                 results = await asyncio.gather(*tasks)
                 
-                # Filter out None results and maintain order
-                images = [img for img in results if img is not None]
-                
-                logger.info(f"Successfully converted {len(images)} pages to images")
-                return images
+                return self._collect_rendered_pages(
+                    pdf_data, page_count, cached_images, dict(zip(pages_to_render, results))
+                )
                 
             finally:
                 # CRITICAL FIX #1: Always shutdown thread pool, even on errors
                 try:
                     thread_pool.shutdown(wait=True)
-                    logger.debug("✅ Thread pool shut down in convert_pdf_to_images")
+                    logger.debug("✅ Conversion lane released in convert_pdf_to_images")
                 except Exception as e:
                     logger.warning(f"⚠️ Error shutting down thread pool: {e}")
                 
+                self._release_document(pinned_handle)
+                
                 # CRITICAL FIX #2: Always clear PDF cache, even on errors
+                # (pins are released; the cache budget decides what stays open)
                 try:
                     self.clear_pdf_cache()
                 except Exception as e:
@@ -831,6 +1087,65 @@ class PDFProcessor:
             logger.error(f"Error converting PDF to images: {e}")
             return []
 
+    async def _convert_pdf_to_images_in_processes(
+        self,
+        handle: PDFDocumentHandle,
+        page_numbers: List[int]
+    ) -> Optional[Dict[int, Optional[str]]]:
+        """
+        Render pages in the worker processes of the render pool (PDF_RENDER_MODE=process)
+        
+        Returns:
+            Dict of page number -> data URL (None for failed pages), or None if the process
+            pool is unavailable (e.g. inside a daemonic worker process) and the caller should
+            use threads instead
+        """
+        try:
+            logger.info(f"Converting {len(page_numbers)} PDF pages to images (process pool)")
+            return await get_pdf_render_pool().render_pages(handle.pdf_bytes, handle.digest, page_numbers)
+        except Exception as e:
+            logger.warning(f"⚠️ Process rendering unavailable, falling back to threads: {e}")
+            return None
+
+    def _get_cached_page_images(self, handle: PDFDocumentHandle, page_count: int) -> Dict[int, str]:
+        """Look up every page of a document in the page render cache"""
+        if self._render_cache is None:
+            return {}
+        cached_images = {}
+        for page_num in range(page_count):
+            image = self._render_cache.get_image(
+                handle.digest, page_num, self.RENDER_CACHE_SCALE, self.RENDER_CACHE_VARIANT
+            )
+            if image is not None:
+                cached_images[page_num] = image
+        if cached_images:
+            logger.info(f"♻️ {len(cached_images)}/{page_count} pages found in page render cache")
+        return cached_images
+
+    def _collect_rendered_pages(
+        self,
+        handle: PDFDocumentHandle,
+        page_count: int,
+        cached_images: Dict[int, str],
+        rendered: Dict[int, Optional[str]]
+    ) -> List[str]:
+        """Store freshly rendered pages in the render cache and merge with cached ones in page order"""
+        if self._render_cache is not None:
+            for page_num, image in rendered.items():
+                if image is not None:
+                    self._render_cache.put_image(
+                        handle.digest, page_num, self.RENDER_CACHE_SCALE, self.RENDER_CACHE_VARIANT, image
+                    )
+        
+        images = []
+        for page_num in range(page_count):
+            image = cached_images.get(page_num) or rendered.get(page_num)
+            if image is not None:
+                images.append(image)
+        
+        logger.info(f"Successfully converted {len(images)} pages to images")
+        return images
+
     def convert_signature_coordinates(
         self,
         bbox: List[int],
@@ -1049,19 +1364,17 @@ class PDFProcessor:
     
     def clear_pdf_cache(self):
         """
-        Clear PDF document cache (call after processing complete)
-        This closes all cached PDF documents and frees memory
+        Trim the PDF document cache after processing (call after processing complete)
+        Pins are released by whoever took them (pin_document, release_pdf_document), so
+        documents other requests are still using are never touched; unpinned documents stay
+        cached between analyses until the cache's byte/entry budget closes them
         """
-        for pdf_hash, pdf_document in self._pdf_cache.items():
-            try:
-                pdf_document.close()
-                logger.debug(f"🔒 Closed cached PDF document (hash: {pdf_hash[:8]}...)")
-            except Exception as e:
-                logger.warning(f"⚠️ Error closing PDF document (hash: {pdf_hash[:8]}...): {e}")
-        
-        self._pdf_cache.clear()
-        self._pdf_bytes_cache.clear()
-        logger.debug("🧹 Cleared PDF document cache")
+        evicted = self._document_cache.trim()
+        logger.debug(f"🧹 Trimmed PDF document cache ({evicted} document(s) evicted over budget)")
+    
+    def get_pdf_cache_stats(self) -> Dict[str, Any]:
+        """Get PDF document cache counters (hits, misses, evictions, bytes)"""
+        return self._document_cache.get_stats()
 
     def _create_debug_image_with_all_bboxes(self, page_image_data: str, signatures: List[dict]):
         """
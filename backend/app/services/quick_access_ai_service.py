@@ -20,7 +20,13 @@ class QuickAccessAIService:
     
     def __init__(self, supabase_client):
         self.supabase = supabase_client
-        
+
+    @property
+    def async_db(self):
+        """Non-blocking PostgREST client for the async methods (same tables as self.supabase)"""
+        from ..core.supabase_client import get_async_supabase_client
+        return get_async_supabase_client()
+
     async def calculate_document_score(
         self, 
         document_id: str, 
@@ -127,14 +133,14 @@ class QuickAccessAIService:
         """Score based on sharing and collaboration activity"""
         try:
             # Check if document is shared
-            shares_response = self.supabase.table('share_links')\
+            shares_response = await self.async_db.table('share_links')\
                 .select('id')\
                 .eq('resource_id', document_id)\
                 .eq('is_active', True)\
                 .execute()
             
             # Check external shares
-            ext_shares_response = self.supabase.table('external_shares')\
+            ext_shares_response = await self.async_db.table('external_shares')\
                 .select('id')\
                 .eq('resource_id', document_id)\
                 .in_('status', ['pending', 'accepted'])\
@@ -248,14 +254,14 @@ class QuickAccessAIService:
         """
         try:
             # Get all documents user has access to
-            query = self.supabase.table('documents')\
+            query = self.async_db.table('documents')\
                 .select('id, file_name, document_type, mime_type, created_at')\
                 .or_(f'uploaded_by.eq.{user_id},user_id.eq.{user_id}')
             
             if limit:
                 query = query.limit(limit)
             
-            docs_response = query.execute()
+            docs_response = await query.execute()
             
             updated_count = 0
             for doc in docs_response.data or []:
@@ -284,7 +290,7 @@ class QuickAccessAIService:
     async def _get_document_metadata(self, document_id: str) -> Dict:
         """Fetch document metadata"""
         try:
-            response = self.supabase.table('documents')\
+            response = await self.async_db.table('documents')\
                 .select('id, file_name, document_type, mime_type, file_size, created_at')\
                 .eq('id', document_id)\
                 .single()\
@@ -297,7 +303,7 @@ class QuickAccessAIService:
     async def _get_access_history(self, document_id: str, user_id: str) -> Dict:
         """Fetch access history for document"""
         try:
-            response = self.supabase.table('quick_access')\
+            response = await self.async_db.table('quick_access')\
                 .select('access_count, last_accessed_at')\
                 .eq('document_id', document_id)\
                 .eq('user_id', user_id)\
@@ -311,7 +317,7 @@ class QuickAccessAIService:
             logger.debug(f"No access history found for document {document_id}: {e}")
             return {'access_count': 0, 'last_accessed_at': None}
         try:
-            response = self.supabase.table('quick_access')\
+            response = await self.async_db.table('quick_access')\
                 .select('access_count, last_accessed_at')\
                 .eq('document_id', document_id)\
                 .eq('user_id', user_id)\
@@ -332,7 +338,7 @@ class QuickAccessAIService:
         """Insert or update quick_access entry"""
         try:
             # Check if exists
-            existing_response = self.supabase.table('quick_access')\
+            existing_response = await self.async_db.table('quick_access')\
                 .select('id, is_pinned, access_count')\
                 .eq('document_id', doc_id)\
                 .eq('user_id', user_id)\
@@ -340,7 +346,7 @@ class QuickAccessAIService:
             
             if existing_response.data:
                 # Update existing - preserve pinned status and access count
-                self.supabase.table('quick_access')\
+                await self.async_db.table('quick_access')\
                     .update({
                         'ai_score': score, 
                         'ai_reason': reason,
@@ -350,7 +356,7 @@ class QuickAccessAIService:
                     .execute()
             else:
                 # Insert new
-                self.supabase.table('quick_access')\
+                await self.async_db.table('quick_access')\
                     .insert({
                         'document_id': doc_id,
                         'user_id': user_id,
@@ -0,0 +1,126 @@
+"""
+Spooled PDF Uploads
+Large uploads kept on disk and memory-mapped instead of held as base64 strings
+
+The JSON /analyze-document body carries the file as a base64 data URL, so a request holds
+the JSON body, the validated string and the decoded bytes at once (~4x the file size).
+The multipart variant streams the upload to a temp file instead:
+
+- spool_upload() copies the upload in chunks to UPLOAD_SPOOL_DIR, hashing as it goes
+- The file is mapped read-only as a SpooledPDFBuffer - a bytes-like object (slicing,
+  len, hashlib, base64) whose pages the OS loads on demand rather than the Python heap
+- PyMuPDF opens it from its path (open_pdf_document), Storage uploads read it from its
+  path (storage_upload_source), and PDFDocumentHandle takes the precomputed digest
+- release_spooled_pdf() drops the cached document, unmaps the file and deletes it after
+  the request
+"""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from typing import Any, Optional, Union
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# Read size when copying an upload to the spool file
+_SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Upload exceeded the configured size limit while spooling"""
+
+
+class SpooledPDFBuffer(mmap.mmap):
+    """Read-only memory map of a PDF spooled to disk (see module docstring)"""
+
+    path: str
+    digest: str
+
+    @classmethod
+    def from_file(cls, path: str, digest: Optional[str] = None) -> "SpooledPDFBuffer":
+        """Map an existing, non-empty file; digest is computed if not given"""
+        with open(path, "rb") as f:
+            buffer = cls(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer.path = path
+        buffer.digest = digest or hashlib.md5(buffer).hexdigest()
+        return buffer
+
+
+async def spool_upload(upload: Any, max_bytes: int, spool_dir: Optional[str] = None) -> SpooledPDFBuffer:
+    """
+    Stream an upload (Starlette UploadFile) to a temp file and memory-map it
+
+    Args:
+        upload: Object with an async read(size) method
+        max_bytes: Largest accepted upload (0 = unlimited)
+        spool_dir: Directory for the spool file (None = system temp dir)
+
+    Returns:
+        SpooledPDFBuffer over the spooled file
+
+    Raises:
+        UploadTooLargeError: Upload exceeded max_bytes
+        ValueError: Upload was empty
+    """
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=".pdf", dir=spool_dir or None)
+    md5 = hashlib.md5()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = await upload.read(_SPOOL_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes // (1024 * 1024)}MB limit")
+                md5.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+        if size == 0:
+            raise ValueError("Uploaded file is empty")
+        buffer = SpooledPDFBuffer.from_file(path, md5.hexdigest())
+    except BaseException:
+        _unlink(path)
+        raise
+
+    logger.info(f"📥 Upload spooled to disk ({size / (1024 * 1024):.1f}MB)")
+    return buffer
+
+
+def release_spooled_pdf(buffer: SpooledPDFBuffer) -> None:
+    """Drop the cached document opened from buffer, unmap buffer and delete its spool file"""
+    from .pdf_document_cache import get_pdf_document_cache
+
+    get_pdf_document_cache().discard(buffer.digest)
+    try:
+        buffer.close()
+    except BufferError:
+        # A memoryview still exports the map - it is unmapped once that view is collected
+        logger.debug(f"Spooled PDF {buffer.path} still referenced, leaving the map to GC")
+    _unlink(buffer.path)
+
+
+def open_pdf_document(pdf_bytes: Union[bytes, SpooledPDFBuffer]) -> fitz.Document:
+    """Open PDF bytes with PyMuPDF - spooled uploads by path, so they are never copied into memory"""
+    if isinstance(pdf_bytes, SpooledPDFBuffer):
+        return fitz.open(pdf_bytes.path, filetype="pdf")
+    return fitz.open(stream=pdf_bytes, filetype="pdf")
+
+
+def storage_upload_source(file_bytes: Union[bytes, SpooledPDFBuffer]) -> Union[bytes, str]:
+    """What to hand Supabase Storage's upload(): the spool file's path, else the bytes"""
+    if isinstance(file_bytes, SpooledPDFBuffer):
+        return file_bytes.path
+    return file_bytes
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
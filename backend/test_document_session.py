@@ -0,0 +1,125 @@
+"""
+Tests for sharing one document session between type detection and extraction
+
+A combined detect+extract request must rasterize every page exactly once: type detection
+downsamples its 2x renders from the session's full-resolution render and the page
+pipeline's render step (render_page_encoded) reuses the same render.
+
+Usage:
+    python -m pytest test_document_session.py -v
+"""
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from app.services.page_render_cache import PageRenderCache
+from app.services.pdf_document_cache import PDFDocumentCache
+from app.services.pdf_document_session import PDFDocumentSession
+from app.services.pdf_processor import PDFProcessor
+
+PAGE_COUNT = 3
+
+
+def _make_pdf(page_count: int) -> bytes:
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page(width=200, height=280)
+        page.insert_text((20, 40), f"Invoice page {page_num + 1}")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+@pytest.fixture
+def session_and_processor(tmp_path):
+    document_cache = PDFDocumentCache(max_bytes=256 * 1024 * 1024)
+    processor = PDFProcessor(
+        document_cache=document_cache,
+        render_cache=PageRenderCache(str(tmp_path / "renders"), 64 * 1024 * 1024)
+    )
+    session = PDFDocumentSession(
+        _make_pdf(PAGE_COUNT),
+        base_scale=PDFProcessor.RENDER_CACHE_SCALE,
+        document_cache=document_cache
+    ).open()
+    try:
+        yield session, processor
+    finally:
+        session.close()
+
+
+def _count_rasterizations(session: PDFDocumentSession) -> Counter:
+    counts: Counter = Counter()
+    rasterize = session._rasterize
+
+    def counting_rasterize(page_number, scale):
+        counts[page_number] += 1
+        return rasterize(page_number, scale)
+
+    session._rasterize = counting_rasterize
+    return counts
+
+
+def test_detect_and_extract_rasterize_each_page_once(session_and_processor):
+    session, processor = session_and_processor
+    counts = _count_rasterizations(session)
+
+    def detect():
+        # Same calls as DocumentTypeDetector._convert_session_pages_to_images
+        return [session.render_page_png(page_num, 2) for page_num in range(min(2, session.page_count))]
+
+    def extract():
+        return [processor.render_page_encoded(session.handle, page_num) for page_num in range(PAGE_COUNT)]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        detect_future = pool.submit(detect)
+        extract_future = pool.submit(extract)
+        detected, extracted = detect_future.result(), extract_future.result()
+
+    assert all(detected) and all(extracted)
+    assert counts == {page_num: 1 for page_num in range(PAGE_COUNT)}
+    assert session.rasterized == PAGE_COUNT
+
+
+def test_page_pipeline_uses_the_sessions_document(session_and_processor):
+    session, processor = session_and_processor
+
+    document = processor.step1_2_acquire_pdf_document(session.handle)
+    try:
+        assert document is session._document
+        assert session.handle.pins == 1
+    finally:
+        processor.release_pdf_document(session.handle)
+
+    assert session.handle.pins == 0
+    assert session.rasterized == 0
+
+
+def test_clear_pdf_cache_keeps_other_callers_pins():
+    # A one-byte budget: trim() closes every document nobody has pinned
+    document_cache = PDFDocumentCache(max_bytes=1)
+    processor = PDFProcessor(document_cache=document_cache, render_cache=None)
+    handle = processor.open_document_handle(_make_pdf(1))
+
+    with processor.pin_document(handle):
+        # Another request sharing the handle finishes and cleans up
+        document = processor.step1_2_acquire_pdf_document(handle)
+        processor.release_pdf_document(handle)
+        processor.clear_pdf_cache()
+
+        assert document_cache.get_stats()["evictions"] == 0
+        assert len(document) == 1  # Still open for the pinning caller
+
+    processor.clear_pdf_cache()
+    assert handle.pins == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
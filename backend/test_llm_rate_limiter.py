@@ -0,0 +1,64 @@
+"""
+Tests for throttle classification in the shared LLM rate limiter
+
+Only real "slow down" errors may cut the adaptive concurrency limit - an unrelated
+error whose message happens to contain "rate" (generate, iterate, moderate) must not.
+
+Usage:
+    python -m pytest test_llm_rate_limiter.py -v
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pytest
+
+from app.services.modules.llm_rate_limiter import AdaptiveLLMRateLimiter, is_throttle_error
+
+
+class ResourceExhausted(Exception):
+    """Stand-in with the same name as google.api_core.exceptions.ResourceExhausted"""
+
+
+class _HTTPError(Exception):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+@pytest.mark.parametrize("error", [
+    ResourceExhausted("Resource has been exhausted (e.g. check quota)."),
+    _HTTPError("Service Unavailable", 503),
+    Exception("429 Quota exceeded for quota metric 'Generate Content API requests per minute'"),
+    Exception("Rate limit reached for requests"),
+])
+def test_throttle_errors_are_classified_as_throttled(error):
+    assert is_throttle_error(error) is True
+
+
+@pytest.mark.parametrize("error", [
+    Exception("Failed to generate content: response was blocked"),
+    Exception("Could not iterate over candidates"),
+    Exception("Content flagged by moderate safety settings"),
+    _HTTPError("Bad Request", 400),
+])
+def test_non_throttle_errors_are_not_throttled(error):
+    assert is_throttle_error(error) is False
+
+
+def test_generate_error_does_not_cut_concurrency():
+    limiter = AdaptiveLLMRateLimiter(min_concurrency=1, max_concurrency=16, initial_concurrency=8)
+    before = limiter.get_stats()["concurrency_limit"]
+
+    ticket = limiter.acquire()
+    error = Exception("Failed to generate content: response was blocked")
+    limiter.release(ticket, throttled=is_throttle_error(error))
+
+    stats = limiter.get_stats()
+    assert stats["throttled"] == 0
+    assert stats["concurrency_limit"] == before
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
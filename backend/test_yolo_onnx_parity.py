@@ -0,0 +1,168 @@
+"""
+Check that the ONNX Runtime YOLO backend matches ultralytics/torch
+
+For every .pt in models/ (or the paths given on the command line): exports the .onnx next
+to it if missing, runs both backends on sample images with the detectors' settings and
+compares the detections box by box. Also prints per-image latency for both backends.
+Skipped under pytest when ultralytics or onnxruntime is not installed.
+
+Usage:
+    python -m pytest test_yolo_onnx_parity.py -v
+    python test_yolo_onnx_parity.py [model.pt ...] [--images page1.png page2.jpg ...]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pytest
+
+YOLO = pytest.importorskip("ultralytics", reason="pip install ultralytics").YOLO
+pytest.importorskip("onnxruntime", reason="pip install onnxruntime")
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from app.services.modules.yolo_onnx_backend import YOLOOnnxModel, resolve_onnx_model_path
+
+# Same call arguments as the detectors
+CONF = 0.1
+IOU = 0.45
+# Allowed difference between backends (pixels / confidence)
+BOX_TOLERANCE = 2.0
+CONF_TOLERANCE = 0.02
+TIMING_RUNS = 5
+
+
+def sample_images():
+    """Synthetic document-like pages in the shapes the pipeline sends (page renders and crops)"""
+    rng = np.random.default_rng(0)
+    images = []
+    for width, height in [(1275, 1650), (640, 640), (900, 300), (2480, 3508)]:
+        image = Image.new('RGB', (width, height), color='white')
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x, y = int(rng.integers(0, width - 60)), int(rng.integers(0, height - 30))
+            points = [(x + int(rng.integers(0, 60)), y + int(rng.integers(0, 30))) for _ in range(8)]
+            draw.line(points, fill='black', width=3)
+        draw.rectangle([width // 10, height // 10, width // 3, height // 3], outline='black', width=4)
+        images.append(image)
+    return images
+
+
+def detections(results):
+    """(class, conf, [x1, y1, x2, y2]) per box for each result, from either backend"""
+    return [
+        [(int(box.cls[0]), float(box.conf[0]), [float(v) for v in box.xyxy[0].tolist()]) for box in result.boxes]
+        for result in results
+    ]
+
+
+def compare(torch_dets, onnx_dets):
+    """Number of mismatching boxes between the two backends for one image"""
+    if len(torch_dets) != len(onnx_dets):
+        print(f"   ❌ Box count differs: torch={len(torch_dets)}, onnx={len(onnx_dets)}")
+        return max(len(torch_dets), len(onnx_dets))
+
+    mismatches = 0
+    for (t_cls, t_conf, t_box), (o_cls, o_conf, o_box) in zip(torch_dets, onnx_dets):
+        box_diff = max(abs(a - b) for a, b in zip(t_box, o_box))
+        if t_cls != o_cls or abs(t_conf - o_conf) > CONF_TOLERANCE or box_diff > BOX_TOLERANCE:
+            print(f"   ❌ torch cls={t_cls} conf={t_conf:.3f} box={[round(v, 1) for v in t_box]}")
+            print(f"      onnx  cls={o_cls} conf={o_conf:.3f} box={[round(v, 1) for v in o_box]}")
+            mismatches += 1
+    return mismatches
+
+
+def timed(model, images):
+    start = time.perf_counter()
+    for _ in range(TIMING_RUNS):
+        for image in images:
+            model(image, conf=CONF, iou=IOU, verbose=False)
+    return (time.perf_counter() - start) / (TIMING_RUNS * len(images))
+
+
+def check_parity(model_path: str, images) -> bool:
+    """Compare torch and ONNX Runtime detections for one model"""
+    print("=" * 60)
+    print(f"Testing: {model_path}")
+    print("=" * 60)
+
+    if not os.path.exists(model_path):
+        print(f"❌ File not found: {model_path}")
+        return False
+
+    torch_model = YOLO(model_path)
+    onnx_path = resolve_onnx_model_path(model_path, None)
+    if not os.path.exists(onnx_path):
+        print(f"📦 Exporting {onnx_path}")
+        torch_model.export(format="onnx", dynamic=True)
+    onnx_model = YOLOOnnxModel(onnx_path)
+    print(f"✅ ONNX model loaded - providers: {onnx_model.providers}, input size: {onnx_model.imgsz}")
+
+    if onnx_model.names != torch_model.names:
+        print(f"❌ Class names differ: torch={torch_model.names}, onnx={onnx_model.names}")
+        return False
+
+    mismatches = 0
+    total_boxes = 0
+    # Single images (the detectors' per-image path) and one batch (the batch queue's path)
+    for i, image in enumerate(images):
+        torch_dets = detections(torch_model(image, conf=CONF, iou=IOU, verbose=False))[0]
+        onnx_dets = detections(onnx_model(image, conf=CONF, iou=IOU))[0]
+        print(f"🖼️  Image {i + 1} ({image.width}x{image.height}): torch={len(torch_dets)} box(es), onnx={len(onnx_dets)}")
+        mismatches += compare(torch_dets, onnx_dets)
+        total_boxes += len(torch_dets)
+
+    torch_batch = detections(torch_model(images, conf=CONF, iou=IOU, verbose=False))
+    onnx_batch = detections(onnx_model(images, conf=CONF, iou=IOU))
+    print(f"📚 Batch of {len(images)}: torch={sum(map(len, torch_batch))} box(es), onnx={sum(map(len, onnx_batch))}")
+    for torch_dets, onnx_dets in zip(torch_batch, onnx_batch):
+        mismatches += compare(torch_dets, onnx_dets)
+
+    torch_latency = timed(torch_model, images)
+    onnx_latency = timed(onnx_model, images)
+    print(f"\n⏱️  torch: {torch_latency * 1000:.1f}ms/image, onnx: {onnx_latency * 1000:.1f}ms/image "
+          f"({torch_latency / onnx_latency:.2f}x)")
+
+    print("=" * 60)
+    if mismatches:
+        print(f"❌ {mismatches} mismatching detection(s) out of {total_boxes}")
+        return False
+    print(f"✅ Backends agree ({total_boxes} detection(s), box tolerance {BOX_TOLERANCE}px, conf tolerance {CONF_TOLERANCE})")
+    return True
+
+
+@pytest.mark.parametrize("model_path", [str(path) for path in Path(__file__).parent.glob("models/*.pt")])
+def test_onnx_matches_torch(model_path):
+    assert check_parity(model_path, sample_images())
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    image_paths = []
+    if "--images" in args:
+        split = args.index("--images")
+        args, image_paths = args[:split], args[split + 1:]
+
+    model_paths = args or [str(path) for path in Path("models").glob("*.pt")]
+    if not model_paths:
+        print("❌ No .pt model files found in models/ directory")
+        sys.exit(1)
+
+    images = [Image.open(path).convert('RGB') for path in image_paths] or sample_images()
+
+    failed = [path for path in model_paths if not check_parity(path, images)]
+    print()
+    if failed:
+        print(f"❌ Parity failed for: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"✅ ONNX backend matches torch for {len(model_paths)} model(s)")
+    print("💡 To use: Set YOLO_BACKEND=onnx (or openvino) in .env")
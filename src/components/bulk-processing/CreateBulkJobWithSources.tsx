@@ -61,7 +61,6 @@ export const CreateBulkJobWithSources: React.FC<CreateBulkJobWithSourcesProps> =
   // Advanced worker configuration
   const [workerConcurrency, setWorkerConcurrency] = useState(50);
   const [workerPrefetch, setWorkerPrefetch] = useState(2);
-  const [pagesPerThread, setPagesPerThread] = useState(5);
   const [checkpointInterval, setCheckpointInterval] = useState(50);
   
   const { toast } = useToast();
@@ -192,7 +191,6 @@ export const CreateBulkJobWithSources: React.FC<CreateBulkJobWithSourcesProps> =
           // Advanced worker configuration
           worker_concurrency: workerConcurrency,
           worker_prefetch_multiplier: workerPrefetch,
-          pages_per_thread: pagesPerThread,
           checkpoint_interval: checkpointInterval
         }
       };
@@ -506,22 +504,6 @@ export const CreateBulkJobWithSources: React.FC<CreateBulkJobWithSourcesProps> =
                       </p>
                     </div>
 
-                    {/* Pages Per Thread */}
-                    <div className="space-y-2">
-                      <Label htmlFor="pages-per-thread">Pages Per Thread</Label>
-                      <Input
-                        id="pages-per-thread"
-                        type="number"
-                        min="1"
-                        max="20"
-                        value={pagesPerThread}
-                        onChange={(e) => setPagesPerThread(Math.max(1, Math.min(20, parseInt(e.target.value) || 1)))}
-                      />
-                      <p className="text-xs text-muted-foreground">
-                        Pages each thread processes (1-20)
-                      </p>
-                    </div>
-
                     {/* Checkpoint Interval */}
                     <div className="space-y-2">
                       <Label htmlFor="checkpoint-interval">Checkpoint Interval</Label>
@@ -552,7 +534,6 @@ export const CreateBulkJobWithSources: React.FC<CreateBulkJobWithSourcesProps> =
                       setRetryDelay(60);
                       setWorkerConcurrency(50);
                       setWorkerPrefetch(2);
-                      setPagesPerThread(5);
                       setCheckpointInterval(50);
                       toast({ title: 'Reset to default values' });
                     }}
@@ -583,10 +564,6 @@ export const CreateBulkJobWithSources: React.FC<CreateBulkJobWithSourcesProps> =
                     <span className="text-muted-foreground">Batch Size:</span>
                     <span className="ml-2 font-medium">{batchSize} docs</span>
                   </div>
-                  <div>
-                    <span className="text-muted-foreground">Pages/Thread:</span>
-                    <span className="ml-2 font-medium">{pagesPerThread} pages</span>
-                  </div>
                   <div>
                     <span className="text-muted-foreground">Max Retries:</span>
                     <span className="ml-2 font-medium">{maxRetries} attempts</span>